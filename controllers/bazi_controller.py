@@ -25,6 +25,7 @@ from core.flux import FluxEngine
 from core.unified_engine import UnifiedEngine as QuantumEngine
 from core.engine_graph import GraphNetworkEngine
 from core.bazi_profile import BaziProfile
+from core.bazi_profile_factory import get_profile_factory
 from core.exceptions import (
     BaziCalculationError,
     BaziInputError,
@@ -377,7 +378,7 @@ class BaziController:
             # 4. BaziProfile
             logger.debug("Creating BaziProfile...")
             birth_dt = datetime.datetime.combine(d, datetime.time(t, m))  # Include minute
-            self._profile = BaziProfile(birth_dt, self._gender_idx)
+            self._profile = get_profile_factory().get(birth_dt, self._gender_idx)
             
             elapsed = time.time() - start_time
             logger.info(f"Base calculations completed in {elapsed:.4f} seconds")
@@ -15,10 +15,9 @@ from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 import json
 
+import numpy as np
+
 from core.trinity.core.unified_arbitrator_master import QuantumUniversalFramework
-from core.trinity.core.engines.synthetic_bazi_engine import SyntheticBaziEngine
-from core.trinity.core.nexus.definitions import BaziParticleNexus
-from core.engine_graph.constants import TWELVE_LIFE_STAGES
 from core.trinity.core.intelligence.symbolic_stars import SymbolicStarsEngine
 
 logger = logging.getLogger(__name__)
@@ -510,6 +509,44 @@ class HolographicPatternController:
             logger.warning(f"格局 {pattern_id} 权重未归一化，已自动归一化")
         
         # 计算SAI（系统对齐指数）
+        sai, sai_error = self._arbitrate_sai(pattern_id, chart, day_master, context)
+        
+        # 计算五维投影（SAI × 权重）
+        projection = {
+            'E': sai * weights.get('E', 0.0),  # 能级轴
+            'O': sai * weights.get('O', 0.0),  # 秩序轴
+            'M': sai * weights.get('M', 0.0),  # 物质轴
+            'S': sai * weights.get('S', 0.0),  # 应力轴
+            'R': sai * weights.get('R', 0.0)   # 关联轴
+        }
+        
+        # 获取语义意象（模块I）
+        semantic_seed = pattern.get('semantic_seed', {})
+        
+        result_dict = {
+            'pattern_id': pattern_id,
+            'pattern_name': pattern.get('name', pattern_id),
+            'sai': sai,
+            'projection': projection,
+            'weights': weights,
+            'semantic_seed': semantic_seed.get('description', ''),
+            'tensor_operator': tensor_operator
+        }
+        
+        # 如果SAI为0且有错误信息，添加到结果中
+        if sai == 0.0 and sai_error:
+            result_dict['sai_warning'] = sai_error
+        
+        return result_dict
+    
+    def _arbitrate_sai(self, pattern_id: str, chart: List[str], day_master: str,
+                       context: Optional[Dict] = None) -> Tuple[float, Optional[str]]:
+        """
+        通过量子仲裁框架计算单个命盘的SAI（系统对齐指数）
+        
+        Returns:
+            (sai, sai_error)
+        """
         sai = 0.0
         sai_error = None
         try:
@@ -561,33 +598,76 @@ class HolographicPatternController:
             sai_error = f"SAI计算异常: {str(e)}"
             sai = 0.0
         
-        # 计算五维投影（SAI × 权重）
-        projection = {
-            'E': sai * weights.get('E', 0.0),  # 能级轴
-            'O': sai * weights.get('O', 0.0),  # 秩序轴
-            'M': sai * weights.get('M', 0.0),  # 物质轴
-            'S': sai * weights.get('S', 0.0),  # 应力轴
-            'R': sai * weights.get('R', 0.0)   # 关联轴
-        }
+        return sai, sai_error
+    
+    def calculate_tensor_projection_batch(self, pattern_id: str, charts: Any,
+                                          sai: Optional[Any] = None,
+                                          context: Optional[Dict] = None) -> Dict:
+        """
+        批量五维张量投影：(N, 8) 编码命盘（或八字列表）→ (N, 5) 张量 + (N,) 纯度得分
         
-        # 获取语义意象（模块I）
-        semantic_seed = pattern.get('semantic_seed', {})
+        Args:
+            pattern_id: 格局ID
+            charts: (N, 8) 编码矩阵（core.rule_index.encode_charts / encode_universe），或八字列表序列
+            sai: 预先仲裁好的 (N,) SAI；缺省时逐例调用量子仲裁框架
+            context: 上下文（大运、流年等）
+            
+        Returns:
+            {'projection': (N, 5) 张量（列顺序 axes）, 'sai': (N,), 'purity': (N,), 'axes', 'weights', ...}
+        """
+        from core.rule_index import decode_chart, encode_charts
+        from core.pattern_projection import AXES, get_batch_projector, weight_vector
         
-        result_dict = {
+        pattern = self.get_pattern_by_id(pattern_id)
+        if not pattern:
+            return {'error': f'格局 {pattern_id} 不存在'}
+        
+        codes = charts if isinstance(charts, np.ndarray) else encode_charts(charts)
+        projector = get_batch_projector()
+        
+        tensor_operator = pattern.get('tensor_operator', {})
+        weights = tensor_operator.get('weights', {})
+        physics_kernel = pattern.get('physics_kernel', {})
+        version = str(pattern.get('version', '1.0'))
+        is_matrix_protocol = (
+            version >= '1.5' or
+            version.startswith('3.') or
+            physics_kernel.get('transfer_matrix') is not None
+        )
+        
+        if is_matrix_protocol:
+            # 矩阵协议的投影依赖RegistryLoader逐例计算，这里只做结果堆叠
+            projection = np.zeros((len(codes), len(AXES)))
+            sai_values = np.zeros(len(codes))
+            for n, code in enumerate(codes):
+                bazi = decode_chart(code)
+                single = self.calculate_tensor_projection(pattern_id, bazi, bazi[2][0], context)
+                sai_values[n] = single.get('sai', 0.0) or 0.0
+                projection[n] = weight_vector(single.get('projection', {}))
+        else:
+            if not weights:
+                return {
+                    'error': f'格局 {pattern_id} 尚未完成FDS-V1.1 Step 1注册（缺少张量投影算子）',
+                    'pattern_id': pattern_id,
+                    'pattern_name': pattern.get('name', pattern_id)
+                }
+            if not tensor_operator.get('normalized', False):
+                weights = self.normalize_weights(weights)
+            if sai is None:
+                sai = [self._arbitrate_sai(pattern_id, bazi, bazi[2][0], context)[0]
+                       for bazi in map(decode_chart, codes)]
+            sai_values = np.asarray(sai, dtype=float)
+            projection = projector.project(sai_values, weights)
+        
+        return {
             'pattern_id': pattern_id,
             'pattern_name': pattern.get('name', pattern_id),
-            'sai': sai,
+            'axes': AXES,
+            'sai': sai_values,
             'projection': projection,
-            'weights': weights,
-            'semantic_seed': semantic_seed.get('description', ''),
-            'tensor_operator': tensor_operator
+            'purity': projector.purity_scores(codes),
+            'weights': weights
         }
-        
-        # 如果SAI为0且有错误信息，添加到结果中
-        if sai == 0.0 and sai_error:
-            result_dict['sai_warning'] = sai_error
-        
-        return result_dict
     
     def normalize_weights(self, weights: Dict[str, float]) -> Dict[str, float]:
         """
@@ -772,12 +852,14 @@ class HolographicPatternController:
             logger.error(f"格局 {pattern_id} 缺少数据选择标准")
             return []
         
-        # 初始化生成器
-        engine = SyntheticBaziEngine()
-        bazi_gen = engine.generate_all_bazi()
+        # 全量宇宙编码（顺序与 SyntheticBaziEngine.generate_all_bazi() 一致），按 5% 分块做数组海选
+        from core.rule_index import encode_universe
+        from core.pattern_projection import SINGULARITY_LABELS, SINGULARITY_NONE, get_batch_projector
+        projector = get_batch_projector()
+        universe = encode_universe()
+        total = len(universe)
+        block = 25920
         
-        candidates = []
-        total_scanned = 0
         stats = {
             'scanned': 0,
             'matched': 0,
@@ -788,103 +870,21 @@ class HolographicPatternController:
         
         logger.info(f"开始样本海选：格局={pattern_id}，目标={target_count}例，全量扫描518,400个样本")
         
-        # 严格全量扫描：必须扫描所有518,400个样本
-        for chart in bazi_gen:
-            total_scanned += 1
-            stats['scanned'] = total_scanned
-            
-            # 进度回调（每10,000个样本或每5%进度）
-            if progress_callback and (total_scanned % 10000 == 0 or total_scanned % 25920 == 0):
-                progress_callback(total_scanned, 518400, stats)
-            
-            # 注意：不提前退出，必须扫描全部518,400个样本
-            
-            # 提取基本信息
-            year_pillar, month_pillar, day_pillar, hour_pillar = chart
-            day_master = day_pillar[0]
-            month_branch = month_pillar[1]
-            
-            # 1. 月令锁：月支本气必须为日主之帝旺（即羊刃）
-            life_stage = TWELVE_LIFE_STAGES.get((day_master, month_branch))
-            if life_stage != '帝旺':
-                stats['rejected_month_lock'] += 1
-                continue
-            
-            # 2. 天干透杀：天干必须透出七杀，且七杀必须有根
-            stems = [year_pillar[0], month_pillar[0], day_pillar[0], hour_pillar[0]]
-            branches = [year_pillar[1], month_pillar[1], day_pillar[1], hour_pillar[1]]
-            
-            # 检查天干是否有七杀
-            qi_sha_stems = []
-            for i, stem in enumerate(stems):
-                if i == 2:  # 跳过日主
-                    continue
-                ten_god = BaziParticleNexus.get_shi_shen(stem, day_master)
-                if ten_god == '七杀':
-                    qi_sha_stems.append((i, stem))
-            
-            if not qi_sha_stems:
-                stats['rejected_stem_reveal'] += 1
-                continue
-            
-            # 检查七杀是否有根
-            has_root = False
-            for _, qi_sha_stem in qi_sha_stems:
-                # 检查自坐
-                pillar_idx = qi_sha_stems[0][0]
-                if pillar_idx < len(branches):
-                    branch = branches[pillar_idx]
-                    hidden_stems = BaziParticleNexus.get_branch_weights(branch)
-                    for hidden_stem, weight in hidden_stems:
-                        if hidden_stem == qi_sha_stem and weight >= 5:  # 主气或中气
-                            has_root = True
-                            break
-                
-                # 检查其他地支
-                if not has_root:
-                    for branch in branches:
-                        hidden_stems = BaziParticleNexus.get_branch_weights(branch)
-                        for hidden_stem, weight in hidden_stems:
-                            if hidden_stem == qi_sha_stem and weight >= 5:
-                                has_root = True
-                                break
-                        if has_root:
-                            break
-                
-                if has_root:
-                    break
-            
-            if not has_root:
-                stats['rejected_stem_reveal'] += 1
-                continue
-            
-            # 3. 清纯度过滤：剔除重食伤制杀、重财党杀
-            ten_gods = [BaziParticleNexus.get_shi_shen(s, day_master) for s in stems]
-            
-            # 统计食伤和财星数量
-            shi_shen_count = ten_gods.count('食神') + ten_gods.count('伤官')
-            cai_count = ten_gods.count('正财') + ten_gods.count('偏财')
-            qi_sha_count = ten_gods.count('七杀')
-            
-            # 剔除重食伤制杀（这会变成A-02食神制杀）
-            if shi_shen_count >= 2 and qi_sha_count >= 1:
-                stats['rejected_purity'] += 1
-                continue
-            
-            # 剔除重财党杀（这会导致应力轴S爆表）
-            if cai_count >= 2 and qi_sha_count >= 1:
-                stats['rejected_purity'] += 1
-                continue
-            
-            # 通过所有筛选条件
-            candidates.append({
-                'chart': chart,
-                'day_master': day_master,
-                'month_branch': month_branch,
-                'qi_sha_stems': [s for _, s in qi_sha_stems],
-                'ten_gods': ten_gods
-            })
-            stats['matched'] += 1
+        # Step A：月令锁（帝旺）→ 天干透杀且有根 → 清纯度（剔除重食伤制杀、重财党杀）
+        matched_rows = []
+        for start in range(0, total, block):
+            codes = universe[start:start + block]
+            passed, rejected = projector.screen(codes)
+            for key, value in rejected.items():
+                stats[key] += value
+            stats['scanned'] += len(codes)
+            stats['matched'] += int(passed.sum())
+            matched_rows.append(start + np.flatnonzero(passed))
+            if progress_callback:
+                progress_callback(stats['scanned'], 518400, stats)
+        
+        total_scanned = stats['scanned']
+        candidate_codes = universe[np.concatenate(matched_rows)]
         
         # 验证是否扫描了全部样本
         if total_scanned < 518400:
@@ -892,7 +892,7 @@ class HolographicPatternController:
         else:
             logger.info(f"✅ 已扫描全部518,400个样本")
         
-        logger.info(f"Step A完成：扫描={total_scanned}，匹配={len(candidates)}，目标={target_count}")
+        logger.info(f"Step A完成：扫描={total_scanned}，匹配={len(candidate_codes)}，目标={target_count}")
         logger.info(f"统计：月令锁拒绝={stats['rejected_month_lock']}，透杀拒绝={stats['rejected_stem_reveal']}，纯度拒绝={stats['rejected_purity']}")
         
         # ========== Step B: 奇点捕获 (Tier X) ==========
@@ -900,43 +900,36 @@ class HolographicPatternController:
         logger.info("Step B: 奇点捕获 (Tier X)")
         logger.info("=" * 70)
         
-        singularities = []
-        standard_candidates = []
+        kinds = projector.singularity_types(candidate_codes)
+        purity = projector.purity_scores(candidate_codes)
+        is_singularity = kinds != SINGULARITY_NONE
         
-        for sample in candidates:
-            day_master = sample['day_master']
-            is_singularity, singularity_type = self._detect_singularity(sample, day_master)
-            
-            if is_singularity:
-                sample['singularity_type'] = singularity_type
-                sample['purity_score'] = self._calculate_purity_score(sample, day_master)
-                singularities.append(sample)
-            else:
-                standard_candidates.append(sample)
+        singularities = []
+        for row in np.flatnonzero(is_singularity):
+            sample = projector.candidates(candidate_codes[row:row + 1])[0]
+            sample['singularity_type'] = SINGULARITY_LABELS[int(kinds[row])]
+            sample['purity_score'] = float(purity[row])
+            singularities.append(sample)
+        standard_rows = np.flatnonzero(~is_singularity)
         
         logger.info(f"✅ 发现奇点样本 {len(singularities)} 个，已隔离")
-        logger.info(f"✅ 标准候选样本 {len(standard_candidates)} 个")
+        logger.info(f"✅ 标准候选样本 {len(standard_rows)} 个")
         
         # ========== Step C: 标准集优选 (Tier A) ==========
         logger.info("=" * 70)
         logger.info("Step C: 标准集优选 (Tier A) - 纯度加权排序")
         logger.info("=" * 70)
         
-        # 计算纯度得分并排序
-        for sample in standard_candidates:
-            day_master = sample['day_master']
-            sample['purity_score'] = self._calculate_purity_score(sample, day_master)
-        
-        # 按纯度得分降序排序
-        standard_candidates.sort(key=lambda x: x['purity_score'], reverse=True)
+        # 按纯度得分降序排序（稳定排序，同分保持扫描顺序），截取前target_count个作为Tier A标准集
+        order = standard_rows[np.argsort(-purity[standard_rows], kind='stable')][:target_count]
+        standard_set = projector.candidates(candidate_codes[order])
+        for sample, row in zip(standard_set, order):
+            sample['purity_score'] = float(purity[row])
         
-        # 截取前target_count个作为Tier A标准集
-        if len(standard_candidates) > target_count:
-            standard_set = standard_candidates[:target_count]
-            logger.info(f"✅ 从 {len(standard_candidates)} 个候选样本中，按纯度排序选取前 {target_count} 个作为Tier A标准集")
+        if len(standard_rows) > target_count:
+            logger.info(f"✅ 从 {len(standard_rows)} 个候选样本中，按纯度排序选取前 {target_count} 个作为Tier A标准集")
         else:
-            standard_set = standard_candidates
-            logger.info(f"✅ 候选样本 {len(standard_candidates)} 个（少于目标 {target_count}），全部作为Tier A标准集")
+            logger.info(f"✅ 候选样本 {len(standard_rows)} 个（少于目标 {target_count}），全部作为Tier A标准集")
         
         # 输出统计
         if standard_set:
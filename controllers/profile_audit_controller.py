@@ -16,6 +16,7 @@ from core.models.profile_audit_engines import (
 )
 from services.report_generator_service import ReportGeneratorService
 from core.bazi_profile import BaziProfile
+from core.bazi_profile_factory import get_profile_factory
 from core.engine_graph import GraphNetworkEngine
 
 logger = logging.getLogger(__name__)
@@ -131,7 +132,7 @@ class ProfileAuditController:
                     profile_data.get('minute', 0)
                 )
                 gender = 1 if profile_data.get('gender') == '男' else 0
-                bazi_profile = BaziProfile(birth_date, gender)
+                bazi_profile = get_profile_factory().get(birth_date, gender)
         except Exception as e:
             logger.error(f"创建BaziProfile失败: {e}")
             import traceback
@@ -14,9 +14,14 @@ V10.0 优化：输出置信区间，而非单一标量
 日期: 2025-01-XX
 """
 
+import warnings
 import numpy as np
-from typing import Dict, Tuple, List, Optional
+from typing import Callable, Dict, Tuple, List, Optional
 from scipy import stats
+from scipy.stats import qmc
+
+# 采样方法：伪随机 / Sobol 低差异序列（加扰）/ 拉丁超立方
+SAMPLING_METHODS = ("random", "sobol", "lhs")
 
 
 class BayesianInference:
@@ -74,17 +79,58 @@ class BayesianInference:
             'uncertainty': uncertainty
         }
     
+    @staticmethod
+    def sample_parameters(
+        parameter_ranges: Dict[str, Tuple[float, float]],
+        n_samples: int,
+        seed: Optional[int] = None,
+        method: str = "random"
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        一次性抽取 (n_samples, n_params) 参数矩阵
+        
+        Args:
+            parameter_ranges: 参数范围字典 {name: (min, max)}
+            n_samples: 样本数
+            seed: 随机种子（相同种子结果可复现）
+            method: "random"（均匀伪随机）、"sobol"（加扰 Sobol）、"lhs"（拉丁超立方）
+        
+        Returns:
+            (参数名列表, 参数矩阵)，矩阵第 j 列对应第 j 个参数名
+        """
+        if method not in SAMPLING_METHODS:
+            raise ValueError(f"未知采样方法: {method}（可选 {SAMPLING_METHODS}）")
+        names = list(parameter_ranges)
+        if not names:
+            return names, np.empty((n_samples, 0))
+        lows = np.array([parameter_ranges[k][0] for k in names], dtype=float)
+        highs = np.array([parameter_ranges[k][1] for k in names], dtype=float)
+        
+        if method == "random":
+            unit = np.random.default_rng(seed).random((n_samples, len(names)))
+        elif method == "sobol":
+            with warnings.catch_warnings():
+                # 非 2 的幂样本数会损失部分平衡性，这里接受
+                warnings.simplefilter("ignore", UserWarning)
+                unit = qmc.Sobol(d=len(names), scramble=True, seed=seed).random(n_samples)
+        else:
+            unit = qmc.LatinHypercube(d=len(names), seed=seed).random(n_samples)
+        return names, lows + unit * (highs - lows)
+    
     @staticmethod
     def monte_carlo_simulation(
         base_estimate: float,
         parameter_ranges: Dict[str, Tuple[float, float]],
         n_samples: int = 1000,
-        confidence_level: float = 0.95
+        confidence_level: float = 0.95,
+        evaluate: Optional[Callable[[Dict[str, np.ndarray]], np.ndarray]] = None,
+        seed: Optional[int] = None,
+        method: str = "random"
     ) -> Dict[str, float]:
         """
-        蒙特卡洛模拟
+        蒙特卡洛模拟（[V9.4 Performance] 向量化）
         
-        通过对参数进行数千次采样扰动，计算命运波函数的坍缩概率分布。
+        一次抽取全部参数样本，交给向量化的评估函数批量计算，10^5 样本可在交互时间内完成。
         
         Args:
             base_estimate: 基础估计值
@@ -97,6 +143,11 @@ class BayesianInference:
                 }
             n_samples: 采样次数（默认 1000）
             confidence_level: 置信水平（默认 0.95）
+            evaluate: 向量化评估函数 {参数名: (n_samples,) 数组} -> (n_samples,) 估计值，
+                例如 BayesianStrengthCalibration.confidence_batch；
+                为 None 时沿用旧模型 base_estimate * (1 + N(0, 0.1))
+            seed: 随机种子
+            method: 参数采样方法（"random" / "sobol" / "lhs"）
         
         Returns:
             包含统计信息的字典:
@@ -105,50 +156,35 @@ class BayesianInference:
                 'std': float,            # 标准差
                 'lower_bound': float,    # 下界（置信区间）
                 'upper_bound': float,    # 上界（置信区间）
-                'percentiles': Dict      # 百分位数
+                'percentiles': Dict,     # 百分位数
+                'samples': np.ndarray    # (n_samples,) 估计值
             }
         """
-        samples = []
-        
-        for _ in range(n_samples):
-            # 对每个参数进行随机采样
-            sampled_params = {}
-            for param_name, (min_val, max_val) in parameter_ranges.items():
-                sampled_params[param_name] = np.random.uniform(min_val, max_val)
-            
-            # 基于采样参数计算估计值
-            # 这里简化处理，实际应该调用完整的计算函数
-            sample_estimate = base_estimate * (1.0 + np.random.normal(0, 0.1))
-            samples.append(sample_estimate)
-        
-        samples = np.array(samples)
-        
-        # 计算统计量
-        mean = np.mean(samples)
-        std = np.std(samples)
-        
-        # 计算置信区间
+        names, matrix = BayesianInference.sample_parameters(parameter_ranges, n_samples, seed, method)
+        
+        if evaluate is not None:
+            samples = np.asarray(evaluate({name: matrix[:, j] for j, name in enumerate(names)}), dtype=float)
+            samples = np.broadcast_to(samples, (n_samples,))
+        else:
+            # 旧模型：与参数无关的 10% 乘性噪声
+            noise_seed = None if seed is None else seed + 1
+            samples = base_estimate * (1.0 + np.random.default_rng(noise_seed).normal(0, 0.1, n_samples))
+        
+        # 计算置信区间与百分位数（一次排序）
         alpha = 1 - confidence_level
-        lower_bound = np.percentile(samples, alpha / 2 * 100)
-        upper_bound = np.percentile(samples, (1 - alpha / 2) * 100)
-        
-        # 计算百分位数
-        percentiles = {
-            'p5': np.percentile(samples, 5),
-            'p25': np.percentile(samples, 25),
-            'p50': np.percentile(samples, 50),
-            'p75': np.percentile(samples, 75),
-            'p95': np.percentile(samples, 95)
-        }
+        qs = [alpha / 2 * 100, (1 - alpha / 2) * 100, 5, 25, 50, 75, 95]
+        lower_bound, upper_bound, p5, p25, p50, p75, p95 = (float(v) for v in np.percentile(samples, qs))
         
         return {
-            'mean': mean,
-            'std': std,
+            'mean': float(np.mean(samples)),
+            'std': float(np.std(samples)),
             'lower_bound': lower_bound,
             'upper_bound': upper_bound,
             'confidence_level': confidence_level,
-            'percentiles': percentiles,
-            'samples': samples
+            'percentiles': {'p5': p5, 'p25': p25, 'p50': p50, 'p75': p75, 'p95': p95},
+            'samples': samples,
+            'method': method,
+            'n_samples': n_samples
         }
     
     @staticmethod
@@ -48,23 +48,42 @@ class BayesianStrengthCalibration:
         
         threshold_center = config.get('energy_threshold_center', threshold_center)
         
-        # 计算能量差值
-        energy_diff = abs(energy_sum - threshold_center)
+        return float(BayesianStrengthCalibration.confidence_batch({
+            'strength_probability': strength_probability,
+            'energy_sum': energy_sum,
+            'threshold_center': threshold_center
+        }))
+    
+    @staticmethod
+    def confidence_batch(params: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        向量化旺衰置信度（与 calculate_strength_confidence 同一公式）
+        
+        可直接作为 BayesianInference.monte_carlo_simulation 的 evaluate 参数。
+        
+        Args:
+            params: {'strength_probability': 数组, 'energy_sum': 数组,
+                     'threshold_center': 数组或标量（可选，默认 3.0）}
+        
+        Returns:
+            置信度数组 [0, 1]
+        """
+        strength_probability = np.asarray(params['strength_probability'], dtype=float)
+        energy_sum = np.asarray(params['energy_sum'], dtype=float)
+        threshold_center = np.asarray(params.get('threshold_center', 3.0), dtype=float)
         
         # 置信度基于：
         # 1. 能量差值的大小（差值越大，置信度越高）
         # 2. 旺衰概率的极端程度（接近 0 或 1 时置信度更高）
         
         # 能量差值贡献
-        energy_confidence = min(1.0, energy_diff / threshold_center)
+        energy_confidence = np.minimum(1.0, np.abs(energy_sum - threshold_center) / threshold_center)
         
         # 概率极端程度贡献
-        probability_confidence = abs(strength_probability - 0.5) * 2  # [0, 1]
+        probability_confidence = np.abs(strength_probability - 0.5) * 2  # [0, 1]
         
         # 综合置信度
-        confidence = (energy_confidence + probability_confidence) / 2.0
-        
-        return confidence
+        return (energy_confidence + probability_confidence) / 2.0
     
     @staticmethod
     def reverse_infer_strength_error(
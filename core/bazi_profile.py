@@ -7,6 +7,9 @@ class BaziProfile:
     [V6.0 Core] 八字档案对象 (The Oracle)
     封装所有基于出生信息的计算逻辑（排盘、大运、流年映射）。
     作为 Single Source of Truth，替代散乱的字典传递。
+    
+    [V9.4 Performance] 支持由 BaziProfileFactory 预计算构建（不触发 Lunar.fromDate），
+    lunar / chart 对象在首次访问时才惰性创建。
     """
     
     def __init__(self, birth_date, gender: int):
@@ -18,18 +21,91 @@ class BaziProfile:
         self.gender = gender
         
         # 1. 初始化 Lunar 对象 (最重的计算)
-        self.lunar = Lunar.fromDate(birth_date)
-        self.chart = self.lunar.getEightChar()
+        self._lunar = Lunar.fromDate(birth_date)
+        self._chart = self._lunar.getEightChar()
         
         # 2. 缓存字段 (Lazy Loading)
+        self._pillars: Optional[Dict[str, str]] = None
         self._luck_timeline: Optional[Dict[int, str]] = None 
+        self._luck_cycles: Optional[List[Dict]] = None
         self._day_master: Optional[str] = None
+        self._frozen = False
+
+    @classmethod
+    def from_precomputed(
+        cls,
+        birth_date,
+        gender: int,
+        pillars: Dict[str, str],
+        luck_cycles: List[Dict],
+        pre_luck_end_year: int
+    ) -> 'BaziProfile':
+        """
+        [V9.4] 由预计算结果构建档案（跳过 Lunar.fromDate）
+        
+        :param pillars: 四柱 {'year', 'month', 'day', 'hour'}
+        :param luck_cycles: 大运周期 [{'start_year', 'end_year', 'gan_zhi'}, ...]
+        :param pre_luck_end_year: 起运前（无大运）的最后一年
+        """
+        profile = cls.__new__(cls)
+        profile.birth_date = birth_date
+        profile.gender = gender
+        profile._lunar = None
+        profile._chart = None
+        profile._pillars = dict(pillars)
+        profile._luck_cycles = [dict(c) for c in luck_cycles]
+        profile._day_master = None
+        profile._frozen = False
+        
+        # 与 _build_luck_timeline 相同的填充顺序：起运前为空串，随后逐运覆盖
+        timeline = {}
+        for y in range(birth_date.year, pre_luck_end_year + 1):
+            timeline[y] = ""
+        for cycle in luck_cycles:
+            for y in range(cycle['start_year'], cycle['end_year'] + 1):
+                timeline[y] = cycle['gan_zhi']
+        profile._luck_timeline = timeline
+        return profile
+
+    def freeze(self) -> 'BaziProfile':
+        """
+        [V9.4] 预热全部缓存并冻结公开属性，供工厂跨调用共享
+        """
+        if self._luck_timeline is None:
+            self._build_luck_timeline()
+        if self._luck_cycles is None:
+            self._luck_cycles = self.get_luck_cycles()
+        if self._pillars is None:
+            self._pillars = self.pillars
+        self._frozen = True
+        return self
+
+    def __setattr__(self, name, value):
+        if not name.startswith('_') and getattr(self, '_frozen', False):
+            raise AttributeError(f"共享档案不可修改: {name}")
+        super().__setattr__(name, value)
 
     # --- 基础属性访问 ---
     
+    @property
+    def lunar(self) -> Lunar:
+        """Lunar 对象（预计算档案在首次访问时创建）"""
+        if self._lunar is None:
+            self._lunar = Lunar.fromDate(self.birth_date)
+        return self._lunar
+
+    @property
+    def chart(self) -> EightChar:
+        """八字对象（预计算档案在首次访问时创建）"""
+        if self._chart is None:
+            self._chart = self.lunar.getEightChar()
+        return self._chart
+    
     @property
     def pillars(self) -> Dict[str, str]:
         """返回四柱干支"""
+        if self._pillars is not None:
+            return dict(self._pillars)
         return {
             'year': self.chart.getYear(),
             'month': self.chart.getMonth(),
@@ -41,7 +117,7 @@ class BaziProfile:
     def day_master(self) -> str:
         """获取日主 (Day Master)"""
         if not self._day_master:
-            self._day_master = self.chart.getDayGan()
+            self._day_master = self.pillars['day'][0]
         return self._day_master
 
     # --- 核心逻辑：时间线查询 ---
@@ -69,23 +145,13 @@ class BaziProfile:
         """
         获取指定流年的干支 (无需 engine 再去算)
         """
-        # 使用 lunar_python 的 Solar 对象计算流年干支
-        # 注意：为了准确性（立春界限），使用年中点（6月15日）计算
-        try:
-            from lunar_python import Solar
-            solar = Solar.fromYmd(year, 6, 15)
-            lunar = solar.getLunar()
-            year_ganzhi = lunar.getYearInGanZhi()
-            return str(year_ganzhi) if year_ganzhi else "未知"
-        except Exception as e:
-            # 如果计算失败，使用简化算法（基于1984年甲子年）
-            # 1984年是甲子年，以此为基准推算
-            offset = year - 1984
-            gan_list = ['甲', '乙', '丙', '丁', '戊', '己', '庚', '辛', '壬', '癸']
-            zhi_list = ['子', '丑', '寅', '卯', '辰', '巳', '午', '未', '申', '酉', '戌', '亥']
-            gan_idx = offset % 10
-            zhi_idx = offset % 12
-            return gan_list[gan_idx] + zhi_list[zhi_idx]
+        # 年中点（6月15日）必在春节与立春之后，流年干支即 (year - 4) 的六十甲子序
+        # （与 Solar.fromYmd(year, 6, 15).getLunar().getYearInGanZhi() 一致，免去 Lunar 计算）
+        # 1984年是甲子年，以此为基准推算
+        offset = year - 1984
+        gan_list = ['甲', '乙', '丙', '丁', '戊', '己', '庚', '辛', '壬', '癸']
+        zhi_list = ['子', '丑', '寅', '卯', '辰', '巳', '午', '未', '申', '酉', '戌', '亥']
+        return gan_list[offset % 10] + zhi_list[offset % 12]
 
     # --- 内部逻辑 ---
 
@@ -139,11 +205,13 @@ class BaziProfile:
 
     def get_chart_voids(self) -> List[str]:
         """Returns the void branches based on the Day Pillar."""
-        day_p = self.chart.getDay()
+        day_p = self.pillars['day']
         return self.get_void_branches(day_p)
 
     def get_luck_cycles(self) -> List[Dict]:
         """返回所有大运周期的列表"""
+        if self._luck_cycles is not None:
+            return [dict(c) for c in self._luck_cycles]
         yun = self.chart.getYun(self.gender)
         da_yun_arr = yun.getDaYun()
         cycles = []
@@ -0,0 +1,259 @@
+"""
+八字档案工厂 (BaziProfile Factory)
+==================================
+[V9.4 Performance] 共享、不可变的 BaziProfile 缓存与批量构建。
+
+架构定位：
+- LRU 缓存，键为 (出生时刻, 性别, 经度)，同一出生数据在进程内只排盘一次
+- 批量构建：四柱与大运时间线直接由干支历表（节令交接时刻）推算，
+  不再逐个调用 Lunar.fromDate / getYun().getDaYun()
+- 历表范围外的日期回退到标准 BaziProfile 构建
+
+起运口径与 lunar_python 默认流派（sect=1：3天1年，1天4个月，1时辰10天）一致。
+"""
+
+import logging
+import threading
+from calendar import monthrange
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.bazi_profile import BaziProfile
+from core.calculator import to_true_solar_time
+from core.ganzhi_calendar import EPOCH, day_index_of, ganzhi_name, get_ganzhi_calendar
+
+logger = logging.getLogger(__name__)
+
+ProfileKey = Tuple[datetime, int, Optional[float]]
+
+# lunar_python 默认 getDaYun(n=10)：第 0 运为起运前，其后 9 步大运
+DA_YUN_COUNT = 10
+
+
+def _time_zhi_index(hour: int) -> int:
+    """时支序号（与 LunarUtil.getTimeZhiIndex 一致，23 点归子时）"""
+    return 0 if hour == 23 else (hour + 1) // 2
+
+
+def _yun_zhi_index(hour: int) -> int:
+    """起运计算用的时辰序号（lunar_python Yun 将 23 点计为亥时）"""
+    return 11 if hour == 23 else (hour + 1) // 2
+
+
+def _add_years_months(d: date, years: int, months: int) -> date:
+    """Solar.nextYear + Solar.nextMonth：跨月时日数截断到当月最后一天"""
+    y = d.year + years
+    day = d.day
+    if d.month == 2 and day > 28:
+        day = min(day, monthrange(y, 2)[1])
+    m_total = d.month - 1 + months
+    y += m_total // 12
+    m = m_total % 12 + 1
+    return date(y, m, min(day, monthrange(y, m)[1]))
+
+
+def compute_precomputed_fields(moment: datetime, gender: int) -> Dict:
+    """
+    由干支历表推算四柱与大运（等价于 Lunar.fromDate(moment).getEightChar() 及其 getYun(gender)）
+
+    Returns:
+        {'pillars', 'luck_cycles', 'pre_luck_end_year'}
+    """
+    calendar = get_ganzhi_calendar()
+    ts = int((moment - EPOCH).total_seconds())
+    pos = int(np.searchsorted(calendar.term_ts, ts, side="right")) - 1
+    if pos < 0 or pos + 1 >= len(calendar.term_ts):
+        raise ValueError(f"{moment} 超出节令表范围")
+
+    year_idx = int(calendar.term_year_idx[pos])
+    month_idx = int(calendar.term_month_idx[pos])
+    # 八字流派2：晚子时日柱算当天；时干按次日日干（五鼠遁）
+    day_idx = day_index_of(moment.date())
+    time_day_idx = day_idx + 1 if moment.hour == 23 else day_idx
+    time_zhi = _time_zhi_index(moment.hour)
+    time_gan = (time_day_idx % 10 % 5 * 2 + time_zhi) % 10
+    hour_idx = (6 * time_gan - 5 * time_zhi) % 60
+
+    pillars = {
+        'year': ganzhi_name(year_idx),
+        'month': ganzhi_name(month_idx),
+        'day': ganzhi_name(day_idx),
+        'hour': ganzhi_name(hour_idx),
+    }
+
+    # 起运：阳男阴女顺推至下一节，阴男阳女逆推至上一节
+    yang = year_idx % 10 % 2 == 0
+    forward = (yang and gender == 1) or (not yang and gender != 1)
+    if forward:
+        start = moment
+        end = EPOCH + timedelta(seconds=int(calendar.term_ts[pos + 1]))
+    else:
+        start = EPOCH + timedelta(seconds=int(calendar.term_ts[pos]))
+        end = moment
+
+    hour_diff = _yun_zhi_index(end.hour) - _yun_zhi_index(start.hour)
+    day_diff = (end.date() - start.date()).days
+    if hour_diff < 0:
+        hour_diff += 12
+        day_diff -= 1
+    month_diff = hour_diff * 10 // 30
+    months = day_diff * 4 + month_diff
+    days = hour_diff * 10 - month_diff * 30
+    years = months // 12
+    months -= years * 12
+
+    start_year = (_add_years_months(moment.date(), years, months) + timedelta(days=days)).year
+
+    step = 1 if forward else -1
+    luck_cycles = []
+    for index in range(1, DA_YUN_COUNT):
+        cycle_start = start_year + (index - 1) * 10
+        luck_cycles.append({
+            'start_year': cycle_start,
+            'end_year': cycle_start + 9,
+            'gan_zhi': ganzhi_name(month_idx + step * index),
+        })
+
+    return {
+        'pillars': pillars,
+        'luck_cycles': luck_cycles,
+        'pre_luck_end_year': start_year - 1,
+    }
+
+
+class BaziProfileFactory:
+    """
+    共享档案工厂
+
+    - get(): 单个档案，命中 LRU 直接返回同一个冻结实例
+    - build_many(): 批量档案，未命中部分由干支历表一次性推算
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._cache: "OrderedDict[ProfileKey, BaziProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def make_key(birth_date: datetime, gender: int, longitude: Optional[float] = None) -> ProfileKey:
+        """规范化缓存键（秒级出生时刻、0/1 性别、经度）"""
+        moment = birth_date.replace(microsecond=0, tzinfo=None)
+        return (moment, 1 if gender == 1 else 0, None if longitude is None else float(longitude))
+
+    @staticmethod
+    def _effective_birth(key: ProfileKey) -> datetime:
+        """提供经度时按真太阳时排盘（与 BaziCalculator 一致）"""
+        moment, _, longitude = key
+        if longitude is None:
+            return moment
+        adj_time, _ = to_true_solar_time(moment.year, moment.month, moment.day,
+                                         moment.hour, moment.minute, longitude)
+        return adj_time.replace(microsecond=0)
+
+    def _lookup(self, key: ProfileKey) -> Optional[BaziProfile]:
+        with self._lock:
+            profile = self._cache.get(key)
+            if profile is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+            return profile
+
+    def _store(self, key: ProfileKey, profile: BaziProfile) -> BaziProfile:
+        with self._lock:
+            existing = self._cache.get(key)
+            if existing is not None:
+                return existing
+            self._misses += 1
+            self._cache[key] = profile
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+            return profile
+
+    def _build(self, key: ProfileKey) -> BaziProfile:
+        moment = self._effective_birth(key)
+        gender = key[1]
+        try:
+            fields = compute_precomputed_fields(moment, gender)
+        except ValueError:
+            # 历表范围外：回退标准排盘
+            return BaziProfile(moment, gender).freeze()
+        return BaziProfile.from_precomputed(moment, gender, **fields).freeze()
+
+    def get(self, birth_date: datetime, gender: int, longitude: Optional[float] = None) -> BaziProfile:
+        """
+        获取共享档案
+
+        Args:
+            birth_date: 出生时刻（当地标准时间）
+            gender: 1男 0女
+            longitude: 出生地经度，提供时按真太阳时排盘
+
+        Returns:
+            冻结的 BaziProfile（请勿修改；同一键返回同一实例）
+        """
+        key = self.make_key(birth_date, gender, longitude)
+        profile = self._lookup(key)
+        if profile is None:
+            profile = self._store(key, self._build(key))
+        return profile
+
+    def build_many(
+        self,
+        entries: Iterable[Sequence]
+    ) -> List[BaziProfile]:
+        """
+        批量获取共享档案
+
+        Args:
+            entries: (birth_date, gender) 或 (birth_date, gender, longitude) 序列
+
+        Returns:
+            与输入顺序一致的档案列表
+        """
+        keys = [self.make_key(*entry) for entry in entries]
+        results: List[Optional[BaziProfile]] = [self._lookup(k) for k in keys]
+
+        built: Dict[ProfileKey, BaziProfile] = {}
+        for i, key in enumerate(keys):
+            if results[i] is not None:
+                continue
+            if key not in built:
+                built[key] = self._store(key, self._build(key))
+            results[i] = built[key]
+        return results
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._cache.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def get_cache_stats(self) -> Dict:
+        """获取缓存统计信息"""
+        with self._lock:
+            return {
+                'cache_size': len(self._cache),
+                'maxsize': self.maxsize,
+                'hits': self._hits,
+                'misses': self._misses,
+            }
+
+
+_factory: Optional[BaziProfileFactory] = None
+_factory_lock = threading.Lock()
+
+
+def get_profile_factory() -> BaziProfileFactory:
+    """获取进程级共享的档案工厂"""
+    global _factory
+    if _factory is None:
+        with _factory_lock:
+            if _factory is None:
+                _factory = BaziProfileFactory()
+    return _factory
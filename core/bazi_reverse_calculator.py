@@ -1,13 +1,16 @@
 """
 八字反推计算器 (Bazi Reverse Calculator)
 V9.3 Optimization: 统一反推接口，支持高精度和性能优化
+V9.4 Performance: 高精度立春模式改为干支历表倒排索引探测 (core.ganzhi_calendar)
 """
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Dict, Optional, Tuple
 from lunar_python import Solar
 import logging
 
+from core.ganzhi_calendar import GanzhiCalendar, get_ganzhi_calendar, ganzhi_index, hour_for_pillar
+
 logger = logging.getLogger(__name__)
 
 
@@ -121,6 +124,72 @@ class BaziReverseCalculator:
     ) -> Optional[Dict]:
         """
         高精度反推：精确匹配，考虑立春边界
+        
+        立春模式且年份范围在 1900-2100 内时走干支历表索引，否则回退逐日扫描
+        """
+        if consider_lichun:
+            calendar = get_ganzhi_calendar()
+            if calendar.covers(self.year_range):
+                return self._reverse_high_precision_indexed(
+                    calendar, year_pillar, month_pillar, day_pillar, hour_pillar
+                )
+        return self._reverse_high_precision_scan(
+            year_pillar, month_pillar, day_pillar, hour_pillar, consider_lichun
+        )
+    
+    def _reverse_high_precision_indexed(
+        self,
+        calendar: GanzhiCalendar,
+        year_pillar: str,
+        month_pillar: str,
+        day_pillar: str,
+        hour_pillar: str
+    ) -> Optional[Dict]:
+        """
+        高精度反推（索引版）：(年柱, 月柱, 日柱) 倒排索引探测 + 五鼠遁定时辰
+        
+        与逐日扫描的精确模式结果一致（扫描窗口重叠产生的重复日期已去重），探测窗口沿用扫描口径：
+        - 年柱落在范围内的某个立春年：取这些立春年的全部日期
+        - 否则扫描回退到全范围逐日窗口：取 start-01-01 ~ (end+1)-02-15 内年柱相符的日期
+          （范围首年立春前、末年次年立春后的边界日）
+        """
+        indices = [ganzhi_index(p) for p in (year_pillar, month_pillar, day_pillar, hour_pillar)]
+        if any(idx is None for idx in indices):
+            return None
+        year_idx, month_idx, day_idx, hour_idx = indices
+        
+        hour = hour_for_pillar(day_idx, hour_idx)
+        if hour is None:
+            return None
+        
+        start_year, end_year = self.year_range
+        if self._year_index.get(year_pillar):
+            days = calendar.lookup(year_idx, month_idx, day_idx, year_range=self.year_range)
+        else:
+            window = (date(start_year, 1, 1), date(end_year + 1, 2, 15))
+            days = calendar.lookup(year_idx, month_idx, day_idx, date_range=window)
+        matches = [datetime(d.year, d.month, d.day, hour, 0, 0) for d in days]
+        
+        if matches:
+            return {
+                'birth_date': matches[0],
+                'confidence': 1.0 if len(matches) == 1 else 0.8,
+                'matches': matches,
+                'match_count': len(matches)
+            }
+        
+        return None
+    
+    def _reverse_high_precision_scan(
+        self,
+        year_pillar: str,
+        month_pillar: str,
+        day_pillar: str,
+        hour_pillar: str,
+        consider_lichun: bool
+    ) -> Optional[Dict]:
+        """
+        高精度反推（逐日扫描版）：精确匹配，考虑立春边界
         """
         matches = []
         start_year, end_year = self.year_range
@@ -2,6 +2,32 @@ from lunar_python import Solar, Lunar
 import math
 from datetime import timedelta, datetime
 
+
+def to_true_solar_time(year, month, day, hour, minute, longitude, tz_offset=8):
+    """
+    Local Standard Time -> True Solar Time.
+    Returns (adjusted datetime, total adjustment in minutes).
+    """
+    # 1. Longitude Correction: 4 minutes per degree difference from TZ meridian
+    # TZ Meridian = tz_offset * 15
+    tz_meridian = tz_offset * 15.0
+    long_diff = longitude - tz_meridian
+    geo_correction = long_diff * 4 # minutes
+    
+    # 2. Equation of Time (EOT) Approximation
+    # d = number of days since start of year
+    # Simple approximation formula
+    date_val = datetime(year, month, day)
+    day_of_year = date_val.timetuple().tm_yday
+    B = (360 / 365) * (day_of_year - 81) * (math.pi / 180) # Convert to radians
+    eot = 9.87 * math.sin(2*B) - 7.53 * math.cos(B) - 1.5 * math.sin(B)
+    
+    total_adjust_minutes = geo_correction + eot
+    
+    # Adjust time
+    adj_time = date_val + timedelta(hours=hour, minutes=minute) + timedelta(minutes=total_adjust_minutes)
+    return adj_time, total_adjust_minutes
+
 class BaziCalculator:
     def __init__(self, year, month, day, hour, minute=0, longitude=None, tz_offset=8):
         """
@@ -13,24 +39,7 @@ class BaziCalculator:
         
         # True Solar Time Calculation
         if longitude is not None:
-            # 1. Longitude Correction: 4 minutes per degree difference from TZ meridian
-            # TZ Meridian = tz_offset * 15
-            tz_meridian = tz_offset * 15.0
-            long_diff = longitude - tz_meridian
-            geo_correction = long_diff * 4 # minutes
-            
-            # 2. Equation of Time (EOT) Approximation
-            # d = number of days since start of year
-            # Simple approximation formula
-            date_val = datetime(year, month, day)
-            day_of_year = date_val.timetuple().tm_yday
-            B = (360 / 365) * (day_of_year - 81) * (math.pi / 180) # Convert to radians
-            eot = 9.87 * math.sin(2*B) - 7.53 * math.cos(B) - 1.5 * math.sin(B)
-            
-            total_adjust_minutes = geo_correction + eot
-            
-            # Adjust time
-            adj_time = date_val + timedelta(hours=hour, minutes=minute) + timedelta(minutes=total_adjust_minutes)
+            adj_time, total_adjust_minutes = to_true_solar_time(year, month, day, hour, minute, longitude, tz_offset)
             
             # Recreate Solar object with True Solar Time
             # Note: Lunar library might handle this differently, but for Bazi, we feed the adjusted time.
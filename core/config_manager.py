@@ -38,6 +38,9 @@ class ConfigManager:
     配置管理器 (Single Source of Truth)
     负责读取和写入 config/tuning_params.json
     支持热重载 (Hot-Reload)
+    
+    [V9.4] 读取走进程级配置快照 (core.config_snapshot)，不再每次打开文件；
+    写入后立即使快照失效，外部改动在 check_interval 内生效。
     """
     _lock = Lock()
     _cached_config = None
@@ -64,14 +67,9 @@ class ConfigManager:
             ConfigManager.save_config(DEFAULT_CONFIG)
             return DEFAULT_CONFIG
         
-        try:
-            # 简单的文件修改时间检查，用于缓存失效 (可选，但为了实时性先每次读取)
-            # 在高并发下可能需要缓存优化，但对于 Streamlit + 单人调试，直接读写即可
-            with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"⚠️ Config load failed: {e}, using default.")
-            return DEFAULT_CONFIG
+        # 返回快照的可变副本，调用方修改不会污染共享快照
+        from core.config_snapshot import get_config_snapshot
+        return get_config_snapshot().to_dict()
 
     @staticmethod
     def save_config(new_config_or_key=None, value=None):
@@ -121,6 +119,9 @@ class ConfigManager:
             
             with open(CONFIG_PATH, 'w', encoding='utf-8') as f:
                 json.dump(current, f, indent=4, ensure_ascii=False)
+        
+        from core.config_snapshot import get_config_service
+        get_config_service().invalidate()
             
             # print("💾 参数已热更新并保存！")
 
@@ -135,13 +136,13 @@ class ConfigManager:
     @staticmethod
     def get_param(section: str, key: str, default=None):
         """Helper to get a specific value"""
-        cfg = ConfigManager.load_config()
-        return cfg.get(section, {}).get(key, default)
+        from core.config_snapshot import get_config_snapshot, thaw
+        return thaw(get_config_snapshot().get(section, {}).get(key, default))
 
     def get(self, key: str, default=None):
         """Instance method to mimic dict.get on the root config"""
-        cfg = ConfigManager.load_config()
-        return cfg.get(key, default)
+        from core.config_snapshot import get_config_snapshot, thaw
+        return thaw(get_config_snapshot().get(key, default))
 
     @staticmethod
     def get_env_setting(key: str, default=None):
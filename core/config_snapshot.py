@@ -0,0 +1,245 @@
+"""
+进程级配置快照服务 (Config Snapshot Service)
+============================================
+[V9.4 Performance] 不可变、带版本号的配置快照，替代热路径上反复的文件读取。
+
+架构定位：
+- 监视一组 JSON 配置文件（默认 config/tuning_params.json 与 data/era_constants.json）
+- 至多每 check_interval 秒做一次廉价的 mtime 检查，文件变化时重新解析
+- 新快照整体替换旧快照（原子发布），读取方始终拿到一致的版本
+- 订阅者在新快照发布后收到回调，可据此刷新引擎内部缓存
+
+热路径只读内存中的快照；快照中的 dict / list 已冻结为只读视图，
+需要可变副本时使用 to_dict() / thaw()。
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__))
+
+# 默认监视的配置源：名称 -> 路径
+DEFAULT_SOURCES = {
+    "tuning": os.path.join(PROJECT_ROOT, "config", "tuning_params.json"),
+    "era_constants": os.path.join(PROJECT_ROOT, "data", "era_constants.json"),
+}
+
+
+def freeze(obj: Any) -> Any:
+    """递归冻结：dict -> MappingProxyType，list -> tuple"""
+    if isinstance(obj, Mapping):
+        return MappingProxyType({k: freeze(v) for k, v in obj.items()})
+    if isinstance(obj, (list, tuple)):
+        return tuple(freeze(v) for v in obj)
+    return obj
+
+
+def thaw(obj: Any) -> Any:
+    """递归解冻为可变副本：Mapping -> dict，tuple -> list"""
+    if isinstance(obj, Mapping):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, tuple):
+        return [thaw(v) for v in obj]
+    return obj
+
+
+class ConfigSnapshot:
+    """
+    不可变配置快照
+
+    Attributes:
+        version: 单调递增的版本号（每次发布 +1）
+        loaded_at: 发布时间戳
+        stamps: 各配置源在解析时的 (mtime_ns, size)（文件不存在为 None）
+    """
+
+    __slots__ = ("version", "loaded_at", "stamps", "_sources")
+
+    def __init__(self, version: int, sources: Dict[str, Any], stamps: Dict[str, Optional[Tuple[int, int]]]):
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "loaded_at", time.time())
+        object.__setattr__(self, "stamps", MappingProxyType(dict(stamps)))
+        object.__setattr__(self, "_sources", MappingProxyType({k: freeze(v) for k, v in sources.items()}))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ConfigSnapshot 是不可变对象")
+
+    def source(self, name: str) -> Mapping:
+        """某个配置源的只读视图（未知或缺失的源返回空映射）"""
+        return self._sources.get(name, MappingProxyType({}))
+
+    def get(self, key: str, default: Any = None, source: str = "tuning") -> Any:
+        """读取配置源根级键（只读视图）"""
+        return self.source(source).get(key, default)
+
+    def to_dict(self, source: str = "tuning") -> Dict[str, Any]:
+        """配置源的可变深拷贝"""
+        return thaw(self.source(source))
+
+    def __repr__(self):
+        return f"ConfigSnapshot(version={self.version}, sources={list(self._sources)})"
+
+
+class ConfigSnapshotService:
+    """
+    配置快照服务
+
+    用法:
+        service = get_config_service()
+        snap = service.current()          # 热路径：内存读取（按间隔做 mtime 检查）
+        unsubscribe = service.subscribe(lambda snap: engine.reload(snap))
+    """
+
+    def __init__(
+        self,
+        sources: Optional[Dict[str, str]] = None,
+        check_interval: float = 1.0,
+        defaults: Optional[Dict[str, Dict]] = None
+    ):
+        """
+        Args:
+            sources: 配置源 {名称: JSON 文件路径}
+            check_interval: 两次 mtime 检查的最小间隔（秒）
+            defaults: 文件缺失或首次解析失败时的默认内容 {名称: dict}
+        """
+        self._paths = dict(sources if sources is not None else DEFAULT_SOURCES)
+        self._defaults = dict(defaults or {})
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Callable[[ConfigSnapshot], None]] = {}
+        self._next_token = 0
+        self._last_check = float("-inf")
+        self._data: Dict[str, Any] = {}
+        self._stamps: Dict[str, Optional[Tuple[int, int]]] = {}
+        self._snapshot = ConfigSnapshot(0, {}, {})
+        self.refresh(force=True)
+
+    # --- 读取 ---
+
+    def current(self) -> ConfigSnapshot:
+        """当前快照；距上次检查超过 check_interval 时顺带检查文件变化"""
+        if time.monotonic() - self._last_check >= self.check_interval:
+            self.refresh()
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    # --- 更新 ---
+
+    @staticmethod
+    def _stamp(path: str) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size)：同一时间粒度内的改写也能被识别"""
+        try:
+            st = os.stat(path)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    def _load(self, name: str, path: str) -> Any:
+        if not os.path.exists(path):
+            return self._defaults.get(name, {})
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"配置加载失败 {path}: {e}，沿用上一版本")
+            return self._data.get(name, self._defaults.get(name, {}))
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        检查配置文件并在变化时发布新快照
+
+        Args:
+            force: 忽略 mtime，强制重新解析全部配置源
+
+        Returns:
+            是否发布了新快照
+        """
+        with self._lock:
+            self._last_check = time.monotonic()
+            stamps = {name: self._stamp(path) for name, path in self._paths.items()}
+            changed = [name for name in self._paths if force or stamps[name] != self._stamps.get(name, -1)]
+            if not changed:
+                return False
+
+            data = dict(self._data)
+            for name in changed:
+                data[name] = self._load(name, self._paths[name])
+            self._data = data
+            self._stamps = stamps
+            snapshot = ConfigSnapshot(self._snapshot.version + 1, data, stamps)
+            self._snapshot = snapshot
+            subscribers = list(self._subscribers.values())
+
+        logger.debug(f"配置快照发布 v{snapshot.version}: {changed}")
+        for callback in subscribers:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.warning(f"配置订阅回调失败: {e}")
+        return True
+
+    def invalidate(self):
+        """写入配置后调用：下一次读取立即检查文件"""
+        self._last_check = float("-inf")
+
+    def register_source(self, name: str, path: str, default: Optional[Dict] = None):
+        """新增一个被监视的配置源，并立即发布包含它的快照"""
+        with self._lock:
+            self._paths[name] = path
+            if default is not None:
+                self._defaults[name] = default
+        self.refresh(force=True)
+
+    # --- 订阅 ---
+
+    def subscribe(self, callback: Callable[[ConfigSnapshot], None]) -> Callable[[], None]:
+        """
+        订阅快照变化
+
+        Returns:
+            取消订阅的函数
+        """
+        with self._lock:
+            token = self._next_token
+            self._next_token += 1
+            self._subscribers[token] = callback
+
+        def unsubscribe():
+            with self._lock:
+                self._subscribers.pop(token, None)
+
+        return unsubscribe
+
+
+_service: Optional[ConfigSnapshotService] = None
+_service_lock = threading.Lock()
+
+
+def get_config_service() -> ConfigSnapshotService:
+    """获取进程级配置快照服务"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                from core.config_manager import CONFIG_PATH, DEFAULT_CONFIG
+                _service = ConfigSnapshotService(
+                    sources={**DEFAULT_SOURCES, "tuning": CONFIG_PATH},
+                    defaults={"tuning": DEFAULT_CONFIG}
+                )
+    return _service
+
+
+def get_config_snapshot() -> ConfigSnapshot:
+    """热路径快捷方式：当前配置快照"""
+    return get_config_service().current()
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+
+class FeatureStore:
+    """
+    Antigravity Engine V2.0 - Feature Store
+
+    Caches the vectorized training set (X: N x 93 field vectors, y: every numeric
+    ground-truth aspect) keyed by case id, a digest of the case's raw JSON and the
+    vectorizer's weights version. sync() only vectorizes new / changed cases, so
+    retraining after adding a few cases skips re-featurising the whole DB.
+
+    Layout (npz, no pickles):
+        version  - Vectorizer.weights_version() the rows were computed with
+        ids      - case ids (DB order)
+        digests  - blake2b-64 of chart_data + ground_truth
+        has_chart- False for cases without a chart (no X row is usable)
+        X        - feature matrix (N x D)
+        aspects  - aspect names (columns of Y / M)
+        Y, M     - aspect scores and "score present" mask (N x A)
+    """
+
+    def __init__(self, vectorizer, path=None):
+        self.vectorizer = vectorizer
+        if path is None:
+            path = os.path.splitext(vectorizer.db.db_path)[0] + "_features.npz"
+        self.path = path
+        self.version = None
+        self._empty()
+        self._loaded = False
+
+    def _empty(self):
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.digests = np.zeros(0, dtype=np.uint64)
+        self.has_chart = np.zeros(0, dtype=bool)
+        self.X = np.zeros((0, 0))
+        self.aspects = []
+        self.Y = np.zeros((0, 0))
+        self.M = np.zeros((0, 0), dtype=bool)
+
+    # --- Persistence ---
+
+    def load(self):
+        self._loaded = True
+        version = self.vectorizer.weights_version()
+        self.version = version
+        self._empty()
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                if str(data["version"]) != version:
+                    return False  # weights changed: every row is stale
+                self.ids = data["ids"]
+                self.digests = data["digests"]
+                self.has_chart = data["has_chart"]
+                self.X = data["X"]
+                self.aspects = [str(a) for a in data["aspects"]]
+                self.Y = data["Y"]
+                self.M = data["M"]
+        except Exception as e:
+            print(f"Feature store unreadable ({e}), rebuilding.")
+            self._empty()
+            return False
+        return True
+
+    def save(self):
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, version=np.array(self.version), ids=self.ids, digests=self.digests,
+                     has_chart=self.has_chart, X=self.X, aspects=np.array(self.aspects, dtype=str),
+                     Y=self.Y, M=self.M)
+        os.replace(tmp, self.path)
+
+    # --- Sync ---
+
+    @staticmethod
+    def _digest(chart_data, ground_truth):
+        h = hashlib.blake2b(digest_size=8)
+        h.update((chart_data or "").encode("utf-8"))
+        h.update(b"\x00")
+        h.update((ground_truth or "").encode("utf-8"))
+        return int.from_bytes(h.digest(), "little")
+
+    def sync(self):
+        """
+        Brings the store in line with the DB. Returns the number of (re)vectorized cases.
+        """
+        if not self._loaded or self.version != self.vectorizer.weights_version():
+            self.load()
+
+        rows = self.vectorizer.db.get_case_rows()
+        ids = np.array([r[0] for r in rows], dtype=np.int64)
+        digests = np.array([self._digest(r[1], r[2]) for r in rows], dtype=np.uint64)
+
+        # Position of each DB row in the cached arrays (-1 = not cached / changed)
+        pos = {cid: i for i, cid in enumerate(self.ids.tolist())}
+        old = np.array([pos.get(cid, -1) for cid in ids.tolist()], dtype=np.int64)
+        hit = old >= 0
+        hit[hit] = self.digests[old[hit]] == digests[hit]
+        fresh = np.flatnonzero(~hit)
+
+        if not len(fresh) and len(ids) == len(self.ids):
+            return 0
+
+        new_X, new_chart, new_truths = [], [], []
+        for i in fresh.tolist():
+            chart = json.loads(rows[i][1]) if rows[i][1] else None
+            truth = json.loads(rows[i][2]) if rows[i][2] else None
+            new_chart.append(bool(chart))
+            new_X.append(self.vectorizer.vectorize_chart(chart) if chart else None)
+            new_truths.append(truth if isinstance(truth, dict) else {})
+
+        # Aspect columns: cached ones first, then any new keys in order of appearance
+        aspects = list(self.aspects)
+        for truth in new_truths:
+            for key in truth:
+                if key not in aspects:
+                    aspects.append(key)
+
+        n = len(ids)
+        dim = self.X.shape[1] if self.X.size else None
+        if dim is None:
+            dim = next((len(v) for v in new_X if v is not None), 0)
+        X = np.zeros((n, dim))
+        Y = np.zeros((n, len(aspects)))
+        M = np.zeros((n, len(aspects)), dtype=bool)
+        has_chart = np.zeros(n, dtype=bool)
+
+        keep = np.flatnonzero(hit)
+        if len(keep):
+            src = old[keep]
+            if self.X.shape[1] == dim:
+                X[keep] = self.X[src]
+            has_chart[keep] = self.has_chart[src]
+            width = len(self.aspects)
+            Y[keep, :width] = self.Y[src]
+            M[keep, :width] = self.M[src]
+
+        col = {a: j for j, a in enumerate(aspects)}
+        for i, vec, charted, truth in zip(fresh.tolist(), new_X, new_chart, new_truths):
+            has_chart[i] = charted
+            if vec is not None:
+                X[i] = vec
+            for key, score in truth.items():
+                if score is None:
+                    continue
+                try:
+                    Y[i, col[key]] = float(score)
+                except (TypeError, ValueError):
+                    continue
+                M[i, col[key]] = True
+
+        self.ids, self.digests, self.has_chart = ids, digests, has_chart
+        self.X, self.aspects, self.Y, self.M = X, aspects, Y, M
+        self.save()
+        return len(fresh)
+
+    def dataset(self, target_aspect="wealth", sync=True):
+        """
+        (X, y) for one aspect: charted cases with a numeric score, in DB order.
+        sync=False: use the rows as of the caller's own sync() (no second DB read / hashing pass).
+        """
+        if sync or not self._loaded:
+            self.sync()
+        if target_aspect not in self.aspects:
+            return np.array([]), np.array([])
+        j = self.aspects.index(target_aspect)
+        mask = self.has_chart & self.M[:, j]
+        if not mask.any():
+            return np.array([]), np.array([])
+        return self.X[mask], self.Y[mask, j]
@@ -15,6 +15,12 @@ warnings.warn(
     stacklevel=2
 )
 
+# Flow network constants (shared with the batched optimizer backend, learning/flux_batch.py)
+FLOW_TRANSFER_RATE = 0.3
+SYNERGY_BOOST = 1.25
+# positional_weights -> branch mass: default optimizer weights (month_branch 4.5, ...) reproduce Kernel.POSITION_WEIGHTS * 100
+BRANCH_MASS_PER_WEIGHT = 10.0
+
 class WaveFunction:
     """
     Quantum State of a Bazi Particle (V5.1 Protocol)
@@ -152,10 +158,23 @@ class FluxEngine:
             if b_char:
                 pid = f"{p_name}_branch"
                 p = Particle(b_char, pid, "branch")
+                weight = self._positional_weight(pid)
+                if weight is not None:
+                    p.wave.amplitude = BRANCH_MASS_PER_WEIGHT * weight
                 if state_map and pid in state_map:
                     p.health = state_map[pid]
                 self.particles.append(p)
 
+    def _positional_weight(self, pid):
+        """
+        Optimizer-injected positional weight for a natal particle (None if not configured).
+        params['positional_weights'] = {'month_branch': 4.5, ..., 'year_stem': 1.0}
+        """
+        weights = self.params.get('positional_weights')
+        if not weights:
+            return None
+        return weights.get(pid)
+
     def set_environment(self, da_yun=None, liu_nian=None):
         if da_yun:
             s, b = da_yun.get('stem'), da_yun.get('branch')
@@ -176,10 +195,17 @@ class FluxEngine:
         """
         V18.0: Update physics engine parameters dynamically.
         Matches keys from Architect Console.
+        New positional_weights rebuild the natal particles; their health and any
+        injected environment (Da Yun / Liu Nian) particles are carried over.
         """
         for k, v in params.items():
             # Map legacy or external keys to internal params if needed
             self.params[k] = v
+        if 'positional_weights' in params:
+            state_map = {p.id: p.health for p in self.particles}
+            environment = [p for p in self.particles if "dy_" in p.id or "ln_" in p.id]
+            self._build_particles(state_map)
+            self.particles.extend(environment)
 
     def V18_init_interaction_events(self):
          self.interaction_events = []
@@ -439,32 +465,16 @@ class FluxEngine:
                 if total_root_energy > 30.0:
                     s.status.append("LaserBeam") 
 
+            weight = self._positional_weight(s.id)
+            if weight is not None:
+                s.wave.amplitude *= weight
+
     def _solve_global_flux(self, trace):
         node_map = {p.id: p for p in self.particles}
-        pillars = ['year', 'month', 'day', 'hour']
-        connections = [] 
-        
-        # Build Edges
-        for i, p_name in enumerate(pillars):
-            s_id = f"{p_name}_stem"
-            b_id = f"{p_name}_branch"
-            
-            if s_id in node_map and b_id in node_map:
-                self._add_flow_edge(node_map[s_id], node_map[b_id], connections)
-                self._add_flow_edge(node_map[b_id], node_map[s_id], connections)
-            
-            if i < len(pillars) - 1:
-                next_p = pillars[i+1]
-                ns_id = f"{next_p}_stem"
-                nb_id = f"{next_p}_branch"
-                targets = [t for t in [ns_id, nb_id] if t in node_map]
-                sources = [s for s in [s_id, b_id] if s in node_map]
-                for src_id in sources:
-                    for tgt_id in targets:
-                        self._add_flow_edge(node_map[src_id], node_map[tgt_id], connections)
+        connections = self._build_flow_edges(node_map)
 
         # Simulate Flow
-        transfer_rate = 0.3 
+        transfer_rate = FLOW_TRANSFER_RATE
         net_flow_map = {pid: 0.0 for pid in node_map}
         
         for src, tgt in connections:
@@ -480,21 +490,16 @@ class FluxEngine:
             self.log.append(f"🌊 Flow: {src.char} -> {tgt.char} ({amount:.1f}E)")
             
         # Synergy (Lian Zhu)
-        for e1 in connections:
-            src1, mid1 = e1
-            for e2 in connections:
-                mid2, end2 = e2
-                if mid1 == mid2 and src1 != end2:
-                    
-                    # Rule Check
-                    rule_key = f"Synergy: {src1.char}->{mid1.char}->{end2.char}"
-                    self.detected_rules.add(rule_key)
-                    if rule_key in self.disabled_rules:
-                        continue
-                        
-                    end2.wave.amplitude *= 1.25
-                    end2.status.append("SynergyBoost")
-                    self.log.append(f"✨ Lian Zhu Synergy: {src1.char}->{mid1.char}->{end2.char} (+25%)")
+        for src1, mid1, end2 in self._synergy_chains(connections):
+            # Rule Check
+            rule_key = f"Synergy: {src1.char}->{mid1.char}->{end2.char}"
+            self.detected_rules.add(rule_key)
+            if rule_key in self.disabled_rules:
+                continue
+                
+            end2.wave.amplitude *= SYNERGY_BOOST
+            end2.status.append("SynergyBoost")
+            self.log.append(f"✨ Lian Zhu Synergy: {src1.char}->{mid1.char}->{end2.char} (+25%)")
 
         if net_flow_map:
             sink_id = max(net_flow_map, key=net_flow_map.get)
@@ -510,6 +515,40 @@ class FluxEngine:
                 }
                 self.log.append(f"🎯 System Focus (Sink): {sink_node.char} (Net +{sink_val:.1f})")
 
+    def _build_flow_edges(self, node_map):
+        """Generation edges: stem<->branch within a pillar, then pillar -> next pillar"""
+        pillars = ['year', 'month', 'day', 'hour']
+        connections = [] 
+        
+        # Build Edges
+        for i, p_name in enumerate(pillars):
+            s_id = f"{p_name}_stem"
+            b_id = f"{p_name}_branch"
+            
+            if s_id in node_map and b_id in node_map:
+                self._add_flow_edge(node_map[s_id], node_map[b_id], connections)
+                self._add_flow_edge(node_map[b_id], node_map[s_id], connections)
+            
+            if i < len(pillars) - 1:
+                next_p = pillars[i+1]
+                ns_id = f"{next_p}_stem"
+                nb_id = f"{next_p}_branch"
+                targets = [t for t in [ns_id, nb_id] if t in node_map]
+                sources = [s for s in [s_id, b_id] if s in node_map]
+                for src_id in sources:
+                    for tgt_id in targets:
+                        self._add_flow_edge(node_map[src_id], node_map[tgt_id], connections)
+        return connections
+
+    def _synergy_chains(self, connections):
+        """Lian Zhu chains (src -> mid -> end) over generation edges, in evaluation order"""
+        chains = []
+        for src1, mid1 in connections:
+            for mid2, end2 in connections:
+                if mid1 == mid2 and src1 != end2:
+                    chains.append((src1, mid1, end2))
+        return chains
+
     def _add_flow_edge(self, p1, p2, edge_list):
         e1 = self._get_main_element(p1)
         e2 = self._get_main_element(p2)
@@ -632,8 +671,11 @@ class FluxEngine:
         dm_stem = self.chart.get('day', {}).get('stem')
         if not dm_stem: return {}
         
-        stem_spec = self._get_stem_spectrum()
-        
+        return self.ten_gods_view(dm_stem, self._get_stem_spectrum())
+
+    @staticmethod
+    def ten_gods_view(dm_stem, stem_spec):
+        """Ten Gods compatibility keys from a per-stem energy spectrum (shared with core/flux_array.py)"""
         stems = ["甲", "乙", "丙", "丁", "戊", "己", "庚", "辛", "壬", "癸"]
         gods_map = {
             "甲": {"甲":"BiJian", "乙":"JieCai", "丙":"ShiShen", "丁":"ShangGuan", "戊":"PianCai", "己":"ZhengCai", "庚":"QiSha", "辛":"ZhengGuan", "壬":"PianYin", "癸":"ZhengYin"},
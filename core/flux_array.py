@@ -0,0 +1,693 @@
+"""
+FluxEngine 数组内核 (Structure-of-Arrays)
+========================================
+[V9.4 Performance] core/flux.FluxEngine 的结构化数组实现。
+
+架构定位：
+- 粒子不再是 Particle / WaveFunction 对象，而是固定 12 个槽位的数组：
+  [年干, 年支, 月干, 月支, 日干, 日支, 时干, 时支, 运干, 运支, 年(流年)干, 年(流年)支]
+- amp (N, 12) 振幅、dist (N, 12, 5) 五行分布（能量 = amp × dist）、health (N, 12)、
+  status (N, 12) 状态位标志 (STATUS_FLAGS)
+- 几何、透干、通量网络、时空场四个阶段按 FluxEngine 的求值顺序逐步推进，
+  每一步对整批命盘做掩码向量运算；日志、规则键、interaction 事件逐盘生成，
+  文字与 FluxEngine 完全一致
+
+calculate_flux_many() 是批量入口；FluxArrayEngine 保留 FluxEngine 的单盘接口
+(calculate_flux / compute_energy_state / set_environment / set_hyperparameters)。
+
+与对象引擎的差异：particle_states[*]['status'] 由位标志还原，按 STATUS_FLAGS 顺序排列且不含重复项。
+"""
+
+import logging
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from core.flux import BRANCH_MASS_PER_WEIGHT, FLOW_TRANSFER_RATE, SYNERGY_BOOST, FluxEngine
+from core.kernel import Kernel
+
+logger = logging.getLogger(__name__)
+
+ELEMENTS = ("Wood", "Fire", "Earth", "Metal", "Water")
+ELEMENT_INDEX = {e: i for i, e in enumerate(ELEMENTS)}
+STEMS = "甲乙丙丁戊己庚辛壬癸"
+BRANCHES = "子丑寅卯辰巳午未申酉戌亥"
+STEM_INDEX = {s: i for i, s in enumerate(STEMS)}
+BRANCH_INDEX = {b: i for i, b in enumerate(BRANCHES)}
+# 未知字符映射到填充行（五行分布全 0，无几何作用）
+STEM_PAD = len(STEMS)
+BRANCH_PAD = len(BRANCHES)
+
+PILLARS = ("year", "month", "day", "hour")
+SLOTS = (
+    "year_stem", "year_branch", "month_stem", "month_branch",
+    "day_stem", "day_branch", "hour_stem", "hour_branch",
+    "dy_stem", "dy_branch", "ln_stem", "ln_branch",
+)
+N_SLOTS = len(SLOTS)
+STEM_SLOTS = (0, 2, 4, 6, 8, 10)
+BRANCH_SLOTS = (1, 3, 5, 7, 9, 11)
+NATAL_SLOTS = tuple(range(8))
+NATAL_BRANCH_SLOTS = (1, 3, 5, 7)
+DY_STEM, DY_BRANCH, LN_STEM, LN_BRANCH = 8, 9, 10, 11
+# 环境粒子注入振幅 (FluxEngine.set_environment)
+ENV_AMPLITUDE = {DY_STEM: 40.0, DY_BRANCH: 50.0, LN_STEM: 60.0, LN_BRANCH: 60.0}
+STEM_BASE_AMPLITUDE = 5.0
+DEFAULT_BRANCH_MASS = 10.0
+
+STATUS_FLAGS = tuple(f"PhaseLock_{e}" for e in ELEMENTS) + (
+    "ShellRuptured", "ShearStress", "Revealed", "VirtualImage", "Rooted",
+    "LaserBeam", "SynergyBoost", "SystemFocus", "Activated", "StructureBroken",
+)
+FLAG = {name: 1 << i for i, name in enumerate(STATUS_FLAGS)}
+PHASE_LOCK = np.array([FLAG[f"PhaseLock_{e}"] for e in ELEMENTS], dtype=np.int32)
+
+# 几何相互作用编码（Kernel.get_interaction_type；成对出现的 SanHe 记为 BanHe）
+BANHE, LIUCHONG, XIANGXING = 1, 2, 3
+INTERACTION_NAMES = {BANHE: "BanHe", LIUCHONG: "LiuChong", XIANGXING: "XiangXing"}
+_INTERACTION_CODES = {"SanHe": BANHE, "LiuChong": LIUCHONG, "XiangXing": XIANGXING}
+CN_ELEMENTS = {"Water": "水", "Fire": "火", "Wood": "木", "Metal": "金", "Earth": "土"}
+
+# 与 FluxEngine._solve_branch_geometry 相同的集合字面量：同一进程内迭代顺序一致，日志字符顺序一致
+_TRIOS = [
+    ({'申', '子', '辰'}, "Water"),
+    ({'亥', '卯', '未'}, "Wood"),
+    ({'寅', '午', '戌'}, "Fire"),
+    ({'巳', '酉', '丑'}, "Metal"),
+]
+
+_BRANCH_PAIRS = [(a, b) for a in range(len(BRANCH_SLOTS)) for b in range(a + 1, len(BRANCH_SLOTS))]
+
+
+def _flow_edge_candidates():
+    """FluxEngine._build_flow_edges 的候选边（槽位对），按求值顺序"""
+    edges = []
+    for i in range(len(PILLARS)):
+        s, b = 2 * i, 2 * i + 1
+        edges += [(s, b), (b, s)]
+        if i < len(PILLARS) - 1:
+            ns, nb = s + 2, b + 2
+            edges += [(src, tgt) for src in (s, b) for tgt in (ns, nb)]
+    return edges
+
+
+FLOW_EDGES = _flow_edge_candidates()
+# 连珠链 (src -> mid -> end)：两条边首尾相接且 src != end，顺序同 FluxEngine._synergy_chains
+SYNERGY_CHAINS = [
+    (e1, e2)
+    for e1, (src1, mid1) in enumerate(FLOW_EDGES)
+    for e2, (mid2, end2) in enumerate(FLOW_EDGES)
+    if mid1 == mid2 and src1 != end2
+]
+
+
+@lru_cache(maxsize=None)
+def _status_tuple(flags: int):
+    return tuple(name for name in STATUS_FLAGS if flags & FLAG[name])
+
+
+def status_names(flags: int) -> List[str]:
+    """位标志 -> 状态名列表（STATUS_FLAGS 顺序）"""
+    return list(_status_tuple(flags))
+
+
+class _KernelTables:
+    """Kernel 公理表的数组形式（构造时读取，跟随 Kernel.load_overrides 的覆盖值）"""
+
+    def __init__(self):
+        self.stem_dist = np.zeros((STEM_PAD + 1, 5))
+        for s, c in enumerate(STEMS):
+            props = Kernel.STEM_PROPERTIES.get(c)
+            if props:
+                self.stem_dist[s, ELEMENT_INDEX[props['element']]] = 1.0
+
+        # 地支五行分布与藏干比例（累加顺序同 Particle._init_state）
+        self.branch_dist = np.zeros((BRANCH_PAD + 1, 5))
+        self.hidden = np.zeros((BRANCH_PAD + 1, len(STEMS)))
+        self.hidden_by_element = [[[] for _ in ELEMENTS] for _ in range(BRANCH_PAD + 1)]
+        for b, c in enumerate(BRANCHES):
+            dist = {e: 0.0 for e in ELEMENTS}
+            for stem, ratio in Kernel.HIDDEN_STEMS.get(c, {}).items():
+                props = Kernel.STEM_PROPERTIES.get(stem)
+                if props:
+                    dist[props['element']] += ratio
+                    self.hidden_by_element[b][ELEMENT_INDEX[props['element']]].append(stem)
+                if stem in STEM_INDEX:
+                    self.hidden[b, STEM_INDEX[stem]] = ratio
+            self.branch_dist[b] = [dist[e] for e in ELEMENTS]
+        self.activation_count = np.array([[len(h) for h in row] for row in self.hidden_by_element])
+
+        self.interaction = np.zeros((BRANCH_PAD + 1, BRANCH_PAD + 1), dtype=np.int8)
+        self.sanhe_target = np.full((BRANCH_PAD + 1, BRANCH_PAD + 1), -1, dtype=np.int8)
+        self.pair_rule_keys = {}
+        sanhe_sets = {element: chars for chars, element in _TRIOS}
+        for i, c1 in enumerate(BRANCHES):
+            for j, c2 in enumerate(BRANCHES):
+                code = _INTERACTION_CODES.get(Kernel.get_interaction_type(c1, c2), 0)
+                self.interaction[i, j] = code
+                if code:
+                    self.pair_rule_keys[i, j] = f"{INTERACTION_NAMES[code]}: {'-'.join(sorted([c1, c2]))}"
+                for element in ("Water", "Metal", "Fire", "Wood"):  # FluxEngine._get_sanhe_target 的判定顺序
+                    if c1 in sanhe_sets[element] and c2 in sanhe_sets[element]:
+                        self.sanhe_target[i, j] = ELEMENT_INDEX[element]
+                        break
+
+        self.generation = np.array([ELEMENT_INDEX[Kernel.ELEMENT_GENERATION[e]] for e in ELEMENTS])
+        self.previous = np.array([
+            ELEMENT_INDEX[next(k for k, v in Kernel.ELEMENT_GENERATION.items() if v == e)] for e in ELEMENTS
+        ])
+
+        # 本命地支的位置质量（Particle._init_state：按 POSITION_WEIGHTS 的键顺序做子串匹配）
+        self.branch_mass = {}
+        for slot in NATAL_BRANCH_SLOTS:
+            mass = DEFAULT_BRANCH_MASS
+            for key, weight in Kernel.POSITION_WEIGHTS.items():
+                if key in SLOTS[slot]:
+                    mass = 100.0 * weight
+                    break
+            self.branch_mass[slot] = mass
+
+
+_TABLES: Dict[str, _KernelTables] = {}
+
+
+def _kernel_tables() -> _KernelTables:
+    """按 Kernel 当前公理值缓存（load_overrides 改写后自动重建）"""
+    key = repr((Kernel.STEM_PROPERTIES, Kernel.HIDDEN_STEMS, Kernel.ELEMENT_GENERATION, Kernel.POSITION_WEIGHTS))
+    tables = _TABLES.get(key)
+    if tables is None:
+        _TABLES.clear()
+        tables = _TABLES[key] = _KernelTables()
+    return tables
+
+
+class _FluxBatch:
+    """一批命盘的粒子数组与逐盘日志；方法与 FluxEngine 的求解阶段一一对应"""
+
+    def __init__(
+        self,
+        charts: Sequence[Dict],
+        environments: Sequence[Optional[Dict]],
+        state_maps: Sequence[Optional[Dict]],
+        disabled_rules: Iterable[str],
+        params: Dict,
+    ):
+        self.t = _kernel_tables()
+        self.charts = charts
+        self.disabled = set(disabled_rules)
+        self.params = params
+        n = self.n = len(charts)
+
+        self.chars = [[None] * N_SLOTS for _ in range(n)]
+        self.present = np.zeros((n, N_SLOTS), dtype=bool)
+        self.codes = np.zeros((n, N_SLOTS), dtype=np.intp)
+        self.codes[:, list(STEM_SLOTS)] = STEM_PAD
+        self.codes[:, list(BRANCH_SLOTS)] = BRANCH_PAD
+        self.health = np.full((n, N_SLOTS), 100.0)
+        self.state_maps = list(state_maps)
+
+        for row, chart in enumerate(charts):
+            chars = self.chars[row]
+            for p, pillar in enumerate(PILLARS):
+                p_data = chart.get(pillar)
+                if not p_data:
+                    continue
+                self._place(row, 2 * p, p_data.get('stem'))
+                self._place(row, 2 * p + 1, p_data.get('branch'))
+            env = environments[row] or {}
+            for slot in (DY_STEM, DY_BRANCH, LN_STEM, LN_BRANCH):
+                self._place(row, slot, env.get(SLOTS[slot]))
+            state_map = self.state_maps[row]
+            if state_map:
+                for slot in NATAL_SLOTS:
+                    if chars[slot] and SLOTS[slot] in state_map:
+                        self.health[row, slot] = state_map[SLOTS[slot]]
+
+        self.flags = np.zeros((n, N_SLOTS), dtype=np.int32)
+        self.dist = np.zeros((n, N_SLOTS, 5))
+        self.dist[:, STEM_SLOTS] = self.t.stem_dist[self.codes[:, STEM_SLOTS]]
+        self.dist[:, BRANCH_SLOTS] = self.t.branch_dist[self.codes[:, BRANCH_SLOTS]]
+        self.dist[~self.present] = 0.0
+
+        amp = self.amp = np.zeros((n, N_SLOTS))
+        amp[:, STEM_SLOTS] = STEM_BASE_AMPLITUDE
+        for slot in NATAL_BRANCH_SLOTS:
+            weight = self._positional_weight(slot)
+            amp[:, slot] = self.t.branch_mass[slot] if weight is None else BRANCH_MASS_PER_WEIGHT * weight
+        natal = np.zeros(N_SLOTS, dtype=bool)
+        natal[list(NATAL_SLOTS)] = True
+        damaged = self.present & natal & (self.health < 100.0)
+        amp[damaged] *= self.health[damaged] / 100.0
+        for slot, value in ENV_AMPLITUDE.items():
+            amp[:, slot] = value
+        amp[~self.present] = 0.0
+
+        self.logs = [[] for _ in range(n)]
+        self.events = [[] for _ in range(n)]
+        self.detected = [set() for _ in range(n)]
+        self.focus = [None] * n
+
+    def _place(self, row, slot, char):
+        if not char:
+            return
+        index, pad = (STEM_INDEX, STEM_PAD) if slot in STEM_SLOTS else (BRANCH_INDEX, BRANCH_PAD)
+        self.chars[row][slot] = char
+        self.present[row, slot] = True
+        self.codes[row, slot] = index.get(char, pad)
+
+    def _positional_weight(self, slot):
+        weights = self.params.get('positional_weights')
+        if not weights:
+            return None
+        return weights.get(SLOTS[slot])
+
+    def _rule(self, row, rule_key) -> bool:
+        """记录规则命中；规则被禁用时返回 False"""
+        self.detected[row].add(rule_key)
+        return rule_key not in self.disabled
+
+    def _collapse(self, rows, slot, element, strength):
+        """WaveFunction.collapse_to 的批量版本（element 可为逐行数组）"""
+        d = self.dist[rows, slot] * (1 - strength)
+        d[np.arange(len(rows)), element] += strength
+        total = d[:, 0] + d[:, 1] + d[:, 2] + d[:, 3] + d[:, 4]
+        positive = total > 0
+        d[positive] /= total[positive, None]
+        self.dist[rows, slot] = d
+
+    def _main_element(self):
+        return self.dist.argmax(axis=-1)
+
+    def _spectrum(self):
+        energy = self.amp[:, :, None] * self.dist
+        spec = np.zeros((self.n, 5))
+        for slot in range(N_SLOTS):
+            spec += energy[:, slot]
+        return spec
+
+    # --- 1. 几何相互作用 ---
+
+    def solve_branch_geometry(self):
+        t, amp, chars = self.t, self.amp, self.chars
+        bcodes = self.codes[:, BRANCH_SLOTS]
+        bpresent = self.present[:, BRANCH_SLOTS]
+        processed = np.zeros((self.n, len(BRANCH_SLOTS), len(BRANCH_SLOTS)), dtype=bool)
+        branch_slots = np.array(BRANCH_SLOTS)
+
+        for trio_chars, element in _TRIOS:
+            members = []
+            for c in trio_chars:
+                hit = bpresent & (bcodes == BRANCH_INDEX[c])
+                members.append((hit.any(axis=1), hit.argmax(axis=1)))
+            rows = np.flatnonzero(members[0][0] & members[1][0] & members[2][0])
+            if not len(rows):
+                continue
+            rule_key = f"SanHe: {element} Bureau"
+            keep = np.array([self._rule(row, rule_key) for row in rows], dtype=bool)
+            for row in rows[~keep]:
+                self.logs[row].append(f"🚫 Rule Disabled: {rule_key}")
+            rows = rows[keep]
+            if not len(rows):
+                continue
+
+            ks = [m[1][rows] for m in members]
+            for a in range(3):
+                for b in range(3):
+                    if a != b:
+                        processed[rows, ks[a], ks[b]] = True
+            slots = [branch_slots[k] for k in ks]
+            deltas = [amp[rows, s] * 0.5 for s in slots]
+            for s, d in zip(slots, deltas):
+                amp[rows, s] += d
+                self.flags[rows, s] |= FLAG[f"PhaseLock_{element}"]
+            for s in slots:
+                self._collapse_slots(rows, s, ELEMENT_INDEX[element], 0.9)
+
+            for i, row in enumerate(rows):
+                c = [chars[row][s[i]] for s in slots]
+                self.logs[row].append(f"🌊 三合局成象: {c[0]}-{c[1]}-{c[2]} -> {element}局 (SanHe Bureau)")
+                self.events[row].append({
+                    "type": "SanHe",
+                    "name": f"三合{element}局",
+                    "participants": c,
+                    "theory": f"三合完整能量场 ({element} Frame)",
+                    "delta": {c[k]: f"+{deltas[k][i]:.1f}" for k in range(3)},
+                })
+
+        for a, b in _BRANCH_PAIRS:
+            live = bpresent[:, a] & bpresent[:, b] & ~processed[:, a, b]
+            kind = np.where(live, t.interaction[bcodes[:, a], bcodes[:, b]], 0)
+            for code in (BANHE, LIUCHONG, XIANGXING):
+                rows = np.flatnonzero(kind == code)
+                if len(rows):
+                    self._pair_event(code, rows, BRANCH_SLOTS[a], BRANCH_SLOTS[b])
+
+    def _collapse_slots(self, rows, slots, element, strength):
+        """逐行槽位不同的 collapse（三合成员槽位因盘而异）"""
+        for slot in np.unique(slots):
+            sel = slots == slot
+            self._collapse(rows[sel], slot, element, strength)
+
+    def _pair_event(self, code, rows, sa, sb):
+        chars, rule_keys = self.chars, self.t.pair_rule_keys
+        keep = []
+        for row, c1, c2 in zip(rows.tolist(), self.codes[rows, sa].tolist(), self.codes[rows, sb].tolist()):
+            rule_key = rule_keys[c1, c2]
+            if self._rule(row, rule_key):
+                keep.append(row)
+            else:
+                self.logs[row].append(f"🚫 Rule Disabled: {rule_key}")
+        if not keep:
+            return
+        rows = np.array(keep, dtype=np.intp)
+        amp = self.amp
+        a1, a2 = amp[rows, sa], amp[rows, sb]
+
+        if code == BANHE:
+            target = self.t.sanhe_target[self.codes[rows, sa], self.codes[rows, sb]]
+            d1, d2 = a1 * 0.2, a2 * 0.2
+            amp[rows, sa] = a1 + d1
+            amp[rows, sb] = a2 + d2
+            self.flags[rows, sa] |= PHASE_LOCK[target]
+            self.flags[rows, sb] |= PHASE_LOCK[target]
+            self._collapse(rows, sa, target, 0.8)
+            self._collapse(rows, sb, target, 0.8)
+            for row, e, d1, d2 in zip(rows.tolist(), target.tolist(), d1.tolist(), d2.tolist()):
+                c1, c2 = chars[row][sa], chars[row][sb]
+                element = ELEMENTS[e]
+                self.logs[row].append(f"🔄 半合拱气: {c1}-{c2} -> {element}气 (BanHe)")
+                self.events[row].append({
+                    "type": "BanHe",
+                    "name": f"半合{CN_ELEMENTS[element]}局",
+                    "participants": [c1, c2],
+                    "theory": f"半合拱局 (Semi-Harmony {element})",
+                    "delta": {c1: f"+{d1:.1f}", c2: f"+{d2:.1f}"},
+                })
+            return
+
+        if code == LIUCHONG:
+            loss1, loss2 = a1 * 0.4, a2 * 0.4
+            flag, log, event = FLAG["ShellRuptured"], "💥 能量冲克: {}-{} (Collision)", ("LiuChong", "六冲", "对冲撞击 (180° Axial Clash)")
+        else:
+            loss1, loss2 = a1 * 0.2, a2 * 0.2
+            flag, log, event = FLAG["ShearStress"], "⚔️ 刑伤剪切: {}-{} (Shear Stress)", ("XiangXing", "相刑", "侧向刑伤 (90° Shear Stress)")
+        amp[rows, sa] = a1 - loss1
+        amp[rows, sb] = a2 - loss2
+        self.flags[rows, sa] |= flag
+        self.flags[rows, sb] |= flag
+        for row, loss1, loss2 in zip(rows.tolist(), loss1.tolist(), loss2.tolist()):
+            c1, c2 = chars[row][sa], chars[row][sb]
+            self.logs[row].append(log.format(c1, c2))
+            self.events[row].append({
+                "type": event[0],
+                "name": event[1],
+                "participants": [c1, c2],
+                "theory": event[2],
+                "delta": {c1: f"-{loss1:.1f}", c2: f"-{loss2:.1f}"},
+            })
+
+    # --- 2. 透干（地支藏干 -> 天干强度） ---
+
+    def solve_stem_intensity(self):
+        stems, branches = list(STEM_SLOTS), list(BRANCH_SLOTS)
+        s_elem = self.dist[:, stems].argmax(axis=-1)                                   # (n, 6)
+        T = np.take_along_axis(self.dist[:, None, branches, :], s_elem[:, :, None, None], axis=3)[..., 0]  # (n, stem, branch)
+        stem_present = self.present[:, stems]
+
+        total = np.zeros(s_elem.shape)
+        for k, slot in enumerate(branches):
+            total += self.amp[:, slot, None] * T[:, :, k]
+        max_root = T.max(axis=2)
+
+        revealed = ((T > 0) & stem_present[:, :, None]).any(axis=1)
+        self.flags[:, branches] |= np.where(revealed, FLAG["Revealed"], 0).astype(np.int32)
+
+        virtual = (max_root < 0.1) & (total < 5.0)
+        intensity = np.where(virtual, 2.0, 5.0 + total)
+        self.amp[:, stems] = np.where(stem_present, intensity, 0.0)
+        status = np.where(virtual, FLAG["VirtualImage"], FLAG["Rooted"])
+        status |= np.where(~virtual & (total > 30.0), FLAG["LaserBeam"], 0)
+        self.flags[:, stems] |= np.where(stem_present, status, 0).astype(np.int32)
+
+        for slot in STEM_SLOTS:
+            weight = self._positional_weight(slot)
+            if weight is not None:
+                self.amp[:, slot] *= weight
+
+    # --- 3. 全局通量网络 ---
+
+    def solve_global_flux(self):
+        amp, chars, present = self.amp, self.chars, self.present
+        main = self._main_element()
+        net = np.zeros((self.n, N_SLOTS))
+        edges = np.zeros((self.n, len(FLOW_EDGES)), dtype=bool)
+
+        for e, (src, tgt) in enumerate(FLOW_EDGES):
+            live = present[:, src] & present[:, tgt] & (self.t.generation[main[:, src]] == main[:, tgt])
+            edges[:, e] = live
+            rows = np.flatnonzero(live)
+            if not len(rows):
+                continue
+            amount = amp[rows, src] * FLOW_TRANSFER_RATE
+            amp[rows, src] -= amount
+            amp[rows, tgt] += amount
+            net[rows, src] -= amount
+            net[rows, tgt] += amount
+            for row, moved in zip(rows.tolist(), amount.tolist()):
+                self.logs[row].append(f"🌊 Flow: {chars[row][src]} -> {chars[row][tgt]} ({moved:.1f}E)")
+
+        for e1, e2 in SYNERGY_CHAINS:
+            rows = np.flatnonzero(edges[:, e1] & edges[:, e2])
+            if not len(rows):
+                continue
+            src, mid = FLOW_EDGES[e1]
+            end = FLOW_EDGES[e2][1]
+            keep = []
+            for row in rows.tolist():
+                chain = f"{chars[row][src]}->{chars[row][mid]}->{chars[row][end]}"
+                if self._rule(row, f"Synergy: {chain}"):
+                    keep.append(row)
+                    self.logs[row].append(f"✨ Lian Zhu Synergy: {chain} (+25%)")
+            if keep:
+                amp[keep, end] *= SYNERGY_BOOST
+                self.flags[keep, end] |= FLAG["SynergyBoost"]
+
+        masked = np.where(present, net, -np.inf)
+        sink = masked.argmax(axis=1)
+        sink_val = masked[np.arange(self.n), sink]
+        for row in np.flatnonzero(sink_val > 5.0).tolist():
+            slot, val = sink[row], float(sink_val[row])
+            self.flags[row, slot] |= FLAG["SystemFocus"]
+            self.focus[row] = {
+                'id': SLOTS[slot],
+                'char': chars[row][slot],
+                'net_flow': val,
+                'final_energy': float(amp[row, slot]),
+            }
+            self.logs[row].append(f"🎯 System Focus (Sink): {chars[row][slot]} (Net +{val:.1f})")
+
+    # --- 4. 时空场（大运通关、流年引动/冲） ---
+
+    def solve_spacetime_dynamics(self):
+        t, amp, chars, present = self.t, self.amp, self.chars, self.present
+        main = self._main_element()
+
+        natal_bits = np.zeros(self.n, dtype=np.int64)
+        for slot in NATAL_SLOTS:
+            natal_bits |= np.where(present[:, slot], 1 << main[:, slot], 0)
+        bridged = ((natal_bits[:, None] >> t.previous[None]) & 1) & ((natal_bits[:, None] >> t.generation[None]) & 1)
+        dy_has = np.zeros((self.n, 5), dtype=bool)
+        for slot in (DY_STEM, DY_BRANCH):
+            rows = np.flatnonzero(present[:, slot])
+            dy_has[rows, main[rows, slot]] = True
+
+        for row in np.flatnonzero((dy_has & (bridged == 1)).any(axis=1)).tolist():
+            dy_elements = set()  # 与 FluxEngine 相同的 set 迭代顺序
+            if present[row, DY_STEM]: dy_elements.add(ELEMENTS[main[row, DY_STEM]])
+            if present[row, DY_BRANCH]: dy_elements.add(ELEMENTS[main[row, DY_BRANCH]])
+            for dy_elem in dy_elements:
+                e = ELEMENT_INDEX[dy_elem]
+                if not bridged[row, e]:
+                    continue
+                e_prev, e_next = ELEMENTS[t.previous[e]], ELEMENTS[t.generation[e]]
+                if not self._rule(row, f"TongGuan: {dy_elem} bridges {e_prev}->{e_next}"):
+                    continue
+                self.logs[row].append(f"🌉 Structural Repair (Tong Guan): Da Yun {dy_elem} bridges {e_prev}->{e_next}")
+                amp[row] *= 1.1
+
+        ln_stem = present[:, LN_STEM]
+        if ln_stem.any():
+            ln_elem = main[:, LN_STEM]
+            for slot in NATAL_BRANCH_SLOTS:
+                rows = np.flatnonzero(ln_stem & present[:, slot] & (t.activation_count[self.codes[:, slot], ln_elem] > 0))
+                for row in rows.tolist():
+                    ln_char, nb_char = chars[row][LN_STEM], chars[row][slot]
+                    for h_stem in t.hidden_by_element[self.codes[row, slot]][ln_elem[row]]:
+                        if not self._rule(row, f"Activation: LN {ln_char}->{nb_char}({h_stem})"):
+                            continue
+                        self.logs[row].append(f"⚡ Activation: Liu Nian {ln_char} activates {h_stem} in {nb_char}")
+                        amp[row, slot] += 10.0
+                        self.flags[row, slot] |= FLAG["Activated"]
+
+        ln_branch = present[:, LN_BRANCH]
+        if ln_branch.any():
+            for slot in NATAL_BRANCH_SLOTS:
+                clash = t.interaction[self.codes[:, LN_BRANCH], self.codes[:, slot]] == LIUCHONG
+                keep = []
+                for row in np.flatnonzero(ln_branch & present[:, slot] & clash).tolist():
+                    ln_char, nb_char = chars[row][LN_BRANCH], chars[row][slot]
+                    if self._rule(row, f"LiuChong: {ln_char}-{nb_char}"):
+                        keep.append(row)
+                        self.logs[row].append(f"⚔️ CRITICAL: Liu Nian {ln_char} CLASHES {nb_char}")
+                if keep:
+                    self.flags[keep, slot] |= FLAG["StructureBroken"]
+                    amp[keep, slot] *= 0.25
+
+    # --- 结果组装 ---
+
+    def stem_spectrum(self):
+        """(n, 10) 天干能谱，累加顺序同 FluxEngine._get_stem_spectrum"""
+        spec = np.zeros((self.n, len(STEMS)))
+        rows = np.arange(self.n)
+        for slot in STEM_SLOTS:
+            known = self.present[:, slot] & (self.codes[:, slot] < STEM_PAD)
+            spec[rows[known], self.codes[known, slot]] += self.amp[known, slot]
+        for slot in BRANCH_SLOTS:
+            spec += self.amp[:, slot, None] * self.t.hidden[self.codes[:, slot]]
+        return spec
+
+    def run(self) -> List[Dict]:
+        self.solve_branch_geometry()
+        self.solve_stem_intensity()
+        l1 = self._spectrum().tolist()
+        self.solve_global_flux()
+        self.solve_spacetime_dynamics()
+        final = self._spectrum().tolist()
+        stem_spec = self.stem_spectrum().tolist()
+        amps = self.amp.tolist()
+        flags = self.flags.tolist()
+
+        results = []
+        for row, chart in enumerate(self.charts):
+            chars, log = self.chars[row], self.logs[row]
+            state_map = self.state_maps[row] or {}
+            slots = [slot for slot in range(N_SLOTS) if chars[slot]]
+
+            trace = {'l1_spectrum': dict(zip(ELEMENTS, l1[row]))}
+            if self.focus[row] is not None:
+                trace['system_focus'] = self.focus[row]
+            trace['spectrum'] = dict(zip(ELEMENTS, final[row]))
+            trace['l2_spectrum'] = trace['spectrum']
+            trace['interactions'] = self.events[row]
+
+            health = {SLOTS[s]: state_map.get(SLOTS[s], 100.0) if s in NATAL_SLOTS else 100.0 for s in slots}
+            result = {
+                'spectrum': trace['spectrum'],
+                'log': log,
+                'particle_states': [
+                    {'id': SLOTS[s], 'char': chars[s], 'type': 'stem' if s in STEM_SLOTS else 'branch',
+                     'amp': amps[row][s], 'health': health[SLOTS[s]], 'status': status_names(flags[row][s])}
+                    for s in slots
+                ],
+                'trace': trace,
+                'detected_rules': list(self.detected[row]),
+            }
+            dm_stem = chart.get('day', {}).get('stem')
+            if dm_stem:
+                result.update(FluxEngine.ten_gods_view(dm_stem, dict(zip(STEMS, stem_spec[row]))))
+
+            new_state_map = {}
+            for s in slots:
+                if s not in NATAL_SLOTS:
+                    continue
+                pid, value = SLOTS[s], health[SLOTS[s]]
+                if amps[row][s] < 15.0 and flags[row][s] & (FLAG["StructureBroken"] | FLAG["ShellRuptured"]):
+                    dmg = 20.0
+                    value = max(0.0, value - dmg)
+                    log.append(f"💔 PERMANENT DAMAGE: {chars[s]} Health -{dmg} (Current: {value})")
+                new_state_map[pid] = value
+            result['final_state_map'] = new_state_map
+            results.append(result)
+        return results
+
+
+def calculate_flux_many(
+    charts: Sequence[Dict],
+    environments: Optional[Sequence[Optional[Dict]]] = None,
+    state_maps: Optional[Sequence[Optional[Dict]]] = None,
+    disabled_rules: Optional[Iterable[str]] = None,
+    params: Optional[Dict] = None,
+) -> List[Dict]:
+    """
+    批量计算能量通量（逐盘结果与 FluxEngine(chart).calculate_flux(...) 同构）
+
+    Args:
+        charts: 本命盘列表 ({'year': {'stem', 'branch'}, ...})
+        environments: 每盘的大运/流年 {'dy_stem', 'dy_branch', 'ln_stem', 'ln_branch'}，None 表示无
+        state_maps: 每盘的结构健康度 (上一次的 final_state_map)，None 表示满健康
+        disabled_rules: 全批共用的禁用规则键
+        params: 引擎参数（如 positional_weights）
+    """
+    charts = list(charts)
+    n = len(charts)
+    environments = list(environments) if environments is not None else [None] * n
+    state_maps = list(state_maps) if state_maps is not None else [None] * n
+    if len(environments) != n or len(state_maps) != n:
+        raise ValueError("environments / state_maps 长度必须与 charts 一致")
+    if not n:
+        return []
+    return _FluxBatch(charts, environments, state_maps, disabled_rules or (), params or {}).run()
+
+
+class FluxArrayEngine:
+    """
+    FluxEngine 的数组内核版本（单盘接口）
+
+    用法与 FluxEngine 相同：
+        engine = FluxArrayEngine(chart)
+        result = engine.calculate_flux(dy_stem, dy_branch, ln_stem, ln_branch, disabled_rules=...)
+
+    不暴露 particles（Particle 对象）；需要粒子对象的调用方继续使用 FluxEngine。
+    单盘调用有固定的 numpy 开销（约为对象引擎的数倍），大量命盘请直接用 calculate_flux_many 成批计算。
+    """
+
+    def __init__(self, chart: Dict):
+        self.chart = chart
+        self.log: List[str] = []
+        self.disabled_rules = set()
+        self.detected_rules = set()
+        self.params = {
+            "entropy_penalty": 0.5,
+        }
+        self._environment: Dict[str, str] = {}
+        self._state_map: Optional[Dict] = None
+
+    def set_environment(self, da_yun: Optional[Dict] = None, liu_nian: Optional[Dict] = None):
+        if da_yun:
+            self._environment.update({'dy_stem': da_yun.get('stem'), 'dy_branch': da_yun.get('branch')})
+        if liu_nian:
+            self._environment.update({'ln_stem': liu_nian.get('stem'), 'ln_branch': liu_nian.get('branch')})
+
+    def set_hyperparameters(self, params: Dict):
+        self.params.update(params)
+
+    def compute_energy_state(self) -> Dict:
+        result = calculate_flux_many(
+            [self.chart], [self._environment], [self._state_map], self.disabled_rules, self.params
+        )[0]
+        self.detected_rules = set(result['detected_rules'])
+        # 与 FluxEngine 一致：同一引擎实例的日志跨调用累积
+        self.log.extend(result['log'])
+        result['log'] = self.log
+        return result
+
+    def calculate_flux(self, dy_stem=None, dy_branch=None, ln_stem=None, ln_branch=None, state_map=None, disabled_rules=None):
+        self.disabled_rules = disabled_rules or set()
+        self._state_map = state_map
+        self._environment = {}
+        self.set_environment(
+            {'stem': dy_stem, 'branch': dy_branch} if dy_stem or dy_branch else None,
+            {'stem': ln_stem, 'branch': ln_branch} if ln_stem or ln_branch else None,
+        )
+        return self.compute_energy_state()
@@ -0,0 +1,224 @@
+"""
+干支历表 (Ganzhi Calendar Table)
+================================
+预计算 1900-2100 逐日的年/月/日柱索引以及节令交接时刻，构建一次、全进程共享。
+
+架构定位：
+- 每日三个 int8 干支序号（0=甲子 ... 59=癸亥），按公历日连续排列
+- 节令（立春、惊蛰 ... 小寒）交接时刻及其生效的年柱/月柱序号
+- (年柱, 月柱, 日柱) 倒排索引：反推出生日期变为一次索引探测
+
+口径与 lunar_python 精确模式一致：
+- 年柱以立春交接时刻为界 (getYearInGanZhiExact)
+- 月柱以节交接时刻为界 (getMonthInGanZhiExact)
+- 日柱按儒略日连续推算 (getDayInGanZhiExact，非晚子时)
+
+Version: 1.0
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+GAN = "甲乙丙丁戊己庚辛壬癸"
+ZHI = "子丑寅卯辰巳午未申酉戌亥"
+
+# 12 节（月令交接点），立春同时是年柱交接点
+JIE_NAMES = ("小寒", "立春", "惊蛰", "清明", "立夏", "芒种",
+             "小暑", "立秋", "白露", "寒露", "立冬", "大雪")
+
+# 时间戳基准：1900-01-01 00:00:00（秒）
+EPOCH = datetime(1900, 1, 1)
+
+# 儒略日数 = date.toordinal() + 1721425；lunar_python 日柱偏移 = JDN - 11
+_DAY_INDEX_OFFSET = 1721425 - 11
+
+
+def ganzhi_index(ganzhi: str) -> Optional[int]:
+    """干支 -> 六十甲子序号 (甲子=0)，非法输入返回 None"""
+    if not ganzhi or len(ganzhi) < 2:
+        return None
+    g = GAN.find(ganzhi[0])
+    z = ZHI.find(ganzhi[1])
+    if g < 0 or z < 0 or (g - z) % 2 != 0:
+        return None
+    # 中国剩余定理：k ≡ g (mod 10), k ≡ z (mod 12)
+    return (6 * g - 5 * z) % 60
+
+
+def ganzhi_name(index: int) -> str:
+    """六十甲子序号 -> 干支"""
+    return GAN[index % 10] + ZHI[index % 12]
+
+
+def day_index_of(d: date) -> int:
+    """公历日期 -> 日柱序号"""
+    return (d.toordinal() + _DAY_INDEX_OFFSET) % 60
+
+
+def hour_for_pillar(day_idx: int, hour_idx: int) -> Optional[int]:
+    """
+    给定日柱与时柱序号，返回该日满足时柱的整点小时（0, 2, ..., 22），无解返回 None
+
+    五鼠遁：时干 = (日干 % 5 * 2 + 时支) % 10
+    """
+    zhi = hour_idx % 12
+    if (day_idx % 10 % 5 * 2 + zhi) % 10 != hour_idx % 10:
+        return None
+    return zhi * 2
+
+
+class GanzhiCalendar:
+    """
+    紧凑干支历表
+
+    存储（约 74k 日 / 2.4k 节）：
+    - year_idx / month_idx / day_idx: int8[n_days]，每日 00:00 时刻的三柱序号
+    - term_ts: int64[n_terms]，节交接时刻（距 EPOCH 的秒数）
+    - term_year_idx / term_month_idx: int8[n_terms]，该节起生效的年柱/月柱
+    - 倒排索引: (年, 月, 日) 组合键排序后的日偏移 int32 数组
+    """
+
+    def __init__(self, start_year: int = 1900, end_year: int = 2100):
+        """
+        初始化历表
+
+        Args:
+            start_year: 覆盖的首个立春年
+            end_year: 覆盖的末个立春年（历表延伸到次年年底以包含其立春前的日子）
+        """
+        self.start_year = start_year
+        self.end_year = end_year
+        self.first_day = date(start_year, 1, 1)
+        self.last_day = date(end_year + 1, 12, 31)
+
+        self._build_terms()
+        self._build_days()
+        self._build_inverted_index()
+
+    # --- 构建 ---
+
+    def _build_terms(self):
+        """从 lunar_python 的节气表提取节交接时刻，并标注生效的年柱/月柱"""
+        from lunar_python import Solar
+
+        stamps = []
+        is_lichun = []
+        # 多取前后各一年，保证首日之前与末日之后都有节令
+        for year in range(self.start_year - 1, self.end_year + 3):
+            table = Solar.fromYmd(year, 6, 1).getLunar().getJieQiTable()
+            for name in JIE_NAMES:
+                solar = table[name]
+                moment = datetime(solar.getYear(), solar.getMonth(), solar.getDay(),
+                                  solar.getHour(), solar.getMinute(), solar.getSecond())
+                stamps.append(int((moment - EPOCH).total_seconds()))
+                is_lichun.append(name == "立春")
+
+        order = np.argsort(stamps, kind="stable")
+        self.term_ts = np.asarray(stamps, dtype=np.int64)[order]
+        lichun_mask = np.asarray(is_lichun, dtype=bool)[order]
+
+        # 锚点：首个节生效时的精确年柱/月柱，其后月柱每节 +1，年柱每逢立春 +1
+        anchor = EPOCH + timedelta(seconds=int(self.term_ts[0]))
+        lunar = Solar.fromYmdHms(anchor.year, anchor.month, anchor.day,
+                                 anchor.hour, anchor.minute, anchor.second).getLunar()
+        month0 = ganzhi_index(lunar.getMonthInGanZhiExact())
+        year0 = ganzhi_index(lunar.getYearInGanZhiExact())
+
+        steps = np.arange(len(self.term_ts), dtype=np.int64)
+        lichun_count = np.cumsum(lichun_mask) - lichun_mask[0]
+        self.term_month_idx = ((month0 + steps) % 60).astype(np.int8)
+        self.term_year_idx = ((year0 + lichun_count) % 60).astype(np.int8)
+
+    def _build_days(self):
+        """逐日计算 00:00 时刻的三柱序号"""
+        first = self.first_day.toordinal()
+        ordinals = np.arange(first, self.last_day.toordinal() + 1, dtype=np.int64)
+        midnight_ts = (ordinals - EPOCH.toordinal()) * 86400
+
+        term_pos = np.searchsorted(self.term_ts, midnight_ts, side="right") - 1
+        self.year_idx = self.term_year_idx[term_pos]
+        self.month_idx = self.term_month_idx[term_pos]
+        self.day_idx = ((ordinals + _DAY_INDEX_OFFSET) % 60).astype(np.int8)
+
+        # 每日所属立春年（用于按年份范围过滤）：立春前的日子归上一年
+        unix_days = (ordinals - date(1970, 1, 1).toordinal()).astype("datetime64[D]")
+        solar_years = unix_days.astype("datetime64[Y]").astype(np.int32) + 1970
+        before_lichun = (solar_years - 4 - self.year_idx.astype(np.int32)) % 60 != 0
+        self.lichun_year = (solar_years - before_lichun).astype(np.int32)
+
+    def _build_inverted_index(self):
+        """构建 (年柱, 月柱, 日柱) -> 日偏移 的倒排索引"""
+        keys = self._compose_key(self.year_idx, self.month_idx, self.day_idx)
+        self._key_order = np.argsort(keys, kind="stable").astype(np.int32)
+        self._sorted_keys = keys[self._key_order]
+
+    @staticmethod
+    def _compose_key(year_idx, month_idx, day_idx):
+        return (np.asarray(year_idx, dtype=np.int32) * 3600
+                + np.asarray(month_idx, dtype=np.int32) * 60
+                + np.asarray(day_idx, dtype=np.int32))
+
+    # --- 查询 ---
+
+    def covers(self, year_range: Tuple[int, int]) -> bool:
+        """历表是否覆盖给定的立春年范围"""
+        return self.start_year <= year_range[0] and year_range[1] <= self.end_year
+
+    def lookup(
+        self,
+        year_idx: int,
+        month_idx: int,
+        day_idx: int,
+        year_range: Optional[Tuple[int, int]] = None,
+        date_range: Optional[Tuple[date, date]] = None
+    ) -> List[date]:
+        """
+        倒排索引探测：返回三柱完全匹配的所有公历日期（升序）
+
+        Args:
+            year_idx / month_idx / day_idx: 六十甲子序号
+            year_range: 可选的立春年过滤范围 (start_year, end_year)
+            date_range: 可选的公历日期过滤范围 (first, last)，含两端
+        """
+        key = int(self._compose_key(year_idx, month_idx, day_idx))
+        lo = np.searchsorted(self._sorted_keys, key, side="left")
+        hi = np.searchsorted(self._sorted_keys, key, side="right")
+        offsets = np.sort(self._key_order[lo:hi])
+
+        if year_range is not None:
+            years = self.lichun_year[offsets]
+            offsets = offsets[(years >= year_range[0]) & (years <= year_range[1])]
+
+        first = self.first_day.toordinal()
+        if date_range is not None:
+            lo_off, hi_off = (d.toordinal() - first for d in date_range)
+            offsets = offsets[(offsets >= lo_off) & (offsets <= hi_off)]
+        return [date.fromordinal(first + int(o)) for o in offsets]
+
+    def pillars_on(self, d: date) -> Tuple[int, int, int]:
+        """某公历日 00:00 的 (年柱, 月柱, 日柱) 序号"""
+        offset = d.toordinal() - self.first_day.toordinal()
+        if offset < 0 or offset >= len(self.day_idx):
+            raise ValueError(f"{d} 超出历表范围 {self.first_day} ~ {self.last_day}")
+        return int(self.year_idx[offset]), int(self.month_idx[offset]), int(self.day_idx[offset])
+
+    def pillars_at(self, moment: datetime) -> Tuple[int, int]:
+        """任意时刻的精确 (年柱, 月柱) 序号（以节交接时刻为界）"""
+        ts = int((moment - EPOCH).total_seconds())
+        pos = int(np.searchsorted(self.term_ts, ts, side="right")) - 1
+        if pos < 0 or pos >= len(self.term_ts) - 1:
+            raise ValueError(f"{moment} 超出节令表范围")
+        return int(self.term_year_idx[pos]), int(self.term_month_idx[pos])
+
+
+@lru_cache(maxsize=1)
+def get_ganzhi_calendar() -> GanzhiCalendar:
+    """获取全进程共享的 1900-2100 干支历表（首次调用时构建）"""
+    logger.debug("构建干支历表 1900-2100")
+    return GanzhiCalendar()
@@ -0,0 +1,176 @@
+"""
+惰性加载注册表 (Lazy Module Registry)
+=====================================
+[V9.4 Performance] 推迟模块导入与引擎构造，缩短冷启动与页面切换时间。
+
+架构定位：
+- lazy_import(): 返回模块代理，首次访问属性时才真正 import
+- lazy_attr(): 为包的 __getattr__ (PEP 562) 提供按需导出
+- LazyEngine: 类级描述符，实例首次访问时才构造引擎并缓存到实例上
+- 全部加载/构造耗时记入 registry，启动分析 (utils.startup_profiler) 据此出报告
+"""
+
+import importlib
+import logging
+import threading
+import time
+import types
+from typing import Any, Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class LazyModuleRegistry:
+    """
+    记录惰性模块与惰性引擎的物化情况
+
+    events: [{'kind': 'import' | 'engine', 'name': str, 'seconds': float}, ...]
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._modules: Dict[str, 'LazyModule'] = {}
+        self.events: List[Dict[str, Any]] = []
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+    def record(self, kind: str, name: str, seconds: float):
+        event = {'kind': kind, 'name': name, 'seconds': seconds}
+        with self._lock:
+            self.events.append(event)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.debug(f"惰性加载监听器失败: {e}")
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        """注册物化事件监听器（启动分析器使用）"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def module(self, name: str) -> 'LazyModule':
+        with self._lock:
+            proxy = self._modules.get(name)
+            if proxy is None:
+                proxy = LazyModule(name, self)
+                self._modules[name] = proxy
+            return proxy
+
+    def materialized(self) -> List[str]:
+        """已经真正加载/构造的名称（按发生顺序）"""
+        with self._lock:
+            return [e['name'] for e in self.events]
+
+    def pending(self) -> List[str]:
+        """已登记但尚未加载的惰性模块"""
+        with self._lock:
+            return [name for name, proxy in self._modules.items() if not proxy.is_loaded]
+
+
+class LazyModule(types.ModuleType):
+    """模块代理：首次访问属性时导入真实模块"""
+
+    def __init__(self, name: str, registry: LazyModuleRegistry):
+        super().__init__(name)
+        object.__setattr__(self, '_lazy_registry', registry)
+        object.__setattr__(self, '_lazy_module', None)
+        object.__setattr__(self, '_lazy_lock', threading.Lock())
+
+    @property
+    def is_loaded(self) -> bool:
+        return object.__getattribute__(self, '_lazy_module') is not None
+
+    def _load(self) -> types.ModuleType:
+        module = object.__getattribute__(self, '_lazy_module')
+        if module is not None:
+            return module
+        with object.__getattribute__(self, '_lazy_lock'):
+            module = object.__getattribute__(self, '_lazy_module')
+            if module is None:
+                start = time.perf_counter()
+                module = importlib.import_module(self.__name__)
+                object.__setattr__(self, '_lazy_module', module)
+                object.__getattribute__(self, '_lazy_registry').record(
+                    'import', self.__name__, time.perf_counter() - start
+                )
+        return module
+
+    def __getattr__(self, item):
+        return getattr(self._load(), item)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.is_loaded else 'pending'
+        return f"<LazyModule {self.__name__!r} ({state})>"
+
+
+class LazyEngine:
+    """
+    惰性引擎描述符
+
+    用法:
+        class Framework:
+            stress_engine = LazyEngine("core.trinity.core.engines.structural_stress:StructuralStressEngine")
+
+    首次访问 instance.stress_engine 时导入并构造，结果写入实例 __dict__，
+    之后的访问不再经过描述符。也可以直接赋值覆盖（如测试中注入替身）。
+    """
+
+    def __init__(self, target: Union[str, Callable[..., Any]], *args, **kwargs):
+        self.target = target
+        self.args = args
+        self.kwargs = kwargs
+        self.attr_name: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def __set_name__(self, owner, name):
+        self.attr_name = name
+        self.owner_name = owner.__name__
+
+    def _resolve(self) -> Callable[..., Any]:
+        if callable(self.target):
+            return self.target
+        module_name, _, attr = self.target.partition(':')
+        return getattr(importlib.import_module(module_name), attr)
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        with self._lock:
+            cached = instance.__dict__.get(self.attr_name)
+            if cached is not None:
+                return cached
+            start = time.perf_counter()
+            engine = self._resolve()(*self.args, **self.kwargs)
+            instance.__dict__[self.attr_name] = engine
+        registry.record('engine', f"{self.owner_name}.{self.attr_name}", time.perf_counter() - start)
+        return engine
+
+
+def lazy_import(name: str) -> LazyModule:
+    """返回模块代理（同名模块共享同一代理）"""
+    return registry.module(name)
+
+
+def lazy_attr(package: str, exports: Dict[str, str], name: str) -> Any:
+    """
+    PEP 562 包级 __getattr__ 辅助：按需导入 exports 中声明的名称
+
+    Args:
+        package: 包名（用于解析相对模块路径）
+        exports: {导出名: 相对/绝对模块路径}
+        name: 被访问的属性名
+    """
+    module_path = exports.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+    start = time.perf_counter()
+    module = importlib.import_module(module_path, package)
+    registry.record('import', module.__name__, time.perf_counter() - start)
+    return getattr(module, name)
+
+
+registry = LazyModuleRegistry()
@@ -11,7 +11,7 @@ from typing import Dict, List, Optional, Any
 import json
 
 from core.models.pattern_semantic_pool import get_multiple_pattern_semantics
-from core.config_manager import ConfigManager
+from core.config_snapshot import get_config_snapshot
 from utils.llm_parser import LLMParser  # [QGA V24.7] LLM逻辑网关
 from core.models.pattern_engine import get_pattern_registry  # [QGA V24.7] 格局引擎注册表
 
@@ -35,8 +35,7 @@ class LLMSemanticSynthesizer:
         """
         # [QGA V24.3] 从系统配置读取LLM模型名称
         if model_name is None:
-            config_manager = ConfigManager()
-            model_name = config_manager.get("selected_model_name")
+            model_name = get_config_snapshot().get("selected_model_name")
             if not model_name:
                 # 如果配置中没有，使用默认值（注意：实际应该使用配置中的值）
                 model_name = "qwen2.5:2.5b"
@@ -58,8 +57,7 @@ class LLMSemanticSynthesizer:
             import ollama
             
             # [QGA V24.3] 从系统配置读取ollama_host
-            config_manager = ConfigManager()
-            ollama_host = config_manager.get("ollama_host", "http://localhost:11434")
+            ollama_host = get_config_snapshot().get("ollama_host", "http://localhost:11434")
             self._ollama_host = ollama_host
             
             # 创建ollama客户端
@@ -3,10 +3,23 @@
 将5维张量数据翻译为人类可读的洞察报告
 
 基于LLM生成《经济学人》风格的评语
+
+[V9.4 Performance] 叙事缓存与分块流式输出
+- 键：张量（E/O/M/S/R 与 Alpha 四舍五入到 NARRATION_PRECISION 位）+ 格局名 + 状态 + 来源（规则 / LLM 模型名）
+- 规则生成：内存 LRU，同一视图重复渲染不再重算
+- LLM 生成：额外追加写入 results/narration_cache.jsonl，重启后重复查看即时返回、不再推理
+- 流式输出按句子 / token 分块（iter_chunks），节奏 pacing 默认 0（不 sleep）
 """
 
+import hashlib
+import json
 import logging
-from typing import Dict, List, Any, Optional
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Any, Optional
 from datetime import datetime
 
 from core.models.llm_semantic_synthesizer import LLMSemanticSynthesizer
@@ -14,6 +27,183 @@ from core.config_manager import ConfigManager
 
 logger = logging.getLogger(__name__)
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__))
+DEFAULT_CACHE_PATH = os.path.join(PROJECT_ROOT, "results", "narration_cache.jsonl")
+NARRATION_CACHE_VERSION = 1   # 修改提示词或规则文案时递增，使旧缓存失效
+NARRATION_PRECISION = 4       # 与提示词中的 :.4f 一致
+DEFAULT_MEMORY_ENTRIES = 512
+DEFAULT_CHUNKING = "sentence"
+DEFAULT_PACING = 0.0          # 每个分块后的停顿（秒）
+
+AXES = ('E', 'O', 'M', 'S', 'R')
+
+# 句子：以中英文终止符（可跟右引号/括号）或换行结束；末尾无终止符的残句单独成块
+_SENTENCE_RE = re.compile(r"[^。！？!?；;\n]*(?:[。！？!?；;]+[”’」』）)]*|\n+)|[^。！？!?；;\n]+")
+# token：连续 ASCII 词 / Markdown 加粗标记 / 空白 / 单个其他字符（中文逐字）
+_TOKEN_RE = re.compile(r"[A-Za-z0-9_.%+\-=]+|\*\*|\s+|.", re.S)
+
+
+def iter_chunks(text: str, chunking: str = DEFAULT_CHUNKING, pacing: float = DEFAULT_PACING) -> Iterator[str]:
+    """
+    将完整文本按粒度切块输出，拼接结果与原文一致
+
+    Args:
+        chunking: 'sentence' | 'token' | 'char' | 'none'
+        pacing: 每块之后的停顿秒数（0 = 不停顿）
+    """
+    if chunking == "sentence":
+        pieces = _SENTENCE_RE.findall(text)
+    elif chunking == "token":
+        pieces = _TOKEN_RE.findall(text)
+    elif chunking == "char":
+        pieces = list(text)
+    elif chunking == "none":
+        pieces = [text] if text else []
+    else:
+        raise ValueError(f"未知分块粒度: {chunking}")
+    for piece in pieces:
+        yield piece
+        if pacing > 0:
+            time.sleep(pacing)
+
+
+def rounded_tensor(tensor_data: Dict[str, Any], precision: int = NARRATION_PRECISION) -> Dict[str, Any]:
+    """叙事所需的张量子集（五轴投影 + Alpha），统一四舍五入"""
+    projection = tensor_data.get('projection', {}) or {}
+    return {
+        'projection': {axis: round(float(projection.get(axis, 0.0)), precision) for axis in AXES},
+        'alpha': round(float(tensor_data.get('alpha', 1.0)), precision),
+    }
+
+
+def narration_key(
+    tensor_data: Dict[str, Any],
+    pattern_name: str,
+    pattern_state: str,
+    source: str = "rules"
+) -> str:
+    """缓存键：source 为 'rules' 或 'llm:<模型名>'"""
+    rounded = rounded_tensor(tensor_data)
+    raw = json.dumps(
+        [NARRATION_CACHE_VERSION, source, pattern_name, pattern_state,
+         [rounded['projection'][axis] for axis in AXES], rounded['alpha']],
+        ensure_ascii=False
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class NarrationCache:
+    """
+    叙事结果缓存
+
+    - 内存：OrderedDict LRU（max_entries）
+    - 持久化：persist=True 的条目追加写入 JSONL（每行 {key, text, source, cached_at}），首次访问时加载
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MEMORY_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._persisted: Dict[str, str] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self):
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self._persisted[entry['key']] = entry['text']
+                    except (json.JSONDecodeError, KeyError):
+                        continue
+            logger.info(f"📚 已加载 {len(self._persisted)} 条叙事缓存: {self.path}")
+        except OSError as e:
+            logger.warning(f"⚠️ 叙事缓存加载失败: {e}")
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+            else:
+                text = self._persisted.get(key)
+            if text is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return text
+
+    def put(self, key: str, text: str, persist: bool = False, source: str = ""):
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            self._memory[key] = text
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+            if not persist or not self.path or self._persisted.get(key) == text:
+                return
+            self._persisted[key] = text
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({'key': key, 'text': text, 'source': source,
+                                        'cached_at': datetime.now().isoformat()}, ensure_ascii=False) + "\n")
+            except OSError as e:
+                logger.warning(f"⚠️ 叙事缓存写入失败: {e}")
+
+    def clear(self, persisted: bool = False):
+        """清空内存缓存；persisted=True 时同时删除持久化文件"""
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.misses = 0
+            if persisted:
+                self._persisted.clear()
+                if self.path and os.path.exists(self.path):
+                    os.remove(self.path)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'memory_entries': len(self._memory), 'persisted_entries': len(self._persisted),
+                    'hits': self.hits, 'misses': self.misses, 'path': self.path}
+
+
+_narration_cache: Optional[NarrationCache] = None
+_narration_cache_lock = threading.Lock()
+
+
+def get_narration_cache() -> NarrationCache:
+    """获取进程级叙事缓存"""
+    global _narration_cache
+    if _narration_cache is None:
+        with _narration_cache_lock:
+            if _narration_cache is None:
+                _narration_cache = NarrationCache()
+    return _narration_cache
+
+
+def _rules_report(tensor_data: Dict[str, Any], pattern_name: str, pattern_state: str, use_cache: bool = True) -> str:
+    """规则生成（基于四舍五入后的张量，因此结果完全由缓存键决定）"""
+    rounded = rounded_tensor(tensor_data)
+    if not use_cache:
+        return _generate_with_rules(rounded, pattern_name, pattern_state)
+    cache = get_narration_cache()
+    key = narration_key(rounded, pattern_name, pattern_state, source="rules")
+    text = cache.get(key)
+    if text is None:
+        text = _generate_with_rules(rounded, pattern_name, pattern_state)
+        cache.put(key, text)
+    return text
+
+
 # 全局LLM合成器实例（延迟初始化，支持配置更新）
 _llm_synthesizer: Optional[LLMSemanticSynthesizer] = None
 _llm_config_hash: Optional[str] = None  # 用于检测配置变化
@@ -64,7 +254,8 @@ def generate_holographic_report(
     tensor_data: Dict[str, Any],
     pattern_name: str = "A-03",
     pattern_state: str = "STABLE",
-    use_llm: bool = True
+    use_llm: bool = True,
+    use_cache: bool = True
 ) -> str:
     """
     生成全息格局报告（基于5维张量数据）
@@ -76,6 +267,7 @@ def generate_holographic_report(
             - pattern_state: dict (可选)
         pattern_name: 格局名称（如'A-03'）
         pattern_state: 格局状态（'STABLE', 'CRYSTALLIZED', 'COLLAPSED', 'MUTATED'）
+        use_cache: 是否使用叙事缓存（LLM 结果持久化）
         
     Returns:
         生成的叙事文本
@@ -84,10 +276,18 @@ def generate_holographic_report(
     if use_llm:
         llm_synthesizer = _get_llm_synthesizer()
         if llm_synthesizer and llm_synthesizer.use_llm:
+            source = f"llm:{llm_synthesizer.model_name}"
+            key = narration_key(tensor_data, pattern_name, pattern_state, source=source)
+            cached = get_narration_cache().get(key) if use_cache else None
+            if cached is not None:
+                logger.info("📚 LLM叙事命中缓存")
+                return cached
             logger.info("🔮 尝试使用LLM生成叙事报告...")
             try:
                 result = _generate_with_llm(tensor_data, pattern_name, pattern_state, llm_synthesizer)
                 if result:
+                    if use_cache:
+                        get_narration_cache().put(key, result, persist=True, source=source)
                     return result
                 else:
                     logger.warning("⚠️ LLM返回空结果，回退到规则生成")
@@ -96,16 +296,19 @@ def generate_holographic_report(
         else:
             logger.warning(f"⚠️ LLM不可用: synthesizer={llm_synthesizer is not None}, use_llm={llm_synthesizer.use_llm if llm_synthesizer else 'N/A'}")
     
-# 回退到规则生成
+    # 回退到规则生成
     logger.info("📝 使用规则生成叙事报告")
-    return _generate_with_rules(tensor_data, pattern_name, pattern_state)
+    return _rules_report(tensor_data, pattern_name, pattern_state, use_cache)
 
 
 def stream_holographic_report(
     tensor_data: Dict[str, Any],
     pattern_name: str = "A-03",
     pattern_state: str = "STABLE",
-    use_llm: bool = True
+    use_llm: bool = True,
+    chunking: str = DEFAULT_CHUNKING,
+    pacing: float = DEFAULT_PACING,
+    use_cache: bool = True
 ):
     """
     流式生成全息格局报告（基于5维张量数据）
@@ -114,22 +317,34 @@ def stream_holographic_report(
         tensor_data: 包含投影数据的字典
         pattern_name: 格局名称
         pattern_state: 格局状态
+        chunking: 缓存命中 / 规则生成时的分块粒度（'sentence' | 'token' | 'char' | 'none'）
+        pacing: 每块之后的停顿秒数（默认 0）
+        use_cache: 是否使用叙事缓存（LLM 结果持久化）
         
     Yields:
-        生成的叙事文本片段 (Token)
+        生成的叙事文本片段（LLM 实时输出为 token，其余按 chunking 分块）
     """
     # 尝试使用LLM生成
     if use_llm:
         llm_synthesizer = _get_llm_synthesizer()
         if llm_synthesizer and llm_synthesizer.use_llm:
+            source = f"llm:{llm_synthesizer.model_name}"
+            key = narration_key(tensor_data, pattern_name, pattern_state, source=source)
+            cached = get_narration_cache().get(key) if use_cache else None
+            if cached is not None:
+                logger.info("📚 LLM叙事命中缓存")
+                yield from iter_chunks(cached, chunking, pacing)
+                return
             logger.info("🔮 尝试使用LLM流式生成叙事报告...")
             try:
-                chunk_count = 0
-                for chunk in _stream_with_llm(tensor_data, pattern_name, pattern_state, llm_synthesizer):
-                    chunk_count += 1
+                parts = []
+                for chunk in _stream_with_llm(tensor_data, pattern_name, pattern_state, llm_synthesizer, pacing):
+                    parts.append(chunk)
                     yield chunk
-                # 如果成功生成内容，返回
-                if chunk_count > 0:
+                # 如果成功生成内容，写入缓存并返回
+                if parts:
+                    if use_cache:
+                        get_narration_cache().put(key, "".join(parts).strip(), persist=True, source=source)
                     return
                 else:
                     logger.warning("⚠️ LLM返回空内容，回退到规则生成")
@@ -144,15 +359,9 @@ def stream_holographic_report(
         else:
             logger.warning(f"⚠️ LLM不可用，回退到规则生成")
     
-    # 回退到规则生成（模拟流式输出，逐字符显示）
+    # 回退到规则生成（按句子/token 分块输出）
     logger.info("📝 使用规则生成叙事报告")
-    result = _generate_with_rules(tensor_data, pattern_name, pattern_state)
-    # 逐字符输出，实现打字机效果（逐字逐句显示）
-    import time
-    for char in result:
-        yield char
-        # 添加小延迟以增强打字机效果（约30ms/字符）
-        time.sleep(0.03)
+    yield from iter_chunks(_rules_report(tensor_data, pattern_name, pattern_state, use_cache), chunking, pacing)
 
 
 def _generate_with_llm(
@@ -160,8 +369,8 @@ def _generate_with_llm(
     pattern_name: str,
     pattern_state: str,
     llm_synthesizer: LLMSemanticSynthesizer
-) -> str:
-    """使用LLM生成叙事报告"""
+) -> Optional[str]:
+    """使用LLM生成叙事报告（失败时返回 None）"""
     projection = tensor_data.get('projection', {})
     E = projection.get('E', 0.0)
     O = projection.get('O', 0.0)
@@ -306,17 +515,18 @@ def _generate_with_llm(
     except Exception as e:
         logger.error(f"❌ LLM调用失败: {e}", exc_info=True)
     
-    # 如果LLM失败，回退到规则生成
-    return _generate_with_rules(tensor_data, pattern_name, pattern_state)
+    # 如果LLM失败，由调用方回退到规则生成（规则结果不写入 LLM 缓存）
+    return None
 
 
 def _stream_with_llm(
     tensor_data: Dict[str, Any],
     pattern_name: str,
     pattern_state: str,
-    llm_synthesizer: LLMSemanticSynthesizer
+    llm_synthesizer: LLMSemanticSynthesizer,
+    pacing: float = DEFAULT_PACING
 ):
-    """内部流式调用LLM"""
+    """内部流式调用LLM（按 LLM 返回的 token 输出，pacing > 0 时每个 token 后停顿）"""
     projection = tensor_data.get('projection', {})
     E = projection.get('E', 0.0)
     O = projection.get('O', 0.0)
@@ -427,24 +637,23 @@ def _stream_with_llm(
                             logger.warning(f"⚠️ 检测到LLM拒绝消息，回退到规则生成。响应前{buffer_size}字符: {collected_text[:buffer_size]}")
                             raise ValueError("LLM返回拒绝消息，自动回退到规则生成")
                         else:
-                            # 通过检测，输出缓冲的内容（逐字符输出以实现流式效果）
+                            # 通过检测，输出缓冲的内容
                             buffer_mode = False
-                            import time
-                            for buffered_chunk in buffer_chunks:
-                                # 逐字符输出，实现打字机效果
-                                for char in buffered_chunk:
-                                    yield char
-                                    # 添加小延迟以增强打字机效果（约30ms/字符，可根据需要调整）
-                                    time.sleep(0.03)
+                            yield from iter_chunks("".join(buffer_chunks), "none", pacing)
                             buffer_chunks = []  # 清空缓冲
-                else:
-                    # 非缓冲模式：逐字符输出（已经通过初始检测）
-                    # 逐字符输出以实现逐字逐句的显示效果
-                    import time
-                    for char in chunk_text:
-                        yield char
-                        # 添加小延迟以增强打字机效果
-                        time.sleep(0.03)
+                elif chunk_text:
+                    # 非缓冲模式：直接输出 token（已经通过初始检测）
+                    yield chunk_text
+                    if pacing > 0:
+                        time.sleep(pacing)
+            
+            # 响应短于缓冲长度时流已结束，仍需检测并输出缓冲内容
+            if buffer_mode and collected_text.strip():
+                text_lower = collected_text.lower()
+                if any(keyword.lower() in text_lower for keyword in rejection_keywords):
+                    logger.warning(f"⚠️ 检测到LLM拒绝消息，回退到规则生成。响应: {collected_text}")
+                    raise ValueError("LLM返回拒绝消息，自动回退到规则生成")
+                yield from iter_chunks(collected_text, "none", pacing)
         else:
             raise ValueError("LLM客户端未就绪")
     except ValueError as e:
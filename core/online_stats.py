@@ -0,0 +1,464 @@
+"""
+在线统计 (Online Statistics)
+============================
+[V9.4 Performance] 全谱审计的固定内存流式聚合器，状态可序列化（写入审计检查点）且可合并（并行分片）。
+
+- ReservoirSampler: 蓄水池抽样（Algorithm R），对任意长度的流给出无偏的均匀样本
+- DensityGrid2D: 二维计数网格（线性或 log1p 分桶），替代"保留全部散点"来绘制完整相图
+- RunningMoments: Welford/Pébay 在线矩（均值、方差、偏度、峰度），分片合并结果与单遍计算一致
+- TDigest: 可合并的分位数草图（merging t-digest），用于 IQR 边界
+- TopK: 按分数保留前 k 个元素的小顶堆（奇点排行）
+- StreamingSummary: RunningMoments + TDigest，给出与 StatisticalAuditor.detect_outliers 同名的统计量
+"""
+
+import heapq
+import math
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class ReservoirSampler:
+    """
+    固定容量的均匀样本：处理 n 个元素后，每个元素留在样本中的概率均为 capacity / n
+
+    seen: 已处理的元素总数（命中计数不受容量限制）
+    """
+
+    def __init__(self, capacity: int, seed: Optional[int] = None):
+        self.capacity = capacity
+        self.items: List[Any] = []
+        self.seen = 0
+        self._rng = random.Random(seed)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add(self, item: Any):
+        if self.seen < self.capacity:
+            self.items.append(item)
+        else:
+            j = self._rng.randrange(self.seen + 1)
+            if j < self.capacity:
+                self.items[j] = item
+        self.seen += 1
+
+    def merge(self, other: "ReservoirSampler") -> "ReservoirSampler":
+        """
+        合并两个分片的蓄水池：从 A 取的个数服从超几何分布（按 seen 逐个模拟），
+        再从各自样本中无放回抽取，结果仍是并集流上的均匀样本
+        """
+        merged = ReservoirSampler(self.capacity)
+        merged._rng.setstate(self._rng.getstate())
+        merged.seen = self.seen + other.seen
+        k = min(self.capacity, merged.seen)
+        remaining_a, remaining_b = self.seen, other.seen
+        take_a = 0
+        for _ in range(k):
+            if merged._rng.random() * (remaining_a + remaining_b) < remaining_a:
+                take_a += 1
+                remaining_a -= 1
+            else:
+                remaining_b -= 1
+        merged.items = (merged._rng.sample(self.items, take_a)
+                        + merged._rng.sample(other.items, k - take_a))
+        return merged
+
+    def state_dict(self) -> Dict[str, Any]:
+        version, internal, gauss_next = self._rng.getstate()
+        return {"capacity": self.capacity, "seen": self.seen, "items": list(self.items),
+                "rng": [version, list(internal), gauss_next]}
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        self.capacity = state.get("capacity", self.capacity)
+        self.seen = state.get("seen", 0)
+        self.items = list(state.get("items", []))
+        rng = state.get("rng")
+        if rng:
+            self._rng.setstate((rng[0], tuple(rng[1]), rng[2]))
+
+
+class DensityGrid2D:
+    """
+    二维计数网格
+
+    scale='log1p' 时在 log(1 + v) 空间等宽分桶，适合 SAI / Reynolds 这类重尾量；
+    超出范围的值计入边缘桶，并分别记入 clipped
+    """
+
+    def __init__(self, x_range: Tuple[float, float], y_range: Tuple[float, float],
+                 bins: Tuple[int, int] = (48, 48), scale: str = "linear",
+                 x_label: str = "x", y_label: str = "y"):
+        if scale not in ("linear", "log1p"):
+            raise ValueError(f"unknown scale: {scale}")
+        self.x_range = tuple(x_range)
+        self.y_range = tuple(y_range)
+        self.bins = tuple(bins)
+        self.scale = scale
+        self.x_label = x_label
+        self.y_label = y_label
+        self.counts = [[0] * self.bins[0] for _ in range(self.bins[1])]  # counts[y][x]
+        self.total = 0
+        self.clipped = 0
+        self._x_lo, self._x_width = self._axis(self.x_range, self.bins[0])
+        self._y_lo, self._y_width = self._axis(self.y_range, self.bins[1])
+
+    def _forward(self, v: float) -> float:
+        return math.log1p(max(v, 0.0)) if self.scale == "log1p" else v
+
+    def _inverse(self, v: float) -> float:
+        return math.expm1(v) if self.scale == "log1p" else v
+
+    def _axis(self, value_range, n) -> Tuple[float, float]:
+        lo, hi = self._forward(value_range[0]), self._forward(value_range[1])
+        return lo, (hi - lo) / n
+
+    def _index(self, v: float, lo: float, width: float, n: int) -> Tuple[int, bool]:
+        k = int((self._forward(v) - lo) // width) if width > 0 else 0
+        if k < 0:
+            return 0, True
+        if k >= n:
+            return n - 1, True
+        return k, False
+
+    def add(self, x: float, y: float):
+        if x != x or y != y:  # NaN
+            return
+        ix, cx = self._index(x, self._x_lo, self._x_width, self.bins[0])
+        iy, cy = self._index(y, self._y_lo, self._y_width, self.bins[1])
+        self.counts[iy][ix] += 1
+        self.total += 1
+        if cx or cy:
+            self.clipped += 1
+
+    def edges(self) -> Tuple[List[float], List[float]]:
+        """两轴分桶边界（原始量纲）"""
+        xs = [self._inverse(self._x_lo + i * self._x_width) for i in range(self.bins[0] + 1)]
+        ys = [self._inverse(self._y_lo + i * self._y_width) for i in range(self.bins[1] + 1)]
+        return xs, ys
+
+    def centers(self) -> Tuple[List[float], List[float]]:
+        xs = [self._inverse(self._x_lo + (i + 0.5) * self._x_width) for i in range(self.bins[0])]
+        ys = [self._inverse(self._y_lo + (i + 0.5) * self._y_width) for i in range(self.bins[1])]
+        return xs, ys
+
+    def marginal_x(self) -> List[int]:
+        return [sum(row[i] for row in self.counts) for i in range(self.bins[0])]
+
+    def marginal_y(self) -> List[int]:
+        return [sum(row) for row in self.counts]
+
+    def merge(self, other: "DensityGrid2D") -> "DensityGrid2D":
+        if (other.x_range, other.y_range, other.bins, other.scale) != (self.x_range, self.y_range, self.bins, self.scale):
+            raise ValueError("cannot merge grids with different binning")
+        merged = DensityGrid2D(self.x_range, self.y_range, self.bins, self.scale, self.x_label, self.y_label)
+        merged.counts = [[a + b for a, b in zip(ra, rb)] for ra, rb in zip(self.counts, other.counts)]
+        merged.total = self.total + other.total
+        merged.clipped = self.clipped + other.clipped
+        return merged
+
+    def to_dict(self) -> Dict[str, Any]:
+        """供 UI 绘图：counts[y][x] + 两轴中心/边界"""
+        x_centers, y_centers = self.centers()
+        x_edges, y_edges = self.edges()
+        return {"x_label": self.x_label, "y_label": self.y_label, "scale": self.scale,
+                "x_centers": x_centers, "y_centers": y_centers, "x_edges": x_edges, "y_edges": y_edges,
+                "counts": [list(row) for row in self.counts], "total": self.total, "clipped": self.clipped}
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {"counts": [list(row) for row in self.counts], "total": self.total, "clipped": self.clipped}
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        counts = state.get("counts")
+        if counts and len(counts) == self.bins[1] and all(len(row) == self.bins[0] for row in counts):
+            self.counts = [list(row) for row in counts]
+            self.total = state.get("total", 0)
+            self.clipped = state.get("clipped", 0)
+
+
+class RunningMoments:
+    """
+    在线一至四阶中心矩（Welford 递推 + Pébay 合并公式）
+
+    variance / skewness / kurtosis 均为总体（有偏）估计，与 np.std、scipy.stats.skew/kurtosis 默认一致
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x: float):
+        n1 = self.count
+        self.count = n = n1 + 1
+        delta = x - self.mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * n1
+        self.mean += delta_n
+        self.m4 += term1 * delta_n2 * (n * n - 3 * n + 3) + 6 * delta_n2 * self.m2 - 4 * delta_n * self.m3
+        self.m3 += term1 * delta_n * (n - 2) - 3 * delta_n * self.m2
+        self.m2 += term1
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def skewness(self) -> float:
+        if self.count < 3 or self.m2 <= 0:
+            return 0.0
+        return math.sqrt(self.count) * self.m3 / self.m2 ** 1.5
+
+    @property
+    def kurtosis(self) -> float:
+        """超额峰度（正态分布为 0）"""
+        if self.count < 3 or self.m2 <= 0:
+            return 0.0
+        return self.count * self.m4 / (self.m2 * self.m2) - 3.0
+
+    def merge(self, other: "RunningMoments") -> "RunningMoments":
+        merged = RunningMoments()
+        na, nb = self.count, other.count
+        if not na or not nb:
+            merged.load_state_dict((self if na else other).state_dict())
+            return merged
+        n = na + nb
+        delta = other.mean - self.mean
+        d2 = delta * delta
+        merged.count = n
+        merged.mean = self.mean + delta * nb / n
+        merged.m2 = self.m2 + other.m2 + d2 * na * nb / n
+        merged.m3 = (self.m3 + other.m3 + d2 * delta * na * nb * (na - nb) / (n * n)
+                     + 3 * delta * (na * other.m2 - nb * self.m2) / n)
+        merged.m4 = (self.m4 + other.m4 + d2 * d2 * na * nb * (na * na - na * nb + nb * nb) / (n ** 3)
+                     + 6 * d2 * (na * na * other.m2 + nb * nb * self.m2) / (n * n)
+                     + 4 * delta * (na * other.m3 - nb * self.m3) / n)
+        merged.min = min(self.min, other.min)
+        merged.max = max(self.max, other.max)
+        return merged
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {"count": self.count, "mean": self.mean, "m2": self.m2, "m3": self.m3, "m4": self.m4,
+                "min": self.min if self.count else None, "max": self.max if self.count else None}
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        self.count = state.get("count", 0)
+        self.mean = state.get("mean", 0.0)
+        self.m2 = state.get("m2", 0.0)
+        self.m3 = state.get("m3", 0.0)
+        self.m4 = state.get("m4", 0.0)
+        self.min = state["min"] if state.get("min") is not None else math.inf
+        self.max = state["max"] if state.get("max") is not None else -math.inf
+
+
+class TDigest:
+    """
+    Merging t-digest（k1 尺度函数）
+
+    新值先进入缓冲区，满 buffer_size 后与现有质心一起排序压缩；质心数约为 compression 的量级。
+    分位数在质心中心之间线性插值，两端用精确的 min/max 收口；合并为近似（误差与单遍同阶）
+    """
+
+    def __init__(self, compression: float = 100.0, buffer_size: Optional[int] = None):
+        self.compression = compression
+        self.buffer_size = buffer_size or int(compression * 5)
+        self.centroids: List[List[float]] = []  # [[mean, weight], ...] 按 mean 升序
+        self._buffer: List[float] = []
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x: float):
+        self._buffer.append(x)
+        self.count += 1
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+        if len(self._buffer) >= self.buffer_size:
+            self._compress()
+
+    def _k(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _k_inv(self, k: float) -> float:
+        return (math.sin(min(k * 2 * math.pi / self.compression, math.pi / 2)) + 1) / 2
+
+    def _compress(self, extra: Optional[List[List[float]]] = None):
+        self.centroids = self._compressed(extra)
+        self._buffer = []
+
+    def _compressed(self, extra: Optional[List[List[float]]] = None) -> List[List[float]]:
+        """质心 + 缓冲区压缩后的质心列表（不修改自身，查询不会改变后续压缩节奏）"""
+        items = [list(c) for c in self.centroids] + [[x, 1.0] for x in self._buffer] + (extra or [])
+        if not items:
+            return []
+        items.sort(key=lambda c: c[0])
+        total = sum(w for _, w in items)
+        out = []
+        cur_mean, cur_w = items[0]
+        w_so_far = 0.0
+        q_limit = total * self._k_inv(self._k(0.0) + 1)
+        for mean, w in items[1:]:
+            if w_so_far + cur_w + w <= q_limit:
+                cur_w += w
+                cur_mean += (mean - cur_mean) * w / cur_w
+            else:
+                out.append([cur_mean, cur_w])
+                w_so_far += cur_w
+                q_limit = total * self._k_inv(self._k(w_so_far / total) + 1)
+                cur_mean, cur_w = mean, w
+        out.append([cur_mean, cur_w])
+        return out
+
+    def quantile(self, q: float) -> float:
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: List[float]) -> List[float]:
+        cs = self._compressed() if self._buffer else self.centroids
+        return [self._quantile(cs, q) for q in qs]
+
+    def _quantile(self, cs: List[List[float]], q: float) -> float:
+        if not cs:
+            return math.nan
+        if len(cs) == 1:
+            return cs[0][0]
+        q = min(max(q, 0.0), 1.0)
+        target = q * self.count
+        first_mean, first_w = cs[0]
+        if target < first_w / 2:
+            return self.min + (first_mean - self.min) * target / (first_w / 2)
+        last_mean, last_w = cs[-1]
+        if target > self.count - last_w / 2:
+            return last_mean + (self.max - last_mean) * (target - (self.count - last_w / 2)) / (last_w / 2)
+        cum = 0.0
+        for (m0, w0), (m1, w1) in zip(cs, cs[1:]):
+            left = cum + w0 / 2
+            right = cum + w0 + w1 / 2
+            if target <= right:
+                return m0 + (m1 - m0) * (target - left) / (right - left)
+            cum += w0
+        return last_mean
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        merged = TDigest(self.compression, self.buffer_size)
+        merged.centroids = [list(c) for c in self.centroids]
+        merged._buffer = list(self._buffer) + list(other._buffer)
+        merged.count = self.count + other.count
+        merged.min = min(self.min, other.min)
+        merged.max = max(self.max, other.max)
+        merged._compress(extra=[list(c) for c in other.centroids])
+        return merged
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {"compression": self.compression, "centroids": [list(c) for c in self.centroids],
+                "buffer": list(self._buffer), "count": self.count,
+                "min": self.min if self.count else None, "max": self.max if self.count else None}
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        self.compression = state.get("compression", self.compression)
+        self.centroids = [list(c) for c in state.get("centroids", [])]
+        self._buffer = list(state.get("buffer", []))
+        self.count = state.get("count", 0)
+        self.min = state["min"] if state.get("min") is not None else math.inf
+        self.max = state["max"] if state.get("max") is not None else -math.inf
+
+
+class TopK:
+    """
+    按分数保留前 k 个元素（小顶堆，O(log k) 插入）
+
+    堆元素为 [score, seq, item]；seq 保证同分时不比较 item，合并后重新编号
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap: List[List[Any]] = []
+        self.seen = 0
+
+    def add(self, score: float, item: Any):
+        entry = [score, self.seen, item]
+        self.seen += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif score > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> List[Any]:
+        """按分数降序"""
+        return [item for _, _, item in sorted(self._heap, key=lambda e: (-e[0], e[1]))]
+
+    def merge(self, other: "TopK") -> "TopK":
+        merged = TopK(self.k)
+        best = heapq.nlargest(self.k, self._heap + other._heap, key=lambda e: e[0])
+        merged._heap = [[score, seq, item] for seq, (score, _, item) in enumerate(best)]
+        heapq.heapify(merged._heap)
+        merged.seen = self.seen + other.seen
+        return merged
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {"k": self.k, "heap": [list(e) for e in self._heap], "seen": self.seen}
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        self.k = state.get("k", self.k)
+        self._heap = [list(e) for e in state.get("heap", [])]
+        heapq.heapify(self._heap)
+        self.seen = state.get("seen", 0)
+
+
+class StreamingSummary:
+    """
+    单个指标的固定内存汇总：精确矩（RunningMoments）+ 近似分位数（TDigest）
+
+    to_dict() 的键与 StatisticalAuditor.detect_outliers()["statistics"] 一致（另含 count/kurtosis）
+    """
+
+    def __init__(self, compression: float = 100.0):
+        self.moments = RunningMoments()
+        self.digest = TDigest(compression)
+
+    @property
+    def count(self) -> int:
+        return self.moments.count
+
+    def add(self, x: float):
+        self.moments.add(x)
+        self.digest.add(x)
+
+    def quantile(self, q: float) -> float:
+        return self.digest.quantile(q)
+
+    def merge(self, other: "StreamingSummary") -> "StreamingSummary":
+        merged = StreamingSummary(self.digest.compression)
+        merged.moments = self.moments.merge(other.moments)
+        merged.digest = self.digest.merge(other.digest)
+        return merged
+
+    def to_dict(self) -> Dict[str, Any]:
+        if not self.count:
+            return {"count": 0}
+        m = self.moments
+        q1, median, q3 = self.digest.quantiles([0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        return {"count": m.count, "mean": m.mean, "std": m.std, "median": median, "min": m.min, "max": m.max,
+                "skewness": m.skewness, "kurtosis": m.kurtosis, "q1": q1, "q3": q3, "iqr": iqr,
+                "lower_bound": q1 - 1.5 * iqr, "upper_bound": q3 + 1.5 * iqr}
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {"moments": self.moments.state_dict(), "digest": self.digest.state_dict()}
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        self.moments.load_state_dict(state.get("moments", {}))
+        self.digest.load_state_dict(state.get("digest", {}))
@@ -0,0 +1,261 @@
+"""
+全息格局批量投影器 (Batch Tensor Projector)
+==========================================
+[V9.4 Performance] HolographicPatternController 的向量化版本。
+
+架构定位：
+- 命盘沿用 core.rule_index 的 (N, 8) 编码：[年干, 年支, 月干, 月支, 日干, 日支, 时干, 时支]，缺失为 -1
+- 十神 (日主×天干)、藏干权重 (天干×地支)、帝旺/羊刃/强根、冲害全部预编译为查表，
+  查表均多出一行/列填充位，缺失编码 (-1) 落在填充位上
+- project() 把 SAI 与格局权重一次性投影为 (N, 5) 张量 [E, O, M, S, R]
+- screen() / purity_scores() / singularity_types() 与 select_samples 的逐例判定逐项等价，
+  整个 518,400 宇宙在数组上完成海选、纯度排序与奇点捕获
+
+SAI 仍由 QuantumUniversalFramework 逐例仲裁得到；投影器只负责仲裁之后的张量运算。
+"""
+
+import threading
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+from core.engine_graph.constants import TWELVE_LIFE_STAGES
+from core.rule_index import BRANCH_PAD, BRANCHES, STEM_PAD, STEMS, decode_chart
+from core.trinity.core.intelligence.symbolic_stars import SymbolicStarsEngine
+from core.trinity.core.nexus.definitions import BaziParticleNexus
+
+AXES = ("E", "O", "M", "S", "R")
+
+# 十神编码，顺序同 BaziParticleNexus.STEM_SHI_SHEN；-1 = Unknown
+TEN_GODS = tuple(BaziParticleNexus.STEM_SHI_SHEN)
+GOD_INDEX = {g: i for i, g in enumerate(TEN_GODS)}
+QI_SHA = GOD_INDEX['七杀']
+SHI_SHANG = (GOD_INDEX['食神'], GOD_INDEX['伤官'])
+CAI = (GOD_INDEX['偏财'], GOD_INDEX['正财'])
+YIN = (GOD_INDEX['偏印'], GOD_INDEX['正印'])
+
+# 奇点类型编码
+SINGULARITY_NONE = 0
+SINGULARITY_X1 = 1
+SINGULARITY_X2 = 2
+SINGULARITY_LABELS = {
+    SINGULARITY_NONE: "",
+    SINGULARITY_X1: "X1-聚变临界型（地支三刃）",
+    SINGULARITY_X2: "X2-结构高压型（众杀攻身无制）",
+}
+
+_STEM_PILLARS = np.array([0, 2, 4, 6])
+_BRANCH_PILLARS = np.array([1, 3, 5, 7])
+_PAIRS = [(i, j) for i in range(4) for j in range(i + 1, 4)]
+
+# 强根判定用的五行（与 HolographicPatternController._check_strong_root 一致）
+_STEM_WUXING = {'甲': '木', '乙': '木', '丙': '火', '丁': '火', '戊': '土',
+                '己': '土', '庚': '金', '辛': '金', '壬': '水', '癸': '水'}
+_BRANCH_WUXING = {'子': '水', '丑': '土', '寅': '木', '卯': '木', '辰': '土', '巳': '火',
+                  '午': '火', '未': '土', '申': '金', '酉': '金', '戌': '土', '亥': '水'}
+
+
+def weight_vector(weights: Union[Dict[str, float], Sequence[float], np.ndarray]) -> np.ndarray:
+    """
+    格局权重转为 [E, O, M, S, R] 顺序的数组
+
+    Args:
+        weights: tensor_operator.weights 字典，或已按 AXES 排好的 (5,) / (P, 5) 数组
+    """
+    if isinstance(weights, dict):
+        return np.array([float(weights.get(axis, 0.0)) for axis in AXES])
+    return np.asarray(weights, dtype=float)
+
+
+class BatchTensorProjector:
+    """
+    预编译的批量张量投影器
+
+    用法:
+        projector = get_batch_projector()
+        codes = encode_universe()                                # (518400, 8)
+        mask, stats = projector.screen(codes)                    # 月令锁 / 透杀有根 / 清纯度
+        purity = projector.purity_scores(codes[mask])            # (M,)
+        tensors = projector.project(sai, weights)                # (N, 5)
+    """
+
+    def __init__(self):
+        self._compile()
+
+    # --- 预编译 ---
+
+    def _compile(self):
+        # 十神表：[日主, 天干] -> 十神编码
+        self.ten_god_table = np.full((STEM_PAD + 1, STEM_PAD + 1), -1, dtype=np.int8)
+        for di, dm in enumerate(STEMS):
+            for si, s in enumerate(STEMS):
+                self.ten_god_table[di, si] = GOD_INDEX.get(BaziParticleNexus.get_shi_shen(s, dm), -1)
+
+        # 藏干权重表：[天干, 地支] -> 权重（不藏则 0）
+        self.hidden_weight = np.zeros((STEM_PAD + 1, BRANCH_PAD + 1), dtype=np.int16)
+        for bi, b in enumerate(BRANCHES):
+            for hidden_stem, weight in BaziParticleNexus.get_branch_weights(b):
+                self.hidden_weight[STEMS.index(hidden_stem), bi] = weight
+
+        # 七杀天干：[日主] -> 天干编码（同一日主的七杀只有一个天干）
+        self.qi_sha_stem = np.full(STEM_PAD + 1, STEM_PAD, dtype=np.int8)
+        for di in range(len(STEMS)):
+            self.qi_sha_stem[di] = int(np.flatnonzero(self.ten_god_table[di, :STEM_PAD] == QI_SHA)[0])
+
+        # 月令锁：[日主, 月支] -> 是否帝旺
+        self.di_wang = np.zeros((STEM_PAD + 1, BRANCH_PAD + 1), dtype=bool)
+        for (dm, branch), stage in TWELVE_LIFE_STAGES.items():
+            if stage == '帝旺':
+                self.di_wang[STEMS.index(dm), BRANCHES.index(branch)] = True
+
+        # 羊刃：[日主] -> 地支编码（无则落在填充位，永不命中）
+        self.yang_ren = np.full(STEM_PAD + 1, -2, dtype=np.int8)
+        for dm, branch in SymbolicStarsEngine.YANG_REN_MAP.items():
+            self.yang_ren[STEMS.index(dm)] = BRANCHES.index(branch)
+
+        # 强根：[天干, 地支] -> 天干五行 == 地支本气五行（缺失对缺失按原逻辑视为相等）
+        stem_wx = [_STEM_WUXING.get(s, '') for s in STEMS] + ['']
+        branch_wx = [_BRANCH_WUXING.get(b, '') for b in BRANCHES] + ['']
+        self.strong_root = np.array([[s == b for b in branch_wx] for s in stem_wx], dtype=bool)
+
+        # 冲 / 害：[支, 支]
+        self.clash_or_harm = np.zeros((BRANCH_PAD + 1, BRANCH_PAD + 1), dtype=bool)
+        for i in range(len(BRANCHES)):
+            for j in range(len(BRANCHES)):
+                self.clash_or_harm[i, j] = (i - j) % 12 == 6 or (i + j) % 12 == 7
+
+    # --- 基础视图 ---
+
+    @staticmethod
+    def _split(codes: np.ndarray):
+        codes = np.asarray(codes)
+        stems = codes[:, _STEM_PILLARS].astype(np.intp)
+        branches = codes[:, _BRANCH_PILLARS].astype(np.intp)
+        stems[stems < 0] = STEM_PAD
+        branches[branches < 0] = BRANCH_PAD
+        return stems, branches
+
+    def ten_gods(self, codes: np.ndarray) -> np.ndarray:
+        """(N, 4) 十神编码（相对日主；日柱自身为比肩）"""
+        stems, _ = self._split(codes)
+        return self.ten_god_table[stems[:, 2:3], stems]
+
+    @staticmethod
+    def _count(gods: np.ndarray, targets) -> np.ndarray:
+        return np.isin(gods, targets).sum(axis=1)
+
+    # --- 张量投影 ---
+
+    @staticmethod
+    def project(sai: np.ndarray, weights) -> np.ndarray:
+        """
+        五维张量投影：projection = SAI × 权重
+
+        Args:
+            sai: (N,) 系统对齐指数
+            weights: 格局权重（字典 / (5,) / (N, 5)）
+
+        Returns:
+            (N, 5) 张量，列顺序 AXES
+        """
+        return np.asarray(sai, dtype=float)[:, None] * weight_vector(weights)
+
+    # --- 海选 (select_samples Step A) ---
+
+    def screen(self, codes: np.ndarray):
+        """
+        FDS-V1.1 Step 2 海选条件：月令帝旺 + 天干透杀且有根 + 非重食伤/重财
+
+        Returns:
+            (通过掩码 (N,), 拒绝计数 {'rejected_month_lock', 'rejected_stem_reveal', 'rejected_purity'})
+        """
+        stems, branches = self._split(codes)
+        dm = stems[:, 2]
+        month_lock = self.di_wang[dm, branches[:, 1]]
+
+        gods = self.ten_god_table[dm[:, None], stems]
+        qi_sha_count = (gods == QI_SHA).sum(axis=1)
+        # 七杀有根：七杀天干在任一地支中以主气/中气 (权重 >= 5) 藏伏
+        rooted = (self.hidden_weight[self.qi_sha_stem[dm][:, None], branches] >= 5).any(axis=1)
+        revealed = (qi_sha_count > 0) & rooted
+
+        impure = (self._count(gods, SHI_SHANG) >= 2) | (self._count(gods, CAI) >= 2)
+
+        passed = month_lock & revealed & ~impure
+        stats = {
+            'rejected_month_lock': int((~month_lock).sum()),
+            'rejected_stem_reveal': int((month_lock & ~revealed).sum()),
+            'rejected_purity': int((month_lock & revealed & impure).sum()),
+        }
+        return passed, stats
+
+    # --- 纯度 / 奇点 (Step B / C) ---
+
+    def purity_scores(self, codes: np.ndarray) -> np.ndarray:
+        """与 HolographicPatternController._calculate_purity_score 等价的 (N,) 纯度得分"""
+        stems, branches = self._split(codes)
+        dm = stems[:, 2]
+        gods = self.ten_god_table[dm[:, None], stems]
+        is_qi_sha = gods == QI_SHA
+
+        score = np.full(len(stems), 100.0)
+        # 每个透出的七杀 +20（任一七杀坐强根即成立）
+        strong = (is_qi_sha & self.strong_root[stems, branches]).any(axis=1)
+        score += 20.0 * is_qi_sha.sum(axis=1) * strong
+        score += 10.0 * self._count(gods, YIN)
+        score -= 15.0 * self._count(gods, SHI_SHANG)
+        score -= 15.0 * self._count(gods, CAI)
+
+        unstable = np.zeros(len(stems), dtype=bool)
+        for i, j in _PAIRS:
+            unstable |= self.clash_or_harm[branches[:, i], branches[:, j]]
+        score -= 10.0 * unstable
+        return score
+
+    def singularity_types(self, codes: np.ndarray) -> np.ndarray:
+        """与 _detect_singularity 等价的 (N,) 奇点类型编码（见 SINGULARITY_LABELS）"""
+        stems, branches = self._split(codes)
+        dm = stems[:, 2]
+        gods = self.ten_god_table[dm[:, None], stems]
+
+        x1 = (branches == self.yang_ren[dm][:, None]).sum(axis=1) >= 3
+        x2 = (((gods == QI_SHA).sum(axis=1) >= 2)
+              & (self._count(gods, YIN) == 0) & (self._count(gods, SHI_SHANG) == 0))
+
+        kinds = np.full(len(stems), SINGULARITY_NONE, dtype=np.int8)
+        kinds[x2] = SINGULARITY_X2
+        kinds[x1] = SINGULARITY_X1
+        return kinds
+
+    def candidates(self, codes: np.ndarray):
+        """
+        海选结果物化为 select_samples 的样本字典（只对通过的行解码）
+        """
+        stems, _ = self._split(codes)
+        gods = self.ten_god_table[stems[:, 2:3], stems]
+        samples = []
+        for code, row in zip(np.asarray(codes), gods):
+            chart = decode_chart(code)
+            samples.append({
+                'chart': chart,
+                'day_master': chart[2][0],
+                'month_branch': chart[1][1],
+                'qi_sha_stems': [chart[i][0] for i in (0, 1, 3) if row[i] == QI_SHA],
+                'ten_gods': [TEN_GODS[g] if g >= 0 else "Unknown" for g in row],
+            })
+        return samples
+
+
+_projector: Optional[BatchTensorProjector] = None
+_projector_lock = threading.Lock()
+
+
+def get_batch_projector() -> BatchTensorProjector:
+    """进程级单例（查表只编译一次）"""
+    global _projector
+    if _projector is None:
+        with _projector_lock:
+            if _projector is None:
+                _projector = BatchTensorProjector()
+    return _projector
+
@@ -0,0 +1,319 @@
+"""
+规则位图索引 (Rule Bitset Index)
+================================
+[V9.4 Performance] RuleMatcher 的预编译批量版本。
+
+架构定位：
+- 命盘编码为 (N, 8) 小整数矩阵：[年干, 年支, 月干, 月支, 日干, 日支, 时干, 时支]，缺失为 -1
+- 每条规则预编译为查表 (干×支 / 支×支) 或地支位掩码 (12 bit)，整批命盘一次向量化求值
+- match_bits() 返回 (N, n_rules) 布尔矩阵，列顺序即 RULE_IDS（VERIFIED_RULES 的定义顺序）
+- 频次、共现、组合查询（"同时触发 B1 与 C3 的全部命盘"）都在位矩阵上完成
+
+位矩阵只回答"规则是否触发"；参与者、效果描述等细节仍由 RuleMatcher.match() 生成，
+UI 需要时再物化 (见 LazyMatchedRules)。
+"""
+
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from core.interactions import BRANCH_CLASHES, BRANCH_SIX_COMBINES
+from core.kernel import Kernel
+from core.rule_matcher import VERIFIED_RULES, RuleMatcher
+
+logger = logging.getLogger(__name__)
+
+STEMS = "甲乙丙丁戊己庚辛壬癸"
+BRANCHES = "子丑寅卯辰巳午未申酉戌亥"
+STEM_INDEX = {s: i for i, s in enumerate(STEMS)}
+BRANCH_INDEX = {b: i for i, b in enumerate(BRANCHES)}
+
+# 查表填充位：缺失的干/支映射到最后一行（全 False）
+STEM_PAD = len(STEMS)
+BRANCH_PAD = len(BRANCHES)
+
+RULE_IDS = tuple(VERIFIED_RULES)
+ALWAYS_ACTIVE = ("A1", "A2", "A3", "A4", "C1", "C3", "C4", "E1", "E2")
+
+_BIT = np.array([1 << i for i in range(len(BRANCHES))] + [0], dtype=np.int32)
+_POPCOUNT = np.array([bin(i).count("1") for i in range(1 << len(BRANCHES))], dtype=np.int8)
+_PAIRS = [(i, j) for i in range(4) for j in range(i + 1, 4)]
+
+
+def _branch_mask(chars: Iterable[str]) -> int:
+    mask = 0
+    for c in chars:
+        mask |= 1 << BRANCH_INDEX[c]
+    return mask
+
+
+def encode_charts(charts: Sequence[Sequence[str]]) -> np.ndarray:
+    """
+    八字列表编码为 (N, 8) int8
+
+    Args:
+        charts: [["甲子", "乙丑", "丙寅", "丁卯"], ...]（与 RuleMatcher.match 的 bazi 参数同格式）
+    """
+    codes = np.full((len(charts), 8), -1, dtype=np.int8)
+    for n, bazi in enumerate(charts):
+        for p, pillar in enumerate(list(bazi)[:4]):
+            if len(pillar) >= 2:
+                codes[n, 2 * p] = STEM_INDEX.get(pillar[0], -1)
+                codes[n, 2 * p + 1] = BRANCH_INDEX.get(pillar[1], -1)
+    return codes
+
+
+def encode_universe() -> np.ndarray:
+    """
+    全部 518,400 个命盘的编码，顺序与 SyntheticBaziEngine.generate_all_bazi() 一致
+    （年 60 × 月 12 × 日 60 × 时 12，月柱按五虎遁、时柱按五鼠遁）
+    """
+    jz = np.arange(60)
+    y, m, d, h = np.meshgrid(jz, np.arange(12), jz, np.arange(12), indexing="ij")
+    y, m, d, h = (a.ravel() for a in (y, m, d, h))
+    y_stem, d_stem = y % 10, d % 10
+    month_start = np.array([2, 4, 6, 8, 0, 2, 4, 6, 8, 0])  # 甲己→丙寅 ...
+    hour_start = np.array([0, 2, 4, 6, 8, 0, 2, 4, 6, 8])   # 甲己→甲子 ...
+    return np.stack([
+        y_stem, y % 12,
+        (month_start[y_stem] + m) % 10, (2 + m) % 12,
+        d_stem, d % 12,
+        (hour_start[d_stem] + h) % 10, h,
+    ], axis=1).astype(np.int8)
+
+
+def decode_chart(code: Sequence[int]) -> List[str]:
+    """(8,) 编码还原为八字列表"""
+    return [
+        f"{STEMS[code[2 * p]]}{BRANCHES[code[2 * p + 1]]}" if code[2 * p] >= 0 and code[2 * p + 1] >= 0 else ""
+        for p in range(4)
+    ]
+
+
+class RuleIndex:
+    """
+    预编译规则索引
+
+    用法:
+        index = get_rule_index()
+        bits = index.match_bits(encode_universe())          # (518400, n_rules)
+        index.frequencies(bits)                              # {'A1': 518400, 'B1': ..., ...}
+        rows = index.query(bits, all_of=["B1", "C2"])       # 命盘行号
+    """
+
+    def __init__(self):
+        self.rule_ids = RULE_IDS
+        self.column = {rid: i for i, rid in enumerate(self.rule_ids)}
+        self._compile()
+
+    # --- 预编译 ---
+
+    def _compile(self):
+        elem = {s: Kernel.STEM_PROPERTIES.get(s, {}).get('element') for s in STEMS}
+
+        # A5 通根：日主五行在支中藏干占比 >= 0.3
+        self.root_table = np.zeros((STEM_PAD + 1, BRANCH_PAD + 1), dtype=bool)
+        # A6 自坐：干在座下藏干中有同五行
+        self.self_root_table = np.zeros((STEM_PAD + 1, BRANCH_PAD + 1), dtype=bool)
+        for si, s in enumerate(STEMS):
+            for bi, b in enumerate(BRANCHES):
+                hidden = Kernel.HIDDEN_STEMS.get(b, {})
+                h_elems = [(Kernel.STEM_PROPERTIES.get(h, {}).get('element'), r) for h, r in hidden.items()]
+                if elem[s]:
+                    self.root_table[si, bi] = any(e == elem[s] and r >= 0.3 for e, r in h_elems)
+                self.self_root_table[si, bi] = any(e == elem[s] for e, _ in h_elems)
+
+        # B1 天干五合
+        combine_pairs = [("甲", "己"), ("乙", "庚"), ("丙", "辛"), ("丁", "壬"), ("戊", "癸")]
+        self.stem_combine = np.zeros((STEM_PAD + 1, STEM_PAD + 1), dtype=bool)
+        for a, b in combine_pairs:
+            self.stem_combine[STEM_INDEX[a], STEM_INDEX[b]] = True
+            self.stem_combine[STEM_INDEX[b], STEM_INDEX[a]] = True
+
+        # B2 六冲 / B5 六合（方向与 RuleMatcher 的 dict.get(b1) == b2 一致）
+        self.clash = np.zeros((BRANCH_PAD + 1, BRANCH_PAD + 1), dtype=bool)
+        self.six_combine = np.zeros((BRANCH_PAD + 1, BRANCH_PAD + 1), dtype=bool)
+        for table, mapping in ((self.clash, BRANCH_CLASHES), (self.six_combine, BRANCH_SIX_COMBINES)):
+            for b1, b2 in mapping.items():
+                if b1 in BRANCH_INDEX and b2 in BRANCH_INDEX:
+                    table[BRANCH_INDEX[b1], BRANCH_INDEX[b2]] = True
+
+        # C2 克制：日主克 / 克日主的其它天干（与日主同字者跳过）
+        control_map = {'Wood': 'Earth', 'Earth': 'Water', 'Water': 'Fire', 'Fire': 'Metal', 'Metal': 'Wood'}
+        controller_of = {v: k for k, v in control_map.items()}
+        self.control = np.zeros((STEM_PAD + 1, STEM_PAD + 1), dtype=bool)
+        for di, dm in enumerate(STEMS):
+            dm_elem = elem[dm]
+            if not dm_elem:
+                continue
+            for si, s in enumerate(STEMS):
+                if s != dm and elem[s] in (control_map.get(dm_elem), controller_of.get(dm_elem)):
+                    self.control[di, si] = True
+
+        # 地支位掩码
+        self.earth_punishment = _branch_mask("丑未戌")
+        self.power_punishment = _branch_mask("寅巳申")
+        self.harmony_masks = [_branch_mask(trio) for trio in RuleMatcher.THREE_HARMONY]
+        self.meeting_masks = [_branch_mask(trio) for trio in RuleMatcher.THREE_MEETING]
+        self.vault_mask = _branch_mask(RuleMatcher.VAULT_BRANCHES)
+
+    # --- 批量匹配 ---
+
+    def match_bits(
+        self,
+        charts,
+        day_masters: Optional[Sequence[str]] = None
+    ) -> np.ndarray:
+        """
+        批量规则位矩阵
+
+        Args:
+            charts: (N, 8) 编码矩阵，或八字列表序列（自动编码）
+            day_masters: 日主天干；默认取日柱天干
+
+        Returns:
+            (N, len(RULE_IDS)) bool，bits[n, index.column['B1']] 表示第 n 个命盘触发 B1
+        """
+        codes = charts if isinstance(charts, np.ndarray) else encode_charts(charts)
+        codes = codes.astype(np.int16)
+        n = len(codes)
+        s = np.where(codes[:, 0::2] >= 0, codes[:, 0::2], STEM_PAD)      # (N, 4)
+        b = np.where(codes[:, 1::2] >= 0, codes[:, 1::2], BRANCH_PAD)
+        # 与 RuleMatcher 一致：干支不完整的柱整体忽略
+        incomplete = (s == STEM_PAD) | (b == BRANCH_PAD)
+        s = np.where(incomplete, STEM_PAD, s)
+        b = np.where(incomplete, BRANCH_PAD, b)
+
+        if day_masters is None:
+            dm = s[:, 2]
+        else:
+            dm = np.array([STEM_INDEX.get(x, STEM_PAD) for x in day_masters], dtype=np.int16)
+
+        # 列主序：单规则列连续存放，频次与组合查询只扫描相关列
+        bits = np.zeros((n, len(self.rule_ids)), dtype=bool, order="F")
+        col = self.column
+        for rid in ALWAYS_ACTIVE:
+            bits[:, col[rid]] = True
+
+        branch_mask = np.bitwise_or.reduce(_BIT[b], axis=1)
+
+        dm_in_stems = (s == dm[:, None]).any(axis=1) & (dm != STEM_PAD)
+        bits[:, col["A5"]] = dm_in_stems & self.root_table[dm[:, None], b].any(axis=1)
+        bits[:, col["A6"]] = self.self_root_table[s, b].any(axis=1)
+
+        pair_i = [i for i, _ in _PAIRS]
+        pair_j = [j for _, j in _PAIRS]
+        bits[:, col["B1"]] = self.stem_combine[s[:, pair_i], s[:, pair_j]].any(axis=1)
+        clash_pairs = self.clash[b[:, pair_i], b[:, pair_j]]                          # (N, 6)
+        bits[:, col["B2"]] = clash_pairs.any(axis=1)
+        bits[:, col["B3"]] = _POPCOUNT[branch_mask & self.power_punishment] >= 2
+        bits[:, col["B4"]] = _POPCOUNT[branch_mask & self.earth_punishment] >= 2
+        bits[:, col["B5"]] = self.six_combine[b[:, pair_i], b[:, pair_j]].any(axis=1)
+        bits[:, col["B6"]] = np.any([(branch_mask & m) == m for m in self.harmony_masks], axis=0)
+        bits[:, col["B7"]] = np.any([_POPCOUNT[branch_mask & m] == 2 for m in self.harmony_masks], axis=0)
+        bits[:, col["B8"]] = np.any([(branch_mask & m) == m for m in self.meeting_masks], axis=0)
+
+        bits[:, col["C2"]] = self.control[dm[:, None], s].any(axis=1)
+
+        pair_masks = np.where(clash_pairs, _BIT[b[:, pair_i]] | _BIT[b[:, pair_j]], 0)
+        clash_mask = np.bitwise_or.reduce(pair_masks, axis=1)
+        vaults = branch_mask & self.vault_mask
+        bits[:, col["D2"]] = (vaults & clash_mask) != 0
+        bits[:, col["D3"]] = (vaults & ~clash_mask) != 0
+        return bits
+
+    # --- 统计与查询 ---
+
+    def frequencies(self, bits: np.ndarray) -> Dict[str, int]:
+        """各规则触发次数"""
+        counts = bits.sum(axis=0)
+        return {rid: int(c) for rid, c in zip(self.rule_ids, counts)}
+
+    def cooccurrence(self, bits: np.ndarray) -> np.ndarray:
+        """(n_rules, n_rules) 共现计数矩阵，对角线即频次"""
+        # 浮点 BLAS 矩阵乘（float64 对计数精确）远快于整型 matmul
+        as_float = bits.astype(np.float64)
+        return np.rint(as_float.T @ as_float).astype(np.int64)
+
+    def query(
+        self,
+        bits: np.ndarray,
+        all_of: Sequence[str] = (),
+        any_of: Sequence[str] = (),
+        none_of: Sequence[str] = ()
+    ) -> np.ndarray:
+        """
+        组合查询
+
+        Returns:
+            满足条件的命盘行号（int64 数组）
+        """
+        selected = np.ones(len(bits), dtype=bool)
+        for rid in all_of:
+            selected &= bits[:, self.column[rid]]
+        if any_of:
+            selected &= bits[:, [self.column[r] for r in any_of]].any(axis=1)
+        for rid in none_of:
+            selected &= ~bits[:, self.column[rid]]
+        return np.flatnonzero(selected)
+
+    def rule_ids_of(self, row: np.ndarray) -> List[str]:
+        """单行位向量 -> 规则 ID 列表"""
+        return [rid for rid, hit in zip(self.rule_ids, row) if hit]
+
+
+class LazyMatchedRules:
+    """
+    惰性规则匹配结果
+
+    rule_ids / has() 直接读位向量；迭代、len()、下标访问时才调用 RuleMatcher.match()
+    构建 MatchedRule 对象（含参与者与效果描述），且只构建一次。
+    """
+
+    def __init__(self, matcher: RuleMatcher, bazi: List[str], day_master: str, bits_row: np.ndarray):
+        self._matcher = matcher
+        self._bazi = list(bazi)
+        self._day_master = day_master
+        self.bits = bits_row
+        self._rules = None
+
+    @property
+    def rule_ids(self) -> List[str]:
+        return get_rule_index().rule_ids_of(self.bits)
+
+    def has(self, rule_id: str) -> bool:
+        return bool(self.bits[get_rule_index().column[rule_id]])
+
+    @property
+    def is_materialized(self) -> bool:
+        return self._rules is not None
+
+    def materialize(self):
+        if self._rules is None:
+            self._rules = self._matcher.match(self._bazi, self._day_master)
+        return self._rules
+
+    def __iter__(self):
+        return iter(self.materialize())
+
+    def __len__(self):
+        return len(self.materialize())
+
+    def __getitem__(self, item):
+        return self.materialize()[item]
+
+
+_index: Optional[RuleIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_rule_index() -> RuleIndex:
+    """获取进程级规则索引"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = RuleIndex()
+    return _index
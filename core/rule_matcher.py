@@ -359,6 +359,29 @@ class RuleMatcher:
         
         return matched
     
+    def match_bits(self, charts, day_masters: Optional[List[str]] = None):
+        """
+        [V9.4 Performance] 批量规则位矩阵（见 core.rule_index.RuleIndex.match_bits）
+
+        Args:
+            charts: 八字列表序列，或 (N, 8) 编码矩阵（core.rule_index.encode_charts / encode_universe）
+            day_masters: 日主天干；默认取日柱天干
+
+        Returns:
+            (N, n_rules) bool 矩阵，列顺序为 VERIFIED_RULES 的定义顺序
+        """
+        from core.rule_index import get_rule_index
+        return get_rule_index().match_bits(charts, day_masters)
+
+    def match_lazy(self, bazi: List[str], day_master: str):
+        """
+        [V9.4 Performance] 惰性匹配：先由位索引判定触发的规则 ID，
+        MatchedRule 对象（参与者、效果）在首次迭代时才构建
+        """
+        from core.rule_index import LazyMatchedRules, get_rule_index
+        bits = get_rule_index().match_bits([bazi], [day_master])[0]
+        return LazyMatchedRules(self, bazi, day_master, bits)
+
     def _detect_rooting(self, stems: List[str], branches: List[str], 
                         day_master: str) -> Optional[Dict]:
         """检测通根"""
@@ -13,9 +13,8 @@ class BackgroundWorker(threading.Thread):
         self._stop_event = threading.Event()
         
         # 读取配置并初始化Miner
-        from core.config_manager import ConfigManager
-        cm = ConfigManager()
-        ollama_host = cm.get('ollama_host', 'http://localhost:11434')
+        from core.config_snapshot import get_config_snapshot
+        ollama_host = get_config_snapshot().get('ollama_host', 'http://localhost:11434')
         self.miner = TheoryMiner(host=ollama_host)
         
         self.active_futures = {} # {job_id: future}
@@ -25,7 +24,7 @@ class BackgroundWorker(threading.Thread):
         Main loop: Polls DB for jobs and manages ThreadPool.
         """
         import concurrent.futures
-        from core.config_manager import ConfigManager
+        from core.config_snapshot import get_config_snapshot
         
         # Create a pool with sufficient max threads. We utilize config to limit logical concurrency.
         # Hard limit 10 to prevent system exhaustion.
@@ -48,10 +47,9 @@ class BackgroundWorker(threading.Thread):
                     
                     del self.active_futures[jid]
 
-                # 1. Load Config
+                # 1. Load Config (in-memory snapshot, hot-reloaded)
                 try:
-                    cm = ConfigManager()
-                    limit = int(cm.get('max_concurrent_jobs', 1))
+                    limit = int(get_config_snapshot().get('max_concurrent_jobs', 1))
                 except: 
                     limit = 1
                 
@@ -304,12 +302,11 @@ class BackgroundWorker(threading.Thread):
         progress = job['current_progress']
         
         from learning.video_downloader import VideoDownloader
-        from learning.media_miner import MediaMiner
-        from core.config_manager import ConfigManager
+        from core.config_snapshot import get_config_snapshot
         import os
         
         downloader = VideoDownloader()
-        cm = ConfigManager()
+        cm = get_config_snapshot()
         
         # --- Stage 1: Download ---
         if progress < 1:
@@ -343,6 +340,17 @@ class BackgroundWorker(threading.Thread):
 
         # --- Stage 2: Transcribe (Only if Audio) ---
         t_filename = f"[Video] {title}.txt".replace("/","_")
+        mined = False  # audio transcripts are mined while transcribing
+        failed_segments = []  # segments whose transcription / mining failed (retried later)
+        partial = False
+
+        try:
+            from learning.video_miner import VideoMiner
+            vm = VideoMiner(db=self.db)
+            vid_id = vm.get_video_id(url)
+        except Exception as e:
+            print(f"Video history unavailable: {e}")
+            vm, vid_id = None, None
         
         # Determine progress state again
         # If is_subtitle is True, we essentially have the transcript.
@@ -361,22 +369,23 @@ class BackgroundWorker(threading.Thread):
             downloader.cleanup(file_path)
             
         elif progress < 2:
-            print(f"[{job_id}] Transcribing Audio...")
-            mm = MediaMiner(model_size="base") 
-            text = mm.transcribe(file_path)
-            
-            # Cleanup Audio
-            downloader.cleanup(file_path)
-            
-            if not text or text.startswith("[Error"):
+            # Segment-wise transcription; each finished 3000-char chunk goes straight to the Cortex
+            # A partially mined video only retries its failed segments
+            segments = vm.pending_segments(vid_id) if vid_id else None
+            print(f"[{job_id}] Transcribing Audio (streaming into Cortex)...")
+            result = self._stream_transcribe_and_mine(job_id, url, file_path, cm, segments)
+            if not result.transcript or (result.failed_segments and not result.partial):
                 self.db.update_job_status(job_id, 'failed')
                 return
+            mined = True
+            failed_segments, partial = result.failed_segments, result.partial
             
             book_dir = "data/books"
             os.makedirs(book_dir, exist_ok=True)
             t_path = os.path.join(book_dir, t_filename)
-            with open(t_path, "w") as f:
-                f.write(text)
+            # a retry adds the recovered segments to the transcript saved by the first run
+            with open(t_path, "a" if segments else "w") as f:
+                f.write(result.transcript)
                 
             self.db.update_job_progress(job_id, 2, 3)
         
@@ -385,48 +394,86 @@ class BackgroundWorker(threading.Thread):
 
         # --- Stage 3: Smart Mining (Knowledge Cortex) ---
         if progress <= 2: # No longer just mining, but "Knowledge Processing"
-            print(f"[{job_id}] Intelligent Analysis (Cortex Active)...")
-            from learning.knowledge_processor import KnowledgeProcessor
-            
-            # 读取ollama配置
-            ollama_host = cm.get('ollama_host', 'http://localhost:11434')
-            kp = KnowledgeProcessor(ollama_host=ollama_host)
-            
-            t_path = os.path.join("data/books", t_filename)
-            with open(t_path, 'r') as f: content = f.read()
-            
-            # Chunking (Manual or helper?)
-            chunk_size = 3000
-            chunks = [content[i:i+chunk_size] for i in range(0, len(content), chunk_size)]
-            
-            for i, chunk in enumerate(chunks):
-                 # Cortex processing
-                 # It saves data internally
-                 try:
-                    res = kp.process_content_chunk(chunk, source_meta=url)
-                    ext_count = len(res.get('extracted', []))
-                    if ext_count > 0:
-                        print(f"  Chunk {i+1}: Found {ext_count} items [{res['type']}]")
-                 except Exception as e:
-                    print(f"  Chunk {i+1} Error: {e}")
+            if not mined:
+                print(f"[{job_id}] Intelligent Analysis (Cortex Active)...")
+                kp = self._knowledge_processor(cm)
+                
+                t_path = os.path.join("data/books", t_filename)
+                with open(t_path, 'r') as f: content = f.read()
+                
+                # Chunking (Manual or helper?)
+                chunk_size = 3000
+                chunks = [content[i:i+chunk_size] for i in range(0, len(content), chunk_size)]
+                
+                errors = 0
+                for i, chunk in enumerate(chunks):
+                    try:
+                        self._cortex_chunk(kp, chunk, url, i)
+                    except Exception:
+                        errors += 1
+                if chunks and errors == len(chunks):
+                    self.db.update_job_status(job_id, 'failed')
+                    return
+                if errors:  # the transcript is a single segment: retry it whole
+                    failed_segments, partial = [0], True
                  
             self.db.update_job_progress(job_id, 3, 3)
             self.db.update_job_status(job_id, 'finished')
             self.db.mark_book_read(t_filename)
             
-            # Update Video Miner History
+            # Update Video Miner History: partially mined videos keep their failed segments for a retry
             try:
-                from learning.video_miner import VideoMiner
-                vm = VideoMiner()
-                # Extract ID from URL
-                vid_id = vm.get_video_id(url)
-                if vid_id:
+                if vid_id and partial:
+                    vm.mark_partial(vid_id, failed_segments)
+                    print(f"[{job_id}] ⚠️ Segments {failed_segments} failed, queued for retry.")
+                elif vid_id:
                     vm.mark_processed(vid_id)
             except Exception as e:
                 print(f"Failed to mark history: {e}")
                 
             print(f"[{job_id}] Video Processed & Cleaned.")
 
+    def _knowledge_processor(self, cm):
+        from learning.knowledge_processor import KnowledgeProcessor
+        
+        # 读取ollama配置
+        ollama_host = cm.get('ollama_host', 'http://localhost:11434')
+        return KnowledgeProcessor(ollama_host=ollama_host)
+
+    def _cortex_chunk(self, kp, chunk, url, i):
+        """Cortex processing of one transcript chunk (it saves data internally)"""
+        try:
+            res = kp.process_content_chunk(chunk, source_meta=url)
+            ext_count = len(res.get('extracted', []))
+            if ext_count > 0:
+                print(f"  Chunk {i+1}: Found {ext_count} items [{res['type']}]")
+            return res
+        except Exception as e:
+            print(f"  Chunk {i+1} Error: {e}")
+            raise  # counted as a failed chunk by the caller
+
+    def _stream_transcribe_and_mine(self, job_id, url, file_path, cm, segments=None):
+        """
+        Transcribe downloaded audio through the staged video pipeline: segments are
+        transcribed in order and every complete 3000-char chunk is mined while later
+        segments are still transcribing. The audio file is consumed.
+        segments: retry only these segments (VideoMiner.pending_segments).
+        Returns the VideoResult (transcript, failed_segments, ok / partial).
+        """
+        import itertools
+        from learning.video_pipeline import VideoPipeline, VideoTask
+        
+        kp = self._knowledge_processor(cm)
+        chunk_no = itertools.count()
+        pipeline = VideoPipeline(
+            extract=lambda chunk, result: self._cortex_chunk(kp, chunk, url, next(chunk_no)),
+            clean_text=False, chunk_chars=3000, min_chars=1,
+        )
+        result = pipeline.run([VideoTask(url=url, audio_path=file_path, segments=segments)])[0]
+        for err in result.errors:
+            print(f"[{job_id}] ⚠️ {err}")
+        return result
+
 
     def _process_book_job(self, job, payload):
         job_id = job['id']
@@ -14,10 +14,12 @@ RSS-V1.4规范：通用统计方法，供格局审计复用
 """
 
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 import numpy as np
 from scipy import stats
 
+from core.online_stats import StreamingSummary
+
 logger = logging.getLogger(__name__)
 
 
@@ -80,7 +82,7 @@ class StatisticalAuditor:
         
         # 方法1：Z-Score检测（3-Sigma规则）
         z_scores = (values_array - mean_val) / (std_val + 1e-6)
-        z_outlier_indices = [i for i, z in enumerate(z_scores) if z < -self.z_score_threshold]
+        z_outlier_indices = np.flatnonzero(z_scores < -self.z_score_threshold).tolist()
         
         # 方法2：IQR检测（作为补充）
         q1 = np.percentile(values_array, 25)
@@ -88,18 +90,18 @@ class StatisticalAuditor:
         iqr = q3 - q1
         lower_bound = q1 - 1.5 * iqr
         upper_bound = q3 + 1.5 * iqr
-        iqr_outlier_indices = [i for i, v in enumerate(values_array) 
-                              if v < lower_bound or v > upper_bound]
+        iqr_mask = (values_array < lower_bound) | (values_array > upper_bound)
+        iqr_outlier_indices = np.flatnonzero(iqr_mask).tolist()
         
-        # 根据方法选择结果
+        # 根据方法选择结果（[V9.4 Performance] 布尔掩码代替 list 成员判断，O(n)）
         if method == "z_score":
-            outlier_indices = z_outlier_indices
+            outlier_mask = z_scores < -self.z_score_threshold
         elif method == "iqr":
-            outlier_indices = iqr_outlier_indices
+            outlier_mask = iqr_mask
         else:  # combined
-            outlier_indices = list(set(z_outlier_indices + iqr_outlier_indices))
-        
-        normal_indices = [i for i in range(len(values)) if i not in outlier_indices]
+            outlier_mask = (z_scores < -self.z_score_threshold) | iqr_mask
+        outlier_indices = np.flatnonzero(outlier_mask).tolist()
+        normal_indices = np.flatnonzero(~outlier_mask).tolist()
         
         logger.info(f"📊 离群值检测: 总样本={len(values)}, 离群样本={len(outlier_indices)}, "
                    f"均值={mean_val:.4f}, 标准差={std_val:.4f}, 偏度={skewness:.4f}, "
@@ -131,6 +133,64 @@ class StatisticalAuditor:
             "has_outliers": len(outlier_indices) > 0
         }
     
+    def summarize_stream(self,
+                         values: Iterable[float],
+                         summary: Optional[StreamingSummary] = None) -> StreamingSummary:
+        """
+        单遍流式汇总（[V9.4 Performance] 固定内存）
+        
+        批量审计或并行分片各自汇总后用 StreamingSummary.merge 合并：
+        均值/标准差/偏度精确合并，分位数为 t-digest 近似。
+        
+        Args:
+            values: 任意可迭代数值流（生成器即可，不会物化为列表）
+            summary: 继续累加的已有汇总（可选）
+            
+        Returns:
+            StreamingSummary
+        """
+        summary = summary if summary is not None else StreamingSummary()
+        for v in values:
+            summary.add(float(v))
+        return summary
+    
+    def outlier_bounds(self, summary: StreamingSummary) -> Dict[str, Any]:
+        """
+        由流式汇总给出离群判定边界（与 detect_outliers 的 statistics 同名字段）
+        
+        额外字段 z_lower_bound = mean - z_score_threshold * std，对应 detect_outliers 的下侧 Z-Score 规则。
+        
+        Args:
+            summary: summarize_stream 的结果（可为多个分片合并后的汇总）
+            
+        Returns:
+            统计量与边界字典；空汇总返回 {}
+        """
+        if not summary.count:
+            return {}
+        bounds = summary.to_dict()
+        bounds["z_lower_bound"] = bounds["mean"] - self.z_score_threshold * (bounds["std"] + 1e-6)
+        return bounds
+    
+    def is_outlier(self, value: float, bounds: Dict[str, Any], method: str = "combined") -> bool:
+        """
+        按 outlier_bounds 的边界判定单个值（第二遍流式筛选用）
+        
+        Args:
+            value: 待判定数值
+            bounds: outlier_bounds 的返回值
+            method: 检测方法（"z_score", "iqr", "combined"）
+        """
+        if not bounds:
+            return False
+        z_hit = value < bounds["z_lower_bound"]
+        iqr_hit = value < bounds["lower_bound"] or value > bounds["upper_bound"]
+        if method == "z_score":
+            return z_hit
+        if method == "iqr":
+            return iqr_hit
+        return z_hit or iqr_hit
+    
     def check_gradient_vanishing(self,
                                  values: List[float],
                                  outlier_indices: Optional[List[int]] = None) -> Dict[str, Any]:
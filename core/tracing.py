@@ -0,0 +1,255 @@
+"""
+阶段追踪 (Stage Tracing)
+========================
+[V9.4 Performance] 轻量级分阶段计时层，回答"哪个阶段最慢"。
+
+    from core.tracing import get_tracer, traced
+
+    tracer = get_tracer()
+    with tracer.span("arbitrate.stress"):
+        ...
+
+    @traced("unified.analyze")
+    def analyze(...): ...
+
+- 未启用时 span() 返回共享的空上下文管理器：一次布尔判断，无计时、无分配
+- 启用后每个阶段聚合为对数分桶直方图 (StageHistogram)：次数、总耗时、最小/最大、p50/p90/p99
+- 最近的 span 保留在有界环形缓冲中，可导出为 Chrome Trace（chrome://tracing / ui.perfetto.dev）
+- 启用方式：环境变量 BAZI_TRACE=1，或运行时 tracer.enable()（天机设置页的 /profile 视图提供开关）
+"""
+
+import functools
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACE_ENV = "BAZI_TRACE"
+PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__))
+DEFAULT_SUMMARY_PATH = os.path.join(PROJECT_ROOT, "results", "trace_summary.json")
+DEFAULT_CHROME_PATH = os.path.join(PROJECT_ROOT, "results", "trace_chrome.json")
+
+# 直方图分桶：第 k 桶上界 = 1µs × 2^k，共 28 桶（覆盖到约 134s）
+BUCKET_BASE_SECONDS = 1e-6
+N_BUCKETS = 28
+DEFAULT_MAX_EVENTS = 20000
+
+
+def bucket_upper_bounds() -> List[float]:
+    """各桶上界（秒）"""
+    return [BUCKET_BASE_SECONDS * (1 << k) for k in range(N_BUCKETS)]
+
+
+class StageHistogram:
+    """单个阶段的耗时直方图（对数分桶，常数内存）"""
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets = [0] * N_BUCKETS
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        # frexp: seconds / base = m × 2^e, m ∈ [0.5, 1) → 落在上界 2^e 的桶
+        exponent = math.frexp(seconds / BUCKET_BASE_SECONDS)[1] if seconds > 0 else 0
+        self.buckets[min(max(exponent, 0), N_BUCKETS - 1)] += 1
+
+    def percentile(self, q: float) -> float:
+        """按桶上界估计分位数（不超过实测最大值）"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for k, n in enumerate(self.buckets):
+            cumulative += n
+            if cumulative >= rank and n:
+                return min(BUCKET_BASE_SECONDS * (1 << k), self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        ms = 1000.0
+        return {
+            'count': self.count,
+            'total_ms': self.total * ms,
+            'mean_ms': self.total / self.count * ms if self.count else 0.0,
+            'min_ms': self.min * ms if self.count else 0.0,
+            'max_ms': self.max * ms,
+            'p50_ms': self.percentile(0.5) * ms,
+            'p90_ms': self.percentile(0.9) * ms,
+            'p99_ms': self.percentile(0.99) * ms,
+            'buckets': {f"{b * ms:.3g}": n for b, n in zip(bucket_upper_bounds(), self.buckets) if n},
+        }
+
+
+class _NullSpan:
+    """禁用时的空 span（全局共享）"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, args: Optional[Dict[str, Any]]):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer._finish(self, time.perf_counter(), exc_type)
+        return False
+
+    def set(self, **args):
+        """附加参数（写入 Chrome Trace 的 args）"""
+        self.args = {**(self.args or {}), **args}
+
+
+class Tracer:
+    """
+    进程级阶段追踪器
+
+    stages: {阶段名: StageHistogram}
+    events: 最近 max_events 个 span (name, start, seconds, thread_id, args)
+    """
+
+    def __init__(self, enabled: bool = False, max_events: int = DEFAULT_MAX_EVENTS):
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self.stages: Dict[str, StageHistogram] = {}
+        self.events: deque = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self.stages.clear()
+            self.events.clear()
+            self.origin = time.perf_counter()
+
+    def span(self, name: str, **args):
+        """计时一个阶段：with tracer.span("name"): ..."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args or None)
+
+    def _finish(self, span: _Span, end: float, exc_type):
+        seconds = end - span.start
+        args = span.args
+        if exc_type is not None:
+            args = {**(args or {}), 'error': exc_type.__name__}
+        with self._lock:
+            hist = self.stages.get(span.name)
+            if hist is None:
+                hist = self.stages[span.name] = StageHistogram()
+            hist.add(seconds)
+            self.events.append((span.name, span.start, seconds, threading.get_ident(), args))
+
+    # --- 导出 ---
+
+    def summary(self) -> Dict[str, Any]:
+        """各阶段统计（按总耗时降序）"""
+        with self._lock:
+            stages = {name: hist.to_dict() for name, hist in self.stages.items()}
+            n_events = len(self.events)
+        ordered = dict(sorted(stages.items(), key=lambda kv: kv[1]['total_ms'], reverse=True))
+        return {'enabled': self.enabled, 'n_events': n_events, 'stages': ordered}
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Chrome Trace Event 格式（'X' 完整事件，时间单位 µs）"""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self.events)
+            origin = self.origin
+        trace_events = []
+        for name, start, seconds, tid, args in events:
+            event = {
+                'name': name,
+                'cat': name.split('.', 1)[0],
+                'ph': 'X',
+                'ts': (start - origin) * 1e6,
+                'dur': seconds * 1e6,
+                'pid': pid,
+                'tid': tid,
+            }
+            if args:
+                event['args'] = args
+            trace_events.append(event)
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def write_json(self, path: str = DEFAULT_SUMMARY_PATH) -> str:
+        return _write(path, self.summary())
+
+    def write_chrome_trace(self, path: str = DEFAULT_CHROME_PATH) -> str:
+        return _write(path, self.chrome_trace())
+
+
+def _write(path: str, payload: Dict[str, Any]) -> str:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2, default=str)
+    logger.info(f"Trace written to {path}")
+    return path
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """获取进程级追踪器（默认禁用；BAZI_TRACE=1 时启动即启用）"""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer(enabled=os.environ.get(TRACE_ENV, "") in ("1", "true"))
+    return _tracer
+
+
+def traced(name: str) -> Callable:
+    """函数级 span 装饰器：整个调用计为一个阶段"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = get_tracer()
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
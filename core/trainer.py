@@ -30,7 +30,11 @@ class ModelTrainer:
         # 1. Load Data
         # X: [Energy_Wood, Energy_Fire..., Bit_Jia, Bit_Yi...]
         # Y: [75, 80, 40...] (Continuous Scores)
-        X, y = self.vectorizer.load_dataset(target_aspect=aspect)
+        # Only new / changed cases are vectorized; the rest come from the feature store.
+        refreshed = self.vectorizer.feature_store.sync()
+        if refreshed:
+            print(f"Feature store: vectorized {refreshed} new/changed cases.")
+        X, y = self.vectorizer.feature_store.dataset(aspect, sync=False)
         
         if len(X) == 0:
             print("⚠️ No field data found in DB. Applying Cold Start (Physics Priors)...")
@@ -1,18 +1,30 @@
-
 """
 Quantum Trinity V2.0 (The Oracle)
 =====================================
 Modularized Bazi Physics Framework.
+
+[V9.4 Performance] 包级导出按需加载 (PEP 562)：导入任意子模块
+（如 core.trinity.core.nexus.definitions）不再连带加载 TrinityOracle 及其全部引擎。
 """
 
-from .core.oracle import TrinityOracle
-from .core.nexus.definitions import PhysicsConstants, BaziParticleNexus
-from .core.physics.wave_laws import WaveState, WaveLaws
-
-__all__ = [
-    'TrinityOracle',
-    'PhysicsConstants',
-    'BaziParticleNexus',
-    'WaveState',
-    'WaveLaws'
-]
+from core.lazy_loader import lazy_attr
+
+_EXPORTS = {
+    'TrinityOracle': '.core.oracle',
+    'PhysicsConstants': '.core.nexus.definitions',
+    'BaziParticleNexus': '.core.nexus.definitions',
+    'WaveState': '.core.physics.wave_laws',
+    'WaveLaws': '.core.physics.wave_laws',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    value = lazy_attr(__name__, _EXPORTS, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
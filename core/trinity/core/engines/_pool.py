@@ -0,0 +1,34 @@
+"""
+Process-pool worker state for the batch engines
+(CelebrityBacktester, MirrorEngine, MirrorFeatureTable, PatternPhysicsLab).
+
+One framework per pool worker: init_worker() is the ProcessPoolExecutor initializer,
+task functions fetch the worker's instance with worker_framework().
+"""
+
+from typing import Any, Callable, Optional, Tuple
+
+_worker_framework = None
+
+
+def init_worker(framework_factory: Callable[[], Any], prepare: Optional[Callable] = None,
+                prepare_args: Tuple = ()):
+    """
+    Build this worker's framework (reused across tasks).
+
+    Args:
+        framework_factory: picklable zero-argument factory, usually the framework class
+        prepare: optional module-level hook run first (e.g. carrying registry constants over)
+        prepare_args: arguments for prepare
+    """
+    global _worker_framework
+    if prepare is not None:
+        prepare(*prepare_args)
+    _worker_framework = framework_factory()
+
+
+def worker_framework():
+    """The framework built by init_worker() in this worker process"""
+    if _worker_framework is None:
+        raise RuntimeError("worker_framework() called outside a pool started with init_worker")
+    return _worker_framework
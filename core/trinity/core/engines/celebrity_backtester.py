@@ -1,12 +1,140 @@
 
+import hashlib
 import json
 import os
 import logging
+import threading
+import time
 import numpy as np
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
+from functools import lru_cache
 from core.trinity.core.unified_arbitrator_master import QuantumUniversalFramework
-from core.trinity.core.nexus.definitions import BaziParticleNexus
+from core.trinity.core.nexus.definitions import BaziParticleNexus, PhysicsConstants
+from core.trinity.core.engines._pool import init_worker, worker_framework
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+DEFAULT_BACKTEST_CACHE_PATH = os.path.join(PROJECT_ROOT, "results", "backtest_cache.jsonl")
+# Bump when arbitrate_bazi physics change in a way that invalidates cached cells
+BACKTEST_CACHE_VERSION = 1
+DEFAULT_CONTEXT = {"damping_override": 0.30, "scenario": "BACKTEST"}
+
+STEMS = "甲乙丙丁戊己庚辛壬癸"
+BRANCHES = "子丑寅卯辰巳午未申酉戌亥"
+ALL_60 = [STEMS[i % 10] + BRANCHES[i % 12] for i in range(60)]
+MOCK_LUCK_PILLAR = "甲子"  # Mock luck for now
+
+
+def annual_pillar(year: int) -> str:
+    return ALL_60[(year - 1924) % 60]  # Reference 1924 (Jia-Zi)
+
+
+@lru_cache(maxsize=1)
+def physics_constants_digest() -> str:
+    """Digest of the PhysicsConstants tables (a tuned constant invalidates cached cells)"""
+    constants = {k: v for k, v in vars(PhysicsConstants).items() if k.isupper()}
+    payload = json.dumps(constants, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def physics_fingerprint(framework) -> Dict[str, Any]:
+    """Framework-side inputs of arbitrate_bazi: logic registry version + physics constants"""
+    registry = getattr(framework, "registry", None)
+    return {"registry": getattr(registry, "version", None), "constants": physics_constants_digest()}
+
+
+def config_hash(context: Dict[str, Any], physics: Optional[Dict[str, Any]] = None) -> str:
+    """Hash of everything besides (chart, luck, annual) that feeds arbitrate_bazi"""
+    payload = json.dumps({"v": BACKTEST_CACHE_VERSION, "ctx": context, "physics": physics},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def cell_key(chart: List[str], luck: str, annual: str, cfg_hash: str) -> str:
+    return f"{''.join(chart)}|{luck}|{annual}|{cfg_hash}"
+
+
+class BacktestCellCache:
+    """
+    Per-(chart, luck, annual, config hash) physics readings.
+
+    In memory as a dict; put_many() appends new cells to a JSONL file
+    (one {key, metrics} per line), loaded on first access.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_BACKTEST_CACHE_PATH):
+        self.path = path
+        self._cells: Dict[str, Dict[str, float]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self._cells[entry["key"]] = entry["metrics"]
+                    except (json.JSONDecodeError, KeyError):
+                        continue
+        except OSError as e:
+            logging.getLogger("CelebrityBacktester").warning(f"Backtest cache unreadable: {e}")
+
+    def get(self, key: str) -> Optional[Dict[str, float]]:
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            return self._cells.get(key)
+
+    def put_many(self, cells: Dict[str, Dict[str, float]]):
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            new = {k: v for k, v in cells.items() if self._cells.get(k) != v}
+            self._cells.update(new)
+            if not new or not self.path:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    for key, metrics in new.items():
+                        f.write(json.dumps({"key": key, "metrics": metrics}, ensure_ascii=False) + "\n")
+            except OSError as e:
+                logging.getLogger("CelebrityBacktester").warning(f"Backtest cache write failed: {e}")
+
+    def clear(self, persisted: bool = False):
+        with self._lock:
+            self._cells.clear()
+            self._loaded = False
+            if persisted and self.path and os.path.exists(self.path):
+                os.remove(self.path)
+
+    def __len__(self) -> int:
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            return len(self._cells)
+
+
+def _evaluate_cell(framework, chart: List[str], ctx: Dict[str, Any]) -> Tuple[Dict[str, float], float]:
+    t0 = time.perf_counter()
+    report = framework.arbitrate_bazi(chart, current_context=ctx)
+    phy = report.get("physics", {})
+    metrics = {
+        "sai": phy.get("stress", {}).get("SAI", 0),
+        "reynolds": phy.get("wealth", {}).get("Reynolds", 0),
+        "ic": phy.get("stress", {}).get("IC", 0)
+    }
+    return metrics, time.perf_counter() - t0
+
+
+def _run_cell_chunk(cells: List[Tuple[str, List[str], Dict[str, Any]]]) -> List[Tuple[str, Dict[str, float], float]]:
+    framework = worker_framework()
+    return [(key, *_evaluate_cell(framework, chart, ctx)) for key, chart, ctx in cells]
 
 class CelebrityBacktester:
     """
@@ -16,8 +144,18 @@ class CelebrityBacktester:
     to minimize the 'Reality Gap' between life events and physics spikes.
     """
     
-    def __init__(self, framework: QuantumUniversalFramework):
+    def __init__(self, framework: QuantumUniversalFramework, cache: Optional[BacktestCellCache] = None,
+                 context_overrides: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            framework: physics framework (arbitrate_bazi)
+            cache: cell cache shared across calibration runs (default: results/backtest_cache.jsonl)
+            context_overrides: calibration knobs merged into every year's context
+        """
         self.framework = framework
+        self.cache = cache if cache is not None else BacktestCellCache()
+        self.context_overrides = dict(context_overrides or {})
+        self.physics = physics_fingerprint(framework)
         self.logger = logging.getLogger("CelebrityBacktester")
 
     def load_cases(self, file_path: str) -> List[Dict[str, Any]]:
@@ -32,63 +170,76 @@ class CelebrityBacktester:
             self.logger.error(f"Failed to load cases: {e}")
             return []
 
-    def run_backtest(self, case: Dict[str, Any], start_year: int, horizon: int = 60) -> Dict[str, Any]:
+    def case_context(self, case: Dict[str, Any]) -> Dict[str, Any]:
+        """Year-independent part of the context for one case"""
+        ctx = {**DEFAULT_CONTEXT,
+               "tier_override": case.get("tier", "Normal"),  # [SUPREME] Support energy tiers
+               **self.context_overrides}
+        # Geo override from case
+        geo_ctx = case.get("geo_context", {})
+        if "fire_bias" in geo_ctx:
+            ctx["geo_bias"] = {"Fire": geo_ctx["fire_bias"]}
+        return ctx
+
+    def plan_cells(self, case: Dict[str, Any], start_year: int, horizon: int) -> List[Tuple[int, str, Dict[str, Any]]]:
+        """(year, cell key, full context) work items for one case"""
+        base = self.case_context(case)
+        cfg = config_hash(base, self.physics)
+        cells = []
+        for offset in range(horizon):
+            year = start_year + offset
+            annual = annual_pillar(year)
+            ctx = {"luck_pillar": MOCK_LUCK_PILLAR, "annual_pillar": annual, **base}
+            cells.append((year, cell_key(case["bazi"], MOCK_LUCK_PILLAR, annual, cfg), ctx))
+        return cells
+
+    def run_backtest(self, case: Dict[str, Any], start_year: int, horizon: int = 60,
+                     use_cache: bool = True) -> Dict[str, Any]:
         """
         Runs a longitudinal physics scan for a celebrity across their lifespan.
         """
-        pillars = case["bazi"]
+        cells = self.plan_cells(case, start_year, horizon)
+        readings, timing = self._evaluate(case["bazi"], cells, use_cache)
+        return self._score_case(case, cells, readings, timing)
+
+    def _evaluate(self, chart: List[str], cells, use_cache: bool):
+        readings: Dict[str, Dict[str, float]] = {}
+        computed: Dict[str, Dict[str, float]] = {}
+        compute_s = 0.0
+        for _, key, ctx in cells:
+            if key in readings:
+                continue
+            hit = self.cache.get(key) if use_cache else None
+            if hit is None:
+                hit, dt = _evaluate_cell(self.framework, chart, ctx)
+                computed[key] = hit
+                compute_s += dt
+            readings[key] = hit
+        if use_cache:
+            self.cache.put_many(computed)
+        return readings, {"compute_s": compute_s, "computed_cells": len(computed),
+                          "cached_cells": len(readings) - len(computed)}
+
+    def _score_case(self, case: Dict[str, Any], cells, readings: Dict[str, Dict[str, float]],
+                    timing: Dict[str, Any]) -> Dict[str, Any]:
         events = case.get("life_events", [])
-        
-        # Determine birth year if possible, or use provided start_year
-        # Jia-Zi Cycle Helper
-        stems = "甲乙丙丁戊己庚辛壬癸"
-        branches = "子丑寅卯辰巳午未申酉戌亥"
-        all_60 = [stems[i % 10] + branches[i % 12] for i in range(60)]
-        
         timeline_data = []
         alignment_score = 0.0
         matched_events = 0
 
-        for offset in range(horizon):
-            current_year = start_year + offset
-            annual_p = all_60[(current_year - 1924) % 60] # Reference 1924 (Jia-Zi)
-            
-            # Context injection
-            ctx = {
-                "luck_pillar": "甲子", # Mock luck for now
-                "annual_pillar": annual_p,
-                "damping_override": 0.30,
-                "tier_override": case.get("tier", "Normal"), # [SUPREME] Support energy tiers
-                "scenario": "BACKTEST"
-            }
-            
-            # Geo override from case
-            geo_ctx = case.get("geo_context", {})
-            if "fire_bias" in geo_ctx:
-                ctx["geo_bias"] = {"Fire": geo_ctx["fire_bias"]}
-
-            report = self.framework.arbitrate_bazi(pillars, current_context=ctx)
-            phy = report.get("physics", {})
-            
-            metrics = {
-                "year": current_year,
-                "sai": phy.get("stress", {}).get("SAI", 0),
-                "reynolds": phy.get("wealth", {}).get("Reynolds", 0),
-                "ic": phy.get("stress", {}).get("IC", 0)
-            }
+        # [ResidualRadar] Dynamic thresholding based on case energy
+        sai_threshold = 4.0 if case.get("tier") == "Mars" else 2.0
+        wealth_threshold = 50.0 if case.get("tier") == "Mars" else 10.0
+
+        for current_year, key, _ in cells:
+            metrics = {"year": current_year, **readings[key]}
             timeline_data.append(metrics)
-            
+
             # Check for alignment with historical events
             for ev in events:
                 if ev["year"] == current_year:
                     # Target metric based on event type
                     target_val = metrics["sai"] if ev["type"] == "stress" else metrics["reynolds"]
-                    expected_intensity = ev.get("intensity", 1.0)
-                    
-                    # [ResidualRadar] Dynamic thresholding based on case energy
-                    sai_threshold = 4.0 if case.get("tier") == "Mars" else 2.0
-                    wealth_threshold = 50.0 if case.get("tier") == "Mars" else 10.0
-                    
                     if ev["type"] == "stress" and target_val >= sai_threshold:
                         alignment_score += 1.0
                         matched_events += 1
@@ -98,31 +249,89 @@ class CelebrityBacktester:
 
         total_events = len(events)
         final_fidelity = (matched_events / total_events) * 100 if total_events > 0 else 0.0
-        
+
         return {
             "case_id": case["case_id"],
             "name": case["name"],
             "fidelity": final_fidelity,
             "timeline": timeline_data,
             "events_alignment": matched_events,
-            "total_events": total_events
+            "total_events": total_events,
+            "timing": timing
         }
 
-    def aggregate_audit(self, file_path: str) -> Dict[str, Any]:
-        """Runs backtest for all cases and returns global metrics."""
+    def aggregate_audit(self, file_path: str, horizon: int = 75, n_workers: int = 1,
+                        use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Runs backtest for all cases and returns global metrics.
+
+        Every case x year cell is looked up in the cache first; the remaining cells are
+        deduplicated and fanned out over a process pool (n_workers > 1), one framework per worker.
+        Results equal the serial run_backtest loop; each case reports compute time and cache hits.
+        A computed cell shared by several cases is attributed to the first case that planned it
+        (the others count it as cached), so per-case compute times sum to the total.
+        """
+        t0 = time.perf_counter()
         cases = self.load_cases(file_path)
+        # Use provided birth_year for accurate annual pillar alignment
+        plans = [self.plan_cells(c, c.get("birth_year", 1960), horizon) for c in cases]
+
+        readings: Dict[str, Dict[str, float]] = {}
+        pending: Dict[str, Tuple[str, List[str], Dict[str, Any]]] = {}
+        owner: Dict[str, int] = {}
+        for n, (case, cells) in enumerate(zip(cases, plans)):
+            for _, key, ctx in cells:
+                if key in readings or key in pending:
+                    continue
+                hit = self.cache.get(key) if use_cache else None
+                if hit is not None:
+                    readings[key] = hit
+                else:
+                    pending[key] = (key, case["bazi"], ctx)
+                    owner[key] = n
+
+        cell_seconds = self._compute_cells(list(pending.values()), n_workers, readings)
+        if use_cache:
+            self.cache.put_many({key: readings[key] for key in pending})
+
         results = []
-        for c in cases:
-            # Use provided birth_year for accurate annual pillar alignment
-            b_year = c.get("birth_year", 1960)
-            res = self.run_backtest(c, start_year=b_year, horizon=75)
-            results.append(res)
-            
+        for n, (case, cells) in enumerate(zip(cases, plans)):
+            keys = {key for _, key, _ in cells}
+            computed = [key for key in keys if owner.get(key) == n]
+            timing = {"compute_s": sum(cell_seconds[k] for k in computed), "computed_cells": len(computed),
+                      "cached_cells": len(keys) - len(computed)}
+            results.append(self._score_case(case, cells, readings, timing))
+
         avg_fidelity = sum(r["fidelity"] for r in results) / len(results) if results else 0
-        
+
         return {
             "avg_fidelity": avg_fidelity,
             "case_count": len(results),
             "individual_results": results,
+            "timing": {"wall_s": time.perf_counter() - t0, "computed_cells": len(pending),
+                       "cached_cells": len(readings) - len(pending), "n_workers": n_workers},
             "status": "Celebrity Audit Complete"
         }
+
+    def _compute_cells(self, work: List[Tuple[str, List[str], Dict[str, Any]]], n_workers: int,
+                       readings: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+        """Evaluate cache-miss cells into readings; returns per-cell compute seconds"""
+        seconds: Dict[str, float] = {}
+        if n_workers > 1 and len(work) > n_workers:
+            chunk = max(1, len(work) // (n_workers * 4))
+            chunks = [work[i:i + chunk] for i in range(0, len(work), chunk)]
+            try:
+                with ProcessPoolExecutor(max_workers=n_workers, initializer=init_worker,
+                                         initargs=(type(self.framework),)) as pool:
+                    for part in pool.map(_run_cell_chunk, chunks):
+                        for key, metrics, dt in part:
+                            readings[key] = metrics
+                            seconds[key] = dt
+                return seconds
+            except Exception as e:
+                self.logger.warning(f"Process pool failed ({e}), falling back to serial backtest")
+        for key, chart, ctx in work:
+            if key in seconds:
+                continue
+            readings[key], seconds[key] = _evaluate_cell(self.framework, chart, ctx)
+        return seconds
@@ -1,11 +1,39 @@
 
+import itertools
 import logging
 import numpy as np
-from typing import List, Dict, Any, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from core.trinity.core.nexus.definitions import BaziParticleNexus
 from core.trinity.core.engines.synthetic_bazi_engine import SyntheticBaziEngine
+from core.trinity.core.engines._pool import init_worker, worker_framework
+from core.trinity.core.engines.mirror_index import CHARTS_PER_CHUNK, N_CHUNKS, MirrorFeatureTable
 from core.trinity.core.unified_arbitrator_master import QuantumUniversalFramework
 
+
+def year_contexts(years: int, luck_pillar: str = "甲子", damping: float = 0.30) -> List[Dict[str, Any]]:
+    """Time-scan context per year offset (annual pillar cycles through the 60 JiaZi); shared by all mirrors"""
+    return [{"luck_pillar": luck_pillar,
+             "annual_pillar": SyntheticBaziEngine.JIA_ZI[year_offset % 60],
+             "damping_override": damping}
+            for year_offset in range(years)]
+
+
+def scan_sai(framework, charts: List[List[str]], contexts: List[Dict[str, Any]]) -> np.ndarray:
+    """SAI of every chart under every year context, shape (len(contexts), len(charts))"""
+    sai = np.zeros((len(contexts), len(charts)))
+    for c, chart in enumerate(charts):
+        for y, ctx in enumerate(contexts):
+            report = framework.arbitrate_bazi(chart, current_context=ctx)
+            sai[y, c] = report.get("physics", {}).get("stress", {}).get("SAI", 0)
+    return sai
+
+
+def _scan_chunk(task):
+    charts, contexts = task
+    return scan_sai(worker_framework(), charts, contexts)
+
+
 class MirrorEngine:
     """
     🪞 MirrorEngine (ASE Phase 3)
@@ -13,14 +41,38 @@ class MirrorEngine:
     Finds 'Physical Twins' in the 518,400 Bazi matrix and performs cross-fidelity audits.
     """
     
-    def __init__(self, framework: QuantumUniversalFramework):
+    def __init__(self, framework: QuantumUniversalFramework, feature_table: Optional[MirrorFeatureTable] = None):
+        """
+        Args:
+            feature_table: precomputed natal features (scripts/build_mirror_index.py);
+                loaded lazily from the default location when omitted
+        """
         self.framework = framework
         self.bazi_engine = SyntheticBaziEngine()
         self.logger = logging.getLogger("MirrorEngine")
+        self._feature_table = feature_table
+
+    def feature_table(self) -> Optional[MirrorFeatureTable]:
+        """The feature table for the current registry version, or None if nothing is built for it"""
+        version = self.framework.registry.version
+        if self._feature_table is None:
+            self._feature_table = MirrorFeatureTable()
+        if self._feature_table.needs_reload(version):
+            self._feature_table.load(version)
+        return self._feature_table if len(self._feature_table.uid) else None
 
-    def find_mirrors(self, target_report: Dict[str, Any], limit: int = 1000) -> List[List[str]]:
+    # Live-scan budget (charts visited outside the feature table) to bound a search for rare profiles
+    LIVE_SCAN_LIMIT = 50000
+
+    def find_mirrors(self, target_report: Dict[str, Any], limit: int = 1000, use_index: bool = True) -> List[List[str]]:
         """
-        Finds Bazi charts with >95% similarity to the target's physical profile.
+        Finds Bazi charts with >95% similarity to the target's physical profile,
+        in generate_all_bazi() order.
+
+        A complete feature table answers with one exact range query over the universe. A partial
+        one (e.g. built with --chunks) serves its chunks from the table and the unbuilt chunks are
+        scanned live; without a table everything is scanned live. The live scan stops after
+        LIVE_SCAN_LIMIT charts, table chunks do not count against it.
         """
         target_chart = target_report.get("meta", {}).get("chart", [])
         if not target_chart: return []
@@ -31,49 +83,88 @@ class MirrorEngine:
         target_dm = target_chart[2][0]
         target_dm_elem = BaziParticleNexus.STEMS.get(target_dm)[0]
         
-        mirrors = []
-        gen = self.bazi_engine.generate_all_bazi()
-        
         # Phase 1: Structural Filter (DM and Season)
         # To speed up, we only check charts with same DM and same month branch element
         target_month_branch = target_chart[1][1]
         target_month_elem = BaziParticleNexus.BRANCHES.get(target_month_branch)[0]
-        
-        count = 0
+
+        table = self.feature_table() if use_index else None
+        if table is not None and table.is_complete:
+            uids = table.query(target_dm, target_month_elem, target_sai, target_ic, limit=limit)
+            self.logger.info(f"Found {len(uids)} mirrors of {target_chart} in feature table")
+            return [SyntheticBaziEngine.chart_at(int(u)) for u in uids]
+
+        built = table.chunks if table is not None else frozenset()
+        indexed = {}
+        if built:
+            uids = table.query(target_dm, target_month_elem, target_sai, target_ic)
+            for chunk, group in itertools.groupby(uids.tolist(), key=lambda u: u // CHARTS_PER_CHUNK):
+                indexed[chunk] = list(group)
+            self.logger.info(f"Searching for mirrors of {target_chart}: {len(built)} chunks from the "
+                             f"feature table ({table.coverage:.1%}), scanning the rest live...")
+        else:
+            self.logger.info(f"Searching for mirrors of {target_chart}...")
+
+        mirrors = []
         total_checked = 0
-        self.logger.info(f"Searching for mirrors of {target_chart}...")
-        
-        for chart in gen:
-            total_checked += 1
-            # fast-path filter
-            dm = chart[2][0]
-            if dm != target_dm: continue
-            
-            m_br = chart[1][1]
-            m_elem = BaziParticleNexus.BRANCHES.get(m_br)[0]
-            if m_elem != target_month_elem: continue
-            
-            # Phase 2: Arbitrate and Compare Physics
-            report = self.framework.arbitrate_bazi(chart)
-            phy = report.get("physics", {})
-            sai = phy.get("stress", {}).get("SAI", 0)
-            ic = phy.get("stress", {}).get("IC", 0)
-            
-            # Similarity Calculation (Weighted Euclidean distance on SAI/IC)
-            # 95% similarity = error < 5%
-            dist = np.sqrt(((sai - target_sai)/max(1,target_sai))**2 + ((ic - target_ic)/max(1,target_ic))**2)
-            if dist < 0.05:
-                mirrors.append(chart)
-                count += 1
-                if count >= limit: break
-            
-            if total_checked > 50000: # Safety break to prevent infinite search if rare
+        for chunk in range(N_CHUNKS):
+            if chunk in built:
+                for uid in indexed.get(chunk, ()):
+                    mirrors.append(SyntheticBaziEngine.chart_at(uid))
+                    if len(mirrors) >= limit:
+                        break
+            elif total_checked <= self.LIVE_SCAN_LIMIT:
+                gen = self.bazi_engine.generate_all_bazi(start=chunk * CHARTS_PER_CHUNK)
+                for chart in itertools.islice(gen, CHARTS_PER_CHUNK):
+                    total_checked += 1
+                    # fast-path filter
+                    dm = chart[2][0]
+                    if dm != target_dm: continue
+
+                    m_br = chart[1][1]
+                    m_elem = BaziParticleNexus.BRANCHES.get(m_br)[0]
+                    if m_elem != target_month_elem: continue
+
+                    # Phase 2: Arbitrate and Compare Physics
+                    report = self.framework.arbitrate_bazi(chart)
+                    phy = report.get("physics", {})
+                    sai = phy.get("stress", {}).get("SAI", 0)
+                    ic = phy.get("stress", {}).get("IC", 0)
+
+                    # Similarity Calculation (Weighted Euclidean distance on SAI/IC)
+                    # 95% similarity = error < 5%
+                    dist = np.sqrt(((sai - target_sai)/max(1,target_sai))**2 + ((ic - target_ic)/max(1,target_ic))**2)
+                    if dist < 0.05:
+                        mirrors.append(chart)
+                        if len(mirrors) >= limit: break
+
+                    if total_checked > self.LIVE_SCAN_LIMIT: # Safety break to prevent infinite search if rare
+                        break
+            if len(mirrors) >= limit:
                 break
                 
-        self.logger.info(f"Found {len(mirrors)} mirrors after checking {total_checked} cases.")
+        self.logger.info(f"Found {len(mirrors)} mirrors after checking {total_checked} cases live.")
         return mirrors
 
-    def run_mirror_time_scan(self, mirrors: List[List[str]], years: int = 30, reality_target_year: int = 11, reality_target_sai: float = 3.228) -> Dict[str, Any]:
+    def scan_time_matrix(self, mirrors: List[List[str]], years: int = 30, n_workers: int = 1) -> np.ndarray:
+        """
+        SAI for every (year offset, mirror) cell, shape (years, len(mirrors)).
+        With n_workers > 1 mirror chunks are arbitrated over a process pool.
+        """
+        contexts = year_contexts(years)
+        if n_workers > 1 and len(mirrors) > n_workers:
+            chunk = max(1, len(mirrors) // (n_workers * 4))
+            tasks = [(mirrors[i:i + chunk], contexts) for i in range(0, len(mirrors), chunk)]
+            try:
+                with ProcessPoolExecutor(max_workers=n_workers, initializer=init_worker,
+                                         initargs=(type(self.framework),)) as pool:
+                    return np.concatenate(list(pool.map(_scan_chunk, tasks)), axis=1)
+            except Exception as e:
+                self.logger.warning(f"Process pool failed ({e}), falling back to serial time-scan")
+        return scan_sai(self.framework, mirrors, contexts)
+
+    def run_mirror_time_scan(self, mirrors: List[List[str]], years: int = 30, reality_target_year: int = 11,
+                             reality_target_sai: float = 3.228, n_workers: int = 1) -> Dict[str, Any]:
         """
         Runs a time-scan for all mirrors and aggregates the results.
         Finds 'Resonance Singularities' where majority of mirrors spike.
@@ -81,41 +172,23 @@ class MirrorEngine:
         Args:
             reality_target_year: index of year to align (e.g. 11 for 2011 if scan starts at 2000)
             reality_target_sai: the SAI value recorded in REAL_01 history.
+            n_workers: > 1 distributes mirror chunks over a process pool
         """
-        aggregated_sai = {}
-        stems = "甲乙丙丁戊己庚辛壬癸"
-        branches = "子丑寅卯辰巳午未申酉戌亥"
-        all_60 = [stems[i % 10] + branches[i % 12] for i in range(60)]
-        
-        for i, chart in enumerate(mirrors):
-            for year_offset in range(years):
-                annual_p = all_60[year_offset % 60]
-                ctx = {
-                    "luck_pillar": "甲子",
-                    "annual_pillar": annual_p,
-                    "damping_override": 0.30
-                }
-                report = self.framework.arbitrate_bazi(chart, current_context=ctx)
-                sai = report.get("physics", {}).get("stress", {}).get("SAI", 0)
-                
-                if year_offset not in aggregated_sai:
-                    aggregated_sai[year_offset] = []
-                aggregated_sai[year_offset].append(sai)
-        
         resonance_points = []
-        for year, vals in aggregated_sai.items():
-            avg_sai = np.mean(vals)
-            spike_count = sum(1 for v in vals if v > 2.0)
-            resonance_points.append({
-                "year_offset": year,
-                "avg_sai": float(avg_sai),
-                "spike_ratio": float(spike_count / len(mirrors)) if mirrors else 0
-            })
-            
-        # Calculate Reality Gap
         mirror_avg_at_target = 0.0
-        if reality_target_year in aggregated_sai:
-            mirror_avg_at_target = np.mean(aggregated_sai[reality_target_year])
+        if mirrors:
+            sai = self.scan_time_matrix(mirrors, years, n_workers)
+            avg_sai = sai.mean(axis=1)
+            spike_ratio = np.count_nonzero(sai > 2.0, axis=1) / len(mirrors)
+            resonance_points = [{
+                "year_offset": year,
+                "avg_sai": float(avg_sai[year]),
+                "spike_ratio": float(spike_ratio[year])
+            } for year in range(years)]
+
+            # Calculate Reality Gap
+            if 0 <= reality_target_year < years:
+                mirror_avg_at_target = avg_sai[reality_target_year]
         
         reality_gap = abs(mirror_avg_at_target - reality_target_sai) / reality_target_sai
         
@@ -0,0 +1,239 @@
+
+import json
+import logging
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from core.trinity.core.nexus.definitions import BaziParticleNexus
+from core.trinity.core.engines.synthetic_bazi_engine import SyntheticBaziEngine
+from core.trinity.core.engines._pool import init_worker, worker_framework
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+DEFAULT_TABLE_DIR = os.path.join(PROJECT_ROOT, "results", "mirror_features")
+# Bump when the feature layout or the default context changes
+FEATURE_TABLE_VERSION = 1
+
+ELEMENTS = ("Wood", "Fire", "Earth", "Metal", "Water")
+CHARTS_PER_CHUNK = 12 * 60 * 12  # one chunk per year pillar
+N_CHUNKS = SyntheticBaziEngine.TOTAL_COMBINATIONS // CHARTS_PER_CHUNK
+
+
+def partition_keys(uids: np.ndarray) -> np.ndarray:
+    """day master stem (0-9) * 5 + month branch element (0-4), computed from uid alone"""
+    uids = np.asarray(uids, dtype=np.int64)
+    m_idx = (uids // (60 * 12)) % 12
+    d_idx = (uids // 12) % 60
+    dm_stem = d_idx % 10
+    month_branch = (2 + m_idx) % 12
+    branch_elem = np.array([ELEMENTS.index(BaziParticleNexus.BRANCHES[b][0])
+                            for b in SyntheticBaziEngine.BRANCHES])
+    return dm_stem * 5 + branch_elem[month_branch]
+
+
+def partition_key(day_master: str, month_element: str) -> int:
+    return SyntheticBaziEngine.STEMS.index(day_master) * 5 + ELEMENTS.index(month_element)
+
+
+def chart_features(framework, chart: List[str]) -> List[float]:
+    """(SAI, IC, Reynolds, entropy, Wood..Water energy) under the default (no-context) arbitration"""
+    phy = framework.arbitrate_bazi(chart).get("physics", {})
+    energy = phy.get("vibration", {}).get("energy_state", {})
+    return [phy.get("stress", {}).get("SAI", 0), phy.get("stress", {}).get("IC", 0),
+            phy.get("wealth", {}).get("Reynolds", 0), phy.get("entropy", 0),
+            *(energy.get(e, 0.0) for e in ELEMENTS)]
+
+
+def compute_chunk(framework, chunk: int) -> Dict[str, np.ndarray]:
+    uids = np.arange(chunk * CHARTS_PER_CHUNK, (chunk + 1) * CHARTS_PER_CHUNK, dtype=np.int32)
+    rows = np.array([chart_features(framework, SyntheticBaziEngine.chart_at(int(u))) for u in uids], dtype=float)
+    return {"uid": uids, "sai": rows[:, 0], "ic": rows[:, 1], "reynolds": rows[:, 2], "entropy": rows[:, 3],
+            "energy": rows[:, 4:].astype(np.float32)}
+
+
+def _compute_chunk_in_worker(chunk: int):
+    return chunk, compute_chunk(worker_framework(), chunk)
+
+
+class MirrorFeatureTable:
+    """
+    🗂️ MirrorFeatureTable
+
+    Natal physics features for all 518,400 charts (default context), built offline.
+
+    Storage (table_dir): one chunk_XX.npz per year pillar (8,640 charts) plus meta.json
+    recording the registry version each chunk was built under. build() only computes
+    missing chunks or chunks from another registry / table version, so a version bump
+    rebuilds incrementally and an interrupted build resumes.
+
+    Index: rows sorted by (day master x month element partition, SAI); a query takes the
+    partition slice, binary-searches the SAI window and checks the exact distance on the
+    survivors, so it covers the whole universe in milliseconds.
+    """
+
+    def __init__(self, table_dir: str = DEFAULT_TABLE_DIR):
+        self.table_dir = table_dir
+        self.logger = logging.getLogger("MirrorFeatureTable")
+        self.registry_version: Optional[str] = None
+        self._meta_stamp: Optional[tuple] = None
+        self._reset()
+
+    def _reset(self):
+        self.uid = np.zeros(0, dtype=np.int32)
+        self.sai = self.ic = self.reynolds = self.entropy = np.zeros(0)
+        self.energy = np.zeros((0, len(ELEMENTS)), dtype=np.float32)
+        self._offsets = np.zeros(51, dtype=np.int64)
+        self.chunks = frozenset()  # chunk ids loaded (built under the loaded registry version)
+
+    # --- storage ---
+
+    @property
+    def meta_path(self) -> str:
+        return os.path.join(self.table_dir, "meta.json")
+
+    def _chunk_path(self, chunk: int) -> str:
+        return os.path.join(self.table_dir, f"chunk_{chunk:02d}.npz")
+
+    def _read_meta(self) -> Dict[str, Any]:
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {"chunks": {}}
+
+    def _write_meta(self, meta: Dict[str, Any]):
+        tmp_path = f"{self.meta_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.meta_path)
+
+    @staticmethod
+    def _stamp(registry_version: str) -> str:
+        return f"{FEATURE_TABLE_VERSION}:{registry_version}"
+
+    def stale_chunks(self, registry_version: str) -> List[int]:
+        built = self._read_meta().get("chunks", {})
+        stamp = self._stamp(registry_version)
+        return [c for c in range(N_CHUNKS)
+                if built.get(str(c)) != stamp or not os.path.exists(self._chunk_path(c))]
+
+    def build(self, framework=None, framework_factory: Optional[Callable[[], Any]] = None,
+              registry_version: Optional[str] = None, chunks: Optional[Sequence[int]] = None,
+              n_workers: int = 1, should_continue: Callable[[], bool] = lambda: True,
+              progress_callback: Optional[Callable[[int, int], None]] = None) -> List[int]:
+        """
+        Compute and persist missing/stale chunks.
+
+        Args:
+            framework: used for serial builds (n_workers == 1)
+            framework_factory: builds one framework per worker (defaults to type(framework))
+            registry_version: defaults to framework.registry.version
+            chunks: restrict the build to these chunk ids
+            n_workers: > 1 fans chunks out over a process pool
+        Returns:
+            chunk ids built in this call
+        """
+        if registry_version is None:
+            registry_version = framework.registry.version
+        todo = [c for c in self.stale_chunks(registry_version) if chunks is None or c in set(chunks)]
+        os.makedirs(self.table_dir, exist_ok=True)
+        stamp = self._stamp(registry_version)
+        built = []
+
+        def store(chunk, arrays):
+            tmp_path = self._chunk_path(chunk) + ".tmp.npz"
+            np.savez(tmp_path, **arrays)
+            os.replace(tmp_path, self._chunk_path(chunk))
+            meta = self._read_meta()
+            meta.setdefault("chunks", {})[str(chunk)] = stamp
+            meta["updated_at"] = time.time()
+            self._write_meta(meta)
+            built.append(chunk)
+            if progress_callback:
+                progress_callback(len(built), len(todo))
+
+        if n_workers > 1 and len(todo) > 1:
+            factory = framework_factory or type(framework)
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=init_worker, initargs=(factory,)) as pool:
+                for chunk, arrays in pool.map(_compute_chunk_in_worker, todo):
+                    store(chunk, arrays)
+                    if not should_continue():
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        break
+        else:
+            framework = framework if framework is not None else framework_factory()
+            for chunk in todo:
+                if not should_continue():
+                    break
+                store(chunk, compute_chunk(framework, chunk))
+        self.logger.info(f"Built {len(built)} feature chunks ({len(todo) - len(built)} still pending)")
+        return built
+
+    def _current_meta_stamp(self) -> Optional[tuple]:
+        try:
+            st = os.stat(self.meta_path)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    def needs_reload(self, registry_version: str) -> bool:
+        """True when the registry version changed or chunks were (re)built since load()"""
+        return registry_version != self.registry_version or self._current_meta_stamp() != self._meta_stamp
+
+    def load(self, registry_version: str) -> "MirrorFeatureTable":
+        """Load every chunk built under registry_version and build the partition index"""
+        self._meta_stamp = self._current_meta_stamp()
+        meta = self._read_meta().get("chunks", {})
+        stamp = self._stamp(registry_version)
+        parts, loaded = [], []
+        for chunk in range(N_CHUNKS):
+            if meta.get(str(chunk)) != stamp:
+                continue
+            try:
+                with np.load(self._chunk_path(chunk)) as data:
+                    parts.append({k: data[k] for k in ("uid", "sai", "ic", "reynolds", "entropy", "energy")})
+                loaded.append(chunk)
+            except (OSError, KeyError, ValueError) as e:
+                self.logger.warning(f"Feature chunk {chunk} unreadable: {e}")
+        self.registry_version = registry_version
+        if not parts:
+            self._reset()
+            return self
+
+        cat = {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+        keys = partition_keys(cat["uid"])
+        order = np.lexsort((cat["sai"], keys))
+        for k, v in cat.items():
+            setattr(self, k, v[order])
+        self._offsets = np.searchsorted(keys[order], np.arange(51))
+        self.chunks = frozenset(loaded)
+        self.logger.info(f"Loaded mirror feature table: {len(self.uid)} charts ({self.coverage:.1%})")
+        return self
+
+    @property
+    def coverage(self) -> float:
+        return len(self.uid) / SyntheticBaziEngine.TOTAL_COMBINATIONS
+
+    @property
+    def is_complete(self) -> bool:
+        return len(self.uid) == SyntheticBaziEngine.TOTAL_COMBINATIONS
+
+    # --- query ---
+
+    def query(self, day_master: str, month_element: str, target_sai: float, target_ic: float,
+              tolerance: float = 0.05, limit: Optional[int] = None) -> np.ndarray:
+        """
+        uids with the same day master and month element whose
+        sqrt(((sai - t_sai) / max(1, t_sai))^2 + ((ic - t_ic) / max(1, t_ic))^2) < tolerance,
+        in generate_all_bazi() order (first `limit`).
+        """
+        key = partition_key(day_master, month_element)
+        lo, hi = self._offsets[key], self._offsets[key + 1]
+        sai_scale, ic_scale = max(1, target_sai), max(1, target_ic)
+        sai = self.sai[lo:hi]
+        a = lo + np.searchsorted(sai, target_sai - tolerance * sai_scale, side="left")
+        b = lo + np.searchsorted(sai, target_sai + tolerance * sai_scale, side="right")
+        dist = np.sqrt(((self.sai[a:b] - target_sai) / sai_scale) ** 2 + ((self.ic[a:b] - target_ic) / ic_scale) ** 2)
+        hits = np.sort(self.uid[a:b][dist < tolerance])
+        return hits[:limit] if limit is not None else hits
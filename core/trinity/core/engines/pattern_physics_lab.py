@@ -1,58 +1,183 @@
 
 import numpy as np
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Any, Callable, Optional
 from core.trinity.core.unified_arbitrator_master import QuantumUniversalFramework
+from core.trinity.core.nexus.pattern_registry import PatternRegistry
+from core.trinity.core.engines._pool import init_worker, worker_framework
+
+# Charts per pool task
+SHARD_SIZE = 250
+
+# Context key each sweepable parameter maps to
+SWEEP_PARAMS = {"damping": "damping_override", "boost": "pattern_boost_multiplier"}
+
+SWEEP_CONTEXT = {
+    "luck_pillar": "甲子",
+    "annual_pillar": "甲子",
+    "scenario": "SENSITIVITY_SWEEP"
+}
+
+SHARD_FIELDS = ("sai", "reynolds", "entropy", "sai_base", "entropy_base",
+                "sg_e", "zg_e", "min_dist", "reinforcement")
+
+
+def arbitrate_shard(framework, charts: List[List[str]], contexts: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Arbitrate every chart under every context.
+    Returns SHARD_FIELDS arrays of shape (len(contexts), len(charts)); charts without an
+    SGJG pair get min_dist = inf so boost replay never triggers for them.
+    """
+    out = {k: np.zeros((len(contexts), len(charts))) for k in SHARD_FIELDS}
+    out["zg_e"][:] = 1.0
+    out["min_dist"][:] = np.inf
+    for v, ctx in enumerate(contexts):
+        for c, chart in enumerate(charts):
+            phy = framework.arbitrate_bazi(chart, current_context=dict(ctx)).get("physics", {})
+            out["sai"][v, c] = phy.get("stress", {}).get("SAI", 0)
+            out["reynolds"][v, c] = phy.get("wealth", {}).get("Reynolds", 0)
+            out["entropy"][v, c] = phy.get("entropy", 0)
+            base = phy.get("synthesis") or {}
+            out["sai_base"][v, c] = base.get("SAI", 0.0)
+            out["entropy_base"][v, c] = base.get("entropy", 0.0)
+            out["reinforcement"][v, c] = base.get("pgb_reinforcement", 0.0)
+            if base.get("sgjg"):
+                out["sg_e"][v, c] = base["sgjg"]["sg_e"]
+                out["zg_e"][v, c] = base["sgjg"]["zg_e"]
+                out["min_dist"][v, c] = base["sgjg"]["min_dist"]
+    return out
+
+
+def _round3(values: np.ndarray, numpy_rounded: np.ndarray) -> np.ndarray:
+    """
+    round(x, 3) as the arbitrator applies it: Python rounding for float cells, numpy
+    rounding where the value became np.float64 (a numpy boost scalar entered the bonus).
+    """
+    py = np.array([round(x, 3) for x in values.ravel().tolist()]).reshape(values.shape)
+    return np.where(numpy_rounded, np.round(values, 3), py)
+
+
+def boost_response(base: Dict[str, np.ndarray], boosts, break_threshold: float):
+    """
+    Replay the arbitrator's SGJG stress injection and PGB buffer for a vector of
+    pattern_boost_multiplier values. base holds (n_charts,) rows from arbitrate_shard;
+    returns rounded (SAI, entropy) arrays of shape (len(boosts), n_charts).
+    """
+    numpy_boost = np.array([isinstance(b, np.generic) for b in boosts])[:, None]
+    boosts = np.asarray(boosts, dtype=float)[:, None]
+    energy_ratio = (base["sg_e"] * boosts) / base["zg_e"]
+    hit = (energy_ratio > break_threshold) & (base["min_dist"] <= 1)
+    bonus = (energy_ratio - break_threshold) * 5.0 + 2.0
+    sai = np.where(hit, base["sai_base"] + bonus, base["sai_base"])
+    entropy = np.where(hit, base["entropy_base"] + bonus * 0.5, base["entropy_base"])
+    sai = sai * (1.0 - base["reinforcement"])
+    entropy = entropy * (1.0 - base["reinforcement"] * 0.5)
+    numpy_rounded = hit & numpy_boost
+    return _round3(sai, numpy_rounded), _round3(entropy, numpy_rounded)
+
+
+def _apply_registry_consts(registry_consts):
+    # Carry volatile registry updates (e.g. a fine-tuned BREAKING_MODULUS) into the worker
+    for pattern_id, consts in registry_consts.items():
+        for key, value in consts.items():
+            PatternRegistry.update_const(pattern_id, key, value)
+
+
+def _run_shard(task):
+    charts, contexts = task
+    return arbitrate_shard(worker_framework(), charts, contexts)
+
 
 class PatternPhysicsLab:
     """
     🏗️ PatternPhysicsLab (ASE Phase 5)
-    
+
     Performs sensitivity sweeps and phase transition analysis
     on specific Bazi topological patterns.
+
+    Sweeps are batched: a boost sweep arbitrates each chart once and replays the
+    boost-dependent SGJG term for the whole value vector in numpy; other parameters
+    reach the influence bus, so every (value, chart) cell is arbitrated, with chart
+    shards fanned out over a process pool when n_workers > 1. Results match the
+    per-value loop exactly.
     """
-    
+
     def __init__(self, framework: QuantumUniversalFramework):
         self.framework = framework
         self.logger = logging.getLogger("PatternPhysicsLab")
 
-    def fine_tune_sgjg(self, charts: List[List[str]], 
-                        progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+    def _evaluate(self, charts: List[List[str]], contexts: List[Dict[str, Any]],
+                  n_workers: int = 1) -> Dict[str, np.ndarray]:
+        """arbitrate_shard over all charts, sharded and optionally parallel"""
+        shards = [charts[i:i + SHARD_SIZE] for i in range(0, len(charts), SHARD_SIZE)]
+        if not shards:
+            return arbitrate_shard(self.framework, [], contexts)
+        if n_workers > 1 and len(shards) > 1:
+            registry_consts = {"SHANG_GUAN_JIAN_GUAN": dict(PatternRegistry.SGJG_CONST)}
+            try:
+                with ProcessPoolExecutor(max_workers=n_workers, initializer=init_worker,
+                                         initargs=(type(self.framework), _apply_registry_consts,
+                                                   (registry_consts,))) as pool:
+                    parts = list(pool.map(_run_shard, [(shard, contexts) for shard in shards]))
+                return {k: np.concatenate([p[k] for p in parts], axis=1) for k in SHARD_FIELDS}
+            except Exception as e:
+                self.logger.warning(f"Process pool failed ({e}), falling back to serial sweep")
+        parts = [arbitrate_shard(self.framework, shard, contexts) for shard in shards]
+        return {k: np.concatenate([p[k] for p in parts], axis=1) for k in SHARD_FIELDS}
+
+    def sweep_matrix(self, charts: List[List[str]], context: Dict[str, Any], param_key: Optional[str],
+                     values, n_workers: int = 1) -> Dict[str, np.ndarray]:
+        """
+        SAI / Reynolds / entropy for every (value, chart) cell, each of shape (len(values), len(charts)).
+        param_key is the context key being swept (None leaves the context unchanged).
+        """
+        if param_key == "pattern_boost_multiplier":
+            # Only the SGJG bonus depends on the boost: arbitrate once, replay the rest
+            base = {k: v[0] for k, v in self._evaluate(charts, [dict(context)], n_workers).items()}
+            sai, entropy = boost_response(base, values, PatternRegistry.SGJG_CONST["BREAKING_MODULUS"])
+            reynolds = np.broadcast_to(base["reynolds"], sai.shape)
+            return {"sai": sai, "reynolds": reynolds, "entropy": entropy}
+
+        contexts = [{**context, param_key: val} if param_key else dict(context) for val in values]
+        cells = self._evaluate(charts, contexts, n_workers)
+        return {k: cells[k] for k in ("sai", "reynolds", "entropy")}
+
+    def fine_tune_sgjg(self, charts: List[List[str]],
+                        progress_callback: Optional[Callable] = None,
+                        step: float = 0.1, max_charts: Optional[int] = 500,
+                        n_workers: int = 1) -> Dict[str, Any]:
         """
         [PRAGMATIC FINE-TUNING]
         Calculates the Breaking Modulus for SGJG by testing energy ratios.
+
+        The sweep costs one arbitration per chart regardless of step, so step=0.01 over
+        max_charts=None (all charts) is practical.
         """
-        from core.trinity.core.nexus.pattern_registry import PatternRegistry
-        
-        # 1. High-Resolution Energy Sweep (0.5 to 2.5 with 0.1 step for speed in lab, 0.01 is too slow for 20k charts)
-        # We simulate the 0.01 precision by interpolating or using a smaller representative batch
-        test_range = np.arange(0.5, 2.5, 0.1) 
+        # 1. Energy Sweep (0.5 to 2.5)
+        test_range = np.arange(0.5, 2.5, step)
         breaking_points = []
-        
-        # We only take a subset if N is too large for real-time fine-tuning
-        sample_charts = charts[:500] if len(charts) > 500 else charts
-        
+
+        sample_charts = charts[:max_charts] if max_charts is not None else charts
+
+        # Mock high-energy injection to find the breaking point
+        cells = self.sweep_matrix(sample_charts, {"damping_override": 0.3}, "pattern_boost_multiplier",
+                                  test_range, n_workers)
+
         for idx, ratio in enumerate(test_range):
-            stresses = []
-            for chart in sample_charts:
-                # Mock high-energy injection to find the breaking point
-                ctx = {"pattern_boost_multiplier": ratio, "damping_override": 0.3}
-                report = self.framework.arbitrate_bazi(chart, current_context=ctx)
-                stresses.append(report.get("physics", {}).get("stress", {}).get("SAI", 0))
-            
-            avg_sai = np.mean(stresses)
+            avg_sai = np.mean(cells["sai"][idx])
             if avg_sai > 2.8: # Empirical breaking threshold
                 breaking_points.append(ratio)
-                
+
             if progress_callback:
                 progress_callback(idx + 1, len(test_range), {"val": ratio, "avg_sai": avg_sai})
 
         # 2. Extract Constant
         breaking_modulus = np.min(breaking_points) if breaking_points else 1.25
-        
+
         # 3. Update Registry (Volatile update for current session)
         PatternRegistry.update_const("SHANG_GUAN_JIAN_GUAN", "BREAKING_MODULUS", breaking_modulus)
-        
+
         return {
             "breaking_modulus": f"{breaking_modulus:.2f}",
             "damping_sensitivity": 0.88, # Calibrated from sweep
@@ -60,59 +185,45 @@ class PatternPhysicsLab:
             "sample_size": len(sample_charts)
         }
 
-    def sensitivity_sweep(self, charts: List[List[str]], 
-                        param_name: str, 
+    def sensitivity_sweep(self, charts: List[List[str]],
+                        param_name: str,
                         param_range: List[float],
-                        progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+                        progress_callback: Optional[Callable] = None,
+                        max_charts: Optional[int] = 500,
+                        n_workers: int = 1) -> Dict[str, Any]:
         """
         Runs a sensitivity sweep on a batch of charts across a parameter range.
-        
+
         Args:
             charts: List of Bazi charts for a specific pattern.
-            param_name: Parameter to sweep (e.g., 'damping_override', 'boost_multiplier').
+            param_name: Parameter to sweep ('damping' or 'boost', see SWEEP_PARAMS).
             param_range: List of values to test.
+            max_charts: Sample cap ([V14.1.0] 500 for real-time responsiveness; None sweeps every chart).
+            n_workers: > 1 arbitrates chart shards over a process pool.
         """
         results = []
-        
-        # [V14.1.0] Pragmatic Limit: 500 samples for real-time responsiveness
-        sample_charts = charts[:500] if len(charts) > 500 else charts
-        
+
+        sample_charts = charts[:max_charts] if max_charts is not None else charts
+        cells = self.sweep_matrix(sample_charts, SWEEP_CONTEXT, SWEEP_PARAMS.get(param_name),
+                                  param_range, n_workers)
+
         for p_idx, p_val in enumerate(param_range):
-            batch_metrics = {"sai": [], "reynolds": [], "entropy": []}
-            
-            for chart in sample_charts:
-                ctx = {
-                    "luck_pillar": "甲子",
-                    "annual_pillar": "甲子",
-                    "scenario": "SENSITIVITY_SWEEP"
-                }
-                
-                # Dynamic context mapping
-                if param_name == "damping":
-                    ctx["damping_override"] = p_val
-                elif param_name == "boost":
-                    ctx["pattern_boost_multiplier"] = p_val # Custom hook for lab
-                
-                report = self.framework.arbitrate_bazi(chart, current_context=ctx)
-                phy = report.get("physics", {})
-                batch_metrics["sai"].append(phy.get("stress", {}).get("SAI", 0))
-                batch_metrics["reynolds"].append(phy.get("wealth", {}).get("Reynolds", 0))
-                batch_metrics["entropy"].append(phy.get("entropy", 0))
-            
+            sai = cells["sai"][p_idx]
+
             # Aggregate stats for this parameter value
             summary = {
                 "val": p_val,
-                "avg_sai": np.mean(batch_metrics["sai"]),
-                "max_sai": np.max(batch_metrics["sai"]),
-                "avg_re": np.mean(batch_metrics["reynolds"]),
-                "avg_entropy": np.mean(batch_metrics["entropy"]),
-                "singularity_rate": sum(1 for s in batch_metrics["sai"] if s > 3.0) / len(sample_charts)
+                "avg_sai": np.mean(sai),
+                "max_sai": np.max(sai),
+                "avg_re": np.mean(cells["reynolds"][p_idx]),
+                "avg_entropy": np.mean(cells["entropy"][p_idx]),
+                "singularity_rate": int(np.count_nonzero(sai > 3.0)) / len(sample_charts)
             }
             results.append(summary)
-            
+
             if progress_callback:
                 progress_callback(p_idx + 1, len(param_range), summary)
-                
+
         # Identify Phase Transition Point
         # Logic: Where the derivative of SAI or Entropy is maximum
         transition_point = None
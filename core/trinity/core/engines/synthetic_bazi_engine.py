@@ -3,6 +3,8 @@ import logging
 from typing import List, Generator, Tuple, Dict, Any
 import random
 
+from core.online_stats import DensityGrid2D, ReservoirSampler, StreamingSummary, TopK
+
 STEMS = "甲乙丙丁戊己庚辛壬癸"
 BRANCHES = "子丑寅卯辰巳午未申酉戌亥"
 JIA_ZI = [STEMS[i % 10] + BRANCHES[i % 12] for i in range(60)]
@@ -18,6 +20,7 @@ class SyntheticBaziEngine:
     STEMS = STEMS
     BRANCHES = BRANCHES
     JIA_ZI = JIA_ZI
+    TOTAL_COMBINATIONS = 60 * 12 * 60 * 12
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -50,20 +53,48 @@ class SyntheticBaziEngine:
         
         return cls.STEMS[hour_stem_idx] + cls.BRANCHES[hour_branch_idx]
 
-    def generate_all_bazi(self) -> Generator[List[str], None, None]:
+    @classmethod
+    def chart_at(cls, uid: int) -> List[str]:
+        """The uid-th chart in generate_all_bazi() order"""
+        y_idx, rest = divmod(uid, 12 * 60 * 12)
+        m_idx, rest = divmod(rest, 60 * 12)
+        d_idx, h_idx = divmod(rest, 12)
+        year_pillar, day_pillar = cls.JIA_ZI[y_idx], cls.JIA_ZI[d_idx]
+        return [year_pillar, cls.get_month_pillar(year_pillar[0], m_idx + 1),
+                day_pillar, cls.get_hour_pillar(day_pillar[0], h_idx)]
+
+    @classmethod
+    def uid_of(cls, chart: List[str]) -> int:
+        """Inverse of chart_at (month/hour indices come from their branches)"""
+        y_idx = cls.JIA_ZI.index(chart[0])
+        m_idx = (cls.BRANCHES.index(chart[1][1]) - 2) % 12
+        d_idx = cls.JIA_ZI.index(chart[2])
+        h_idx = cls.BRANCHES.index(chart[3][1])
+        return ((y_idx * 12 + m_idx) * 60 + d_idx) * 12 + h_idx
+
+    def generate_all_bazi(self, start: int = 0) -> Generator[List[str], None, None]:
         """
         Generates all 518,400 Bazi combinations.
         Order: Year -> Month -> Day -> Hour
+        start: index of the first combination to yield (used to resume streaming audits)
         """
-        for year_pillar in self.JIA_ZI:
+        y0, rest = divmod(start, 12 * 60 * 12)
+        m0, rest = divmod(rest, 60 * 12)
+        d0, h0 = divmod(rest, 12)
+        for y_idx in range(y0, len(self.JIA_ZI)):
+            year_pillar = self.JIA_ZI[y_idx]
             y_stem = year_pillar[0]
-            for m_idx in range(1, 13):
+            for m_idx in range(m0 + 1, 13):
                 month_pillar = self.get_month_pillar(y_stem, m_idx)
-                for day_pillar in self.JIA_ZI:
+                for d_idx in range(d0, len(self.JIA_ZI)):
+                    day_pillar = self.JIA_ZI[d_idx]
                     d_stem = day_pillar[0]
-                    for h_idx in range(12):
+                    for h_idx in range(h0, 12):
                         hour_pillar = self.get_hour_pillar(d_stem, h_idx)
                         yield [year_pillar, month_pillar, day_pillar, hour_pillar]
+                    h0 = 0
+                d0 = 0
+            m0 = 0
 
     def generate_sample_variants(self, count: int = 1000) -> List[Dict[str, Any]]:
         """
@@ -95,23 +126,38 @@ class SyntheticBaziEngine:
                 break
         return samples
 
+def sai_reynolds_grid() -> DensityGrid2D:
+    """SAI x Reynolds phase grid; log1p bins cover the heavy tails (SAI p99 ~12, Reynolds p99 ~400)"""
+    return DensityGrid2D((0.0, 100.0), (0.0, 5000.0), bins=(48, 48), scale="log1p",
+                         x_label="SAI", y_label="Reynolds")
+
+
 class ExpectedValueCollector:
     """
     📊 ExpectedValueCollector
     
     Aggregates physical metrics from ASE batch runs to define the Statistical Baseline.
+
+    Memory is fixed regardless of batch size: each metric is a StreamingSummary (exact
+    mean/stdev/skewness, t-digest quartiles), singularities are kept as a uniform reservoir
+    sample plus top-k heaps by SAI and Reynolds (``singularity_count`` still counts every hit),
+    and every sample lands in an SAI x Reynolds density grid. Collectors from parallel shards
+    combine with ``merge``.
     """
-    
-    def __init__(self):
-        self.metrics = {
-            "SAI": [],
-            "IC": [],
-            "Entropy": [],
-            "Reynolds": [],
-            "Binding_Energy": [],
-            "Vibration_Impedance": []
-        }
-        self.singularities = []
+
+    METRICS = ("SAI", "IC", "Entropy", "Reynolds", "Binding_Energy", "Vibration_Impedance")
+    SINGULARITY_CAPACITY = 5000
+    TOP_K = 50
+
+    def __init__(self, singularity_capacity: int = SINGULARITY_CAPACITY, seed: int = None, top_k: int = TOP_K):
+        self.metrics = {key: StreamingSummary() for key in self.METRICS}
+        self.singularity_sample = ReservoirSampler(singularity_capacity, seed=seed)
+        self.top_singularities = {"SAI": TopK(top_k), "Reynolds": TopK(top_k)}
+        self.phase_grid = sai_reynolds_grid()
+
+    @property
+    def singularities(self) -> List[Dict[str, Any]]:
+        return self.singularity_sample.items
 
     def collect(self, report: Dict[str, Any]):
         phy = report.get("physics", {})
@@ -119,30 +165,70 @@ class ExpectedValueCollector:
         wealth = phy.get("wealth", {})
         rel = phy.get("relationship", {})
         vib = phy.get("vibration", {})
-        
-        self.metrics["SAI"].append(stress.get("SAI", 0))
-        self.metrics["IC"].append(stress.get("IC", 0))
-        self.metrics["Entropy"].append(phy.get("entropy", 0))
-        self.metrics["Reynolds"].append(wealth.get("Reynolds", 0))
-        self.metrics["Binding_Energy"].append(rel.get("Binding_Energy", 0))
-        self.metrics["Vibration_Impedance"].append(vib.get("impedance_magnitude", 0))
-        
-        if stress.get("SAI", 0) > 2.0 or wealth.get("Reynolds", 0) > 4000:
-            self.singularities.append({
+
+        sai = stress.get("SAI", 0) or 0
+        reynolds = wealth.get("Reynolds", 0) or 0
+        self.metrics["SAI"].add(sai)
+        self.metrics["IC"].add(stress.get("IC", 0) or 0)
+        self.metrics["Entropy"].add(phy.get("entropy", 0) or 0)
+        self.metrics["Reynolds"].add(reynolds)
+        self.metrics["Binding_Energy"].add(rel.get("Binding_Energy", 0) or 0)
+        self.metrics["Vibration_Impedance"].add(vib.get("impedance_magnitude", 0) or 0)
+        self.phase_grid.add(sai, reynolds)
+
+        if sai > 2.0 or reynolds > 4000:
+            hit = {
                 "chart": report.get("meta", {}).get("chart"),
                 "SAI": stress.get("SAI"),
                 "Reynolds": wealth.get("Reynolds")
-            })
+            }
+            self.singularity_sample.add(hit)
+            self.top_singularities["SAI"].add(sai, hit)
+            self.top_singularities["Reynolds"].add(reynolds, hit)
+
+    def merge(self, other: "ExpectedValueCollector") -> "ExpectedValueCollector":
+        """Combine the partial results of two shards"""
+        merged = ExpectedValueCollector(self.singularity_sample.capacity, top_k=self.top_singularities["SAI"].k)
+        merged.metrics = {key: self.metrics[key].merge(other.metrics[key]) for key in self.METRICS}
+        merged.singularity_sample = self.singularity_sample.merge(other.singularity_sample)
+        merged.top_singularities = {key: heap.merge(other.top_singularities[key])
+                                    for key, heap in self.top_singularities.items()}
+        merged.phase_grid = self.phase_grid.merge(other.phase_grid)
+        return merged
+
+    def state_dict(self) -> Dict[str, Any]:
+        """Serializable collector state (for audit checkpoints)"""
+        return {"metrics": {k: v.state_dict() for k, v in self.metrics.items()},
+                "singularities": self.singularity_sample.state_dict(),
+                "top_singularities": {k: v.state_dict() for k, v in self.top_singularities.items()},
+                "phase_grid": self.phase_grid.state_dict()}
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        for key, vals in state.get("metrics", {}).items():
+            if key in self.metrics:
+                self.metrics[key].load_state_dict(vals)
+        self.singularity_sample.load_state_dict(state.get("singularities", {}))
+        for key, vals in state.get("top_singularities", {}).items():
+            if key in self.top_singularities:
+                self.top_singularities[key].load_state_dict(vals)
+        self.phase_grid.load_state_dict(state.get("phase_grid", {}))
 
     def get_summary(self) -> Dict[str, Any]:
         summary = {}
-        for key, vals in self.metrics.items():
-            if not vals: continue
+        for key, metric in self.metrics.items():
+            if not metric.count: continue
+            stats = metric.to_dict()
             summary[key] = {
-                "mean": sum(vals) / len(vals),
-                "max": max(vals),
-                "min": min(vals),
-                "stdev": (sum((x - (sum(vals)/len(vals)))**2 for x in vals) / len(vals))**0.5
+                "mean": stats["mean"],
+                "max": stats["max"],
+                "min": stats["min"],
+                "stdev": stats["std"],
+                "skewness": stats["skewness"],
+                "q1": stats["q1"],
+                "median": stats["median"],
+                "q3": stats["q3"],
+                "lower_bound": stats["lower_bound"],
+                "upper_bound": stats["upper_bound"]
             }
-        summary["singularity_count"] = len(self.singularities)
+        summary["singularity_count"] = self.singularity_sample.seen
         return summary
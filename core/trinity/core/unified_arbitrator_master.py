@@ -7,19 +7,13 @@ from datetime import datetime
 from typing import Dict, Any, List, Optional
 
 # --- Core Engine Imports ---
-from core.trinity.core.engines.quantum_dispersion import QuantumDispersionEngine
-from core.trinity.core.assets.pillar_gravity_engine import PillarGravityEngine
-from core.trinity.core.assets.resonance_booster import ResonanceBooster
-# [V13.7 升级] 使用 V13.7 版本的物理引擎
-from core.trinity.core.engines.spacetime_inertia_v13_7 import SpacetimeInertiaEngineV13_7
-from core.trinity.core.engines.structural_stress import StructuralStressEngine
+# [V9.4 Performance] 仅在 QuantumUniversalFramework 中使用的子引擎改为 LazyEngine 按需导入与构造
+from core.lazy_loader import LazyEngine
+from core.tracing import get_tracer, traced
 from core.trinity.core.engines.wealth_fluid_v13_7 import WealthFluidEngineV13_7
 from core.trinity.core.engines.relationship_gravity_v13_7 import RelationshipGravityEngineV13_7
 # [NEW] Integrated Assets
 from core.trinity.core.intelligence.symbolic_stars import SymbolicStarsEngine
-from core.trinity.core.assets.combination_phase_logic import CombinationPhaseEngine
-from core.processors.geo import GeoProcessor
-from core.trinity.core.engines.resonance_field import ResonanceField
 from core.trinity.core.engines.structural_vibration import StructuralVibrationEngine
 from core.trinity.core.intelligence.logic_arbitrator import LogicArbitrator
 from core.trinity.core.physics.wave_laws import WaveState
@@ -53,42 +47,40 @@ class QuantumUniversalFramework:
     Orchestrates all physics modules to generate a 'Holographic' verdict.
     """
     
+    # 1. Sub-Engines（首次访问时才导入并构造，见 core.lazy_loader.LazyEngine）
+    dispersion_engine = LazyEngine("core.trinity.core.engines.quantum_dispersion:QuantumDispersionEngine")
+    gravity_engine = LazyEngine("core.trinity.core.assets.pillar_gravity_engine:PillarGravityEngine")
+    resonance_booster = LazyEngine("core.trinity.core.assets.resonance_booster:ResonanceBooster")
+    # [V13.7 升级] 使用 V13.7 版本的时空惯性引擎（支持 InfluenceBus）
+    inertia_engine = LazyEngine("core.trinity.core.engines.spacetime_inertia_v13_7:SpacetimeInertiaEngineV13_7", tau=3.0)
+    stress_engine = LazyEngine("core.trinity.core.engines.structural_stress:StructuralStressEngine")
+    combo_engine = LazyEngine("core.trinity.core.assets.combination_phase_logic:CombinationPhaseEngine")
+    # GeoProcessor needs no args usually, assuming it loads internal json
+    geo_processor = LazyEngine("core.processors.geo:GeoProcessor")
+    resonance_field = LazyEngine("core.trinity.core.engines.resonance_field:ResonanceField")
+
+    # [V13.7 补齐] V13.7 物理引擎
+    # MOD_14: 多维时空场耦合
+    spacetime_interference_engine = LazyEngine(
+        "core.trinity.core.engines.spacetime_interference_v13_7:SpacetimeInterferenceEngineV13_7")
+    # MOD_16: 应期预测
+    temporal_prediction_engine = LazyEngine(
+        "core.trinity.core.engines.temporal_prediction_v13_7:TemporalPredictionEngineV13_7")
+    # MOD_07: 生命轨道
+    lifepath_engine = LazyEngine(
+        "core.trinity.core.engines.lifepath_resampling_v13_7:LifepathResamplingEngineV13_7")
+    # MOD_18: 全局干涉
+    global_interference_engine = LazyEngine(
+        "core.trinity.core.engines.global_interference_v13_7:GlobalInterferenceEngineV13_7")
+
+    # Standardized Framework Utility: Destiny Translator (Default to Stephen Chow style)
+    translator = LazyEngine(DestinyTranslator, style=TranslationStyle.STEPHEN_CHOW)
+
     def __init__(self):
         self.registry = LogicRegistry()
         logger.info(f"🏛️ Initializing Quantum Universal Framework [V{self.registry.version}]")
-        
-        # 1. Initialize Sub-Engines
-        self.dispersion_engine = QuantumDispersionEngine()
-        self.gravity_engine = PillarGravityEngine()
-        self.resonance_booster = ResonanceBooster()
-        # [V13.7 升级] 使用 V13.7 版本的时空惯性引擎（支持 InfluenceBus）
-        self.inertia_engine = SpacetimeInertiaEngineV13_7(tau=3.0)
-        self.stress_engine = StructuralStressEngine()
-        self.combo_engine = CombinationPhaseEngine()
-        # GeoProcessor needs no args usually, assuming it loads internal json
-        self.geo_processor = GeoProcessor()
-        self.resonance_field = ResonanceField()
-        
-        # [V13.7 补齐] 初始化 V13.7 物理引擎
-        # MOD_14: 多维时空场耦合
-        from core.trinity.core.engines.spacetime_interference_v13_7 import SpacetimeInterferenceEngineV13_7
-        self.spacetime_interference_engine = SpacetimeInterferenceEngineV13_7()
-        
-        # MOD_16: 应期预测
-        from core.trinity.core.engines.temporal_prediction_v13_7 import TemporalPredictionEngineV13_7
-        self.temporal_prediction_engine = TemporalPredictionEngineV13_7()
-        
-        # MOD_07: 生命轨道
-        from core.trinity.core.engines.lifepath_resampling_v13_7 import LifepathResamplingEngineV13_7
-        self.lifepath_engine = LifepathResamplingEngineV13_7()
-        
-        # MOD_18: 全局干涉
-        from core.trinity.core.engines.global_interference_v13_7 import GlobalInterferenceEngineV13_7
-        self.global_interference_engine = GlobalInterferenceEngineV13_7()
         # 60 甲子空亡映射（按旬空公式生成）
         self._void_table = self._build_void_table()
-        # Standardized Framework Utility: Destiny Translator (Default to Stephen Chow style)
-        self.translator = DestinyTranslator(style=TranslationStyle.STEPHEN_CHOW)
 
     @staticmethod
     def _build_void_table() -> Dict[str, List[str]]:
@@ -284,12 +276,15 @@ class QuantumUniversalFramework:
 
         return bus
         
+    @traced("arbitrate_bazi")
     def arbitrate_bazi(self, bazi_chart: List[str], birth_info: Optional[Dict[str, Any]] = None, current_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Executes the full physics pipeline on a Bazi chart.
+        Each stage is timed as an "arbitrate.<stage>" span (core/tracing.py; no-op unless tracing is enabled).
         """
         if not bazi_chart or len(bazi_chart) < 4:
             return {"error": "Invalid Chart Data"}
+        tracer = get_tracer()
 
         # Context Defaults
         ctx = current_context or {}
@@ -300,12 +295,13 @@ class QuantumUniversalFramework:
         scenario_str = ctx.get('scenario', 'GENERAL')
         
         # Create Context Snapshot (Phase 8: Context-Aware State Machine)
-        context = ContextInjector.create_from_request(
-            luck_pillar=luck,
-            annual_pillar=annual,
-            geo_city=geo_city,
-            scenario=scenario_str
-        )
+        with tracer.span("arbitrate.context"):
+            context = ContextInjector.create_from_request(
+                luck_pillar=luck,
+                annual_pillar=annual,
+                geo_city=geo_city,
+                scenario=scenario_str
+            )
 
         # Extract stems/branches
         try:
@@ -324,8 +320,9 @@ class QuantumUniversalFramework:
             return {"error": "Chart Parsing Failed"}
 
         # Load active rules/modules for later cross-check
-        manifest_rules = self.registry.get_all_active_rules()
-        manifest_modules = {m['id']: m for m in self.registry.get_active_modules()}
+        with tracer.span("arbitrate.registry"):
+            manifest_rules = self.registry.get_all_active_rules()
+            manifest_modules = {m['id']: m for m in self.registry.get_active_modules()}
 
         # --- PHASE 1: Base Physics (Environment) ---
         all_pillars = bazi_chart + [luck, annual]
@@ -336,123 +333,134 @@ class QuantumUniversalFramework:
         geo_factor = ctx.get('geo_factor', 1.0)
         
         # 1.1 Quantum Dispersion (Substrate)
-        substrate_field = self.dispersion_engine.get_dynamic_weights(month_branch, phase_progress)
+        with tracer.span("arbitrate.dispersion"):
+            substrate_field = self.dispersion_engine.get_dynamic_weights(month_branch, phase_progress)
 
         # 1.2 Pillar Gravity (Weights)
-        gravity_weights = self.gravity_engine.calculate_dynamic_weights(phase_progress)
+        with tracer.span("arbitrate.gravity"):
+            gravity_weights = self.gravity_engine.calculate_dynamic_weights(phase_progress)
 
         # 1.3 Void Shielding (Simple Logic)
-        void_branches: List[str] = []
-        is_void = False
-        try:
-            day_pillar = bazi_chart[2]
-            void_branches = self._get_void_branches_60(day_pillar)
-            is_void = any(br in void_branches for br in all_branches)
-        except Exception:
+        with tracer.span("arbitrate.void"):
+            void_branches: List[str] = []
             is_void = False
-        void_shield_factor = 0.45 if is_void else 1.0
+            try:
+                day_pillar = bazi_chart[2]
+                void_branches = self._get_void_branches_60(day_pillar)
+                is_void = any(br in void_branches for br in all_branches)
+            except Exception:
+                is_void = False
+            void_shield_factor = 0.45 if is_void else 1.0
 
         # 1.4 GEO Correction - Use passed geo_factor if available, otherwise lookup
-        ctx_data = ctx.get('data', {})
-        passed_geo_factor = ctx_data.get('geo_factor')
-        passed_geo_element = ctx_data.get('geo_element', 'Neutral')
-        
-        if passed_geo_factor is not None:
-            # Use directly passed geo info from UI
-            geo_modifiers = {
-                'desc': f"{geo_city} - {passed_geo_element}",
-                'temperature_factor': passed_geo_factor,
-                'humidity_factor': 1.0,
-                'environment_bias': f"地理因子: {passed_geo_factor:.2f}x | 五行亲和: {passed_geo_element}",
-                'fire': passed_geo_factor if 'Fire' in passed_geo_element else 1.0,
-                'water': passed_geo_factor if 'Water' in passed_geo_element else 1.0,
-                'wood': passed_geo_factor if 'Wood' in passed_geo_element else 1.0,
-                'metal': passed_geo_factor if 'Metal' in passed_geo_element else 1.0,
-                'earth': passed_geo_factor if 'Earth' in passed_geo_element else 1.0
-            }
-        else:
-            # Fallback to GeoProcessor lookup
-            geo_modifiers = self.geo_processor.process(geo_city)
+        with tracer.span("arbitrate.geo"):
+            ctx_data = ctx.get('data', {})
+            passed_geo_factor = ctx_data.get('geo_factor')
+            passed_geo_element = ctx_data.get('geo_element', 'Neutral')
+        
+            if passed_geo_factor is not None:
+                # Use directly passed geo info from UI
+                geo_modifiers = {
+                    'desc': f"{geo_city} - {passed_geo_element}",
+                    'temperature_factor': passed_geo_factor,
+                    'humidity_factor': 1.0,
+                    'environment_bias': f"地理因子: {passed_geo_factor:.2f}x | 五行亲和: {passed_geo_element}",
+                    'fire': passed_geo_factor if 'Fire' in passed_geo_element else 1.0,
+                    'water': passed_geo_factor if 'Water' in passed_geo_element else 1.0,
+                    'wood': passed_geo_factor if 'Wood' in passed_geo_element else 1.0,
+                    'metal': passed_geo_factor if 'Metal' in passed_geo_element else 1.0,
+                    'earth': passed_geo_factor if 'Earth' in passed_geo_element else 1.0
+                }
+            else:
+                # Fallback to GeoProcessor lookup
+                geo_modifiers = self.geo_processor.process(geo_city)
         
         # --- PHASE 2: Micro-Structures (Internal) ---
         # 2.1 Structural Stress (SAI/IC)
-        self.stress_engine.day_master = current_dm
-        stress_report = self.stress_engine.calculate_micro_lattice_defects(all_branches, month_branch)
+        with tracer.span("arbitrate.stress"):
+            self.stress_engine.day_master = current_dm
+            stress_report = self.stress_engine.calculate_micro_lattice_defects(all_branches, month_branch)
         
         # 2.2 Symbolic Stars (Tian Yi / Wen Chang / Lu / Yang Ren / Peach / Horse)
-        year_branch = bazi_chart[0][1] if bazi_chart and len(bazi_chart[0]) >= 2 else None
-        star_stats = SymbolicStarsEngine.analyze_stars(current_dm, all_branches, year_branch=year_branch)
-        star_phys = SymbolicStarsEngine.get_physical_modifiers(star_stats)
+        with tracer.span("arbitrate.stars"):
+            year_branch = bazi_chart[0][1] if bazi_chart and len(bazi_chart[0]) >= 2 else None
+            star_stats = SymbolicStarsEngine.analyze_stars(current_dm, all_branches, year_branch=year_branch)
+            star_phys = SymbolicStarsEngine.get_physical_modifiers(star_stats)
         
         # 2.3 Combination Phase (He Hua)
         # Check interactions between stems (e.g. Month Stem + Day Stem)
-        m_stem = bazi_chart[1][0]
-        combo_res = {}
-        try:
-            dm_stem = current_dm
-            month_energy = gravity_weights.get('Month', 0.5)
-            combo_res = self.combo_engine.check_combination_phase([dm_stem, m_stem], month_energy)
-        except Exception:
+        with tracer.span("arbitrate.combo"):
+            m_stem = bazi_chart[1][0]
             combo_res = {}
+            try:
+                dm_stem = current_dm
+                month_energy = gravity_weights.get('Month', 0.5)
+                combo_res = self.combo_engine.check_combination_phase([dm_stem, m_stem], month_energy)
+            except Exception:
+                combo_res = {}
 
         # --- PHASE 3: Power Dynamics (Energy) ---
         # [V13.5] Initialize Influence Bus
-        influence_bus = self._build_influence_bus(ctx, geo_modifiers)
+        with tracer.span("arbitrate.influence_bus"):
+            influence_bus = self._build_influence_bus(ctx, geo_modifiers)
         
         # 3.1 Resonance Gain (Rooting)
         # Pass influence_bus to MOD_10
-        rooting_status = self.resonance_booster.calculate_resonance_gain(
-            current_dm, all_branches, influence_bus=influence_bus
-        )
+        with tracer.span("arbitrate.resonance"):
+            rooting_status = self.resonance_booster.calculate_resonance_gain(
+                current_dm, all_branches, influence_bus=influence_bus
+            )
         
         # [NEW] 3.2 Wealth Fluid Dynamics (Navier-Stokes)
         # 3.2.1 Reconstruct Base Elemental Waves (NATAL ONLY)
-        from core.trinity.core.nexus.definitions import BaziParticleNexus
-        elem_map = {e: 0.0 for e in ['Wood', 'Fire', 'Earth', 'Metal', 'Water']}
+        with tracer.span("arbitrate.wealth_fluid"):
+            from core.trinity.core.nexus.definitions import BaziParticleNexus
+            elem_map = {e: 0.0 for e in ['Wood', 'Fire', 'Earth', 'Metal', 'Water']}
             
-        for p in bazi_chart:
-            # Stems
-            s_elem = BaziParticleNexus.STEMS.get(p[0])[0]
-            elem_map[s_elem] = elem_map.get(s_elem, 0) + 1.0
+            for p in bazi_chart:
+                # Stems
+                s_elem = BaziParticleNexus.STEMS.get(p[0])[0]
+                elem_map[s_elem] = elem_map.get(s_elem, 0) + 1.0
             
-            # Branches
-            hidden_stems = BaziParticleNexus.get_branch_weights(p[1])
-            for h_stem, h_weight in hidden_stems:
-                 h_elem = BaziParticleNexus.STEMS.get(h_stem)[0]
-                 elem_map[h_elem] = elem_map.get(h_elem, 0) + (h_weight * 0.15)
-
-        # 3.2.2 Create WaveStates for the Bus
-        from core.trinity.core.nexus.definitions import PhysicsConstants
-        waves_natal = {
-            k: WaveState(amplitude=v, phase=PhysicsConstants.ELEMENT_PHASES.get(k, 0.0)) 
-            for k, v in elem_map.items()
-        }
+                # Branches
+                hidden_stems = BaziParticleNexus.get_branch_weights(p[1])
+                for h_stem, h_weight in hidden_stems:
+                     h_elem = BaziParticleNexus.STEMS.get(h_stem)[0]
+                     elem_map[h_elem] = elem_map.get(h_elem, 0) + (h_weight * 0.15)
 
-        # 3.2.3 [V13.5] Apply Influence Bus Correction
-        # This replaces the hardcoded Luck/Annual/Geo logic with plug-and-play factors
-        bus_verdict = influence_bus.arbitrate_environment(waves_natal, ctx)
-        corrected_e = bus_verdict["expectation"]
-        
-        # Sync corrected amplitudes back to waves
-        waves_corrected = {}
-        for k, v in waves_natal.items():
-            amplitude = corrected_e.elements.get(k.lower(), v.amplitude)
-            waves_corrected[k] = WaveState(amplitude=amplitude, phase=v.phase)
-        
-        # 3.2.4 Wealth Analysis
-        # [V13.7 升级] 使用 V13.7 版本的财富流体引擎（纳维-斯托克斯方程）
-        dm_elem = BaziParticleNexus.STEMS.get(current_dm)[0]
-        wealth_engine = WealthFluidEngineV13_7(dm_elem)
-        wealth_metrics = wealth_engine.analyze_flow(waves_corrected, influence_bus=influence_bus)
+            # 3.2.2 Create WaveStates for the Bus
+            from core.trinity.core.nexus.definitions import PhysicsConstants
+            waves_natal = {
+                k: WaveState(amplitude=v, phase=PhysicsConstants.ELEMENT_PHASES.get(k, 0.0)) 
+                for k, v in elem_map.items()
+            }
+
+            # 3.2.3 [V13.5] Apply Influence Bus Correction
+            # This replaces the hardcoded Luck/Annual/Geo logic with plug-and-play factors
+            bus_verdict = influence_bus.arbitrate_environment(waves_natal, ctx)
+            corrected_e = bus_verdict["expectation"]
+        
+            # Sync corrected amplitudes back to waves
+            waves_corrected = {}
+            for k, v in waves_natal.items():
+                amplitude = corrected_e.elements.get(k.lower(), v.amplitude)
+                waves_corrected[k] = WaveState(amplitude=amplitude, phase=v.phase)
+        
+            # 3.2.4 Wealth Analysis
+            # [V13.7 升级] 使用 V13.7 版本的财富流体引擎（纳维-斯托克斯方程）
+            dm_elem = BaziParticleNexus.STEMS.get(current_dm)[0]
+            wealth_engine = WealthFluidEngineV13_7(dm_elem)
+            wealth_metrics = wealth_engine.analyze_flow(waves_corrected, influence_bus=influence_bus)
         
         # [NEW] 3.3 Relationship Gravity
         # [V13.7 升级] 使用 V13.7 版本的情感引力引擎（谐振子摄动模型）
-        gender = birth_info.get('gender', '男') if birth_info else '男'
-        rel_engine = RelationshipGravityEngineV13_7(current_dm, gender)
-        # [V13.7] 通过 InfluenceBus 传递大运、流年、地理信息，支持轨道摄动模型
-        rel_metrics = rel_engine.analyze_relationship(
-            waves_corrected, bazi_chart, influence_bus=influence_bus
-        )
+        with tracer.span("arbitrate.relationship"):
+            gender = birth_info.get('gender', '男') if birth_info else '男'
+            rel_engine = RelationshipGravityEngineV13_7(current_dm, gender)
+            # [V13.7] 通过 InfluenceBus 传递大运、流年、地理信息，支持轨道摄动模型
+            rel_metrics = rel_engine.analyze_relationship(
+                waves_corrected, bazi_chart, influence_bus=influence_bus
+            )
 
         # [V12.2.0] 专旺格 Detection (Self-Dominance Follow Pattern)
         # When DM element > 55% of total energy, it's a self-dominance pattern
@@ -471,9 +479,10 @@ class QuantumUniversalFramework:
 
         # [NEW] 3.4 Resonance Field Analysis
         # Use the engines to get real coherence metrics
-        dm_wave = waves_corrected.get(dm_elem)
-        field_list = [v for k, v in waves_corrected.items() if k != dm_elem]
-        res_analysis = self.resonance_field.evaluate_system(dm_wave, field_list)
+        with tracer.span("arbitrate.resonance_field"):
+            dm_wave = waves_corrected.get(dm_elem)
+            field_list = [v for k, v in waves_corrected.items() if k != dm_elem]
+            res_analysis = self.resonance_field.evaluate_system(dm_wave, field_list)
         
         # [V12.2.0] Override is_follow for 专旺格/从强 cases
         final_is_follow = res_analysis.is_follow or is_self_dominant or is_follow_strong
@@ -496,31 +505,33 @@ class QuantumUniversalFramework:
         
         # [NEW] 3.5 Structural Vibration (MOD_15)
         # Non-linear energy transmission
-        vib_engine = StructuralVibrationEngine(current_dm)
-        # Context for vibration engine (reuse unified context 'ctx')
-        vib_metrics = vib_engine.calculate_vibration_metrics(
-             all_stems, all_branches, context=ctx
-        )
+        with tracer.span("arbitrate.vibration"):
+            vib_engine = StructuralVibrationEngine(current_dm)
+            # Context for vibration engine (reuse unified context 'ctx')
+            vib_metrics = vib_engine.calculate_vibration_metrics(
+                 all_stems, all_branches, context=ctx
+            )
         
         # --- PHASE 4: Temporal Evolution (Flow) ---
         # 4.1 Spacetime Inertia
         # [V13.7 升级] 使用 V13.7 版本的时空惯性引擎（指数衰减模型，支持 InfluenceBus）
         # 将单个值转换为时间序列以适配 V13.7 接口
-        time_months_list = [max(0.0, months_since_switch)]
-        inertia_weights = self.inertia_engine.calculate_inertia_weights(
-            time_months=time_months_list,
-            previous_energy=1.0,
-            influence_bus=influence_bus
-        )
-        # 转换为旧版格式以保持兼容性
-        w_prev = inertia_weights[0] if inertia_weights else (1.0 if months_since_switch < 0 else math.exp(-months_since_switch / 3.0))
-        w_next = 1.0 - w_prev
-        viscosity = 4 * w_prev * w_next
-        inertia_metrics = {
-            "Prev_Luck": round(w_prev, 4),
-            "Next_Luck": round(w_next, 4),
-            "Viscosity": round(viscosity, 4)
-        }
+        with tracer.span("arbitrate.inertia"):
+            time_months_list = [max(0.0, months_since_switch)]
+            inertia_weights = self.inertia_engine.calculate_inertia_weights(
+                time_months=time_months_list,
+                previous_energy=1.0,
+                influence_bus=influence_bus
+            )
+            # 转换为旧版格式以保持兼容性
+            w_prev = inertia_weights[0] if inertia_weights else (1.0 if months_since_switch < 0 else math.exp(-months_since_switch / 3.0))
+            w_next = 1.0 - w_prev
+            viscosity = 4 * w_prev * w_next
+            inertia_metrics = {
+                "Prev_Luck": round(w_prev, 4),
+                "Next_Luck": round(w_next, 4),
+                "Viscosity": round(viscosity, 4)
+            }
 
         # Finalizing physics packet
         stellar_metrics = {
@@ -559,190 +570,201 @@ class QuantumUniversalFramework:
         # --- synthesize Unified State ---
         # 5.1 Probability Wave Correction (Phase 8: Context-Aware Adjustment)
         # Apply GEO Bias and Environmental saturation to core metrics
-        dm_char = current_dm
-        # Get DM element (mock mapping for correction)
-        dm_elem = BaziParticleNexus.STEMS.get(dm_char, ("Earth", "Yang", 5))[0]
-        geo_bias_val = context.geo_bias.get(dm_elem, 1.0)
-        
-        # Calculate System Entropy (Adjusted by context and ASE Social Damping)
-        gamma = ctx.get('damping_override', 0.30)
-        
-        # [ASE PHASE 4] Dynamic Energy Tiers (Supreme Calibration)
-        # Calculate Orbital Flux Integration (Fo) based on natal chart concentration
-        elem_counts = {}
-        for s in all_stems[:4]: # Natal only
-            s_elem = BaziParticleNexus.STEMS.get(s, ("Other",))[0]
-            elem_counts[s_elem] = elem_counts.get(s_elem, 0) + 1
-        
-        # Max element count determines the base energy tier
-        max_concentration = max(elem_counts.values()) if elem_counts else 0
-        is_pattern = max_concentration >= 3
-        
-        # Determine Energy Tier: Normal -> Elite (3) -> Mars (4+)
-        energy_tier = "Normal"
-        if max_concentration == 3: energy_tier = "Elite"
-        elif max_concentration >= 4: energy_tier = "Mars"
+        with tracer.span("arbitrate.synthesis"):
+            dm_char = current_dm
+            # Get DM element (mock mapping for correction)
+            dm_elem = BaziParticleNexus.STEMS.get(dm_char, ("Earth", "Yang", 5))[0]
+            geo_bias_val = context.geo_bias.get(dm_elem, 1.0)
+        
+            # Calculate System Entropy (Adjusted by context and ASE Social Damping)
+            gamma = ctx.get('damping_override', 0.30)
+        
+            # [ASE PHASE 4] Dynamic Energy Tiers (Supreme Calibration)
+            # Calculate Orbital Flux Integration (Fo) based on natal chart concentration
+            elem_counts = {}
+            for s in all_stems[:4]: # Natal only
+                s_elem = BaziParticleNexus.STEMS.get(s, ("Other",))[0]
+                elem_counts[s_elem] = elem_counts.get(s_elem, 0) + 1
+        
+            # Max element count determines the base energy tier
+            max_concentration = max(elem_counts.values()) if elem_counts else 0
+            is_pattern = max_concentration >= 3
+        
+            # Determine Energy Tier: Normal -> Elite (3) -> Mars (4+)
+            energy_tier = "Normal"
+            if max_concentration == 3: energy_tier = "Elite"
+            elif max_concentration >= 4: energy_tier = "Mars"
+        
+            # Forced override for specific Master Jin identified patterns
+            if ctx.get('tier_override') == "Mars": energy_tier = "Mars"
+        
+            gamma = ctx.get('damping_override', 0.30)
+            effective_gamma = gamma
+            pattern_boost = 1.0
+        
+            if energy_tier == "Elite":
+                effective_gamma *= 0.25 # 75% Protection
+                pattern_boost = 2.5     # V13.8 Standard Boost
+            elif energy_tier == "Mars":
+                effective_gamma *= 0.15 # 85% Protection (Supreme)
+                pattern_boost = 4.5     # [SUPREME] Elon Musk Level Boost
+            
+            damp_multiplier = (1.0 - effective_gamma)
         
-        # Forced override for specific Master Jin identified patterns
-        if ctx.get('tier_override') == "Mars": energy_tier = "Mars"
+            # Final Physics Synthesis
+            sai = stress_report.get('SAI', 0) * (2.0 - geo_bias_val) * damp_multiplier * pattern_boost
+            ic = min(1.0, stress_report.get('IC', 0) * geo_bias_val * damp_multiplier * (1.0 / pattern_boost if is_pattern else 1.0))
         
-        gamma = ctx.get('damping_override', 0.30)
-        effective_gamma = gamma
-        pattern_boost = 1.0
-        
-        if energy_tier == "Elite":
-            effective_gamma *= 0.25 # 75% Protection
-            pattern_boost = 2.5     # V13.8 Standard Boost
-        elif energy_tier == "Mars":
-            effective_gamma *= 0.15 # 85% Protection (Supreme)
-            pattern_boost = 4.5     # [SUPREME] Elon Musk Level Boost
-            
-        damp_multiplier = (1.0 - effective_gamma)
-        
-        # Final Physics Synthesis
-        sai = stress_report.get('SAI', 0) * (2.0 - geo_bias_val) * damp_multiplier * pattern_boost
-        ic = min(1.0, stress_report.get('IC', 0) * geo_bias_val * damp_multiplier * (1.0 / pattern_boost if is_pattern else 1.0))
-        
-        # [SUPREME] Apply Pattern Boost to Wealth (Hyper-Flow Induction)
-        if 'Reynolds' in wealth_metrics:
-            wealth_metrics['Reynolds'] *= (pattern_boost if energy_tier != "Normal" else 1.0)
-
-        system_entropy = sai + (1.0 - ic) * 0.5
-        system_entropy *= star_phys.get('entropy_damping', 1.0)
-
-        # --- [V14.0.9] SGJG Pragmatic Stress Injection ---
-        sgjg_stress_bonus = 0.0
-        ten_gods_natal = [BaziParticleNexus.get_shi_shen(p[0], current_dm) for p in bazi_chart]
-        if "伤官" in ten_gods_natal and "正官" in ten_gods_natal:
-            from core.trinity.core.nexus.definitions import PhysicsConstants as PC
-            sg_idx = [i for i, tg in enumerate(ten_gods_natal) if tg == "伤官"]
-            zg_idx = [i for i, tg in enumerate(ten_gods_natal) if tg == "正官"]
+            # [SUPREME] Apply Pattern Boost to Wealth (Hyper-Flow Induction)
+            if 'Reynolds' in wealth_metrics:
+                wealth_metrics['Reynolds'] *= (pattern_boost if energy_tier != "Normal" else 1.0)
+
+            system_entropy = sai + (1.0 - ic) * 0.5
+            system_entropy *= star_phys.get('entropy_damping', 1.0)
+
+            # [V14.1.0] Boost-independent synthesis state: lets PatternPhysicsLab replay the
+            # SGJG / PGB injection below for any pattern_boost_multiplier without re-arbitrating
+            synthesis_base = {"SAI": sai, "entropy": system_entropy, "sgjg": None, "pgb_reinforcement": 0.0}
+
+            # --- [V14.0.9] SGJG Pragmatic Stress Injection ---
+            sgjg_stress_bonus = 0.0
+            ten_gods_natal = [BaziParticleNexus.get_shi_shen(p[0], current_dm) for p in bazi_chart]
+            if "伤官" in ten_gods_natal and "正官" in ten_gods_natal:
+                from core.trinity.core.nexus.definitions import PhysicsConstants as PC
+                sg_idx = [i for i, tg in enumerate(ten_gods_natal) if tg == "伤官"]
+                zg_idx = [i for i, tg in enumerate(ten_gods_natal) if tg == "正官"]
             
-            # Use seasonal matrix for energy (simplified lab logic)
-            s_mult = PC.SEASONAL_MATRIX.get(month_branch, {})
-            def get_e(idx):
-                elem = BaziParticleNexus.STEMS[all_stems[idx]][0]
-                return PC.BASE_SCORE * PC.PILLAR_WEIGHTS.get(['year','month','day','hour'][idx], 1.0) * s_mult.get(elem, 1.0)
+                # Use seasonal matrix for energy (simplified lab logic)
+                s_mult = PC.SEASONAL_MATRIX.get(month_branch, {})
+                def get_e(idx):
+                    elem = BaziParticleNexus.STEMS[all_stems[idx]][0]
+                    return PC.BASE_SCORE * PC.PILLAR_WEIGHTS.get(['year','month','day','hour'][idx], 1.0) * s_mult.get(elem, 1.0)
             
-            sg_e = max([get_e(i) for i in sg_idx])
-            zg_e = max([get_e(i) for i in zg_idx])
+                sg_e = max([get_e(i) for i in sg_idx])
+                zg_e = max([get_e(i) for i in zg_idx])
             
-            # [V14.1.0] Allow dynamic boosting for fine-tuning & live-fire
-            boost = ctx.get("pattern_boost_multiplier", 1.0)
-            energy_ratio = (sg_e * boost) / zg_e
+                # [V14.1.0] Allow dynamic boosting for fine-tuning & live-fire
+                boost = ctx.get("pattern_boost_multiplier", 1.0)
+                energy_ratio = (sg_e * boost) / zg_e
             
-            # Check Proximity
-            min_dist = min([abs(s-z) for s in sg_idx for z in zg_idx])
+                # Check Proximity
+                min_dist = min([abs(s-z) for s in sg_idx for z in zg_idx])
+                synthesis_base["sgjg"] = {"sg_e": sg_e, "zg_e": zg_e, "min_dist": min_dist}
             
-            # Apply Breaking Modulus from Registry
-            break_threshold = PatternRegistry.SGJG_CONST["BREAKING_MODULUS"]
-            if energy_ratio > break_threshold and min_dist <= 1:
-                # Non-linear stress jump at the singularity point
-                sgjg_stress_bonus = (energy_ratio - break_threshold) * 5.0 + 2.0
-                sai += sgjg_stress_bonus
-                system_entropy += sgjg_stress_bonus * 0.5
-                logger.info(f"🔥 [SGJG SINGULARITY] Ratio {energy_ratio:.2f} > {break_threshold} | Stress +{sgjg_stress_bonus:.2f}")
-
-        # --- [V14.0.9] PGB Stress Buffer (Fingerprint Reinforcement) ---
-        has_fingerprint = False
-        # Check for Yin-Xing (Resource) as a buffer
-        if "正印" in ten_gods_natal or "偏印" in ten_gods_natal:
-            has_fingerprint = True
-            reinforcement = PatternRegistry.PGB_STRESS_BUFFER["REINFORCEMENT_GAIN"]
-            sai *= (1.0 - reinforcement)
-            system_entropy *= (1.0 - reinforcement * 0.5)
-            logger.info(f"🛡️ [PGB BUFFER] Fingerprint: YIN_XING_HUA_SHA | SAI Reinforcement {reinforcement*100}%")
+                # Apply Breaking Modulus from Registry
+                break_threshold = PatternRegistry.SGJG_CONST["BREAKING_MODULUS"]
+                if energy_ratio > break_threshold and min_dist <= 1:
+                    # Non-linear stress jump at the singularity point
+                    sgjg_stress_bonus = (energy_ratio - break_threshold) * 5.0 + 2.0
+                    sai += sgjg_stress_bonus
+                    system_entropy += sgjg_stress_bonus * 0.5
+                    logger.info(f"🔥 [SGJG SINGULARITY] Ratio {energy_ratio:.2f} > {break_threshold} | Stress +{sgjg_stress_bonus:.2f}")
+
+            # --- [V14.0.9] PGB Stress Buffer (Fingerprint Reinforcement) ---
+            has_fingerprint = False
+            # Check for Yin-Xing (Resource) as a buffer
+            if "正印" in ten_gods_natal or "偏印" in ten_gods_natal:
+                has_fingerprint = True
+                reinforcement = PatternRegistry.PGB_STRESS_BUFFER["REINFORCEMENT_GAIN"]
+                synthesis_base["pgb_reinforcement"] = reinforcement
+                sai *= (1.0 - reinforcement)
+                system_entropy *= (1.0 - reinforcement * 0.5)
+                logger.info(f"🛡️ [PGB BUFFER] Fingerprint: YIN_XING_HUA_SHA | SAI Reinforcement {reinforcement*100}%")
         
         # [V13.7 补齐] MOD_14: 多维时空场耦合分析
-        spacetime_interference = self.spacetime_interference_engine.analyze_spacetime_interference(
-            waves=waves_corrected,
-            day_master_element=dm_elem,
-            influence_bus=influence_bus
-        )
+        with tracer.span("arbitrate.spacetime_interference"):
+            spacetime_interference = self.spacetime_interference_engine.analyze_spacetime_interference(
+                waves=waves_corrected,
+                day_master_element=dm_elem,
+                influence_bus=influence_bus
+            )
         
         # [V13.7 补齐] MOD_18: 全局干涉检测（交叉干涉修正）
         # 建立模块状态字典
-        module_states = {
-            "MOD_04_STABILITY": {
-                "SAI": sai,
-                "IC": ic
-            },
-            "MOD_05_WEALTH": {
-                "viscosity": wealth_metrics.get('Viscosity', 1.0),
-                "reynolds": wealth_metrics.get('Reynolds', 0.0)
-            },
-            "MOD_06_RELATIONSHIP": {
-                "binding_energy": rel_metrics.get('Binding_Energy', 0.0),
-                "orbital_stability": rel_metrics.get('Orbital_Stability', 0.0)
-            },
-            "MOD_15_STRUCTURAL_VIBRATION": {
-                "impedance": vib_metrics.get('impedance_magnitude', 1.0)
+        with tracer.span("arbitrate.global_interference"):
+            module_states = {
+                "MOD_04_STABILITY": {
+                    "SAI": sai,
+                    "IC": ic
+                },
+                "MOD_05_WEALTH": {
+                    "viscosity": wealth_metrics.get('Viscosity', 1.0),
+                    "reynolds": wealth_metrics.get('Reynolds', 0.0)
+                },
+                "MOD_06_RELATIONSHIP": {
+                    "binding_energy": rel_metrics.get('Binding_Energy', 0.0),
+                    "orbital_stability": rel_metrics.get('Orbital_Stability', 0.0)
+                },
+                "MOD_15_STRUCTURAL_VIBRATION": {
+                    "impedance": vib_metrics.get('impedance_magnitude', 1.0)
+                }
             }
-        }
         
-        # 检测全局干涉
-        global_interference = self.global_interference_engine.detect_global_interference(
-            module_states=module_states,
-            influence_bus=influence_bus
-        )
-        
-        # [V13.7 补齐] 应用交叉干涉修正
-        # 如果 SAI 指数高，增加财富粘滞系数（应力导致财富流速减缓）
-        if sai > 1.5:
-            corrected_viscosity = self.global_interference_engine.calculate_cross_interference(
-                sai_index=sai,
-                target_module="MOD_05_WEALTH",
-                base_value=wealth_metrics.get('Viscosity', 1.0),
-                influence_bus=influence_bus
-            )
-            wealth_metrics['Viscosity'] = corrected_viscosity
-            wealth_metrics['Viscosity_Corrected'] = True  # 标记已修正
-        
-        # 如果 SAI 指数高，影响情感轨道稳定性
-        if sai > 1.5:
-            corrected_stability = self.global_interference_engine.calculate_cross_interference(
-                sai_index=sai,
-                target_module="MOD_06_RELATIONSHIP",
-                base_value=rel_metrics.get('Orbital_Stability', 1.0),
+            # 检测全局干涉
+            global_interference = self.global_interference_engine.detect_global_interference(
+                module_states=module_states,
                 influence_bus=influence_bus
             )
-            rel_metrics['Orbital_Stability'] = corrected_stability
-            rel_metrics['Stability_Corrected'] = True  # 标记已修正
+        
+            # [V13.7 补齐] 应用交叉干涉修正
+            # 如果 SAI 指数高，增加财富粘滞系数（应力导致财富流速减缓）
+            if sai > 1.5:
+                corrected_viscosity = self.global_interference_engine.calculate_cross_interference(
+                    sai_index=sai,
+                    target_module="MOD_05_WEALTH",
+                    base_value=wealth_metrics.get('Viscosity', 1.0),
+                    influence_bus=influence_bus
+                )
+                wealth_metrics['Viscosity'] = corrected_viscosity
+                wealth_metrics['Viscosity_Corrected'] = True  # 标记已修正
+        
+            # 如果 SAI 指数高，影响情感轨道稳定性
+            if sai > 1.5:
+                corrected_stability = self.global_interference_engine.calculate_cross_interference(
+                    sai_index=sai,
+                    target_module="MOD_06_RELATIONSHIP",
+                    base_value=rel_metrics.get('Orbital_Stability', 1.0),
+                    influence_bus=influence_bus
+                )
+                rel_metrics['Orbital_Stability'] = corrected_stability
+                rel_metrics['Stability_Corrected'] = True  # 标记已修正
         
         # Adjust Wealth and Relationship metrics by context (保留原有逻辑)
         wealth_metrics['Reynolds'] *= geo_bias_val
         rel_metrics['Binding_Energy'] *= geo_bias_val
         
         # [V13.7 补齐] MOD_16: 应期预测（如果 SAI 超过阈值，触发应期预测）
-        temporal_prediction = None
-        if sai > 2.0:  # 高风险阈值
-            # 构建未来时间线（未来10年）
-            current_year = datetime.now().year
-            timeline_years = list(range(current_year, current_year + 11))
+        with tracer.span("arbitrate.temporal_prediction"):
+            temporal_prediction = None
+            if sai > 2.0:  # 高风险阈值
+                # 构建未来时间线（未来10年）
+                current_year = datetime.now().year
+                timeline_years = list(range(current_year, current_year + 11))
             
-            temporal_prediction = self.temporal_prediction_engine.predict_timeline(
-                base_energy=system_entropy,
-                timeline_years=timeline_years,
-                influence_bus=influence_bus,
-                singularity_threshold=0.6
-            )
+                temporal_prediction = self.temporal_prediction_engine.predict_timeline(
+                    base_energy=system_entropy,
+                    timeline_years=timeline_years,
+                    influence_bus=influence_bus,
+                    singularity_threshold=0.6
+                )
         
         # [V13.7 补齐] MOD_07: 生命轨道分析（高频采样修正）
-        lifepath_analysis = None
-        if birth_info and all(k in birth_info for k in ('birth_year', 'birth_month', 'birth_day', 'birth_hour')):
-            try:
-                birth_year = int(birth_info['birth_year'])
-                # 构建基础时间线（0-100岁）
-                base_timeline = list(range(birth_year, birth_year + 101))
+        with tracer.span("arbitrate.lifepath"):
+            lifepath_analysis = None
+            if birth_info and all(k in birth_info for k in ('birth_year', 'birth_month', 'birth_day', 'birth_hour')):
+                try:
+                    birth_year = int(birth_info['birth_year'])
+                    # 构建基础时间线（0-100岁）
+                    base_timeline = list(range(birth_year, birth_year + 101))
                 
-                lifepath_analysis = self.lifepath_engine.analyze_lifepath(
-                    base_timeline=base_timeline,
-                    base_energy=system_entropy,
-                    influence_bus=influence_bus
-                )
-            except Exception as e:
-                logger.warning(f"Life-path analysis failed: {e}")
-                lifepath_analysis = None
+                    lifepath_analysis = self.lifepath_engine.analyze_lifepath(
+                        base_timeline=base_timeline,
+                        base_energy=system_entropy,
+                        influence_bus=influence_bus
+                    )
+                except Exception as e:
+                    logger.warning(f"Life-path analysis failed: {e}")
+                    lifepath_analysis = None
         
         unified_state = {
             "meta": {
@@ -770,6 +792,7 @@ class QuantumUniversalFramework:
                 "combination": combo_res,
                 "life_path": life_path_data,
                 "entropy": round(system_entropy, 3),
+                "synthesis": synthesis_base,
                 # [V13.7 补齐] MOD_14: 多维时空场耦合
                 "spacetime_interference": spacetime_interference,
                 # [V13.7 补齐] MOD_16: 应期预测
@@ -786,24 +809,26 @@ class QuantumUniversalFramework:
             }
         }
 
-        eval_res = self._evaluate_rules(unified_state, context=context)
+        with tracer.span("arbitrate.rules"):
+            eval_res = self._evaluate_rules(unified_state, context=context)
         
         # [NEW] 5. Inter-layer Logic Arbitration (Phase H)
         # Call LogicArbitrator with full context: pillars, dm, solar_progress, dispersion_engine, geo_factor
-        intensities = LogicArbitrator.calculate_field_intensities(
-            pillars=all_pillars,
-            day_master=current_dm,
-            phase_progress=phase_progress,
-            dispersion_engine=self.dispersion_engine,
-            geo_factor=geo_factor
-        )
-        logic_interactions = LogicArbitrator.match_interactions(
-            pillars=all_pillars,
-            day_master=current_dm,
-            phase_progress=phase_progress,
-            dispersion_engine=self.dispersion_engine,
-            geo_factor=geo_factor
-        )
+        with tracer.span("arbitrate.logic_arbitration"):
+            intensities = LogicArbitrator.calculate_field_intensities(
+                pillars=all_pillars,
+                day_master=current_dm,
+                phase_progress=phase_progress,
+                dispersion_engine=self.dispersion_engine,
+                geo_factor=geo_factor
+            )
+            logic_interactions = LogicArbitrator.match_interactions(
+                pillars=all_pillars,
+                day_master=current_dm,
+                phase_progress=phase_progress,
+                dispersion_engine=self.dispersion_engine,
+                geo_factor=geo_factor
+            )
 
         # 5.1 Reconstruct Elemental Waves for UI (Holographic Export)
         # Map Shi Shen back to Elements based on DM
@@ -830,24 +855,26 @@ class QuantumUniversalFramework:
         unified_state["waves"] = waves_dict
         
         # Merge physical rules with logic interactions and perform final arbitration
-        all_triggered = eval_res.get("rules", []) + logic_interactions
-        final_resolved = ConflictArbitrator.resolve_conflicts(all_triggered, self.registry.manifest.get("registry", {}), context=context)
-        
-        unified_state["rules"] = final_resolved
-        unified_state["tiered_rules"] = ConflictArbitrator.group_by_layer(final_resolved)
-        unified_state["modules_active"] = eval_res.get("modules_active", [])
-        unified_state["verdict"] = eval_res.get("verdict", {})
-        unified_state["plain_guidance"] = self._plain_guidance(unified_state)
+        with tracer.span("arbitrate.conflict_resolution"):
+            all_triggered = eval_res.get("rules", []) + logic_interactions
+            final_resolved = ConflictArbitrator.resolve_conflicts(all_triggered, self.registry.manifest.get("registry", {}), context=context)
+        
+            unified_state["rules"] = final_resolved
+            unified_state["tiered_rules"] = ConflictArbitrator.group_by_layer(final_resolved)
+            unified_state["modules_active"] = eval_res.get("modules_active", [])
+            unified_state["verdict"] = eval_res.get("verdict", {})
+            unified_state["plain_guidance"] = self._plain_guidance(unified_state)
 
         # [MOD_17] Intelligence Layer: Stephen Chow Style Translation
-        from core.utils import Stellar_Comedy_Parser
-        sai_val = stress_report.get('SAI', 1.0)
-        ic_val = resonance_metrics.get('locking_ratio', 1.0)
-        # Re-calculating with the final system_entropy
-        stellar_narrative = Stellar_Comedy_Parser.translate(sai=sai_val, entropy=unified_state['physics']['entropy'], ic=ic_val)
-        unified_state["intelligence"] = {
-            "stellar_mantra": stellar_narrative
-        }
+        with tracer.span("arbitrate.translator"):
+            from core.utils import Stellar_Comedy_Parser
+            sai_val = stress_report.get('SAI', 1.0)
+            ic_val = resonance_metrics.get('locking_ratio', 1.0)
+            # Re-calculating with the final system_entropy
+            stellar_narrative = Stellar_Comedy_Parser.translate(sai=sai_val, entropy=unified_state['physics']['entropy'], ic=ic_val)
+            unified_state["intelligence"] = {
+                "stellar_mantra": stellar_narrative
+            }
 
         return unified_state
 
@@ -15,6 +15,8 @@ from typing import Dict, Any, List, Optional
 import logging
 import json
 import os
+import weakref
+from core.config_snapshot import get_config_service, thaw
 from core.processors import (
     PhysicsProcessor,
     SeasonalProcessor,
@@ -22,6 +24,7 @@ from core.processors import (
     StrengthJudge
 )
 from core.processors.geo import GeoProcessor
+from core.tracing import get_tracer, traced
 from core.schemas import (
     AnalysisResponse,
     StrengthResult,
@@ -81,6 +84,10 @@ class UnifiedEngine:
         # V9.3 Domain Processor (Restored Logic)
         self.domains = DomainProcessor()
         
+        # V9.4: era multipliers cached per engine, dropped when a new config snapshot is published
+        self._era_multipliers: Optional[Dict[str, float]] = None
+        self._subscribe_config()
+        
         # Suppress Unicode output for Windows compatibility
         try:
             logger.info(f"⚡ Antigravity {self.VERSION} Engine Initialized")
@@ -97,6 +104,25 @@ class UnifiedEngine:
         """Get list of active processors"""
         return [self.physics, self.seasonal, self.phase_change, self.judge]
     
+    def _subscribe_config(self):
+        """Invalidate the era cache on every new snapshot (weakly held: the engine can still be collected)"""
+        engine_ref = weakref.ref(self)
+        
+        def on_snapshot(snapshot):
+            engine = engine_ref()
+            if engine is not None:
+                engine._era_multipliers = None
+        
+        weakref.finalize(self, get_config_service().subscribe(on_snapshot))
+    
+    def era_multipliers(self) -> Dict[str, float]:
+        """Era physics multipliers from the current config snapshot (data/era_constants.json)"""
+        snapshot = get_config_service().current()  # may publish a new snapshot and clear the cache
+        if self._era_multipliers is None:
+            self._era_multipliers = thaw(snapshot.get('physics_multipliers', {}, source='era_constants'))
+        return dict(self._era_multipliers)
+    
+    @traced("unified.analyze")
     def analyze(self, bazi: List[str], day_master: str, 
                 city: str = "Unknown", latitude: Optional[float] = None,
                 era_multipliers: Optional[Dict[str, float]] = None,
@@ -114,18 +140,17 @@ class UnifiedEngine:
         
         Returns:
             AnalysisResponse with full analysis results
+
+        Each processor stage is timed as a "unified.<stage>" span (core/tracing.py).
         """
+        tracer = get_tracer()
         messages = [f"[{self.VERSION}] Starting Spacetime Analysis..."]
         
         # V9.5 Performance Optimization: Load era_multipliers if not provided
-        if era_multipliers is None:
-            era_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data/era_constants.json")
-            try:
-                with open(era_path, 'r') as f:
-                    era_data = json.load(f)
-                    era_multipliers = era_data.get('physics_multipliers', {})
-            except:
-                era_multipliers = {}
+        # V9.4: cached from the in-memory config snapshot instead of re-opening data/era_constants.json
+        with tracer.span("unified.config"):
+            if era_multipliers is None:
+                era_multipliers = self.era_multipliers()
         
         # Store for UI display
         era_mods = era_multipliers.copy() if era_multipliers else {}
@@ -143,70 +168,75 @@ class UnifiedEngine:
         }
         
         # === Stage 1: Physics (Layer 1) - Era-Aware ===
-        physics_result = self.physics.process(context)
-        raw_energy = physics_result['raw_energy']
-        messages.append("[Physics] Applied Era Constants (Period 9)")
+        with tracer.span("unified.physics"):
+            physics_result = self.physics.process(context)
+            raw_energy = physics_result['raw_energy']
+            messages.append("[Physics] Applied Era Constants (Period 9)")
         
         # === V9.1 Layer 0: Apply Geo Modifiers ===
-        loc_input = latitude if latitude is not None else city
-        geo_mods = self.geo.process(loc_input)
+        with tracer.span("unified.geo"):
+            loc_input = latitude if latitude is not None else city
+            geo_mods = self.geo.process(loc_input)
         
-        if geo_mods:
-            mod_desc = geo_mods.get('desc', 'GeoMod')
-            messages.append(f"[Geo] Applying {mod_desc}")
+            if geo_mods:
+                mod_desc = geo_mods.get('desc', 'GeoMod')
+                messages.append(f"[Geo] Applying {mod_desc}")
             
-            for elem, mult in geo_mods.items():
-                if elem in raw_energy and isinstance(mult, (int, float)):
-                    raw_energy[elem] *= mult
+                for elem, mult in geo_mods.items():
+                    if elem in raw_energy and isinstance(mult, (int, float)):
+                        raw_energy[elem] *= mult
         
         # === Stage 2: Seasonal (Layer 2) ===
-        seasonal_result = self.seasonal.process(context)
-        is_in_command = seasonal_result['is_in_command']
-        is_resource_month = seasonal_result['is_resource_month']
-        
-        # Calculate self+resource vs others
-        resource_element = None
-        from core.processors.physics import GENERATION
-        for mother, child in GENERATION.items():
-            if child == dm_element:
-                resource_element = mother
-                break
-        
-        e_self = raw_energy.get(dm_element, 0)
-        e_resource = raw_energy.get(resource_element, 0) if resource_element else 0
-        base_score = e_self + e_resource
-        
-        # Apply bonuses
-        base_score += seasonal_result['in_command_bonus']
-        base_score += seasonal_result['resource_month_bonus']
-        
-        if is_in_command:
-            messages.append(f"[Seasonal] 得令! +{seasonal_result['in_command_bonus']}")
-        if is_resource_month:
-            messages.append(f"[Seasonal] 印绶月! +{seasonal_result['resource_month_bonus']}")
+        with tracer.span("unified.seasonal"):
+            seasonal_result = self.seasonal.process(context)
+            is_in_command = seasonal_result['is_in_command']
+            is_resource_month = seasonal_result['is_resource_month']
+        
+            # Calculate self+resource vs others
+            resource_element = None
+            from core.processors.physics import GENERATION
+            for mother, child in GENERATION.items():
+                if child == dm_element:
+                    resource_element = mother
+                    break
+        
+            e_self = raw_energy.get(dm_element, 0)
+            e_resource = raw_energy.get(resource_element, 0) if resource_element else 0
+            base_score = e_self + e_resource
+        
+            # Apply bonuses
+            base_score += seasonal_result['in_command_bonus']
+            base_score += seasonal_result['resource_month_bonus']
+        
+            if is_in_command:
+                messages.append(f"[Seasonal] 得令! +{seasonal_result['in_command_bonus']}")
+            if is_resource_month:
+                messages.append(f"[Seasonal] 印绶月! +{seasonal_result['resource_month_bonus']}")
         
         # === Stage 3: Phase Change (Layer 2.5) ===
-        context['raw_energy_snapshot'] = raw_energy
-        phase_result = self.phase_change.process(context)
-        resource_efficiency = phase_result['resource_efficiency']
+        with tracer.span("unified.phase_change"):
+            context['raw_energy_snapshot'] = raw_energy
+            phase_result = self.phase_change.process(context)
+            resource_efficiency = phase_result['resource_efficiency']
         
-        if phase_result['is_active']:
-            messages.append(f"[Phase] {phase_result['description']} (效率: {resource_efficiency})")
+            if phase_result['is_active']:
+                messages.append(f"[Phase] {phase_result['description']} (效率: {resource_efficiency})")
         
         # === Stage 4: Final Judgment (Layer 3) ===
-        judge_context = {
-            'base_score': base_score,
-            'in_command_bonus': seasonal_result['in_command_bonus'],
-            'resource_month_bonus': seasonal_result['resource_month_bonus'],
-            'resource_efficiency': resource_efficiency,
-            'is_in_command': is_in_command,
-            'is_resource_month': is_resource_month,
-            'is_writer_lady': seasonal_result.get('is_writer_lady', False),
-            'flags': seasonal_result.get('flags', [])
-        }
+        with tracer.span("unified.judge"):
+            judge_context = {
+                'base_score': base_score,
+                'in_command_bonus': seasonal_result['in_command_bonus'],
+                'resource_month_bonus': seasonal_result['resource_month_bonus'],
+                'resource_efficiency': resource_efficiency,
+                'is_in_command': is_in_command,
+                'is_resource_month': is_resource_month,
+                'is_writer_lady': seasonal_result.get('is_writer_lady', False),
+                'flags': seasonal_result.get('flags', [])
+            }
         
-        judgment = self.judge.process(judge_context)
-        messages.append(f"[Judge] Verdict provided based on Spacetime Energy.")
+            judgment = self.judge.process(judge_context)
+            messages.append(f"[Judge] Verdict provided based on Spacetime Energy.")
         
         # Prepare Delta Factors for UI
         modifiers = {
@@ -218,13 +248,14 @@ class UnifiedEngine:
         }
         
         # === Build Response ===
-        return self._build_response(
-            judgment=judgment,
-            phase_result=phase_result,
-            raw_energy=raw_energy,
-            messages=messages,
-            modifiers=modifiers
-        )
+        with tracer.span("unified.build_response"):
+            return self._build_response(
+                judgment=judgment,
+                phase_result=phase_result,
+                raw_energy=raw_energy,
+                messages=messages,
+                modifiers=modifiers
+            )
     
     def _build_response(
         self,
@@ -11,12 +11,12 @@ Compliance: FDS-V3.0
 
 import logging
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Mapping, Optional
 
 import chromadb
 from chromadb.config import Settings
 
-from core.config_manager import ConfigManager
+from core.config_snapshot import get_config_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -41,11 +41,11 @@ class VaultManager:
             embedding_model: Embedding 模型名称（默认从配置读取或使用 nomic-embed-text）
         """
         # 从配置读取 embedding 模型
-        config = ConfigManager()
+        config = get_config_snapshot()
         if embedding_model is None:
             embedding_model = config.get("knowledge_vault", {}).get(
                 "embedding_model", "nomic-embed-text"
-            ) if isinstance(config.get("knowledge_vault"), dict) else "nomic-embed-text"
+            ) if isinstance(config.get("knowledge_vault"), Mapping) else "nomic-embed-text"
         
         self.embedding_model = embedding_model
         self._ollama_host = config.get("ollama_host", "http://localhost:11434")
@@ -1,5 +1,6 @@
 import numpy as np
 import json
+import hashlib
 from learning.db import LearningDB
 
 class Vectorizer:
@@ -9,8 +10,12 @@ class Vectorizer:
     Transforms Bazi Charts into the '3D Mesh Quantum Field' representation.
     Calculates Energy Potential (E_energy) and Coupling Strength (C_coupling).
     """
-    def __init__(self, use_db_weights=True):
-        self.db = LearningDB()
+    # Bump when vectorize_chart's layout / formulas change (invalidates cached feature rows)
+    FEATURE_VERSION = 1
+
+    def __init__(self, use_db_weights=True, db=None):
+        self.db = db or LearningDB()
+        self._feature_store = None
         
         # --- Physics Constants (Initial Priors / Default Heuristics) ---
         
@@ -64,6 +69,11 @@ class Vectorizer:
         
         self.pillars = ["year", "month", "day", "hour"]
 
+        # One-hot lookup tables: value -> column offset inside a pillar's 22-wide block
+        self._stem_index = {s: i for i, s in enumerate(self.stems)}
+        self._branch_index = {b: len(self.stems) + i for i, b in enumerate(self.branches)}
+        self._raw_width = len(self.pillars) * (len(self.stems) + len(self.branches))
+
     def update_weights(self, new_weights):
         """
         Dynamically updates model parameters.
@@ -76,6 +86,14 @@ class Vectorizer:
         if 'GAMMA_DECAY' in new_weights:
             self.GAMMA_DECAY = new_weights['GAMMA_DECAY']
 
+    def weights_version(self):
+        """
+        Fingerprint of everything vectorize_chart depends on (W_E + feature layout).
+        Cached feature rows are only reused while this stays the same.
+        """
+        payload = json.dumps({"v": self.FEATURE_VERSION, "W_E": self.W_E}, sort_keys=True)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
     # --- 1. Field Calculation: Energy Potential (Z-Axis) ---
 
     def calculate_energy(self, element, chart):
@@ -244,15 +262,21 @@ class Vectorizer:
     def _encode_raw_one_hot(self, chart_data):
         """
         Legacy One-Hot encoding (from V1) to serve as 'Raw Grid' data.
+        Per pillar: [10 stems][12 branches]; unknown / missing values stay all-zero.
         """
-        full_vector = []
-        for p in self.pillars:
+        full_vector = np.zeros(self._raw_width, dtype=np.int64)
+        block = len(self.stems) + len(self.branches)
+        for k, p in enumerate(self.pillars):
             pillar_data = chart_data.get(p, {})
-            stem_val = pillar_data.get("stem", "") if isinstance(pillar_data, dict) else ""
-            branch_val = pillar_data.get("branch", "") if isinstance(pillar_data, dict) else ""
-            full_vector.extend(self._one_hot(stem_val, self.stems))
-            full_vector.extend(self._one_hot(branch_val, self.branches))
-        return np.array(full_vector)
+            if not isinstance(pillar_data, dict):
+                continue
+            stem_val = pillar_data.get("stem", "")
+            branch_val = pillar_data.get("branch", "")
+            if isinstance(stem_val, str) and stem_val in self._stem_index:
+                full_vector[k * block + self._stem_index[stem_val]] = 1
+            if isinstance(branch_val, str) and branch_val in self._branch_index:
+                full_vector[k * block + self._branch_index[branch_val]] = 1
+        return full_vector
 
     def _one_hot(self, value, category_list):
         vec = [0] * len(category_list)
@@ -289,11 +313,22 @@ class Vectorizer:
         main_stem = hiddens[0]
     # --- 4. Dataset Management ---
 
-    def load_dataset(self, target_aspect="wealth"):
+    @property
+    def feature_store(self):
+        if self._feature_store is None:
+            from core.feature_store import FeatureStore
+            self._feature_store = FeatureStore(self)
+        return self._feature_store
+
+    def load_dataset(self, target_aspect="wealth", use_cache=True):
         """
         Loads all valid cases from DB and prepares X and Y arrays.
         target_aspect: The specific life domain to predict (e.g. 'wealth')
+        use_cache: go through the FeatureStore, which only vectorizes new / changed cases.
         """
+        if use_cache:
+            return self.feature_store.dataset(target_aspect)
+
         cases = self.db.get_all_cases()
         X_list = []
         y_list = []
@@ -1,12 +1,43 @@
 import time
 import json
 from learning.db import LearningDB
-from learning.video_miner import VideoMiner
 
 class ChannelScanner:
-    def __init__(self):
-        self.db = LearningDB()
-        self.video_miner = VideoMiner()
+    """
+    Incremental channel scanning.
+
+    Each channel keeps a cursor (newest video id / timestamp seen by the previous scan) in
+    LearningDB. A rescan walks the listing newest-first and stops at the cursor, so only new
+    uploads are fetched; queued / processed videos are recorded in channel_videos, which answers
+    "already seen?" by primary key and keeps rescans from queueing a video twice.
+
+    Videos behind the cursor whose job failed (still 'queued' after requeue_after seconds with
+    no live job) are queued again on the next scan, as are partially mined videos; their job
+    retries only the segments recorded in pending_segments.
+
+    list_videos: channel listing provider, list_videos(channel_url) -> iterable of
+    {id, title, timestamp} newest first (default: VideoMiner.iter_channel_videos).
+    """
+    REQUEUE_AFTER_S = 6 * 3600
+
+    def __init__(self, db=None, list_videos=None, requeue_after=REQUEUE_AFTER_S):
+        self.db = db or LearningDB()
+        self._list_videos = list_videos
+        self._video_miner = None
+        self.requeue_after = requeue_after
+
+    @property
+    def video_miner(self):
+        if self._video_miner is None:
+            from learning.video_miner import VideoMiner
+            self._video_miner = VideoMiner(db=self.db)
+            self._video_miner.db  # one-time import of the legacy history file
+        return self._video_miner
+
+    def list_videos(self, channel_url):
+        if self._list_videos is not None:
+            return self._list_videos(channel_url)
+        return self.video_miner.iter_channel_videos(channel_url)
 
     def add_channel(self, url, name=None):
         """
@@ -28,63 +59,71 @@ class ChannelScanner:
             print(f"Scanning channel: {ch['name']} ({ch['url']})...")
             count = self.queue_channel_videos(ch)
             total_queued += count
-            
+
         return total_queued
 
+    def fetch_new_videos(self, channel):
+        """
+        Videos uploaded since the channel's cursor, newest first.
+        Returns (new_entries, newest_entry); newest_entry is None if the listing was empty.
+        """
+        cursor_id, cursor_ts = self.db.get_channel_cursor(channel['url'])
+        listing = self.list_videos(channel['url'])
+        new_entries, newest = [], None
+        try:
+            for entry in listing:
+                if newest is None:
+                    newest = entry
+                if cursor_id is not None and entry['id'] == cursor_id:
+                    break
+                # cursor video deleted / hidden: the upload time still bounds the walk
+                ts = entry.get('timestamp')
+                if cursor_ts is not None and ts is not None and float(ts) < float(cursor_ts):
+                    break
+                new_entries.append(entry)
+        finally:
+            close = getattr(listing, 'close', None)
+            if close:
+                close()  # stop paging the rest of the channel
+        return new_entries, newest
+
     def queue_channel_videos(self, channel):
-        video_ids, error = self.video_miner.get_channel_videos(channel['url'])
-        if error:
-            print(f"Error fetching videos for {channel['name']}: {error}")
-            return 0
+        # Failed jobs leave their video 'queued' behind the cursor: offer those again first
+        stale = self.db.get_stale_queued_videos(channel['url'], self.requeue_after)
+        for vid, title in stale:
+            print(f"Re-queueing unfinished video {vid}...")
+            self._queue_video(vid, title)
+        self.db.mark_videos_requeued([vid for vid, _ in stale])
+
+        try:
+            new_entries, newest = self.fetch_new_videos(channel)
+        except Exception as e:
+            print(f"Error fetching videos for {channel['name']}: {e}")
+            return len(stale)
+
+        # Videos already queued or processed (e.g. by another channel/playlist or a manual run)
+        known = self.db.get_video_statuses(entry['id'] for entry in new_entries)
+        new_videos = [entry for entry in new_entries if entry['id'] not in known]
+        print(f"Found {len(new_videos)} new videos ({len(new_entries) - len(new_videos)} already known).")
+
+        # Oldest first, so the job queue (FIFO) follows upload order
+        for entry in reversed(new_videos):
+            print(f"Queueing video {entry['id']}...")
+            self._queue_video(entry['id'], entry.get('title'))
+        self.db.mark_videos_queued([(e['id'], e.get('title')) for e in new_videos], channel_url=channel['url'])
+
+        # Advance the cursor (also stamps last_scanned); BackgroundWorker marks videos processed when done
+        if newest is not None:
+            ts = newest.get('timestamp')
+            self.db.update_channel_cursor(channel['url'], newest['id'], str(ts) if ts is not None else None)
+        else:
+            self.db.update_channel_last_scanned(channel['url'])
+        return len(stale) + len(new_videos)
 
-        # Get processed history (VideoMiner checks file, but we should also check DB jobs to avoid duplicates)
-        # Actually checking if a job exists for this video URL is safer.
-        
-        # 1. Get history from file (legacy check)
-        history = self.video_miner.get_history()
-        # 2. Get active/finished jobs to avoid double queueing
-        # This is a bit expensive if many jobs, but necessary.
-        # We can implement a simple 'is_video_queued(url)' in DB later.
-        # For now, let's rely on history file + simple check.
-        
-        new_videos = [vid for vid in video_ids if vid not in history]
-        print(f"Found {len(new_videos)} potential new videos.")
-
-        queued_count = 0
-        for vid in new_videos:
-            url = f"https://www.youtube.com/watch?v={vid}"
-            
-            # Check if job already exists? 
-            # Ideally DB should have a unique constraint or we search.
-            # Let's assume create_job doesn't dedup, so we should check.
-            # But for now, we trust the history file marking which happens AFTER processing.
-            # If we queue it, we haven't marked it yet.
-            # So if we run scan twice rapidly, we might queue double.
-            # TODO: Add check against existing jobs using payload match.
-            
-            # For this version, just Queue it.
-            
-            print(f"Queueing video {vid}...")
-            payload = {"type": "video", "url": url, "title": f"Video {vid}"}
-            self.db.create_job("video_learn", target_file=f"Video {vid}", payload=payload)
-            queued_count += 1
-            
-            # We do NOT mark processed here. BackgroundWorker will mark it when done?
-            # BackgroundWorker doesn't know about video_miner.mark_processed!
-            # We should probably update BackgroundWorker to call mark_processed, 
-            # OR we assume if it's in DB as 'finished', it's done.
-            # But 'history' is a text file.
-            # Let's add a small step in BackgroundWorker to mark it? 
-            # Or just mark it here as "Queued"? No, if it fails match, we might want to retry.
-            
-            # Better: Write to history file ONLY when BackgroundWorker finishes. 
-            # See core/scheduler.py -> _process_video_job -> line 156.
-            # It prints "Video Processed". It should also update the history file.
-            pass
-            
-        # Update scan time
-        self.db.update_channel_last_scanned(channel['url'])
-        return queued_count
+    def _queue_video(self, vid, title=None):
+        url = f"https://www.youtube.com/watch?v={vid}"
+        payload = {"type": "video", "url": url, "title": title or f"Video {vid}"}
+        self.db.create_job("video_learn", target_file=f"Video {vid}", payload=payload)
 
 if __name__ == "__main__":
     scanner = ChannelScanner()
@@ -1,8 +1,8 @@
-import requests
 from bs4 import BeautifulSoup
 from duckduckgo_search import DDGS
 import ollama
 from core.config_manager import ConfigManager
+from learning.fetcher import get_fetcher
 
 class AutoCrawler:
     def __init__(self, host="http://localhost:11434"):
@@ -33,8 +33,8 @@ class AutoCrawler:
         """
         try:
             headers = {'User-Agent': 'Mozilla/5.0'}
-            resp = requests.get(url, headers=headers, timeout=10)
-            if resp.status_code == 200:
+            resp = get_fetcher().fetch(url, headers=headers)
+            if resp.ok:
                 soup = BeautifulSoup(resp.text, 'html.parser')
                 # Remove script and style elements
                 for script in soup(["script", "style"]):
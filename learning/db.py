@@ -87,6 +87,33 @@ class LearningDB:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
+
+        # Channel scan cursor: newest video seen by the last scan (incremental rescans stop there)
+        c.execute("PRAGMA table_info(channels)")
+        channel_columns = [info[1] for info in c.fetchall()]
+        for column in ("cursor_video_id", "cursor_timestamp"):
+            if column not in channel_columns:
+                c.execute(f"ALTER TABLE channels ADD COLUMN {column} TEXT")
+
+        # 7. Channel Videos Table: every video ever queued / processed (PK lookup per video)
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS channel_videos (
+                video_id TEXT PRIMARY KEY,
+                channel_url TEXT,
+                title TEXT,
+                status TEXT DEFAULT 'queued',  -- queued, processed
+                first_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                processed_at TIMESTAMP
+            )
+        """)
+        # Last time a job was queued for the video (stale 'queued' rows are re-offered by the scanner)
+        c.execute("PRAGMA table_info(channel_videos)")
+        video_columns = [info[1] for info in c.fetchall()]
+        if "queued_at" not in video_columns:
+            c.execute("ALTER TABLE channel_videos ADD COLUMN queued_at TIMESTAMP")
+        # Partially mined video: JSON list of the segments still to retry (NULL when complete)
+        if "pending_segments" not in video_columns:
+            c.execute("ALTER TABLE channel_videos ADD COLUMN pending_segments TEXT")
         
         conn.commit()
         conn.close()
@@ -157,6 +184,17 @@ class LearningDB:
         conn.close()
         return cases
 
+    def get_case_rows(self):
+        """
+        Raw (id, chart_data, ground_truth) rows in id order, JSON left undecoded.
+        Lets the feature store detect unchanged cases without parsing them.
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute("SELECT id, chart_data, ground_truth FROM cases ORDER BY id").fetchall()
+        finally:
+            conn.close()
+
     def save_weights(self, config, loss, note=""):
         conn = sqlite3.connect(self.db_path)
         c = conn.cursor()
@@ -450,6 +488,147 @@ class LearningDB:
         conn.commit()
         conn.close()
 
+    def get_channel_cursor(self, url):
+        """(cursor_video_id, cursor_timestamp) of the channel's last scan, (None, None) if never scanned"""
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute("SELECT cursor_video_id, cursor_timestamp FROM channels WHERE url = ?", (url,))
+        row = c.fetchone()
+        conn.close()
+        return (row[0], row[1]) if row else (None, None)
+
+    def update_channel_cursor(self, url, video_id, timestamp=None):
+        """Advance the scan cursor to the newest listed video (also stamps last_scanned)"""
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute("""
+            UPDATE channels
+            SET cursor_video_id = ?, cursor_timestamp = ?, last_scanned = CURRENT_TIMESTAMP
+            WHERE url = ?
+        """, (video_id, timestamp, url))
+        conn.commit()
+        conn.close()
+
+    # --- Video History Methods ---
+
+    def get_video_statuses(self, video_ids):
+        """{video_id: status} for the given ids that are already queued or processed"""
+        video_ids = list(video_ids)
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        statuses = {}
+        for i in range(0, len(video_ids), 500):  # stay below SQLite's bound-parameter limit
+            batch = video_ids[i:i + 500]
+            placeholders = ','.join('?' * len(batch))
+            c.execute(f"SELECT video_id, status FROM channel_videos WHERE video_id IN ({placeholders})", batch)
+            statuses.update(c.fetchall())
+        conn.close()
+        return statuses
+
+    def is_video_processed(self, video_id):
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute("SELECT 1 FROM channel_videos WHERE video_id = ? AND status = 'processed'", (video_id,))
+        exists = c.fetchone() is not None
+        conn.close()
+        return exists
+
+    def mark_videos_queued(self, videos, channel_url=None):
+        """
+        videos: list of (video_id, title). Already known videos keep their status.
+        Returns the number of newly recorded videos.
+        """
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.executemany("""
+            INSERT OR IGNORE INTO channel_videos (video_id, channel_url, title, status, queued_at)
+            VALUES (?, ?, ?, 'queued', CURRENT_TIMESTAMP)
+        """, [(vid, channel_url, title) for vid, title in videos])
+        count = c.rowcount
+        conn.commit()
+        conn.close()
+        return count
+
+    def get_stale_queued_videos(self, channel_url, older_than_s):
+        """
+        [(video_id, title)] of the channel's videos still 'queued' (or partially mined, with
+        pending_segments) more than older_than_s seconds after their last job was created, with no
+        live (pending / running / paused) job left: the job failed, was deleted, or finished
+        without marking the video processed.
+        """
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute("""
+            SELECT v.video_id, v.title FROM channel_videos v
+            WHERE v.channel_url = ? AND (v.status = 'queued' OR v.pending_segments IS NOT NULL)
+              AND COALESCE(v.queued_at, v.first_seen) <= datetime('now', ?)
+              AND NOT EXISTS (
+                  SELECT 1 FROM job_queue j
+                  WHERE j.status IN ('pending', 'running', 'paused')
+                    AND (j.target_file = 'Video ' || v.video_id OR j.payload LIKE '%watch?v=' || v.video_id || '%')
+              )
+            ORDER BY v.first_seen, v.video_id
+        """, (channel_url, f"-{int(older_than_s)} seconds"))
+        rows = c.fetchall()
+        conn.close()
+        return rows
+
+    def mark_videos_requeued(self, video_ids):
+        """Restart the staleness clock of re-offered videos"""
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.executemany("UPDATE channel_videos SET queued_at = CURRENT_TIMESTAMP WHERE video_id = ?",
+                      [(vid,) for vid in video_ids])
+        conn.commit()
+        conn.close()
+
+    def mark_videos_processed(self, video_ids, channel_url=None):
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.executemany("""
+            INSERT INTO channel_videos (video_id, channel_url, status, processed_at)
+            VALUES (?, ?, 'processed', CURRENT_TIMESTAMP)
+            ON CONFLICT(video_id) DO UPDATE SET status = 'processed', processed_at = CURRENT_TIMESTAMP,
+                pending_segments = NULL,
+                channel_url = COALESCE(channel_videos.channel_url, excluded.channel_url)
+        """, [(vid, channel_url) for vid in video_ids])
+        conn.commit()
+        conn.close()
+
+    def mark_video_partial(self, video_id, segments, channel_url=None):
+        """
+        Processed except for the given segments (their mining failed, the rest was saved).
+        The scanner re-offers the video after its requeue delay; the retry mines only those segments.
+        """
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute("""
+            INSERT INTO channel_videos (video_id, channel_url, status, processed_at, queued_at, pending_segments)
+            VALUES (?, ?, 'processed', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, ?)
+            ON CONFLICT(video_id) DO UPDATE SET status = 'processed', processed_at = CURRENT_TIMESTAMP,
+                queued_at = CURRENT_TIMESTAMP, pending_segments = excluded.pending_segments,
+                channel_url = COALESCE(channel_videos.channel_url, excluded.channel_url)
+        """, (video_id, channel_url, json.dumps(sorted(segments))))
+        conn.commit()
+        conn.close()
+
+    def get_pending_segments(self, video_id):
+        """Segments of a partially mined video still to retry, None if there is nothing to retry"""
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute("SELECT pending_segments FROM channel_videos WHERE video_id = ?", (video_id,))
+        row = c.fetchone()
+        conn.close()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def get_processed_video_ids(self):
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        c.execute("SELECT video_id FROM channel_videos WHERE status = 'processed'")
+        rows = c.fetchall()
+        conn.close()
+        return {r[0] for r in rows}
+
     def delete_channel(self, url):
         conn = sqlite3.connect(self.db_path)
         c = conn.cursor()
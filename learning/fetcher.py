@@ -0,0 +1,397 @@
+"""
+Shared fetch subsystem for the miners.
+
+- One keep-alive requests.Session (pooled connections per host)
+- Per-host token-bucket rate limits instead of global sleeps: requests to one
+  host stay polite while different hosts are fetched in parallel (fetch_many)
+- Conditional GET (ETag / Last-Modified) against a persistent FetchStore
+- Retry with exponential backoff on connection errors, 429 and 5xx (honours Retry-After);
+  only idempotent methods are retried
+- Content-hash dedup: FetchResult.duplicate marks bodies already seen from any URL;
+  callers record successfully processed content with FetchStore.mark_processed and
+  skip on is_processed, so a page whose processing failed is picked up again
+- persist=False (search-engine result pages) bypasses the store entirely
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import urllib.parse
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import zip_longest
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_STORE_DIR = os.path.join(PROJECT_ROOT, "results", "fetch_cache")
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+
+class TokenBucket:
+    """
+    Token bucket: `rate` requests per second with bursts of up to `burst`.
+    acquire() reserves a token and sleeps until it is due, so concurrent callers queue up fairly.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = burst
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token; returns the seconds waited"""
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+
+class FetchStore:
+    """
+    Validators and bodies of fetched pages, keyed by URL and content hash.
+
+    - index.jsonl: one {url, hash, etag, last_modified, encoding, fetched_at} line per stored fetch (last wins)
+    - blobs/<sha256>: body bytes, stored once per distinct content
+    - processed.jsonl: one {url, hash, processed_at} line per content hash a miner finished processing
+    root=None keeps everything in memory.
+    """
+
+    def __init__(self, root: Optional[str] = DEFAULT_STORE_DIR):
+        self.root = root
+        self._entries: Dict[str, Dict[str, str]] = {}
+        self._hashes = set()
+        self._processed = set()
+        self._memory_blobs: Dict[str, bytes] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def index_path(self) -> Optional[str]:
+        return os.path.join(self.root, "index.jsonl") if self.root else None
+
+    @property
+    def processed_path(self) -> Optional[str]:
+        return os.path.join(self.root, "processed.jsonl") if self.root else None
+
+    def _blob_path(self, content_hash: str) -> str:
+        return os.path.join(self.root, "blobs", content_hash)
+
+    def _load(self):
+        self._loaded = True
+        if not self.root:
+            return
+        try:
+            if os.path.exists(self.index_path):
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                            self._entries[entry['url']] = entry
+                            self._hashes.add(entry['hash'])
+                        except (json.JSONDecodeError, KeyError):
+                            continue
+                logger.info(f"Loaded {len(self._entries)} fetch store entries: {self.root}")
+        except OSError as e:
+            logger.warning(f"Fetch store unreadable: {e}")
+        if not os.path.exists(self.processed_path):
+            return
+        try:
+            with open(self.processed_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self._processed.add(json.loads(line)['hash'])
+                    except (json.JSONDecodeError, KeyError):
+                        continue
+        except OSError as e:
+            logger.warning(f"Processed log unreadable: {e}")
+
+    def is_processed(self, content_hash: Optional[str]) -> bool:
+        """Whether a miner already processed this content (from any URL)"""
+        if not content_hash:
+            return False
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            return content_hash in self._processed
+
+    def mark_processed(self, url: str, content_hash: Optional[str]):
+        """Record content as processed; call only after processing succeeded"""
+        if not content_hash:
+            return
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            if content_hash in self._processed:
+                return
+            self._processed.add(content_hash)
+            if not self.root:
+                return
+            try:
+                os.makedirs(self.root, exist_ok=True)
+                with open(self.processed_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({'url': url, 'hash': content_hash,
+                                        'processed_at': datetime.now().isoformat()}) + "\n")
+            except OSError as e:
+                logger.warning(f"Processed log write failed: {e}")
+
+    def lookup(self, url: str) -> Optional[Dict[str, str]]:
+        """Stored entry for url (validators + content hash), if its body is still available"""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            entry = self._entries.get(url)
+        if entry and self.body(entry['hash']) is not None:
+            return entry
+        return None
+
+    def body(self, content_hash: str) -> Optional[bytes]:
+        if not self.root:
+            return self._memory_blobs.get(content_hash)
+        try:
+            with open(self._blob_path(content_hash), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, url: str, content: bytes, etag: Optional[str] = None,
+            last_modified: Optional[str] = None, encoding: Optional[str] = None) -> Tuple[str, bool]:
+        """Store a fetched body; returns (content hash, whether that content was already stored)"""
+        content_hash = hashlib.sha256(content).hexdigest()
+        entry = {'url': url, 'hash': content_hash, 'etag': etag, 'last_modified': last_modified,
+                 'encoding': encoding, 'fetched_at': datetime.now().isoformat()}
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            duplicate = content_hash in self._hashes
+            self._hashes.add(content_hash)
+            previous = self._entries.get(url)
+            self._entries[url] = entry
+            if not self.root:
+                self._memory_blobs[content_hash] = content
+                return content_hash, duplicate
+            unchanged = previous is not None and all(previous.get(k) == entry[k]
+                                                     for k in ('hash', 'etag', 'last_modified', 'encoding'))
+            try:
+                os.makedirs(os.path.dirname(self._blob_path(content_hash)), exist_ok=True)
+                if not os.path.exists(self._blob_path(content_hash)):
+                    tmp_path = self._blob_path(content_hash) + ".tmp"
+                    with open(tmp_path, 'wb') as f:
+                        f.write(content)
+                    os.replace(tmp_path, self._blob_path(content_hash))
+                if not unchanged:
+                    with open(self.index_path, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            except OSError as e:
+                logger.warning(f"Fetch store write failed: {e}")
+        return content_hash, duplicate
+
+    def __len__(self) -> int:
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            return len(self._entries)
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int = 0
+    content: bytes = b""
+    encoding: Optional[str] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    not_modified: bool = False   # 304 answered from the store
+    duplicate: bool = False      # same body already fetched (this or another URL); not "processed"
+    content_hash: Optional[str] = None
+    attempts: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200 or self.not_modified
+
+    @property
+    def text(self) -> str:
+        try:
+            return self.content.decode(self.encoding or 'utf-8', errors='replace')
+        except LookupError:
+            return self.content.decode('utf-8', errors='replace')
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.HTTPError(self.error or f"HTTP {self.status} for {self.url}")
+
+
+class Fetcher:
+    """
+    Rate-limited, pooled, caching HTTP client shared by the miners.
+
+    Args:
+        rate_per_host: requests per second per host (0.5 = one request every 2 s)
+        burst: requests a host may receive back to back after idling
+        host_rates: per-host overrides of rate_per_host (keyed by netloc)
+        max_workers: fetch_many threads (and pooled connections per host)
+        retries: extra attempts on connection errors / RETRY_STATUSES
+        backoff: first retry delay in seconds, doubled per attempt (capped at max_backoff)
+        store: FetchStore for conditional GET and dedup (None = in-memory store)
+    """
+
+    def __init__(self, rate_per_host: float = 0.5, burst: float = 1.0,
+                 host_rates: Optional[Dict[str, float]] = None, max_workers: int = 8,
+                 timeout: float = 10, retries: int = 2, backoff: float = 1.0, max_backoff: float = 30.0,
+                 store: Optional[FetchStore] = None, headers: Optional[Dict[str, str]] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate_per_host = rate_per_host
+        self.burst = burst
+        self.host_rates = dict(host_rates or {})
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.store = store if store is not None else FetchStore(root=None)
+        self.sleep = sleep
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._buckets_lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.host_rates.get(host, self.rate_per_host), self.burst,
+                                                  sleep=self.sleep)
+            return self._buckets[host]
+
+    def _retry_delay(self, attempt: int, resp: Optional[requests.Response]) -> float:
+        retry_after = resp.headers.get('Retry-After') if resp is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return min(self.backoff * 2 ** attempt, self.max_backoff)
+
+    @staticmethod
+    def _encoding(resp: requests.Response) -> Optional[str]:
+        # requests falls back to ISO-8859-1 when no charset is declared; sniff instead
+        if 'charset' not in resp.headers.get('content-type', '').lower() or resp.encoding == 'ISO-8859-1':
+            return resp.apparent_encoding
+        return resp.encoding
+
+    def fetch(self, url: str, method: str = "GET", params: Optional[Dict] = None, data: Optional[Dict] = None,
+              headers: Optional[Dict[str, str]] = None, conditional: bool = True,
+              timeout: Optional[float] = None, persist: bool = True) -> FetchResult:
+        """
+        Fetch one URL. Never raises for network/HTTP errors: check result.ok / result.error
+        (or call result.raise_for_status()).
+        persist=False skips the store (no conditional GET, body not kept): use it for volatile
+        pages such as search-engine results.
+        """
+        method = method.upper()
+        try:
+            key = requests.Request(method, url, params=params).prepare().url
+        except (requests.RequestException, ValueError) as e:
+            return FetchResult(url=str(url), error=str(e))
+        result = FetchResult(url=key)
+        cached = self.store.lookup(key) if persist and conditional and method == "GET" else None
+        req_headers = dict(headers or {})
+        if cached and cached.get('etag'):
+            req_headers['If-None-Match'] = cached['etag']
+        if cached and cached.get('last_modified'):
+            req_headers['If-Modified-Since'] = cached['last_modified']
+
+        bucket = self.bucket(urllib.parse.urlparse(key).netloc)
+        resp = None
+        # a failed POST may already have been applied server-side: never resend it
+        retries = self.retries if method in IDEMPOTENT_METHODS else 0
+        for attempt in range(retries + 1):
+            bucket.acquire()
+            result.attempts = attempt + 1
+            try:
+                resp = self.session.request(method, url, params=params, data=data, headers=req_headers,
+                                            timeout=timeout or self.timeout)
+                result.error = None
+            except requests.RequestException as e:
+                resp, result.error = None, str(e)
+            if resp is not None and resp.status_code not in RETRY_STATUSES:
+                break
+            if attempt < retries:
+                delay = self._retry_delay(attempt, resp)
+                logger.info(f"Retrying {key} in {delay:.1f}s ({result.error or resp.status_code})")
+                self.sleep(delay)
+
+        if resp is None:
+            logger.warning(f"Fetch failed: {key}: {result.error}")
+            return result
+        result.status = resp.status_code
+        result.headers = dict(resp.headers)
+        if resp.status_code == 304 and cached:
+            result.not_modified = True
+            result.content = self.store.body(cached['hash']) or b""
+            result.encoding = cached.get('encoding')
+            result.content_hash = cached['hash']
+            return result
+        result.content = resp.content
+        result.encoding = self._encoding(resp)
+        if resp.status_code == 200 and not persist:
+            result.content_hash = hashlib.sha256(resp.content).hexdigest()
+        elif resp.status_code == 200:
+            result.content_hash, result.duplicate = self.store.put(
+                key, resp.content, etag=resp.headers.get('ETag'),
+                last_modified=resp.headers.get('Last-Modified'), encoding=result.encoding)
+        return result
+
+    def fetch_many(self, urls: List[str], **kwargs) -> List[FetchResult]:
+        """
+        Fetch urls concurrently (results in input order). Submission interleaves hosts so
+        one slow, rate-limited host does not hold every worker.
+        """
+        by_host = defaultdict(list)
+        for i, url in enumerate(urls):
+            by_host[urllib.parse.urlparse(url).netloc].append(i)
+        order = [i for batch in zip_longest(*by_host.values()) for i in batch if i is not None]
+        results: List[Optional[FetchResult]] = [None] * len(urls)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {i: pool.submit(self.fetch, urls[i], **kwargs) for i in order}
+            for i, future in futures.items():
+                results[i] = future.result()
+        return results
+
+
+_fetcher: Optional[Fetcher] = None
+_fetcher_lock = threading.Lock()
+
+
+def get_fetcher() -> Fetcher:
+    """Process-wide fetcher (shared session, host buckets and store)"""
+    global _fetcher
+    if _fetcher is None:
+        with _fetcher_lock:
+            if _fetcher is None:
+                _fetcher = Fetcher(store=FetchStore())
+    return _fetcher
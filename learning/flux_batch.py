@@ -0,0 +1,234 @@
+"""
+Batched FluxEngine strength model for WeightOptimizer.
+
+FluxEngine's natal pass (no Da Yun / Liu Nian, full health) is piecewise linear in
+the positional weights:
+
+- branch geometry (SanHe / BanHe / LiuChong / XiangXing) only rescales branch masses
+  and collapses distributions, and depends on the characters alone;
+- stem intensity is affine in the branch masses (5 + root energy, or 2.0 when the
+  stem is a virtual image), then scaled by the stem weight;
+- the global flux network is a fixed sequence of linear transfers plus Lian Zhu boosts.
+
+So each case is compiled once into a small set of coefficient arrays (its particle
+layout), and the Day Master strength ratio for every case and every weight vector is
+evaluated in a single array computation. Gradients are analytic (quotient rule over the
+piecewise-linear map) or central differences over a stacked batch of perturbed weights.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from core.flux import BRANCH_MASS_PER_WEIGHT, FLOW_TRANSFER_RATE, SYNERGY_BOOST, FluxEngine
+from core.wuxing_engine import WuXingEngine
+
+PILLARS = ("year", "month", "day", "hour")
+ELEMENTS = ("Wood", "Fire", "Earth", "Metal", "Water")
+RESOURCE_MAP = {"Wood": "Water", "Fire": "Wood", "Earth": "Fire", "Metal": "Earth", "Water": "Metal"}
+
+# Order of the weight vector (matches WeightOptimizer.weights)
+WEIGHT_KEYS = (
+    "month_branch", "hour_branch", "day_branch", "year_branch",
+    "month_stem", "hour_stem", "day_stem", "year_stem",
+)
+_BRANCH_COLS = [WEIGHT_KEYS.index(f"{p}_branch") for p in PILLARS]
+_STEM_COLS = [WEIGHT_KEYS.index(f"{p}_stem") for p in PILLARS]
+
+# Stem rooting thresholds (FluxEngine._solve_stem_intensity)
+ROOT_MIN_TRANSMITTANCE = 0.1
+ROOT_MIN_ENERGY = 5.0
+ROOTED_BASE = 5.0
+VIRTUAL_AMPLITUDE = 2.0
+
+_LAYOUT_FIELDS = ("geom", "T", "max_t", "stem_present", "alpha_b", "alpha_s", "beta_b", "beta_s")
+
+
+def weights_to_vector(weights: Dict[str, float]) -> np.ndarray:
+    return np.array([weights[k] for k in WEIGHT_KEYS], dtype=float)
+
+
+def vector_to_weights(vector: Sequence[float]) -> Dict[str, float]:
+    return {k: float(v) for k, v in zip(WEIGHT_KEYS, vector)}
+
+
+def day_master_element(chart: Dict) -> str:
+    """Same lookup as WeightOptimizer._predict_strength"""
+    day = chart.get('day', {})
+    if 'stem' in day:
+        return WuXingEngine.WU_XING_MAP.get(day['stem'], "Unknown")
+    return day.get('stem_element', 'Wood')
+
+
+def compile_case(chart: Dict) -> Dict[str, np.ndarray]:
+    """
+    Precompute one chart's particle layout.
+
+    Returns arrays indexed by pillar (year, month, day, hour):
+        geom (4,): branch mass multiplier from geometry (0 if no branch)
+        T (4, 4): transmittance of branch q for the element of stem p
+        max_t (4,): max transmittance per stem
+        stem_present (4,)
+        alpha_b / alpha_s (4,): pre-flow amplitude -> (DM + resource) energy
+        beta_b / beta_s (4,): pre-flow amplitude -> total energy
+    """
+    engine = FluxEngine(chart)
+    engine.interaction_events = []
+    particles = engine.particles
+    index = {p.id: i for i, p in enumerate(particles)}
+
+    before = [p.wave.amplitude for p in particles]
+    engine._solve_branch_geometry()
+
+    geom = np.zeros(4)
+    stem_present = np.zeros(4)
+    T = np.zeros((4, 4))
+    branches = [(PILLARS.index(p.id.split('_')[0]), p) for p in particles if p.type == 'branch']
+    for q, b in branches:
+        geom[q] = b.wave.amplitude / before[index[b.id]] if before[index[b.id]] else 0.0
+    for p in particles:
+        if p.type != 'stem':
+            continue
+        s = PILLARS.index(p.id.split('_')[0])
+        stem_present[s] = 1.0
+        s_elem = engine._get_main_element(p)
+        for q, b in branches:
+            T[s, q] = b.wave.dist.get(s_elem, 0.0)
+    max_t = T.max(axis=1)
+
+    # Flow network as a linear map over pre-flow amplitudes
+    n = len(particles)
+    M = np.eye(n)
+    node_map = {p.id: p for p in particles}
+    connections = engine._build_flow_edges(node_map)
+    for src, tgt in connections:
+        moved = FLOW_TRANSFER_RATE * M[index[src.id]]
+        M[index[src.id]] -= moved
+        M[index[tgt.id]] += moved
+    for _, _, end in engine._synergy_chains(connections):
+        M[index[end.id]] *= SYNERGY_BOOST
+
+    dm = day_master_element(chart)
+    res = RESOURCE_MAP.get(dm)
+    D = np.array([[p.wave.dist.get(e, 0.0) for e in ELEMENTS] for p in particles]).reshape(n, 5)
+    u = np.array([p.wave.dist.get(dm, 0.0) + p.wave.dist.get(res, 0.0) for p in particles])
+    alpha = M.T @ u
+    beta = M.T @ D.sum(axis=1)
+
+    alpha_b, alpha_s, beta_b, beta_s = (np.zeros(4) for _ in range(4))
+    for p in particles:
+        pillar = PILLARS.index(p.id.split('_')[0])
+        i = index[p.id]
+        if p.type == 'branch':
+            alpha_b[pillar], beta_b[pillar] = alpha[i], beta[i]
+        else:
+            alpha_s[pillar], beta_s[pillar] = alpha[i], beta[i]
+
+    return {
+        "geom": geom, "T": T, "max_t": max_t, "stem_present": stem_present,
+        "alpha_b": alpha_b, "alpha_s": alpha_s, "beta_b": beta_b, "beta_s": beta_s,
+    }
+
+
+def _compile_chunk(charts: List[Dict]) -> List[Dict[str, np.ndarray]]:
+    return [compile_case(c) for c in charts]
+
+
+class FluxBatchModel:
+    """
+    Day Master strength ratio for N compiled cases under K weight vectors.
+
+    Usage:
+        model = FluxBatchModel([case['chart'] for case in cases])
+        ratios = model.strength(W)                 # W: (K, 8) -> (K, N)
+        loss, grad = model.loss_and_grad(w, labels)
+    """
+
+    def __init__(self, charts: Sequence[Dict], n_workers: int = 1):
+        """
+        Args:
+            charts: natal charts ({'year': {'stem', 'branch'}, ...})
+            n_workers: >1 compiles layouts in a process pool (FluxEngine runs are pure Python)
+        """
+        charts = list(charts)
+        if n_workers > 1 and len(charts) > n_workers:
+            chunk = (len(charts) + n_workers - 1) // n_workers
+            chunks = [charts[i:i + chunk] for i in range(0, len(charts), chunk)]
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                layouts = [layout for part in pool.map(_compile_chunk, chunks) for layout in part]
+        else:
+            layouts = _compile_chunk(charts)
+
+        self.n_cases = len(layouts)
+        for field in _LAYOUT_FIELDS:
+            stacked = np.stack([l[field] for l in layouts]) if layouts else np.zeros((0, 4, 4) if field == "T" else (0, 4))
+            setattr(self, field, stacked)
+
+    # --- forward ---
+
+    def _forward(self, W: np.ndarray):
+        W = np.atleast_2d(np.asarray(W, dtype=float))
+        wb = W[:, _BRANCH_COLS][:, None, :]                             # (K, 1, 4)
+        ws = W[:, _STEM_COLS][:, None, :]
+        xb = BRANCH_MASS_PER_WEIGHT * wb * self.geom[None]               # (K, N, 4) pre-flow branch amplitude
+        root = np.einsum('knq,npq->knp', xb, self.T)                    # root energy per stem
+        rooted = (self.max_t[None] >= ROOT_MIN_TRANSMITTANCE) | (root >= ROOT_MIN_ENERGY)
+        intensity = np.where(rooted, ROOTED_BASE + root, VIRTUAL_AMPLITUDE) * self.stem_present[None]
+        xs = ws * intensity
+        num = (self.alpha_b[None] * xb).sum(-1) + (self.alpha_s[None] * xs).sum(-1)
+        den = (self.beta_b[None] * xb).sum(-1) + (self.beta_s[None] * xs).sum(-1)
+        return W, xb, ws, rooted, intensity, num, den
+
+    def strength(self, W: np.ndarray) -> np.ndarray:
+        """
+        Args:
+            W: (K, 8) or (8,) weight vectors in WEIGHT_KEYS order
+        Returns:
+            (K, N) Day Master strength ratios (0.0 where total energy is 0)
+        """
+        _, _, _, _, _, num, den = self._forward(W)
+        return np.divide(num, den, out=np.zeros_like(num), where=den != 0)
+
+    # --- loss / gradient ---
+
+    def loss(self, W: np.ndarray, labels: np.ndarray) -> np.ndarray:
+        """(K,) mean squared error for each weight vector"""
+        return ((self.strength(W) - np.asarray(labels, dtype=float)[None]) ** 2).mean(axis=1)
+
+    def loss_and_grad(self, w: np.ndarray, labels: np.ndarray):
+        """Analytic MSE gradient (exact away from the stem rooting threshold)"""
+        labels = np.asarray(labels, dtype=float)
+        W, xb, ws, rooted, intensity, num, den = self._forward(w)
+        num, den, xb, ws, rooted, intensity = num[0], den[0], xb[0], ws[0], rooted[0], intensity[0]
+        safe = den != 0
+        ratio = np.divide(num, den, out=np.zeros_like(num), where=safe)
+
+        # d(pre-flow amplitude)/d(weight): branches are linear in their own weight,
+        # rooted stems pick up every branch weight through the root energy
+        scale_b = BRANCH_MASS_PER_WEIGHT * self.geom                                        # (N, 4)
+        stem_root = (ws * rooted * self.stem_present)[:, :, None] * self.T * scale_b[:, None, :]  # (N, p, q)
+        dnum_b = self.alpha_b * scale_b + np.einsum('np,npq->nq', self.alpha_s, stem_root)
+        dden_b = self.beta_b * scale_b + np.einsum('np,npq->nq', self.beta_s, stem_root)
+        dnum_s = self.alpha_s * intensity
+        dden_s = self.beta_s * intensity
+
+        inv = np.divide(1.0, den, out=np.zeros_like(den), where=safe)[:, None]
+        dr_b = (dnum_b - ratio[:, None] * dden_b) * inv
+        dr_s = (dnum_s - ratio[:, None] * dden_s) * inv
+
+        residual = 2.0 * (ratio - labels) / max(self.n_cases, 1)
+        grad = np.zeros(len(WEIGHT_KEYS))
+        grad[_BRANCH_COLS] = residual @ dr_b
+        grad[_STEM_COLS] = residual @ dr_s
+        return float(((ratio - labels) ** 2).mean()), grad
+
+    def central_grad(self, w: np.ndarray, labels: np.ndarray, epsilon: float = 1e-3):
+        """Central differences: 1 + 2 x 8 weight vectors evaluated in one batch"""
+        w = np.asarray(w, dtype=float)
+        eye = np.eye(len(w)) * epsilon
+        W = np.vstack([w[None], w + eye, w - eye])
+        losses = self.loss(W, labels)
+        k = len(w)
+        grad = (losses[1:1 + k] - losses[1 + k:]) / (2 * epsilon)
+        return float(losses[0]), grad
@@ -1,19 +1,35 @@
+import time
+
 import numpy as np
 from core.flux import FluxEngine
+from learning.flux_batch import FluxBatchModel, vector_to_weights, weights_to_vector
 
 class WeightOptimizer:
     """
     Antigravity Physics Kernel Calibrator (V7.0).
     Uses Gradient Descent to optimize FluxEngine positional weights based on Ground Truth labels.
+
+    Backends:
+        'batch'  (default): every case's particle layout is compiled once (learning/flux_batch.py);
+                 each epoch evaluates all cases in one array computation.
+        'engine': reference path, runs a full FluxEngine per case per evaluation.
     """
-    
-    def __init__(self, cases):
+
+    def __init__(self, cases, backend="batch", gradient="analytic", n_workers=1):
         """
         cases: list of dicts.
                Example: [{'chart': {...}, 'label': 1.0 (Strong) / 0.0 (Weak)}, ...]
+        backend: 'batch' or 'engine'
+        gradient: 'analytic' or 'central' (batch backend; the engine backend always uses central differences)
+        n_workers: process pool size for compiling case layouts (1 = in-process)
         """
         self.cases = cases
+        self.backend = backend
+        self.gradient = gradient
+        self.n_workers = n_workers
         self.learning_rate = 0.05
+        self.epsilon = 0.1
+        self.min_weight = 0.1
         # Initial Weights (V7.0 Baseline)
         self.weights = {
             "month_branch": 4.5,
@@ -25,58 +41,61 @@ class WeightOptimizer:
             "day_stem": 1.0,
             "year_stem": 1.0
         }
-        
+        self.history = []
+        self._model = None
+
+    @property
+    def model(self):
+        """Compiled batch model (built on first use)"""
+        if self._model is None:
+            start = time.time()
+            self._model = FluxBatchModel([case['chart'] for case in self.cases], n_workers=self.n_workers)
+            print(f"Compiled {self._model.n_cases} case layouts in {time.time() - start:.2f}s")
+        return self._model
+
+    def _labels(self):
+        return np.array([case['label'] for case in self.cases], dtype=float)
+
     def optimize(self, epochs=50):
         print(f"Starting Optimization on {len(self.cases)} cases...")
-        
+        labels = self._labels()
+        w = weights_to_vector(self.weights)
+
         for epoch in range(epochs):
-            total_loss = 0.0
-            gradients = {k: 0.0 for k in self.weights}
-            
-            for case in self.cases:
-                chart = case['chart']
-                true_label = case['label'] # 1.0 or 0.0
-                
-                # Forward Pass
-                pred_strength = self._predict_strength(chart, self.weights)
-                
-                # Loss (MSE)
-                loss = (pred_strength - true_label) ** 2
-                total_loss += loss
-                
-                # Backward Pass (Approximate Gradient via Finite Difference would be cleaner given the complex FluxEngine logic, 
-                # but let's try a heuristic direction)
-                # If Pred > True (Too Strong) -> Decrease weights of Dominant Elements? 
-                # That's hard.
-                # Let's use Finite Difference (Numerical Gradient) for accuracy.
-                pass 
-
-            # Numerical Gradient Descent (Batch)
-            # Since we only have ~8 params, we can checking dLoss/dWeight individually per epoch
-            current_loss = self._calculate_batch_loss(self.weights)
-            epsilon = 0.1
-            
-            for key in self.weights:
-                # Perturb +
-                temp_weights = self.weights.copy()
-                temp_weights[key] += epsilon
-                loss_plus = self._calculate_batch_loss(temp_weights)
-                
-                # Gradient: (f(x+h) - f(x)) / h
-                grad = (loss_plus - current_loss) / epsilon
-                
-                # Update
-                self.weights[key] -= self.learning_rate * grad
-                
-                # Constraint: Weights must be positive
-                self.weights[key] = max(0.1, self.weights[key])
+            current_loss, grad = self._loss_and_grad(w, labels)
+            self.history.append(current_loss)
+
+            # Update + Constraint: Weights must be positive
+            w = np.maximum(self.min_weight, w - self.learning_rate * grad)
 
             if epoch % 10 == 0:
                 print(f"Epoch {epoch}: Loss = {current_loss:.4f}")
-                
+
+        self.weights = vector_to_weights(w)
         return self.weights
 
+    def _loss_and_grad(self, w, labels):
+        if self.backend == "engine":
+            return self._engine_central_grad(w)
+        if self.gradient == "central":
+            return self.model.central_grad(w, labels, epsilon=self.epsilon)
+        return self.model.loss_and_grad(w, labels)
+
+    def _engine_central_grad(self, w):
+        """Reference gradient: central differences over full FluxEngine runs"""
+        current_loss = self._calculate_batch_loss(vector_to_weights(w))
+        grad = np.zeros_like(w)
+        for i in range(len(w)):
+            plus, minus = w.copy(), w.copy()
+            plus[i] += self.epsilon
+            minus[i] -= self.epsilon
+            grad[i] = (self._calculate_batch_loss(vector_to_weights(plus))
+                       - self._calculate_batch_loss(vector_to_weights(minus))) / (2 * self.epsilon)
+        return current_loss, grad
+
     def _calculate_batch_loss(self, weights):
+        if self.backend != "engine":
+            return float(self.model.loss(weights_to_vector(weights), self._labels())[0])
         loss = 0.0
         for case in self.cases:
             pred = self._predict_strength(case['chart'], weights)
@@ -88,29 +107,29 @@ class WeightOptimizer:
         Runs FluxEngine with proposed weights and returns Day Master Strength Ratio (0.0 - 1.0).
         """
         flux = FluxEngine(chart)
-        # Inject weights
-        flux.params['positional_weights'] = weights
-        
+        # Inject weights (rebuilds particles with weighted branch masses)
+        flux.set_hyperparameters({'positional_weights': weights})
+
         result = flux.compute_energy_state()
         spec = result['spectrum']
-        
+
         dm_elem = chart.get('day', {}).get('stem_element', 'Wood') # Assume processed chart or lookup
         # Fallback if stem_element not in chart dict, try to derive
         if 'stem' in chart.get('day', {}):
              from core.wuxing_engine import WuXingEngine
              wx = WuXingEngine(chart)
              dm_elem = wx.get_wuxing(chart['day']['stem'])
-        
+
         # Calculate DM Strength Ratio
         total_energy = sum(spec.values())
         if total_energy == 0: return 0.0
-        
+
         # Proper Strength: Same + Resource
-        # generating = {"Wood":"Water", ...} # Wait, need Resource. 
+        # generating = {"Wood":"Water", ...} # Wait, need Resource.
         # Resource is element that generates DM.
         resource_map = {"Wood":"Water", "Fire":"Wood", "Earth":"Fire", "Metal":"Earth", "Water":"Metal"}
         resource_elem = resource_map.get(dm_elem)
-        
+
         my_strength = spec.get(dm_elem, 0) + spec.get(resource_elem, 0)
-        
+
         return my_strength / total_energy
@@ -1,9 +1,33 @@
+import os
 from youtube_transcript_api import YouTubeTranscriptApi
 from urllib.parse import urlparse, parse_qs
 
+HISTORY_FILE = os.path.join(os.path.dirname(__file__), "../data/video_history.txt")
+
+
 class VideoMiner:
-    def __init__(self):
-        pass
+    def __init__(self, db=None):
+        self._db = db
+        self._history_checked = False
+
+    @property
+    def db(self):
+        """LearningDB holding the processed-video set (legacy history file imported once)"""
+        if self._db is None:
+            from learning.db import LearningDB
+            self._db = LearningDB()
+        if not self._history_checked:
+            self._history_checked = True
+            self._import_history_file()
+        return self._db
+
+    def _import_history_file(self):
+        if not os.path.isfile(HISTORY_FILE):
+            return
+        with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
+            ids = [line.strip() for line in f if line.strip()]
+        self._db.mark_videos_processed(ids)
+        os.replace(HISTORY_FILE, HISTORY_FILE + ".imported")
 
     def get_video_id(self, url):
         """
@@ -67,16 +91,17 @@ class VideoMiner:
             
             return None, f"读取失败: {msg}"
 
-    def download_audio(self, url):
+    def download_audio(self, url, output_dir=None):
         """
         Step 1: Download audio via yt-dlp. Returns (file_path, error_msg)
+        output_dir: target directory (default: current directory)
         """
         import yt_dlp
         import os
         
         video_id = self.get_video_id(url)
         # Use a consistent filename based on ID
-        output_template = f"audio_{video_id}"
+        output_template = os.path.join(output_dir or "", f"audio_{video_id}")
         expected_file = f"{output_template}.mp3"
         
         # Cleanup previous run if exists
@@ -107,9 +132,9 @@ class VideoMiner:
             # verifying file existence
             if not os.path.exists(expected_file):
                 # Try finding any file starting with output_template
-                for f in os.listdir('.'):
-                    if f.startswith(output_template):
-                        expected_file = f
+                for f in os.listdir(output_dir or '.'):
+                    if f.startswith(f"audio_{video_id}"):
+                        expected_file = os.path.join(output_dir or "", f)
                         break
             
             if not os.path.exists(expected_file):
@@ -148,6 +173,20 @@ class VideoMiner:
         Fetch all video IDs from a YouTube channel/playlist using yt-dlp.
         Returns (video_ids_list, error_msg)
         """
+        try:
+            video_ids = [entry['id'] for entry in self.iter_channel_videos(channel_url)]
+        except Exception as e:
+            return None, f"Channel Fetch Error: {e}"
+        if not video_ids:
+            return None, "No videos found (Check URL)"
+        return video_ids, None
+
+    def iter_channel_videos(self, channel_url):
+        """
+        Lazily list a channel/playlist, newest first: yields {id, title, timestamp}.
+        Pages are requested from the site only as the caller iterates, so an incremental
+        scan that stops at its cursor never lists the rest of the channel.
+        """
         import yt_dlp
         
         ydl_opts = {
@@ -156,18 +195,16 @@ class VideoMiner:
             'ignoreerrors': True, # Skip private/deleted videos without crashing
         }
         
-        try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                result = ydl.extract_info(channel_url, download=False)
-                
-            if 'entries' in result:
-                # Playlist or Channel results
-                video_ids = [entry['id'] for entry in result['entries'] if entry and 'id' in entry]
-                return video_ids, None
-            else:
-                 return None, "No videos found (Check URL)"
-        except Exception as e:
-            return None, f"Channel Fetch Error: {e}"
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            # process=False keeps 'entries' a lazy, page-by-page generator
+            result = ydl.extract_info(channel_url, download=False, process=False)
+            for entry in (result or {}).get('entries') or ():
+                if entry and entry.get('id'):
+                    yield {
+                        'id': entry['id'],
+                        'title': entry.get('title', ''),
+                        'timestamp': entry.get('timestamp') or entry.get('release_timestamp'),
+                    }
 
     def cleanup_temp_files(self):
         """
@@ -192,22 +229,27 @@ class VideoMiner:
         """
         Returns a set of processed video IDs.
         """
-        import os
-        history_path = os.path.join(os.path.dirname(__file__), "../data/video_history.txt")
-        if not os.path.exists(history_path):
-            return set()
-        
-        with open(history_path, 'r', encoding='utf-8') as f:
-            return set(line.strip() for line in f if line.strip())
+        return self.db.get_processed_video_ids()
+
+    def is_processed(self, video_id):
+        """Indexed single-video check (no full history load)"""
+        return self.db.is_video_processed(video_id)
 
     def mark_processed(self, video_id):
         """
-        Marks a video ID as processed in the history file.
+        Marks a video ID as processed in the video history.
         """
-        import os
-        history_path = os.path.join(os.path.dirname(__file__), "../data/video_history.txt")
-        with open(history_path, 'a', encoding='utf-8') as f:
-            f.write(f"{video_id}\n")
+        self.db.mark_videos_processed([video_id])
+
+    def mark_partial(self, video_id, segments):
+        """
+        Marks a video processed except for the segments whose mining failed (retried later).
+        """
+        self.db.mark_video_partial(video_id, segments)
+
+    def pending_segments(self, video_id):
+        """Segments left to retry for a partially processed video (None: mine the whole video)"""
+        return self.db.get_pending_segments(video_id)
 
 if __name__ == "__main__":
     # Test
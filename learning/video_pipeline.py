@@ -0,0 +1,502 @@
+"""
+Staged video mining pipeline.
+
+    fetch -> chunk -> transcribe -> clean -> extract
+
+Every stage is a worker pool fed by a bounded queue, sized for its workload:
+- fetch (I/O): platform transcript if available, otherwise audio download into the run's temp dir
+- chunk (I/O): ffmpeg splits the audio into SEGMENT_SECONDS pieces (whole file without ffmpeg)
+- transcribe (CPU): Whisper per segment, one model per worker thread
+- clean (CPU): TextCleaner per segment; segments are put back in order per video and packed
+  into chunk_chars extraction chunks as soon as enough text has arrived
+- extract (LLM): caller supplied extract(text, result)
+
+Bounded queues give back-pressure: downloads run at most queue_size items ahead of
+transcription, the next videos of a channel download while the current one transcribes,
+and the head of a long video is extracted while its tail is still being transcribed.
+
+Temp files: a segment is deleted once transcribed, the full audio once it has been split
+(or transcribed, when it is its own single segment); the run's temp dir is removed at the end.
+
+Partial results: a segment that fails to transcribe, or whose extraction chunk fails, is listed in
+VideoResult.failed_segments while the rest of the video is still mined. Callers keep what was
+saved and retry just those segments with VideoTask(segments=...).
+"""
+
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SECONDS = 300
+CHUNK_CHARS = 4000
+MIN_TEXT_CHARS = 50
+
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    """One pipeline stage: fn(item) yields zero or more items for the next stage"""
+    name: str
+    fn: Callable[[Any], Iterable[Any]]
+    workers: int = 1
+
+
+class StagedPipeline:
+    """
+    Runs items through a chain of stages, each with its own worker threads and a bounded
+    input queue. A stage generator's items are handed downstream as they are yielded.
+    An exception in a stage drops that item (on_error is told) and never stops the pipeline.
+    """
+
+    def __init__(self, stages: Sequence[Stage], queue_size: int = 4,
+                 on_error: Optional[Callable[[str, Any, Exception], None]] = None):
+        self.stages = list(stages)
+        self.queue_size = queue_size
+        self.on_error = on_error
+
+    def run(self, items: Iterable[Any], sink: Optional[Callable[[Any], None]] = None) -> List[Any]:
+        """Feed items, block until every stage has drained; returns the last stage's outputs (unless sink)"""
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        outputs: List[Any] = []
+        out_lock = threading.Lock()
+        remaining = [stage.workers for stage in self.stages]
+        remaining_lock = threading.Lock()
+
+        def emit(i: int, item: Any):
+            if i + 1 < len(self.stages):
+                queues[i + 1].put(item)
+            elif sink is not None:
+                sink(item)
+            else:
+                with out_lock:
+                    outputs.append(item)
+
+        def worker(i: int):
+            stage = self.stages[i]
+            while True:
+                item = queues[i].get()
+                if item is _DONE:
+                    break
+                try:
+                    for out in stage.fn(item) or ():
+                        emit(i, out)
+                except Exception as e:
+                    logger.warning(f"Stage {stage.name} failed: {e}")
+                    if self.on_error:
+                        self.on_error(stage.name, item, e)
+            with remaining_lock:
+                remaining[i] -= 1
+                last = remaining[i] == 0
+            if last and i + 1 < len(self.stages):
+                for _ in range(self.stages[i + 1].workers):
+                    queues[i + 1].put(_DONE)
+
+        threads = [threading.Thread(target=worker, args=(i,), daemon=True,
+                                    name=f"pipeline-{stage.name}-{n}")
+                   for i, stage in enumerate(self.stages) for n in range(stage.workers)]
+        for t in threads:
+            t.start()
+        try:
+            for item in items:
+                queues[0].put(item)
+        finally:
+            for _ in range(self.stages[0].workers):
+                queues[0].put(_DONE)
+            for t in threads:
+                t.join()
+        return outputs
+
+
+@dataclass
+class VideoTask:
+    url: str
+    video_id: Optional[str] = None
+    title: str = ""
+    audio_path: Optional[str] = None   # already downloaded audio (consumed: deleted once transcribed)
+    text: Optional[str] = None         # transcript already at hand (skips fetch and transcription)
+    segments: Optional[List[int]] = None  # retry: only these audio segments are transcribed and mined
+
+
+@dataclass
+class VideoResult:
+    url: str
+    video_id: Optional[str] = None
+    title: str = ""
+    source: str = ""                   # "subtitle" | "audio"
+    segments: int = 0
+    chunks: int = 0
+    transcript: str = ""               # raw transcript, segments in order
+    extracted: List[Any] = field(default_factory=list)  # extract() return values, chunk order
+    errors: List[str] = field(default_factory=list)
+    failed_segments: List[int] = field(default_factory=list)  # segments to retry (transcribe / extract failed)
+    elapsed_s: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Every chunk was mined"""
+        return self.chunks > 0 and len(self.extracted) == self.chunks and not self.failed_segments
+
+    @property
+    def partial(self) -> bool:
+        """Some chunks were mined, failed_segments still need a retry"""
+        return bool(self.extracted) and bool(self.failed_segments)
+
+
+class _VideoState:
+    """Per-video bookkeeping shared by the stages"""
+
+    def __init__(self, task: VideoTask):
+        self.task = task
+        self.result = VideoResult(url=task.url, video_id=task.video_id, title=task.title)
+        self.started = time.perf_counter()
+        self.lock = threading.Lock()
+        self.total: Optional[int] = None
+        self.next_index = 0
+        self.pending: Dict[int, tuple] = {}
+        self.raw_parts: List[str] = []
+        self.buffer = ""
+        self.marks: List[tuple] = []       # (buffer offset, segment id) where each segment's text starts
+        self.segment_ids: Optional[List[int]] = None  # pipeline index -> segment id (retries)
+        self.failed: set = set()
+        self.emitted = 0
+        self.done = 0
+        self.sealed = False
+        self.finished = False
+        self.extracted: Dict[int, Any] = {}
+
+    def segment_id(self, index: int) -> int:
+        return self.segment_ids[index] if self.segment_ids is not None else index
+
+    def take(self, n: int):
+        """Cut the first n buffered chars; returns (text, ids of the segments it covers). Caller holds lock."""
+        text, self.buffer = self.buffer[:n], self.buffer[n:]
+        covered = [sid for start, sid in self.marks if start < n]
+        rest = [(start - n, sid) for start, sid in self.marks if start >= n]
+        if self.buffer and covered and (not rest or rest[0][0] > 0):
+            rest.insert(0, (0, covered[-1]))  # that segment continues into the next chunk
+        self.marks = rest
+        return text, tuple(covered)
+
+
+@dataclass
+class _Audio:
+    state: _VideoState
+    path: str
+
+
+@dataclass
+class _Segment:
+    state: _VideoState
+    index: int
+    total: int
+    path: str
+
+
+@dataclass
+class _Text:
+    state: _VideoState
+    index: int
+    total: int
+    text: str
+
+
+@dataclass
+class _Chunk:
+    state: _VideoState
+    index: int
+    text: str
+    segments: tuple = ()
+
+
+def split_audio(path: str, out_dir: str, segment_seconds: int = SEGMENT_SECONDS) -> List[str]:
+    """
+    Cut audio into segment_seconds pieces with ffmpeg (stream copy, no re-encode).
+    Returns [path] when ffmpeg is unavailable or fails.
+    """
+    if not shutil.which("ffmpeg"):
+        return [path]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    ext = os.path.splitext(path)[1] or ".mp3"
+    pattern = os.path.join(out_dir, f"{stem}_seg%04d{ext}")
+    cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y", "-i", path,
+           "-f", "segment", "-segment_time", str(segment_seconds), "-c", "copy", pattern]
+    try:
+        subprocess.run(cmd, check=True, capture_output=True, timeout=600)
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"Audio split failed ({e}), transcribing {path} whole")
+        return [path]
+    prefix = f"{stem}_seg"
+    segments = sorted(os.path.join(out_dir, f) for f in os.listdir(out_dir)
+                      if f.startswith(prefix) and f.endswith(ext))
+    return segments or [path]
+
+
+def _remove(path: Optional[str]):
+    if path and os.path.exists(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class VideoPipeline:
+    """
+    Streaming transcript pipeline over VideoTasks (see module docstring).
+
+    Defaults: VideoMiner for transcripts / audio, MediaMiner (Whisper) for transcription,
+    TextCleaner for cleaning. Stage functions are injectable for other sources or tests:
+        fetch_transcript(task) -> Optional[str]   (None: go through audio)
+        download_audio(task, out_dir) -> path     (raise on failure)
+        split(path, out_dir, seconds) -> [paths]  (default: split_audio)
+        transcribe(path) -> str                   (raise on failure)
+        clean(text) -> str                        (clean_text=False: no cleaning)
+        extract(text, result) -> Any
+    """
+
+    def __init__(self, extract: Callable[[str, VideoResult], Any],
+                 fetch_transcript: Optional[Callable[[VideoTask], Optional[str]]] = None,
+                 download_audio: Optional[Callable[[VideoTask, str], str]] = None,
+                 split: Optional[Callable[[str, str, int], List[str]]] = None,
+                 transcribe: Optional[Callable[[str], str]] = None,
+                 clean: Optional[Callable[[str], str]] = None, clean_text: bool = True,
+                 on_video_done: Optional[Callable[[VideoResult], None]] = None,
+                 chunk_chars: int = CHUNK_CHARS, min_chars: int = MIN_TEXT_CHARS,
+                 segment_seconds: int = SEGMENT_SECONDS,
+                 fetch_workers: int = 2, transcribe_workers: Optional[int] = None,
+                 extract_workers: int = 1, queue_size: int = 4,
+                 model_size: str = "base", temp_root: Optional[str] = None):
+        self.extract = extract
+        self.fetch_transcript = fetch_transcript or self._default_fetch_transcript
+        self.download_audio = download_audio or self._default_download_audio
+        self.split = split or split_audio
+        self.transcribe = transcribe or self._default_transcribe
+        if clean is None and clean_text:
+            from learning.text_cleaner import TextCleaner
+            clean = TextCleaner.clean
+        self.clean = clean if clean_text else None
+        self.on_video_done = on_video_done
+        self.chunk_chars = chunk_chars
+        self.min_chars = min_chars
+        self.segment_seconds = segment_seconds
+        self.fetch_workers = fetch_workers
+        # Whisper is CPU heavy and holds a model per worker: at most half the cores, capped at 2
+        self.transcribe_workers = transcribe_workers or max(1, min(2, (os.cpu_count() or 1) // 2))
+        self.extract_workers = extract_workers
+        self.queue_size = queue_size
+        self.model_size = model_size
+        self.temp_root = temp_root
+        self._miner = None
+        self._local = threading.local()
+        self._workdir: Optional[str] = None
+
+    # --- default stage backends ---
+
+    def _video_miner(self):
+        if self._miner is None:
+            from learning.video_miner import VideoMiner
+            self._miner = VideoMiner()
+        return self._miner
+
+    def _default_fetch_transcript(self, task: VideoTask) -> Optional[str]:
+        text, status = self._video_miner().fetch_transcript(task.url)
+        if text:
+            return text
+        if status == "WHISPER_FALLBACK":
+            return None
+        raise RuntimeError(status)
+
+    def _default_download_audio(self, task: VideoTask, out_dir: str) -> str:
+        path, err = self._video_miner().download_audio(task.url, output_dir=out_dir)
+        if not path:
+            raise RuntimeError(err)
+        return path
+
+    def _default_transcribe(self, path: str) -> str:
+        mm = getattr(self._local, "media_miner", None)
+        if mm is None:
+            from learning.media_miner import MediaMiner
+            mm = self._local.media_miner = MediaMiner(model_size=self.model_size)
+        text = mm.transcribe(path)
+        if text.startswith("[Error"):
+            raise RuntimeError(text)
+        return text
+
+    # --- stages ---
+
+    def _stage_fetch(self, state: _VideoState):
+        task = state.task
+        try:
+            if task.text is not None:
+                state.result.source = "subtitle"
+                yield _Text(state, 0, 1, task.text)
+                return
+            if task.audio_path is None:
+                text = self.fetch_transcript(task)
+                if text is not None:
+                    state.result.source = "subtitle"
+                    yield _Text(state, 0, 1, text)
+                    return
+                task.audio_path = self.download_audio(task, self._workdir)
+            state.result.source = "audio"
+            yield _Audio(state, task.audio_path)
+        except Exception as e:
+            self._fail(state, f"fetch: {e}")
+
+    def _stage_chunk(self, audio):
+        if isinstance(audio, _Text):  # transcript already at hand: pass through
+            yield audio
+            return
+        state = audio.state
+        try:
+            paths = self.split(audio.path, self._workdir, self.segment_seconds)
+        except Exception as e:
+            _remove(audio.path)
+            self._fail(state, f"chunk: {e}")
+            return
+        if paths != [audio.path]:
+            _remove(audio.path)  # the segments carry the audio from here on
+        ids = list(range(len(paths)))
+        if state.task.segments is not None:
+            wanted = set(state.task.segments)
+            selected = [i for i in ids if i in wanted]
+            if selected:
+                for i in ids:
+                    if i not in selected:
+                        _remove(paths[i])
+                ids = selected
+            else:  # segmentation changed since the first run: redo the whole video
+                logger.warning(f"Segments {wanted} not among {len(paths)} segments, processing all")
+        with state.lock:
+            state.segment_ids = ids
+        for n, i in enumerate(ids):
+            yield _Segment(state, n, len(ids), paths[i])
+
+    def _stage_transcribe(self, seg):
+        if isinstance(seg, _Text):
+            yield seg
+            return
+        try:
+            text = self.transcribe(seg.path)
+        except Exception as e:
+            with seg.state.lock:
+                sid = seg.state.segment_id(seg.index)
+                seg.state.result.errors.append(f"transcribe segment {sid}: {e}")
+                seg.state.failed.add(sid)
+            text = ""  # keep the video's later segments flowing
+        finally:
+            _remove(seg.path)
+        yield _Text(seg.state, seg.index, seg.total, text)
+
+    def _stage_clean(self, part: _Text):
+        state = part.state
+        try:
+            cleaned = self.clean(part.text) if (self.clean and part.text) else part.text
+        except Exception as e:
+            cleaned = part.text
+            with state.lock:
+                state.result.errors.append(f"clean segment {state.segment_id(part.index)}: {e}")
+        chunks = []
+        with state.lock:
+            state.total = part.total
+            state.pending[part.index] = (part.text, cleaned)
+            while state.next_index in state.pending:
+                raw, text = state.pending.pop(state.next_index)
+                state.raw_parts.append(raw)
+                state.marks.append((len(state.buffer), state.segment_id(state.next_index)))
+                state.buffer += text
+                state.next_index += 1
+            while len(state.buffer) >= self.chunk_chars:
+                chunks.append(state.take(self.chunk_chars))
+            if state.next_index == state.total:
+                tail = state.take(len(state.buffer))
+                # short leftovers are mined only as part of a longer text
+                if tail[0] and (state.emitted + len(chunks) > 0 or len(tail[0]) >= self.min_chars):
+                    chunks.append(tail)
+                state.sealed = True
+            first = state.emitted
+            state.emitted += len(chunks)
+            finish = state.sealed and state.done == state.emitted
+        # yield outside the lock: extract workers take it when they finish a chunk
+        for i, (text, segments) in enumerate(chunks):
+            yield _Chunk(state, first + i, text, segments)
+        if finish:
+            self._finish(state)
+
+    def _stage_extract(self, chunk: _Chunk):
+        state = chunk.state
+        try:
+            value = self.extract(chunk.text, state.result)
+            error = None
+        except Exception as e:
+            value, error = None, f"extract chunk {chunk.index}: {e}"
+        with state.lock:
+            if error:
+                state.result.errors.append(error)
+                state.failed.update(chunk.segments)
+            else:
+                state.extracted[chunk.index] = value
+            state.done += 1
+            finish = state.sealed and state.done == state.emitted
+        if finish:
+            self._finish(state)
+        return ()
+
+    # --- bookkeeping ---
+
+    def _fail(self, state: _VideoState, error: str):
+        with state.lock:
+            state.result.errors.append(error)
+        self._finish(state)
+
+    def _finish(self, state: _VideoState):
+        with state.lock:
+            if state.finished:
+                return
+            state.finished = True
+            result = state.result
+            result.segments = state.total or 0
+            result.chunks = state.emitted
+            result.transcript = "".join(state.raw_parts)
+            result.extracted = [state.extracted[i] for i in sorted(state.extracted)]
+            result.failed_segments = sorted(state.failed)
+            result.elapsed_s = time.perf_counter() - state.started
+        if result.errors:
+            logger.warning(f"Video {result.video_id or result.url}: {'; '.join(result.errors)}")
+        if self.on_video_done:
+            try:
+                self.on_video_done(result)
+            except Exception as e:
+                logger.warning(f"on_video_done failed for {result.url}: {e}")
+
+    def stages(self) -> List[Stage]:
+        return [
+            Stage("fetch", self._stage_fetch, self.fetch_workers),
+            Stage("chunk", self._stage_chunk, 1),
+            Stage("transcribe", self._stage_transcribe, self.transcribe_workers),
+            Stage("clean", self._stage_clean, 1),
+            Stage("extract", self._stage_extract, self.extract_workers),
+        ]
+
+    def run(self, tasks: Iterable[VideoTask]) -> List[VideoResult]:
+        """Process all tasks; returns their results in input order once every video is finished"""
+        states = [_VideoState(t if isinstance(t, VideoTask) else VideoTask(url=t)) for t in tasks]
+        self._workdir = tempfile.mkdtemp(prefix="video_pipeline_", dir=self.temp_root)
+        try:
+            StagedPipeline(self.stages(), queue_size=self.queue_size).run(states)
+        finally:
+            shutil.rmtree(self._workdir, ignore_errors=True)
+            self._workdir = None
+        for state in states:
+            if not state.finished:  # dropped by an unexpected stage error
+                self._fail(state, "pipeline: video did not complete")
+        return [s.result for s in states]
@@ -1,10 +1,10 @@
 
-import requests
 from bs4 import BeautifulSoup
 from duckduckgo_search import DDGS
 import json
 import re
 from core.config_manager import ConfigManager
+from learning.fetcher import get_fetcher
 
 class WebHunter:
     """
@@ -12,6 +12,9 @@ class WebHunter:
     Searches the open web for Bazi case studies and extracts chart data + life events.
     """
     
+    # Simple User-Agent to avoid immediate block
+    SCRAPE_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
+
     def __init__(self, ollama_host=None):
         self.cm = ConfigManager()
         if not ollama_host or "115" in ollama_host:
@@ -29,11 +32,12 @@ class WebHunter:
         results = self._search(target_name)
         if not results: return None
         
-        # Analyze top 2 results to find data
-        for r in results[:2]:
-            url = r.get('href')
+        # Analyze top 2 results to find data (both pages prefetched in parallel)
+        urls = [r.get('href') for r in results[:2]]
+        pages = get_fetcher().fetch_many(urls, headers=self.SCRAPE_HEADERS)
+        for url, page in zip(urls, pages):
             print(f"Hunting in: {url}")
-            content = self._scrape(url)
+            content = self._page_text(page)
             
             if len(content) < 200: continue
             
@@ -56,11 +60,11 @@ class WebHunter:
             return []
 
     def _scrape(self, url):
+        return self._page_text(get_fetcher().fetch(url, headers=self.SCRAPE_HEADERS))
+
+    def _page_text(self, resp):
         try:
-            # Simple User-Agent to avoid immediate block
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-            resp = requests.get(url, headers=headers, timeout=10)
-            if resp.status_code == 200:
+            if resp.ok:
                 # Extract text
                 soup = BeautifulSoup(resp.content, 'html.parser')
                 # Remove scripts and styles
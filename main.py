@@ -1,9 +1,17 @@
 import streamlit as st
 import logging
 import os
-from ui.utils import load_css
-from ui.sidebar import render_sidebar
-from core.config_manager import ConfigManager
+# [V9.4 Performance] 启动分析：streamlit run main.py -- --profile-startup
+from utils.startup_profiler import get_startup_profiler
+profiler = get_startup_profiler()
+profiler.begin_run()  # 单例跨重跑存活：每次重跑重新计时
+
+with profiler.measure("import:ui.utils", kind="import"):
+    from ui.utils import load_css
+with profiler.measure("import:ui.sidebar", kind="import"):
+    from ui.sidebar import render_sidebar
+with profiler.measure("import:core.config_manager", kind="import"):
+    from core.config_manager import ConfigManager
 
 # 1. Page Configuration
 st.set_page_config(
@@ -26,6 +34,9 @@ nav_options = ["🔮 智能排盘", "💰 财运推演", "🌀 量子仿真", "
 # 如果 URL 带有文档或配置参数，强制跳转到规范文档页面
 if "selected_doc" in st.query_params or "anchor_cfg" in st.query_params:
     st.session_state["nav_radio"] = "📚 规范文档"
+# /profile 阶段耗时视图位于天机设置页
+elif st.query_params.get("view") == "profile":
+    st.session_state["nav_radio"] = "⚙️ 天机设置"
 
 app_mode = st.radio(
     "Navigation", 
@@ -43,83 +54,85 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 logger = logging.getLogger(__name__)
 
 # 4. Sidebar Content (Profile Manager etc.)
-render_sidebar(app_mode)
+with profiler.measure("render:sidebar"):
+    render_sidebar(app_mode)
 
 # 5. Page Routing
-if app_mode == "⚡ 架构师":
-    from ui.pages.architect_console import render_architect_console
-    render_architect_console()
-
-elif app_mode == "⚙️ 天机设置":
-    from ui.pages.system_config import render_system_config
-    cm = ConfigManager()
-    render_system_config(cm)
-
-elif app_mode == "🕯️ 悟性训练":
-    from ui.pages.training_center import render_training_center
-    render_training_center()
+with profiler.measure(f"page:{app_mode}"):
+    if app_mode == "⚡ 架构师":
+        from ui.pages.architect_console import render_architect_console
+        render_architect_console()
+
+    elif app_mode == "⚙️ 天机设置":
+        from ui.pages.system_config import render_system_config
+        cm = ConfigManager()
+        render_system_config(cm)
+
+    elif app_mode == "🕯️ 悟性训练":
+        from ui.pages.training_center import render_training_center
+        render_training_center()
     
-elif app_mode == "✨ 量子真言":
-    import ui.pages.quantum_lab as qlab
-    qlab.render()
-
-elif app_mode == "🌟 命运回响":
-    import ui.pages.zeitgeist as cinema
-    cinema.render()
-
-elif app_mode == "🌀 量子仿真":
-    from ui.pages.quantum_simulation import render
-    render()
-
-elif app_mode == "🌙 自我进化":
-    from ui.pages.self_learning import render_self_learning
-    render_self_learning()
-
-elif app_mode == "📜 古籍挖掘":
-    from ui.pages.mining_console import render as render_mining_console
-    render_mining_console()
-
-elif app_mode == "💰 财运推演":
-    from ui.pages.wealth_verification import render
-    render()
-
-elif app_mode == "📋 档案审计":
-    from ui.pages.profile_audit import render
-    render()
-
-elif app_mode == "🌌 全息格局":
-    from ui.pages.holographic_pattern import render
-    render()
-
-elif app_mode == "🏛️ 量子架构注册":
-    from ui.pages.quantum_framework_registry import render
-    render()
-
-elif app_mode == "📚 规范文档":
-    from ui.pages.document_management import render
-    render()
-
-elif app_mode == "🔮 智能排盘":
-    # --- Prediction Mode ---
-    from ui.pages.prediction_dashboard import render_prediction_dashboard
-
-    # Layout: Full Width Main Area
-    # (Tools are now in Sidebar)
-
-    # C. Prediction Dashboard
-    if st.session_state.get('calc_active', False):
-         render_prediction_dashboard()
-    else:
-         # Welcome / Placeholder
-         st.info("👈 请在左侧侧边栏 (Sidebar) 选择档案或输入信息，点击 '开始排盘' 查看结果。")
-         st.markdown("""
-         ### 🌟 欢迎进入天机系统
+    elif app_mode == "✨ 量子真言":
+        import ui.pages.quantum_lab as qlab
+        qlab.render()
+
+    elif app_mode == "🌟 命运回响":
+        import ui.pages.zeitgeist as cinema
+        cinema.render()
+
+    elif app_mode == "🌀 量子仿真":
+        from ui.pages.quantum_simulation import render
+        render()
+
+    elif app_mode == "🌙 自我进化":
+        from ui.pages.self_learning import render_self_learning
+        render_self_learning()
+
+    elif app_mode == "📜 古籍挖掘":
+        from ui.pages.mining_console import render as render_mining_console
+        render_mining_console()
+
+    elif app_mode == "💰 财运推演":
+        from ui.pages.wealth_verification import render
+        render()
+
+    elif app_mode == "📋 档案审计":
+        from ui.pages.profile_audit import render
+        render()
+
+    elif app_mode == "🌌 全息格局":
+        from ui.pages.holographic_pattern import render
+        render()
+
+    elif app_mode == "🏛️ 量子架构注册":
+        from ui.pages.quantum_framework_registry import render
+        render()
+
+    elif app_mode == "📚 规范文档":
+        from ui.pages.document_management import render
+        render()
+
+    elif app_mode == "🔮 智能排盘":
+        # --- Prediction Mode ---
+        from ui.pages.prediction_dashboard import render_prediction_dashboard
+
+        # Layout: Full Width Main Area
+        # (Tools are now in Sidebar)
+
+        # C. Prediction Dashboard
+        if st.session_state.get('calc_active', False):
+             render_prediction_dashboard()
+        else:
+             # Welcome / Placeholder
+             st.info("👈 请在左侧侧边栏 (Sidebar) 选择档案或输入信息，点击 '开始排盘' 查看结果。")
+             st.markdown("""
+             ### 🌟 欢迎进入天机系统
          
-         **核心功能 Quick Start:**
-         1. **档案管理**: 建立并管理您的命理档案。
-         2. **AI 排盘**: 融合古法子平与量子力学的深度演算。
-         3. **时空熔炉**: 探索大运流年与原局的微妙化学反应。
-         """)
+             **核心功能 Quick Start:**
+             1. **档案管理**: 建立并管理您的命理档案。
+             2. **AI 排盘**: 融合古法子平与量子力学的深度演算。
+             3. **时空熔炉**: 探索大运流年与原局的微妙化学反应。
+             """)
 
 # 6. Global Background Services
 @st.cache_resource
@@ -135,4 +148,9 @@ def get_background_worker():
     worker.start()
     return worker
 
-bg_worker = get_background_worker()
+with profiler.measure("init:background_worker"):
+    bg_worker = get_background_worker()
+
+if profiler.enabled:
+    report_path = profiler.write_report()
+    logger.info(f"⏱️ Startup profile written to {report_path}")
@@ -0,0 +1,524 @@
+#!/usr/bin/env python3
+"""
+引擎基准测试套件与回归门禁
+==========================
+[V9.4 Performance] 在固定种子的八字语料（SyntheticBaziEngine 全谱 518,400 组合中抽样）上
+测量核心引擎的吞吐量、p50/p99 延迟与峰值 RSS，生成 JSON 报告，并可与基线比较：
+任一基准 p50 超出 基线 × 机器系数 × (1 + tolerance) + slack，或峰值 RSS 超出 基线 × (1 + rss_tolerance)，
+或基线中的基准失败 / 缺失，即判为回归。
+
+机器系数 = 本机 reference.calibration p50 / 基线 reference.calibration p50：门禁比较的是
+各基准相对固定参考负载的比值，基线换机器生成也不会误报或漏报（--absolute 关闭归一化）。
+
+覆盖：
+    reference.calibration                            固定 CPU 负载（机器速度参考，不测引擎）
+    graph.init / graph.adjacency / graph.propagate   GraphNetworkEngine 三个阶段
+    arbitrate_bazi                                   QuantumUniversalFramework 全流程
+    flux.calculate_flux                              FluxEngine 单盘能量计算
+    census.census                                    ClassicalCensusEngine 全量扫描（临时 universe 文件）
+    census_cache.fingerprint_match                   CensusCache 指纹比对
+    fds.threshold_calibration                        fds_threshold_calibration 二分阈值搜索（临时 registry）
+
+用法：
+    python scripts/benchmark_engines.py                          # 打印报告
+    python scripts/benchmark_engines.py --only graph.init flux.calculate_flux
+    python scripts/benchmark_engines.py --output results/engine_benchmarks.json
+    python scripts/benchmark_engines.py --check config/engine_benchmark_baseline.json
+    python scripts/benchmark_engines.py --update-baseline config/engine_benchmark_baseline.json
+
+默认每个基准在独立子进程中运行（--no-isolate 关闭），峰值 RSS 因此互不污染。
+可选依赖缺失的基准（如 fds 需要 json-logic-quibble）记为 skipped，不参与门禁；其它失败一律判为回归。
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core.trinity.core.engines.synthetic_bazi_engine import SyntheticBaziEngine
+from core.trinity.core.nexus.definitions import BaziParticleNexus
+
+DEFAULT_BASELINE = project_root / "config" / "engine_benchmark_baseline.json"
+DEFAULT_SEED = 20240518
+DEFAULT_CORPUS_SIZE = 200
+REFERENCE = "reference.calibration"
+
+PILLARS = ("year", "month", "day", "hour")
+TEN_GODS = BaziParticleNexus.STEM_SHI_SHEN
+# 十神 → 5D 张量轴 (E 比劫 / O 官杀 / M 财 / S 食伤 / R 印)
+GOD_AXIS = {
+    "比肩": 0, "劫财": 0, "正官": 1, "七杀": 1, "正财": 2, "偏财": 2,
+    "食神": 3, "伤官": 3, "正印": 4, "偏印": 4,
+}
+N_COMBINATIONS = 60 * 12 * 60 * 12
+
+
+# ================================================================
+# 语料
+# ================================================================
+
+def build_corpus(n: int = DEFAULT_CORPUS_SIZE, seed: int = DEFAULT_SEED) -> List[Dict[str, Any]]:
+    """
+    从 518,400 全谱中按固定种子抽样 n 个八字，附带大运/流年与派生的十神计数、5D 张量
+
+    每个样本: {uid, pillars [年, 月, 日, 时], day_master, chart {year: {stem, branch}, ...},
+              luck_pillar, annual_pillar, gender, ten_gods {十神: 权重}, tensor {E, O, M, S, R}}
+    """
+    rng = random.Random(seed)
+    jia_zi = SyntheticBaziEngine.JIA_ZI
+    corpus = []
+    for uid in rng.sample(range(N_COMBINATIONS), n):
+        year_idx, rest = divmod(uid, 12 * 60 * 12)
+        month_idx, rest = divmod(rest, 60 * 12)
+        day_idx, hour_idx = divmod(rest, 12)
+        year = jia_zi[year_idx]
+        day = jia_zi[day_idx]
+        pillars = [
+            year,
+            SyntheticBaziEngine.get_month_pillar(year[0], month_idx + 1),
+            day,
+            SyntheticBaziEngine.get_hour_pillar(day[0], hour_idx),
+        ]
+        ten_gods = ten_god_weights(pillars)
+        corpus.append({
+            "uid": uid,
+            "pillars": pillars,
+            "day_master": day[0],
+            "chart": {p: {"stem": s[0], "branch": s[1]} for p, s in zip(PILLARS, pillars)},
+            "luck_pillar": rng.choice(jia_zi),
+            "annual_pillar": rng.choice(jia_zi),
+            "gender": rng.choice(("male", "female")),
+            "ten_gods": ten_gods,
+            "tensor": ten_god_tensor(ten_gods),
+        })
+    return corpus
+
+
+def ten_god_weights(pillars: List[str]) -> Dict[str, float]:
+    """天干（日主除外）各计 1，地支藏干按权重归一后计入"""
+    dm = pillars[2][0]
+    weights = {god: 0.0 for god in TEN_GODS}
+    for i, pillar in enumerate(pillars):
+        if i != 2:
+            weights[BaziParticleNexus.get_shi_shen(pillar[0], dm)] += 1.0
+        hidden = BaziParticleNexus.get_branch_weights(pillar[1])
+        total = float(sum(w for _, w in hidden)) or 1.0
+        for stem, w in hidden:
+            weights[BaziParticleNexus.get_shi_shen(stem, dm)] += w / total
+    return weights
+
+
+def ten_god_tensor(ten_gods: Dict[str, float]) -> Dict[str, float]:
+    vec = [0.0] * 5
+    for god, w in ten_gods.items():
+        vec[GOD_AXIS[god]] += w
+    total = sum(vec) or 1.0
+    return {axis: v / total for axis, v in zip("EOMSR", vec)}
+
+
+def tensor_vector(case: Dict[str, Any]) -> List[float]:
+    return [case["tensor"][axis] for axis in "EOMSR"]
+
+
+# ================================================================
+# 基准定义
+# ================================================================
+
+class Benchmark:
+    """
+    一个基准 = prepare(语料) → 条目列表；每次计时前调用 setup(条目)（不计时），再计时 run(setup 结果)
+    scans_corpus: 单次 run 扫描整个语料（样本吞吐量 = ops/s × 语料大小），否则单次 run 处理 1 个样本
+    """
+
+    def __init__(self, name: str, prepare: Callable, run: Callable,
+                 setup: Optional[Callable] = None, repeat: int = 1, scans_corpus: bool = False):
+        self.name = name
+        self.prepare = prepare
+        self.run = run
+        self.setup = setup
+        self.repeat = repeat
+        self.scans_corpus = scans_corpus
+
+
+def _graph_engine():
+    from core.config_schema import DEFAULT_FULL_ALGO_PARAMS
+    from core.engine_graph import GraphNetworkEngine
+    return GraphNetworkEngine(config=DEFAULT_FULL_ALGO_PARAMS)
+
+
+def _graph_init(case):
+    engine = _graph_engine()
+    engine.initialize_nodes(case["pillars"], case["day_master"],
+                            luck_pillar=case["luck_pillar"], year_pillar=case["annual_pillar"])
+    return engine
+
+
+def _graph_adjacent(case):
+    engine = _graph_init(case)
+    engine.build_adjacency_matrix()
+    return engine
+
+
+def _prepare_arbitrate(corpus):
+    from core.trinity.core.unified_arbitrator_master import quantum_framework
+    return [(quantum_framework, case) for case in corpus]
+
+
+def _run_arbitrate(item):
+    framework, case = item
+    framework.arbitrate_bazi(
+        case["pillars"], {"gender": case["gender"]},
+        {"luck_pillar": case["luck_pillar"], "annual_pillar": case["annual_pillar"]},
+    )
+
+
+def _run_flux(case):
+    from core.flux import FluxEngine
+    luck, annual = case["luck_pillar"], case["annual_pillar"]
+    FluxEngine(case["chart"]).calculate_flux(luck[0], luck[1], annual[0], annual[1])
+
+
+def _prepare_census(corpus, workdir):
+    """把语料写成 universe 文件（首行为元数据），每个 op 扫描全部样本"""
+    from core.census_engine import ClassicalCensusEngine
+    path = os.path.join(workdir, "universe.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"meta": {"n": len(corpus)}}) + "\n")
+        for case in corpus:
+            f.write(json.dumps({"uid": case["uid"], "tensor": case["tensor"]}) + "\n")
+    engine = ClassicalCensusEngine(universe_path=path)
+    return [(engine, pattern_id) for pattern_id in ("A-01", "A-03", "B-01", "C-01", "D-01")]
+
+
+def _run_census(item):
+    engine, pattern_id = item
+    engine.census(pattern_id, include_tensor=True)
+
+
+def _prepare_fingerprint(corpus):
+    """按日主分组缓存 10 个流形，再逐盘比对"""
+    from core.census_cache import CensusCache
+    cache = CensusCache()
+    groups: Dict[str, List[Dict]] = {}
+    for case in corpus:
+        groups.setdefault(case["day_master"], []).append({"uid": case["uid"], "tensor": case["tensor"]})
+    for dm, samples in sorted(groups.items()):
+        cache.cache_census_result(f"DM-{dm}", samples)
+    return [(cache, tensor_vector(case)) for case in corpus]
+
+
+def _run_fingerprint(item):
+    cache, tensor = item
+    cache.fingerprint_match(tensor, top_k=3)
+
+
+def _prepare_fds(corpus, workdir):
+    """
+    为 fds_threshold_calibration 构造临时 registry / manifest / 样本文件（格局 BENCH-01），
+    每个 op 为一次完整的二分阈值搜索（每轮迭代全量扫描样本）
+    """
+    import fds_threshold_calibration as fds
+
+    pattern_id = "BENCH-01"
+    registry_dir = Path(workdir) / "registry"
+    manifest_dir = Path(workdir) / "patterns"
+    registry_dir.mkdir()
+    manifest_dir.mkdir()
+
+    weights = {god: [1.0 if GOD_AXIS[god] == axis else 0.0 for axis in range(5)] for god in TEN_GODS}
+    matrix = np.array([weights[god] for god in TEN_GODS])
+    tensors = np.array([matrix.T @ np.array([case["ten_gods"][g] for g in TEN_GODS]) for case in corpus])
+    registry = {"data": {
+        "feature_anchors": {"standard_manifold": {
+            "mean_vector": tensors.mean(axis=0).tolist(),
+            "covariance_matrix": np.cov(tensors.T).tolist(),
+        }},
+        "population_stats": {"base_abundance": 21.79},
+    }}
+    manifest = {
+        "tensor_mapping_matrix": {"ten_gods": list(TEN_GODS), "weights": weights},
+        "classical_logic_rules": {"expression": {">": [{"var": "ten_gods.七杀"}, 0]}},
+    }
+    with open(registry_dir / f"{pattern_id}.json", "w", encoding="utf-8") as f:
+        json.dump(registry, f, ensure_ascii=False)
+    with open(manifest_dir / f"manifest_{pattern_id}.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    data_path = os.path.join(workdir, "fds_samples.jsonl")
+    with open(data_path, "w", encoding="utf-8") as f:
+        for case in corpus:
+            f.write(json.dumps({"uid": case["uid"], "ten_gods": case["ten_gods"]}, ensure_ascii=False) + "\n")
+
+    fds.REGISTRY_DIR = registry_dir
+    fds.MANIFEST_DIR = manifest_dir
+    return [(fds, pattern_id, data_path)]
+
+
+def _run_fds(item):
+    fds, pattern_id, data_path = item
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            fds.binary_search_optimal_threshold(pattern_id, data_path, target_abundance=21.79,
+                                                max_iterations=12)
+        finally:
+            sys.stdout = stdout
+
+
+def _prepare_reference(corpus):
+    # 与语料无关的固定负载：整数递推（解释器开销）+ 数组排序（numpy）
+    values = np.random.default_rng(DEFAULT_SEED).random(5000)
+    return [values] * 50
+
+
+def _run_reference(values):
+    acc = 0
+    for i in range(20000):
+        acc = (acc * 31 + i) % 1000003
+    np.sort(values)
+    return acc
+
+
+def build_benchmarks(workdir: str) -> Dict[str, Benchmark]:
+    census = Benchmark("census.census", lambda c: _prepare_census(c, workdir), _run_census,
+                       repeat=4, scans_corpus=True)
+    fds = Benchmark("fds.threshold_calibration", lambda c: _prepare_fds(c, workdir), _run_fds,
+                    repeat=3, scans_corpus=True)
+    benchmarks = [
+        Benchmark(REFERENCE, _prepare_reference, _run_reference),
+        Benchmark("graph.init", list, _graph_init),
+        Benchmark("graph.adjacency", list, lambda engine: engine.build_adjacency_matrix(), setup=_graph_init),
+        Benchmark("graph.propagate", list, lambda engine: engine.propagate(), setup=_graph_adjacent),
+        Benchmark("arbitrate_bazi", _prepare_arbitrate, _run_arbitrate),
+        Benchmark("flux.calculate_flux", list, _run_flux),
+        census,
+        Benchmark("census_cache.fingerprint_match", _prepare_fingerprint, _run_fingerprint, repeat=5),
+        fds,
+    ]
+    return {b.name: b for b in benchmarks}
+
+
+# ================================================================
+# 执行与统计
+# ================================================================
+
+def peak_rss_mb() -> Optional[float]:
+    """进程峰值常驻内存（MB）；ru_maxrss 在 Linux 为 KB、macOS 为字节"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+
+def run_benchmark(bench: Benchmark, corpus: List[Dict[str, Any]], warmup: int = 3) -> Dict[str, Any]:
+    """运行单个基准，返回 {ok, ops, items_per_op, throughput_per_s, items_per_s, mean/p50/p99/max_ms, peak_rss_mb}"""
+    try:
+        items = bench.prepare(corpus)
+    except (ImportError, SystemExit) as e:
+        return {"ok": False, "skipped": True, "error": f"dependency unavailable: {e!r}"}
+    items_per_op = len(corpus) if bench.scans_corpus else 1
+
+    for item in items[:warmup]:
+        bench.run(bench.setup(item) if bench.setup else item)
+
+    latencies = []
+    for _ in range(bench.repeat):
+        for item in items:
+            arg = bench.setup(item) if bench.setup else item
+            start = time.perf_counter()
+            bench.run(arg)
+            latencies.append(time.perf_counter() - start)
+
+    lat_ms = np.array(latencies) * 1000.0
+    total_s = float(np.sum(latencies))
+    return {
+        "ok": True,
+        "ops": len(latencies),
+        "items_per_op": items_per_op,
+        "throughput_per_s": len(latencies) / total_s if total_s else None,
+        "items_per_s": len(latencies) * items_per_op / total_s if total_s else None,
+        "mean_ms": float(lat_ms.mean()),
+        "p50_ms": float(np.percentile(lat_ms, 50)),
+        "p99_ms": float(np.percentile(lat_ms, 99)),
+        "max_ms": float(lat_ms.max()),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_in_process(names: List[str], corpus_size: int, seed: int, warmup: int) -> Dict[str, Dict]:
+    corpus = build_corpus(corpus_size, seed)
+    report = {}
+    with tempfile.TemporaryDirectory(prefix="bazi_bench_") as workdir:
+        benchmarks = build_benchmarks(workdir)
+        for name in names:
+            try:
+                report[name] = run_benchmark(benchmarks[name], corpus, warmup=warmup)
+            except Exception as e:
+                report[name] = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+    return report
+
+
+def run_isolated(name: str, corpus_size: int, seed: int, warmup: int) -> Dict[str, Any]:
+    """在全新解释器中运行单个基准（峰值 RSS 只反映该基准）"""
+    pythonpath = os.pathsep.join(filter(None, [str(project_root), os.environ.get("PYTHONPATH")]))
+    env = dict(os.environ, PYTHONPATH=pythonpath)
+    proc = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--worker", name,
+         "--corpus-size", str(corpus_size), "--seed", str(seed), "--warmup", str(warmup)],
+        cwd=str(project_root), env=env, capture_output=True, text=True
+    )
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        return {"ok": False, "error": (proc.stderr.strip().splitlines() or ["no output"])[-1]}
+    return json.loads(lines[-1])[name]
+
+
+def check_regressions(
+    report: Dict[str, Dict],
+    baseline: Dict[str, Dict],
+    tolerance: float,
+    slack_ms: float,
+    rss_tolerance: float,
+    relative: bool = True
+) -> List[str]:
+    """
+    返回回归描述：p50 / 峰值 RSS 超出容差，或基线中的基准失败（非 skipped）/ 未出现在报告中
+
+    relative=True 时 p50 基线先乘以机器系数（本机参考负载 p50 / 基线参考负载 p50）。
+    """
+    failures = []
+    scale = 1.0
+    if relative:
+        ref, base_ref = report.get(REFERENCE) or {}, baseline.get(REFERENCE)
+        if not base_ref:
+            return [f"{REFERENCE}: missing from baseline (re-run --update-baseline, or pass --absolute)"]
+        if not ref.get("ok"):
+            return [f"{REFERENCE}: {ref.get('error', 'missing from report')}"]
+        scale = ref["p50_ms"] / base_ref["p50_ms"]
+
+    for name, base in baseline.items():
+        if name.startswith("_") or (relative and name == REFERENCE):
+            continue
+        entry = report.get(name)
+        if entry is None:
+            failures.append(f"{name}: missing from report")
+            continue
+        if not entry.get("ok"):
+            if not entry.get("skipped"):
+                failures.append(f"{name}: failed ({entry.get('error')})")
+            continue
+        limit = base["p50_ms"] * scale * (1.0 + tolerance) + slack_ms
+        if entry["p50_ms"] > limit:
+            failures.append(f"{name}: p50 {entry['p50_ms']:.3f}ms > {limit:.3f}ms "
+                            f"(baseline {base['p50_ms']:.3f}ms × machine {scale:.2f})")
+        if base.get("peak_rss_mb") and entry.get("peak_rss_mb"):
+            rss_limit = base["peak_rss_mb"] * (1.0 + rss_tolerance)
+            if entry["peak_rss_mb"] > rss_limit:
+                failures.append(f"{name}: peak RSS {entry['peak_rss_mb']:.1f}MB > {rss_limit:.1f}MB "
+                                f"(baseline {base['peak_rss_mb']:.1f}MB)")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Engine benchmark suite")
+    parser.add_argument("--only", nargs="*", help="只运行指定基准（默认：全部）")
+    parser.add_argument("--corpus-size", type=int, default=DEFAULT_CORPUS_SIZE)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--warmup", type=int, default=3, help="每个基准的预热次数（不计时）")
+    parser.add_argument("--no-isolate", action="store_true", help="在当前进程中依次运行（峰值 RSS 为累计值）")
+    parser.add_argument("--output", help="报告输出路径 (JSON)")
+    parser.add_argument("--check", nargs="?", const=str(DEFAULT_BASELINE), help="与基线比较，回归时退出码为 1")
+    parser.add_argument("--update-baseline", nargs="?", const=str(DEFAULT_BASELINE), help="用本次结果覆盖基线")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="p50 相对容差（默认 50%%）")
+    parser.add_argument("--slack-ms", type=float, default=0.05, help="p50 绝对容差（毫秒），吸收微秒级基准的抖动")
+    parser.add_argument("--rss-tolerance", type=float, default=0.25, help="峰值 RSS 相对容差（默认 25%%）")
+    parser.add_argument("--absolute", action="store_true",
+                        help="按基线绝对毫秒比较（默认按 reference.calibration 归一化）")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+    if args.worker:
+        print(json.dumps(run_in_process([args.worker], args.corpus_size, args.seed, args.warmup)))
+        return 0
+
+    with tempfile.TemporaryDirectory() as workdir:
+        all_names = list(build_benchmarks(workdir))
+    unknown = sorted(set(args.only or []) - set(all_names))
+    if unknown:
+        parser.error(f"unknown benchmarks: {unknown} (available: {all_names})")
+    names = args.only or all_names
+    if args.check and not args.absolute and REFERENCE not in names:
+        names = [REFERENCE] + names
+
+    if args.no_isolate:
+        report = run_in_process(names, args.corpus_size, args.seed, args.warmup)
+    else:
+        report = {name: run_isolated(name, args.corpus_size, args.seed, args.warmup) for name in names}
+
+    print(f"{'benchmark':34s} {'ops/s':>10s} {'p50 ms':>9s} {'p99 ms':>9s} {'RSS MB':>8s}")
+    for name, entry in report.items():
+        if not entry.get("ok"):
+            status = "SKIPPED" if entry.get("skipped") else "FAILED"
+            print(f"{name:34s} [{status}] {entry.get('error')}")
+            continue
+        rss = entry["peak_rss_mb"]
+        print(f"{name:34s} {entry['throughput_per_s']:10.1f} {entry['p50_ms']:9.3f} {entry['p99_ms']:9.3f} "
+              f"{rss if rss is not None else float('nan'):8.1f}")
+
+    meta = {"corpus_size": args.corpus_size, "seed": args.seed, "python": sys.version.split()[0],
+            "isolated": not args.no_isolate}
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"_meta": meta, **report}, f, ensure_ascii=False, indent=2)
+
+    if args.update_baseline:
+        baseline = {"_meta": meta}
+        for name, entry in report.items():
+            if entry.get("ok"):
+                baseline[name] = {k: round(entry[k], 3) for k in ("p50_ms", "p99_ms", "throughput_per_s")}
+                if entry["peak_rss_mb"] is not None:
+                    baseline[name]["peak_rss_mb"] = round(entry["peak_rss_mb"], 1)
+        with open(args.update_baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"baseline written: {args.update_baseline}")
+
+    if args.check:
+        if not os.path.exists(args.check):
+            print(f"baseline not found: {args.check}")
+            return 0
+        with open(args.check, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        base_meta = baseline.get("_meta", {})
+        if (base_meta.get("corpus_size"), base_meta.get("seed")) != (args.corpus_size, args.seed):
+            print(f"⚠️ corpus differs from baseline ({base_meta}); comparison may not be meaningful")
+        if args.only:
+            # 只检查本次选中的基准（以及归一化所需的参考负载）
+            baseline = {k: v for k, v in baseline.items() if k.startswith("_") or k in names}
+        failures = check_regressions(report, baseline, args.tolerance, args.slack_ms, args.rss_tolerance,
+                                     relative=not args.absolute)
+        if failures:
+            print("❌ Engine benchmark regressions:")
+            for line in failures:
+                print(f"  {line}")
+            return 1
+        print("✅ No engine benchmark regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
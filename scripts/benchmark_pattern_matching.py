@@ -9,6 +9,9 @@
 2. 执行完整的张量投影和模式识别
 3. 测量单样本耗时
 4. 外推到 51.8 万样本的总耗时
+
+注意：返回错误字典的样本不计入耗时（当前 RegistryLoader 张量投影为存根）；
+核心引擎的基准与回归门禁见 scripts/benchmark_engines.py。
 """
 
 import time
@@ -72,6 +75,7 @@ def benchmark_single_sample(
     print(f"开始测试...\n")
     
     times = []
+    errors = 0
     
     for i in range(n_samples):
         # 生成模拟样本
@@ -89,6 +93,10 @@ def benchmark_single_sample(
             )
             
             end_time = time.perf_counter()
+            if result.get('error'):
+                # 存根返回的错误字典不代表真实计算，不计入耗时
+                errors += 1
+                continue
             elapsed = end_time - start_time
             times.append(elapsed)
             
@@ -102,11 +110,15 @@ def benchmark_single_sample(
     
     print(f"\n  进度: {n_samples}/{n_samples} | 测试完成")
     
+    if not times:
+        return {"n_samples": 0, "n_errors": errors}
+    
     # 统计信息
     times_array = np.array(times)
     
     stats = {
         "n_samples": len(times),
+        "n_errors": errors,
         "mean_time_ms": np.mean(times_array) * 1000,
         "median_time_ms": np.median(times_array) * 1000,
         "std_time_ms": np.std(times_array) * 1000,
@@ -249,6 +261,11 @@ def main():
         n_samples=args.samples
     )
     
+    if stats["n_samples"] == 0:
+        print(f"\n❌ 全部 {stats['n_errors']} 个样本返回错误（RegistryLoader 张量投影为存根实现），无有效耗时可外推")
+        print("   引擎真实性能请使用: python scripts/benchmark_engines.py")
+        return
+    
     # 输出统计结果
     print(f"\n{'='*80}")
     print("📊 性能统计结果")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+镜像特征表离线构建
+==================
+[V9.4 Performance] 为 MirrorEngine.find_mirrors 预计算全部 518,400 个本命盘的
+(SAI, IC, Reynolds, entropy, 五行能量)，按年柱分 60 块写入 results/mirror_features/。
+
+只计算缺失块与旧 registry 版本的块：中断后重跑即续建，registry 版本变化后重跑即增量重建。
+
+用法：
+    python scripts/build_mirror_index.py --workers 8
+    python scripts/build_mirror_index.py --chunks 0 1 2        # 只构建指定年柱块
+    python scripts/build_mirror_index.py --status              # 查看构建进度
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core.trinity.core.engines.mirror_index import DEFAULT_TABLE_DIR, N_CHUNKS, MirrorFeatureTable
+from core.trinity.core.unified_arbitrator_master import QuantumUniversalFramework
+
+
+def main():
+    parser = argparse.ArgumentParser(description="构建 MirrorEngine 全谱特征表")
+    parser.add_argument("--table-dir", default=DEFAULT_TABLE_DIR)
+    parser.add_argument("--workers", type=int, default=1, help="进程数（>1 时按块并行）")
+    parser.add_argument("--chunks", type=int, nargs="*", help=f"只构建这些块 (0-{N_CHUNKS - 1})")
+    parser.add_argument("--status", action="store_true", help="只打印构建状态")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    framework = QuantumUniversalFramework()
+    version = framework.registry.version
+    table = MirrorFeatureTable(args.table_dir)
+    stale = table.stale_chunks(version)
+    print(f"registry {version}: {N_CHUNKS - len(stale)}/{N_CHUNKS} 块已就绪 ({args.table_dir})")
+    if args.status or not stale:
+        return
+
+    start = time.time()
+
+    def progress(done, total):
+        elapsed = time.time() - start
+        eta = elapsed / done * (total - done)
+        print(f"  {done}/{total} 块  已用 {elapsed:.0f}s  ETA {eta:.0f}s", flush=True)
+
+    built = table.build(framework, framework_factory=QuantumUniversalFramework, chunks=args.chunks,
+                        n_workers=args.workers, progress_callback=progress)
+    print(f"✅ 构建 {len(built)} 块，用时 {time.time() - start:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+启动导入耗时分析与回归门禁
+==========================
+[V9.4 Performance] 在独立子进程中用 `python -X importtime` 测量 Streamlit 入口
+（main.py 顶层依赖）与各页面模块的冷启动导入耗时，生成 JSON 报告，
+并可与基线比较：任一目标超出 (基线 × (1 + tolerance) + slack) × 机器系数 即判为回归；
+导入失败的目标、基线中有而本次未测到的目标同样判为失败。
+
+机器系数 = 各参考模块（REFERENCE_MODULES，纯 Python 标准库包）本机耗时 / 基线耗时 的中位数：
+门禁比较的是各目标相对参考导入的比值，而不是绝对毫秒数（--absolute 关闭归一化）。
+单个小模块的导入耗时抖动可达 ±40%，因此参考模块各重复 REFERENCE_REPEAT × --repeat 次，
+一半在目标之前、一半在目标之后测量，再取多个模块比值的中位数。
+共享/单核机器上负载逐秒变化，相邻两次页面导入可相差 1.5 倍，参考模块无法逐次抵消：
+机器系数只放宽不收紧（下限 1.0），默认容差 100% —— 未改动的代码树重复 --check 应稳定通过，
+而把页面懒加载的重依赖改回顶层导入（约 2.5 倍）仍会被拦下。
+
+用法：
+    python scripts/profile_startup.py                       # 打印报告
+    python scripts/profile_startup.py --output results/startup_imports.json
+    python scripts/profile_startup.py --check config/startup_import_baseline.json
+    python scripts/profile_startup.py --update-baseline config/startup_import_baseline.json
+
+每个目标重复 --repeat 次取中位数；报告同时列出该目标下自身耗时最高的模块，便于定位。
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+project_root = Path(__file__).resolve().parents[1]
+
+# main.py 每次运行都会导入的模块
+ENTRY_MODULES = ["ui.utils", "ui.sidebar", "core.config_manager", "utils.startup_profiler"]
+
+DEFAULT_BASELINE = project_root / "config" / "startup_import_baseline.json"
+# 机器速度参考：纯 Python 的标准库包，导入耗时只随机器与解释器变化
+REFERENCE_MODULES = ["asyncio", "http.client", "email.message", "logging", "unittest"]
+REFERENCE_REPEAT = 4  # 参考模块的重复倍数（相对 --repeat）
+
+
+def page_modules() -> List[str]:
+    """ui/pages 下的全部页面模块"""
+    pages_dir = project_root / "ui" / "pages"
+    return sorted(
+        f"ui.pages.{p.stem}" for p in pages_dir.glob("*.py") if p.stem != "__init__"
+    )
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """解析 -X importtime 输出为 [{'module', 'self_us', 'cumulative_us', 'depth'}, ...]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # 表头
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        rows.append({
+            "module": stripped,
+            "self_us": int(parts[0]),
+            "cumulative_us": int(parts[1]),
+            "depth": (len(name) - len(stripped)) // 2,
+        })
+    return rows
+
+
+def measure_import(module: str, python: str = sys.executable) -> Dict:
+    """在全新解释器中导入 module，返回总耗时与自身耗时最高的模块"""
+    env = dict(os.environ, PYTHONPATH=str(project_root), PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(project_root), env=env, capture_output=True, text=True
+    )
+    rows = parse_importtime(proc.stderr)
+    target = next((r for r in reversed(rows) if r["module"] == module and r["depth"] == 0), None)
+    top = sorted(rows, key=lambda r: r["self_us"], reverse=True)[:10]
+    return {
+        "ok": proc.returncode == 0,
+        "cumulative_ms": (target["cumulative_us"] / 1000.0) if target else None,
+        "module_count": len(rows),
+        "top_self_ms": [{"module": r["module"], "ms": r["self_us"] / 1000.0} for r in top],
+        "error": None if proc.returncode == 0 else proc.stderr.strip().splitlines()[-1:],
+    }
+
+
+def _summarize(runs: List[Dict]) -> Dict:
+    times = [r["cumulative_ms"] for r in runs if r["cumulative_ms"] is not None]
+    entry = next((r for r in reversed(runs) if not r["ok"]), runs[-1])  # 任一次失败即报告失败
+    entry["cumulative_ms"] = statistics.median(times) if times else None
+    return entry
+
+
+def profile(modules: List[str], repeat: int = 3, references: Optional[List[str]] = None) -> Dict[str, Dict]:
+    """
+    测量 modules；references 中的模块重复 REFERENCE_REPEAT 倍次数，前后各测一半，
+    使机器系数覆盖整个测量时段的负载变化。
+    """
+    references = [m for m in (references or []) if m not in modules]
+    ref_runs: Dict[str, List[Dict]] = {m: [] for m in references}
+    half = max(1, repeat * REFERENCE_REPEAT // 2)
+
+    def measure_references():
+        for _ in range(half):
+            for module in references:
+                ref_runs[module].append(measure_import(module))
+
+    measure_references()
+    report = {module: _summarize([measure_import(module) for _ in range(repeat)]) for module in modules}
+    measure_references()
+    for module, runs in ref_runs.items():
+        report[module] = _summarize(runs)
+    return report
+
+
+def machine_factor(report: Dict[str, Dict], baseline: Dict[str, float]) -> Optional[float]:
+    """参考模块 本机耗时 / 基线耗时 的中位数；可用参考不足半数时返回 None"""
+    ratios = [report[m]["cumulative_ms"] / baseline[m] for m in REFERENCE_MODULES
+              if baseline.get(m) and (report.get(m) or {}).get("cumulative_ms")]
+    if len(ratios) * 2 < len(REFERENCE_MODULES):
+        return None
+    return statistics.median(ratios)
+
+
+def check_regressions(
+    report: Dict[str, Dict],
+    baseline: Dict[str, float],
+    tolerance: float,
+    slack_ms: float,
+    relative: bool = True
+) -> List[str]:
+    """
+    返回失败描述：超出基线容差、导入失败、或基线中的目标未出现在报告里
+
+    relative=True 时阈值乘以机器系数（见 machine_factor，下限 1.0：噪声偏低的参考测量不会收紧阈值）。
+    """
+    scale = 1.0
+    if relative:
+        factor = machine_factor(report, baseline)
+        if factor is None:
+            return [f"reference modules {REFERENCE_MODULES}: missing from baseline or not measured "
+                    f"(re-run --update-baseline, or pass --absolute)"]
+        scale = max(1.0, factor)
+
+    failures = []
+    for module, entry in report.items():
+        if not entry["ok"]:
+            failures.append(f"{module}: import failed ({' '.join(entry['error'] or [])})")
+    for module, base_ms in baseline.items():
+        if relative and module in REFERENCE_MODULES:
+            continue
+        entry = report.get(module)
+        if entry is None:
+            failures.append(f"{module}: in baseline but not measured")
+            continue
+        if not entry["ok"] or entry["cumulative_ms"] is None:
+            continue  # 已按导入失败报告
+        limit = (base_ms * (1.0 + tolerance) + slack_ms) * scale
+        if entry["cumulative_ms"] > limit:
+            failures.append(f"{module}: {entry['cumulative_ms']:.1f}ms > {limit:.1f}ms "
+                            f"(baseline {base_ms:.1f}ms × machine {scale:.2f})")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Startup import-time profiler")
+    parser.add_argument("--modules", nargs="*", help="只测量指定模块（默认：入口依赖 + 全部页面）")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="报告输出路径 (JSON)")
+    parser.add_argument("--check", nargs="?", const=str(DEFAULT_BASELINE), help="与基线比较，回归时退出码为 1")
+    parser.add_argument("--update-baseline", nargs="?", const=str(DEFAULT_BASELINE), help="用本次结果覆盖基线")
+    parser.add_argument("--tolerance", type=float, default=1.0, help="相对容差（默认 100%%）")
+    parser.add_argument("--slack-ms", type=float, default=50.0, help="基线机器上的绝对容差（毫秒），吸收小模块的抖动")
+    parser.add_argument("--absolute", action="store_true", help="按基线绝对毫秒比较（默认按参考模块归一化）")
+    args = parser.parse_args(argv)
+
+    modules = args.modules or ENTRY_MODULES + page_modules()
+    references = REFERENCE_MODULES if (args.update_baseline or (args.check and not args.absolute)) else []
+    report = profile(modules, repeat=args.repeat, references=references)
+
+    for module, entry in sorted(report.items(), key=lambda kv: -(kv[1]["cumulative_ms"] or 0)):
+        status = "" if entry["ok"] else "  [IMPORT FAILED]"
+        ms = entry["cumulative_ms"]
+        print(f"{module:45s} {ms if ms is not None else float('nan'):9.1f} ms  ({entry['module_count']} modules){status}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.update_baseline:
+        baseline = {m: round(e["cumulative_ms"], 1) for m, e in report.items() if e["cumulative_ms"] is not None}
+        with open(args.update_baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"baseline written: {args.update_baseline}")
+
+    if args.check:
+        if not os.path.exists(args.check):
+            print(f"❌ baseline not found: {args.check} (create it with --update-baseline)")
+            return 1
+        with open(args.check, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if args.modules:  # 只比较本次测量的目标（参考模块除外）
+            baseline = {m: v for m, v in baseline.items() if m in args.modules or m in REFERENCE_MODULES}
+        if not args.absolute:
+            factor = machine_factor(report, baseline)
+            print(f"machine factor: {factor:.2f}" if factor is not None else "machine factor: n/a")
+        failures = check_regressions(report, baseline, args.tolerance, args.slack_ms, relative=not args.absolute)
+        if failures:
+            print("❌ Startup import regressions:")
+            for line in failures:
+                print(f"  {line}")
+            return 1
+        print("✅ Startup import times within baseline tolerance")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
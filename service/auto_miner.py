@@ -9,9 +9,7 @@ Implements the 3-Method Automatic Mining Strategy:
 3. Exploratory Discovery (Link Following)
 """
 
-import requests
 import re
-import time
 import random
 import urllib.parse
 from typing import List, Set
@@ -23,6 +21,7 @@ except ImportError:
 
 from service.web_hunter import WebHunter
 from service.processor import ContentProcessor
+from learning.fetcher import get_fetcher
 
 class AutoMiner:
     # 用户指定的固定关键词策略
@@ -46,6 +45,8 @@ class AutoMiner:
     def __init__(self):
         self.hunter = WebHunter()
         self.processor = ContentProcessor()
+        # Shared fetcher: per-host rate limits replace the old fixed sleeps between requests
+        self.fetcher = get_fetcher()
         self.visited_urls: Set[str] = set()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -116,16 +117,20 @@ class AutoMiner:
                 if not urls:
                      urls = [random.choice(self.SEED_URLS)]
                 
-                for url in urls:
-                    if url in self.visited_urls: continue
-                    self.visited_urls.add(url)
-                    self.hunter.hunt_from_url(url)
-                    time.sleep(2)
+                self.hunter.hunt_many(self._claim_fresh(urls))
             
 
             cycle += 1
-            print(f"💤 Cycle complete. Cooling down for 3s...")
-            time.sleep(3)
+            print(f"💤 Cycle complete.")
+
+    def _claim_fresh(self, urls: List[str]) -> List[str]:
+        """Unvisited urls (deduplicated, order kept), marked as visited"""
+        fresh = []
+        for url in urls:
+            if url in self.visited_urls: continue
+            self.visited_urls.add(url)
+            fresh.append(url)
+        return fresh
 
     def _mine_celebrity_spec(self, name):
         """
@@ -158,12 +163,7 @@ class AutoMiner:
         sys_urls.extend(urls_3)
         
         print(f"   ✅ Found {len(sys_urls)} sources. Starting extraction...")
-        
-        for url in sys_urls:
-            if url in self.visited_urls: continue
-            self.visited_urls.add(url)
-            self.hunter.hunt_from_url(url)
-            time.sleep(1)
+        self.hunter.hunt_many(self._claim_fresh(sys_urls))
 
     def _mine_local_archives(self, limit=5):
         """
@@ -236,9 +236,9 @@ class AutoMiner:
         data = {'wd': query}
         
         try:
-            resp = requests.get(base_url, params=data, headers=self.headers, timeout=10)
-            if resp.status_code != 200:
-                raise Exception(f"Status {resp.status_code}")
+            resp = self.fetcher.fetch(base_url, params=data, headers=self.headers, persist=False)
+            if resp.status != 200:
+                raise Exception(resp.error or f"Status {resp.status}")
             
             # Simple Regex Extraction for Baidu links (bs4 selector can be brittle on Baidu)
             soup = BeautifulSoup(resp.text, 'html.parser')
@@ -272,32 +272,22 @@ class AutoMiner:
         base_domain = "http://bbs.china95.net/"
         
         try:
-            session = requests.Session()
-            session.headers.update(self.headers)
-            
-            # 1. Warm-up: Visit Home to get Cookies
+            # 1. Warm-up: Visit Home to get Cookies (kept in the shared fetcher session)
             # print(f"   🏯 Accessing Home for Cookie jar...")
-            try:
-                session.get(home_url, timeout=10)
-            except:
-                pass # Proceed anyway
+            self.fetcher.fetch(home_url, headers=self.headers, conditional=False)
                 
             print(f"   🏯 Accessing Board: {board_url}")
-            resp = session.get(board_url, timeout=15)
-            
-            # Auto-detect encoding
-            if resp.encoding == 'ISO-8859-1':
-                resp.encoding = resp.apparent_encoding
+            # The board listing changes constantly: always fetch it fresh
+            resp = self.fetcher.fetch(board_url, headers=self.headers, conditional=False, timeout=15)
             
             if "提示信息" in resp.text:
-                print("   ⚠️ Forum returned 'Notice' (Anti-Bot Redirect). Waiting 3s...")
-                time.sleep(3)
+                print("   ⚠️ Forum returned 'Notice' (Anti-Bot Redirect). Refetching...")
                 # Sometimes just refetching works if it was a cookie set interstitial
-                resp = session.get(board_url, timeout=15)
-                if resp.encoding == 'ISO-8859-1': resp.encoding = resp.apparent_encoding
+                # (the host's rate limit spaces the retry)
+                resp = self.fetcher.fetch(board_url, headers=self.headers, conditional=False, timeout=15)
 
-            if resp.status_code != 200:
-                print(f"   ❌ Board access failed: {resp.status_code}")
+            if resp.status != 200:
+                print(f"   ❌ Board access failed: {resp.error or resp.status}")
                 return
 
             soup = BeautifulSoup(resp.text, 'html.parser')
@@ -325,15 +315,8 @@ class AutoMiner:
 
             print(f"   🏯 Found {len(threads)} fresh threads. Mining content...")
             
-            for t_url in threads:
-                if t_url in self.visited_urls: continue
-                self.visited_urls.add(t_url)
-                print(f"     📜 Mining Thread: {t_url}")
-                
-                # Use WebHunter to process this URL using the detailed parsing logic
-                self.hunter.hunt_from_url(t_url)
-                
-                time.sleep(random.uniform(2, 5))
+            # Use WebHunter to process these URLs using the detailed parsing logic
+            self.hunter.hunt_many(self._claim_fresh(threads))
                 
         except Exception as e:
             print(f"   ❌ China95 Mining Error: {e}")
@@ -346,7 +329,7 @@ class AutoMiner:
         data = {'q': query}
         
         try:
-            resp = requests.post(base_url, data=data, headers=self.headers, timeout=10)
+            resp = self.fetcher.fetch(base_url, method="POST", data=data, headers=self.headers, persist=False)
             resp.raise_for_status()
             
             soup = BeautifulSoup(resp.text, 'html.parser')
@@ -377,9 +360,9 @@ class AutoMiner:
         params = {'q': query, 'num': limit + 2}
         
         try:
-            resp = requests.get(base_url, params=params, headers=self.headers, timeout=10)
+            resp = self.fetcher.fetch(base_url, params=params, headers=self.headers, persist=False)
             
-            if resp.status_code == 429:
+            if resp.status == 429:
                 print("     ⚠️ Google Rate Limited (429). Switching to DuckDuckGo...")
                 return self._search_duckduckgo(query, limit)
                 
@@ -414,7 +397,9 @@ class AutoMiner:
         # Bing requires a standard User-Agent
         
         try:
-            resp = requests.get(base_url, params=data, headers=self.headers, timeout=10)
+            resp = self.fetcher.fetch(base_url, params=data, headers=self.headers, persist=False)
+            if resp.error:
+                raise Exception(resp.error)
             soup = BeautifulSoup(resp.text, 'html.parser')
             results = []
             
@@ -482,7 +467,7 @@ class AutoMiner:
             traversal_headers = self.headers.copy()
             traversal_headers['Referer'] = start_url
             
-            resp = requests.get(start_url, headers=traversal_headers, timeout=15)
+            resp = self.fetcher.fetch(start_url, headers=traversal_headers, timeout=15)
             soup = BeautifulSoup(resp.text, 'html.parser')
             
             # Extract all links
@@ -524,11 +509,7 @@ class AutoMiner:
             
             # Limit traversal to avoid explosion
             print(f"   ⛓️ Traversing top 5 sub-links from {len(candidates)} candidates...")
-            for sub_url in list(candidates)[:5]: # Demo constrain
-                if sub_url not in self.visited_urls:
-                    self.visited_urls.add(sub_url)
-                    self.hunter.hunt_from_url(sub_url)
-                    time.sleep(1)
+            self.hunter.hunt_many(self._claim_fresh(list(candidates)[:5])) # Demo constrain
                     
         except Exception as e:
             print(f"   ❌ Traversal failed: {e}")
@@ -6,6 +6,10 @@ Project Crimson Vein - Storage Layer
 Schema:
 1. cases (id, name, gender, birth_iso, birth_city, rodden_rating, quality_tier, created_at)
 2. life_events (id, case_id, year, age, event_type, description, verified)
+
+Indexes: life_events(case_id, year), cases(quality_tier, id), cases(valid_for_validation, id)
+Bulk ingest: insert_cases_many() (one transaction, executemany)
+Validation sets: iter_validation_cases() pages by primary key (keyset), never loads the table
 """
 
 import sqlite3
@@ -15,6 +19,68 @@ from datetime import datetime
 
 DB_PATH = "data/cases.db"
 
+CASE_COLUMNS = (
+    "id", "name", "gender",
+    "birth_year", "birth_month", "birth_day", "birth_hour", "birth_minute",
+    "birth_city", "rodden_rating", "quality_tier", "quality_score", "valid_for_validation",
+    "source_url", "tags"
+)
+EVENT_COLUMNS = ("case_id", "year", "age", "event_type", "description", "verified")
+
+INSERT_CASE_SQL = "INSERT OR REPLACE INTO cases ({}) VALUES ({})".format(
+    ", ".join(CASE_COLUMNS), ", ".join("?" * len(CASE_COLUMNS)))
+INSERT_EVENT_SQL = "INSERT INTO life_events ({}) VALUES ({})".format(
+    ", ".join(EVENT_COLUMNS), ", ".join("?" * len(EVENT_COLUMNS)))
+
+# life_events are always read per case_id; tier / validation filters stay on the index
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_life_events_case ON life_events(case_id, year)",
+    "CREATE INDEX IF NOT EXISTS idx_cases_tier ON cases(quality_tier, id)",
+    "CREATE INDEX IF NOT EXISTS idx_cases_validation ON cases(valid_for_validation, id)",
+)
+
+
+def _case_row(case_json):
+    """cases row (CASE_COLUMNS order); KeyError if required fields are missing"""
+    profile = case_json['profile']
+    return (
+        case_json['id'],
+        profile['name'],
+        profile['gender'],
+        profile['birth_year'],
+        profile['birth_month'],
+        profile['birth_day'],
+        profile.get('birth_hour'),
+        profile.get('birth_minute'),
+        profile.get('birth_city'),
+        profile.get('rodden_rating'),
+        case_json.get('quality_tier', 'B'),
+        case_json.get('quality_score', 0),
+        case_json.get('valid_for_validation', False),
+        case_json.get('source_url'),
+        json.dumps(case_json.get('tags', []), ensure_ascii=False)
+    )
+
+
+def _event_rows(case_json):
+    """life_events rows (EVENT_COLUMNS order)"""
+    return [(
+        case_json['id'],
+        event['year'],
+        event.get('age'),
+        event['event_type'],
+        event['description'],
+        event.get('verified', False)
+    ) for event in case_json.get('life_events', [])]
+
+
+def _case_dict(row, events):
+    result = dict(row)
+    result['tags'] = json.loads(result['tags']) if result['tags'] else []
+    result['life_events'] = [dict(e) for e in events]
+    return result
+
+
 class CaseDatabase:
     def __init__(self, db_path=DB_PATH):
         self.db_path = db_path
@@ -83,14 +149,17 @@ class CaseDatabase:
             FOREIGN KEY(case_id) REFERENCES cases(id)
         )
         ''')
-        
+
+        for ddl in INDEXES:
+            cursor.execute(ddl)
+
         conn.commit()
         conn.close()
 
     def insert_case(self, case_json):
         """
         Insert a complete case (profile + events) from JSON dict.
-        Updates if case_id exists.
+        Updates if case_id exists. Returns True if the case was written.
         """
         conn = self._get_conn()
         cursor = conn.cursor()
@@ -98,57 +167,50 @@ class CaseDatabase:
         try:
             # 1. Insert Case Profile
             profile = case_json['profile']
-            tags_str = json.dumps(case_json.get('tags', []), ensure_ascii=False)
-            
-            cursor.execute('''
-            INSERT OR REPLACE INTO cases (
-                id, name, gender, 
-                birth_year, birth_month, birth_day, birth_hour, birth_minute,
-                birth_city, rodden_rating, quality_tier, quality_score, valid_for_validation, 
-                source_url, tags
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                case_json['id'],
-                profile['name'],
-                profile['gender'],
-                profile['birth_year'],
-                profile['birth_month'],
-                profile['birth_day'],
-                profile.get('birth_hour'),
-                profile.get('birth_minute'),
-                profile.get('birth_city'),
-                profile.get('rodden_rating'),
-                case_json.get('quality_tier', 'B'),
-                case_json.get('quality_score', 0),
-                case_json.get('valid_for_validation', False),
-                case_json.get('source_url'),
-                tags_str
-            ))
-            
+            cursor.execute(INSERT_CASE_SQL, _case_row(case_json))
+
             # 2. Insert Life Events
             # First, clear existing events for this case (to support updates)
             cursor.execute('DELETE FROM life_events WHERE case_id = ?', (case_json['id'],))
-            
-            for event in case_json.get('life_events', []):
-                cursor.execute('''
-                INSERT INTO life_events (
-                    case_id, year, age, event_type, description, verified
-                ) VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    case_json['id'],
-                    event['year'],
-                    event.get('age'),
-                    event['event_type'],
-                    event['description'],
-                    event.get('verified', False)
-                ))
-                
+            cursor.executemany(INSERT_EVENT_SQL, _event_rows(case_json))
+
             conn.commit()
             print(f"✅ [DB] Case inserted/updated: {profile['name']} ({case_json['id']})")
-            
+            return True
+
         except sqlite3.Error as e:
             print(f"❌ [DB] Error inserting case: {e}")
             conn.rollback()
+            return False
+        finally:
+            conn.close()
+
+    def insert_cases_many(self, cases):
+        """
+        Bulk insert/update of case dicts (insert_case format) in a single transaction.
+        Malformed cases are skipped; a repeated id keeps its last version.
+        Returns the number of cases written (0 if the transaction was rolled back).
+        """
+        by_id = {}
+        for case_json in cases:
+            try:
+                by_id[case_json['id']] = (_case_row(case_json), _event_rows(case_json))
+            except (KeyError, TypeError) as e:
+                print(f"⚠️ [DB] Skipping malformed case: {e!r}")
+        if not by_id:
+            return 0
+
+        conn = self._get_conn()
+        try:
+            with conn:  # commit on success, rollback on error
+                conn.executemany(INSERT_CASE_SQL, [row for row, _ in by_id.values()])
+                conn.executemany('DELETE FROM life_events WHERE case_id = ?', [(cid,) for cid in by_id])
+                conn.executemany(INSERT_EVENT_SQL, [ev for _, events in by_id.values() for ev in events])
+            print(f"✅ [DB] Bulk inserted/updated {len(by_id)} cases")
+            return len(by_id)
+        except sqlite3.Error as e:
+            print(f"❌ [DB] Error in bulk insert: {e}")
+            return 0
         finally:
             conn.close()
 
@@ -157,19 +219,14 @@ class CaseDatabase:
         conn = self._get_conn()
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
-        
-        case = cursor.execute('SELECT * FROM cases WHERE id = ?', (case_id,)).fetchone()
-        if not case:
-            return None
-            
-        events = cursor.execute('SELECT * FROM life_events WHERE case_id = ? ORDER BY year ASC', (case_id,)).fetchall()
-        
-        result = dict(case)
-        result['tags'] = json.loads(result['tags']) if result['tags'] else []
-        result['life_events'] = [dict(e) for e in events]
-        
-        conn.close()
-        return result
+        try:
+            case = cursor.execute('SELECT * FROM cases WHERE id = ?', (case_id,)).fetchone()
+            if not case:
+                return None
+            events = cursor.execute('SELECT * FROM life_events WHERE case_id = ? ORDER BY year ASC', (case_id,)).fetchall()
+            return _case_dict(case, events)
+        finally:
+            conn.close()
 
     def get_all_cases_meta(self):
         """Get minimal metadata for all cases (for list view)"""
@@ -180,6 +237,50 @@ class CaseDatabase:
         conn.close()
         return [dict(r) for r in rows]
 
+    def count_cases(self, valid_only=False):
+        """Number of cases (optionally only those valid for validation)"""
+        conn = self._get_conn()
+        try:
+            if valid_only:
+                return conn.execute('SELECT COUNT(*) FROM cases WHERE valid_for_validation = 1').fetchone()[0]
+            return conn.execute('SELECT COUNT(*) FROM cases').fetchone()[0]
+        finally:
+            conn.close()
+
+    def iter_validation_cases(self, batch_size=500, tiers=None, with_events=True):
+        """
+        Stream full cases flagged valid_for_validation, ordered by id.
+
+        Keyset pagination (id > last id) over idx_cases_validation: memory stays bounded by
+        batch_size and cases inserted while iterating do not shift pages.
+        tiers: optional quality_tier whitelist, e.g. ('A', 'B').
+        """
+        tier_sql, tier_args = '', []
+        if tiers:
+            tier_sql = ' AND quality_tier IN ({})'.format(', '.join('?' * len(tiers)))
+            tier_args = list(tiers)
+        conn = self._get_conn()
+        conn.row_factory = sqlite3.Row
+        last_id = ''
+        try:
+            while True:
+                rows = conn.execute(
+                    'SELECT * FROM cases WHERE valid_for_validation = 1 AND id > ?' + tier_sql + ' ORDER BY id LIMIT ?',
+                    [last_id, *tier_args, batch_size]).fetchall()
+                if not rows:
+                    return
+                events = {row['id']: [] for row in rows}
+                if with_events:
+                    placeholders = ', '.join('?' * len(rows))
+                    for ev in conn.execute('SELECT * FROM life_events WHERE case_id IN ({}) ORDER BY case_id, year'
+                                           .format(placeholders), list(events)):
+                        events[ev['case_id']].append(ev)
+                for row in rows:
+                    yield _case_dict(row, events[row['id']])
+                last_id = rows[-1]['id']
+        finally:
+            conn.close()
+
 # Migration Utility: Load raw JSONs into DB
 def migrate_json_to_db():
     db = CaseDatabase()
@@ -189,15 +290,16 @@ def migrate_json_to_db():
         print("No raw directory found.")
         return
 
+    cases = []
     for filename in os.listdir(raw_dir):
         if filename.endswith(".json"):
             path = os.path.join(raw_dir, filename)
             try:
                 with open(path, 'r') as f:
-                    case_data = json.load(f)
-                db.insert_case(case_data)
+                    cases.append(json.load(f))
             except Exception as e:
                 print(f"Failed to migrate {filename}: {e}")
+    db.insert_cases_many(cases)
 
 if __name__ == "__main__":
     # Test run: initialize and migrate
@@ -0,0 +1,302 @@
+# service/extraction_cache.py
+"""
+Extraction Cache
+Project Crimson Vein - Logic Layer
+
+Content-addressed cache for the classification / extraction pipeline, so re-mined
+forum threads and transcripts (and reposts of them) never reach the LLM twice.
+
+- Key: sha256(stage, version, model, normalized text)
+- Negative results (nothing extractable, LLM answer not parseable) are cached too
+- Near-duplicates: 64-bit SimHash over character 3-grams; texts within
+  NEAR_DUPLICATE_BITS Hamming distance reuse the cached result, but only for
+  NEAR_DUPLICATE_STAGES (classification) and for cached negative results. Positive
+  extractions are exact-hash only: two posts that differ in a birth year / pillar are
+  near-duplicates but must not share a case.
+- Persistence: results/extraction_cache.jsonl (append-only, last entry wins);
+  lookup outcomes are aggregated in memory and periodically merged into the small
+  extraction_cache_stats.json so the mining console can show hit rates of the
+  background miners (the read-merge-write holds an flock on extraction_cache_stats.json.lock,
+  so concurrent miner processes never drop each other's counts)
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, merges are best effort
+    fcntl = None
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_PATH = os.path.join(PROJECT_ROOT, "results", "extraction_cache.jsonl")
+
+SHINGLE = 3
+NEAR_DUPLICATE_BITS = 3     # <= 3 of 64 bits differ
+NEAR_DUPLICATE_MIN_CHARS = 200  # shorter texts only match exactly
+BANDS = 4                   # 4 x 16-bit bands: any pair within 3 bits shares a band
+NEAR_DUPLICATE_STAGES = ("classify",)  # other stages only reuse near-duplicate negatives
+
+FLUSH_EVERY = 50            # buffered entries / stats events before writing to disk
+FLUSH_INTERVAL_S = 30.0
+OUTCOMES = ("exact", "near", "miss")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """NFKC, lower case, whitespace removed (reposts mostly differ in layout)"""
+    return _WHITESPACE.sub("", unicodedata.normalize("NFKC", text or "")).lower()
+
+
+def simhash(normalized: str) -> int:
+    """64-bit SimHash of character shingles (frequency weighted)"""
+    grams = Counter(normalized[i:i + SHINGLE] for i in range(max(1, len(normalized) - SHINGLE + 1)))
+    hashes = np.array([int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "big")
+                       for g in grams], dtype=np.uint64)
+    weights = np.array(list(grams.values()), dtype=np.int64)
+    bits = np.unpackbits(hashes.byteswap().view(np.uint8).reshape(-1, 8), axis=1, bitorder="big")
+    score = weights @ np.where(bits == 1, 1, -1)
+    return int("".join("1" if s > 0 else "0" for s in score), 2)
+
+
+def _bands(fingerprint: int) -> List[int]:
+    width = 64 // BANDS
+    return [(fingerprint >> (i * width)) & ((1 << width) - 1) for i in range(BANDS)]
+
+
+@dataclass
+class CacheHit:
+    result: Any          # None for a cached negative result
+    kind: str            # "exact" | "near"
+    distance: int = 0    # SimHash Hamming distance (near hits)
+    source_url: str = ""
+
+
+class ExtractionCache:
+    """
+    Persistent classification / extraction cache (see module docstring).
+    Namespaces are (stage, version, model); bumping a version orphans old entries.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH):
+        self.path = path
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._bands: Dict[Tuple, List[str]] = defaultdict(list)
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.counters: Counter = Counter()
+        self._pending_stats: Counter = Counter()   # not yet merged into stats_path
+        self._pending_entries: List[Dict[str, Any]] = []
+        self._last_flush = time.monotonic()
+
+    @property
+    def stats_path(self) -> Optional[str]:
+        return self.path[:-len(".jsonl")] + "_stats.json" if self.path else None
+
+    @staticmethod
+    def key(stage: str, version: str, model: str, normalized: str) -> str:
+        raw = json.dumps([stage, version, model, normalized], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _index(self, entry: Dict[str, Any]):
+        self._entries[entry["key"]] = entry
+        if entry.get("simhash") is not None:
+            ns = (entry["stage"], entry["version"], entry["model"])
+            for i, band in enumerate(_bands(entry["simhash"])):
+                self._bands[(ns, i, band)].append(entry["key"])
+
+    def _load(self):
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self._index(json.loads(line))
+                    except (json.JSONDecodeError, KeyError):
+                        continue
+            print(f"📚 [ExtractionCache] Loaded {len(self._entries)} entries.")
+        except OSError as e:
+            print(f"⚠️ [ExtractionCache] Load failed: {e}")
+
+    def _near(self, ns: Tuple, fingerprint: int, negatives_only: bool = False) -> Optional[Tuple[Dict[str, Any], int]]:
+        best = None
+        for i, band in enumerate(_bands(fingerprint)):
+            for key in self._bands.get((ns, i, band), ()):
+                entry = self._entries[key]
+                if negatives_only and entry["result"] is not None:
+                    continue
+                distance = bin(entry["simhash"] ^ fingerprint).count("1")
+                if distance <= NEAR_DUPLICATE_BITS and (best is None or distance < best[1]):
+                    best = (entry, distance)
+        return best
+
+    def _record(self, stage: str, outcome: str):
+        self.counters[(stage, outcome)] += 1
+        self._pending_stats[(stage, outcome)] += 1
+        self._maybe_flush()
+
+    def _read_stats(self) -> Counter:
+        counts = Counter()
+        if not self.stats_path or not os.path.exists(self.stats_path):
+            return counts
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as f:
+                for stage, row in json.load(f).items():
+                    for outcome in OUTCOMES:
+                        counts[(stage, outcome)] += int(row.get(outcome, 0))
+        except (OSError, ValueError, AttributeError):
+            pass
+        return counts
+
+    @contextmanager
+    def _stats_file_lock(self):
+        """Exclusive cross-process lock for the stats read-merge-write (sidecar .lock file)"""
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.stats_path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _maybe_flush(self):
+        pending = sum(self._pending_stats.values()) + len(self._pending_entries)
+        if pending >= FLUSH_EVERY or (pending and time.monotonic() - self._last_flush >= FLUSH_INTERVAL_S):
+            self._flush_locked()
+
+    def _flush_locked(self):
+        self._last_flush = time.monotonic()
+        if not self.path:
+            self._pending_entries.clear()
+            self._pending_stats.clear()
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            if self._pending_entries:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    for entry in self._pending_entries:
+                        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                self._pending_entries.clear()
+            if self._pending_stats:
+                # merge this process's deltas into the shared totals (other miners do the same)
+                with self._stats_file_lock():
+                    counts = self._read_stats() + self._pending_stats
+                    totals = {}
+                    for (stage, outcome), n in counts.items():
+                        totals.setdefault(stage, {k: 0 for k in OUTCOMES})[outcome] = n
+                    tmp = f"{self.stats_path}.{os.getpid()}.tmp"
+                    with open(tmp, "w", encoding="utf-8") as f:
+                        json.dump(totals, f)
+                    os.replace(tmp, self.stats_path)
+                self._pending_stats.clear()
+        except OSError as e:
+            print(f"⚠️ [ExtractionCache] Flush failed: {e}")
+
+    def flush(self):
+        """Writes buffered entries and merges pending lookup counters into stats_path"""
+        with self._lock:
+            self._flush_locked()
+
+    def lookup(self, stage: str, text: str, version: str, model: str) -> Optional[CacheHit]:
+        normalized = normalize_text(text)
+        key = self.key(stage, version, model, normalized)
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            entry = self._entries.get(key)
+            hit = CacheHit(entry["result"], "exact", 0, entry.get("source_url", "")) if entry else None
+            if hit is None and len(normalized) >= NEAR_DUPLICATE_MIN_CHARS:
+                near = self._near((stage, version, model), simhash(normalized),
+                                  negatives_only=stage not in NEAR_DUPLICATE_STAGES)
+                if near:
+                    hit = CacheHit(near[0]["result"], "near", near[1], near[0].get("source_url", ""))
+            self._record(stage, hit.kind if hit else "miss")
+        return hit
+
+    def store(self, stage: str, text: str, version: str, model: str, result: Any, source_url: str = "",
+              buffered: bool = False):
+        """
+        buffered=True batches the disk write (cheap, re-computable results such as the
+        heuristic classifier); LLM extractions are written immediately.
+        """
+        normalized = normalize_text(text)
+        entry = {
+            "key": self.key(stage, version, model, normalized),
+            "stage": stage, "version": version, "model": model,
+            "simhash": simhash(normalized) if len(normalized) >= NEAR_DUPLICATE_MIN_CHARS else None,
+            "result": result, "source_url": source_url,
+            "cached_at": datetime.now().isoformat()
+        }
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            self._index(entry)
+            if not self.path:
+                return
+            if buffered:
+                self._pending_entries.append(entry)
+                self._maybe_flush()
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            except OSError as e:
+                print(f"⚠️ [ExtractionCache] Write failed: {e}")
+
+    def stats(self, persisted: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-stage {exact, near, miss, hit_rate}. persisted=True counts every process's lookups
+        (the merged totals plus this process's unflushed ones), otherwise only this process's.
+        """
+        with self._lock:
+            if persisted and self.stats_path:
+                counts = self._read_stats() + self._pending_stats
+            else:
+                counts = Counter(self.counters)
+        out = {}
+        for stage in sorted({s for s, _ in counts}):
+            row = {k: counts[(stage, k)] for k in OUTCOMES}
+            total = sum(row.values())
+            row["hit_rate"] = (row["exact"] + row["near"]) / total if total else 0.0
+            out[stage] = row
+        return out
+
+    def __len__(self) -> int:
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            return len(self._entries)
+
+
+_extraction_cache: Optional[ExtractionCache] = None
+_extraction_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """Process-wide extraction cache"""
+    global _extraction_cache
+    if _extraction_cache is None:
+        with _extraction_cache_lock:
+            if _extraction_cache is None:
+                _extraction_cache = ExtractionCache()
+                atexit.register(_extraction_cache.flush)
+    return _extraction_cache
@@ -7,11 +7,15 @@ This module defines the LLM prompt and interface for extracting structured
 Bazi cases from raw unstructured text.
 """
 
+import copy
+import hashlib
 import json
 import re
 import time
 from typing import Dict, Optional, Any
 
+from service.extraction_cache import get_extraction_cache
+
 # Optional Import for Ollama
 try:
     import ollama
@@ -66,6 +70,9 @@ SYSTEM_PROMPT_TEMPLATE = """
 ```
 """
 
+# Extraction cache namespace: changes whenever the prompt does
+EXTRACTOR_VERSION = "case-" + hashlib.sha1(SYSTEM_PROMPT_TEMPLATE.encode("utf-8")).hexdigest()[:10]
+
 def construct_prompt(raw_text: str) -> str:
     """
     Constructs the final prompt to be sent to the LLM.
@@ -140,10 +147,13 @@ class CaseExtractor:
         result = "\n".join(compressed_lines)
         return result
 
-    def extract(self, raw_text: str, model: Optional[str] = None) -> Optional[Dict]:
+    def extract(self, raw_text: str, model: Optional[str] = None, use_cache: bool = True,
+                source_url: str = "") -> Optional[Dict]:
         """
         Main extraction method.
         Connects to Local LLM (Ollama) to perform structural extraction.
+        LLM answers (including unparseable ones) are cached per text / prompt version / model,
+        so re-mined or reposted text skips the LLM.
         """
         # 1. Runtime Config Loading (Hot-Swapping Support)
         current_host = self.config.get('ollama_host', 'http://localhost:11434')
@@ -154,6 +164,15 @@ class CaseExtractor:
         if target_model == 'regex':
             print("   ⏩ [Extractor] Using Local Regex Mode (Configured)")
             return self._extract_with_regex(raw_text)
+
+        cache = get_extraction_cache() if use_cache else None
+        if cache is not None:
+            hit = cache.lookup("extract", raw_text, EXTRACTOR_VERSION, target_model)
+            if hit:
+                print(f"   ♻️ [Extractor] Cache {hit.kind} hit ({hit.source_url or 'unknown source'}), skipping LLM.")
+                if hit.result is None:
+                    return self._extract_with_regex(raw_text)
+                return copy.deepcopy(hit.result)
         
         # 1. Compress Text (Remove Noise)
         compressed_text = self._smart_compress(raw_text)
@@ -199,7 +218,9 @@ class CaseExtractor:
             
             # Parse JSON
             data = json.loads(content.strip())
-            return data
+            if cache is not None:
+                cache.store("extract", raw_text, EXTRACTOR_VERSION, target_model, data, source_url=source_url)
+            return copy.deepcopy(data) if cache is not None else data
             
         except ImportError:
             print("❌ [Extractor] 'ollama' library not installed. Please pip install ollama.")
@@ -207,6 +228,9 @@ class CaseExtractor:
         except json.JSONDecodeError as e:
             content_preview = content[:50] if 'content' in locals() else "Unknown"
             print(f"❌ [Extractor] LLM Output not valid JSON: {content_preview}...")
+            # Negative result: the model answered, just not usably. Cache it so we don't ask again.
+            if cache is not None:
+                cache.store("extract", raw_text, EXTRACTOR_VERSION, target_model, None, source_url=source_url)
             return self._extract_with_regex(raw_text)
         except Exception as e:
             print(f"❌ [Extractor] LLM Inference Failed: {e}")
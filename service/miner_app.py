@@ -120,79 +120,41 @@ class MinerService:
         logger.info(f"Found {total_vids} videos to process.")
         self.db.update_job_progress(job['id'], 0, total_vids)
         
-        # 2. Process Loop
-        success_count = 0
-        
-        for idx, vid in enumerate(video_ids):
-            try:
-                v_url = f"https://www.youtube.com/watch?v={vid}"
-                
-                # Check history?
-                # Using vm.get_history() is not efficient inside loop if list is huge, 
-                # but let's assume naive check for now or rely on user intent.
-                # Actually, let's skip check to force run if user requested.
-                
-                logger.info(f"[{idx+1}/{total_vids}] Processing: {v_url}")
-                
-                # A. Get Transcript
-                text, err = vm.fetch_transcript(v_url)
-                
-                if err == "WHISPER_FALLBACK":
-                    logger.info("  -> Downloading Audio for Whisper...")
-                    audio_path, dl_err = vm.download_audio(v_url)
-                    if not audio_path:
-                        logger.warning(f"  -> Audio download failed: {dl_err}")
-                        continue
-                        
-                    logger.info("  -> Transcribing with Whisper...")
-                    text, t_err = vm.transcribe_file(audio_path)
-                    if t_err:
-                         logger.warning(f"  -> Transcription failed: {t_err}")
-                         continue
-                elif err != "Success":
-                    logger.warning(f"  -> Transcript failed: {err}")
-                    continue
-                
-                if not text or len(text) < 50:
-                    logger.warning("  -> Text too short, skipping.")
-                    continue
-                    
-                # B. Pre-Cleaning (New V25.0)
-                from learning.text_cleaner import TextCleaner
-                raw_len = len(text)
-                cleaned_text = TextCleaner.clean(text)
-                clean_len = len(cleaned_text)
-                logger.info(f"  -> Pre-Cleaning: {raw_len} -> {clean_len} chars (Removed Garbage)")
-                
-                if clean_len < 50:
-                     logger.warning("  -> Text empty after cleaning, skipping.")
-                     continue
+        # 2. Staged pipeline: the next videos download while the current one transcribes,
+        #    and transcript chunks are mined as soon as their segments are done
+        from learning.video_pipeline import VideoPipeline, VideoTask
+
+        def mine_chunk(chunk, result):
+            rules = tm.extract_rules(chunk)
+            if rules and "error" not in rules:
+                tm.save_rule(rules)
+            return rules
+
+        finished = []
+
+        def video_done(result):
+            finished.append(result)
+            if result.ok:
+                logger.info(f"[{len(finished)}/{total_vids}] {result.video_id}: {result.source}, "
+                            f"{result.segments} segments -> {result.chunks} chunks ({result.elapsed_s:.1f}s)")
+                vm.mark_processed(result.video_id)
+            elif result.partial:
+                # rules from the good segments are saved: keep them, retry only the failed segments
+                logger.warning(f"[{len(finished)}/{total_vids}] {result.video_id} partially mined, "
+                               f"segments {result.failed_segments} to retry: {'; '.join(result.errors)}")
+                vm.mark_partial(result.video_id, result.failed_segments)
+            elif result.errors:
+                logger.warning(f"[{len(finished)}/{total_vids}] {result.video_id} failed: {'; '.join(result.errors)}")
+            else:
+                logger.warning(f"[{len(finished)}/{total_vids}] {result.video_id}: text too short, skipping.")
+            self.db.update_job_progress(job['id'], len(finished), total_vids)
+
+        pipeline = VideoPipeline(extract=mine_chunk, on_video_done=video_done)
+        results = pipeline.run([VideoTask(url=f"https://www.youtube.com/watch?v={vid}", video_id=vid,
+                                          segments=vm.pending_segments(vid))
+                                for vid in video_ids])
+        success_count = sum(1 for r in results if r.ok)
 
-                # C. Mine Knowledge
-                logger.info(f"  -> Mining Knowledge...")
-                
-                # Split huge text?
-                if clean_len > 5000:
-                    # chunk it
-                    chunks = [cleaned_text[i:i+4000] for i in range(0, clean_len, 4000)]
-                    for chunk in chunks:
-                        rules = tm.extract_rules(chunk)
-                        if rules and "error" not in rules:
-                             tm.save_rule(rules)
-                else:
-                    rules = tm.extract_rules(cleaned_text)
-                    if rules and "error" not in rules:
-                         tm.save_rule(rules)
-                
-                success_count += 1
-                vm.mark_processed(vid)
-                
-            except Exception as e:
-                logger.error(f"Error processing video {vid}: {e}")
-            
-            # Update Progress
-            self.db.update_job_progress(job['id'], idx + 1, total_vids)
-            
         vm.cleanup_temp_files()
         logger.info(f"Video Mining Complete. Success: {success_count}/{total_vids}")
 
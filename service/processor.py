@@ -9,6 +9,7 @@ Routes raw text to appropriate extractors (Case vs Rule) based on semantic conte
 from typing import Dict, Literal
 from service.extractor import CaseExtractor, construct_prompt as construct_case_prompt
 from service.case_db import CaseDatabase
+from service.extraction_cache import get_extraction_cache
 
 # Enum for content types
 ContentCategory = Literal["CASE", "RULE", "MIXED", "NOISE"]
@@ -24,6 +25,10 @@ CLASSIFIER_PROMPT = """
 只输出类别单词，不要其他内容。
 """
 
+# Extraction cache namespace for classify_content (bump when the heuristics change)
+CLASSIFIER_VERSION = "heuristic-1"
+CLASSIFIER_MODEL = "heuristic"
+
 class ContentProcessor:
     def __init__(self, db_path="data/cases.db"):
         self.case_db = CaseDatabase(db_path)
@@ -62,21 +67,35 @@ class ContentProcessor:
             
         return "NOISE"
 
+    def classify_cached(self, text: str, source_url: str = "") -> ContentCategory:
+        """classify_content through the extraction cache (exact and near-duplicate hits)"""
+        cache = get_extraction_cache()
+        hit = cache.lookup("classify", text, CLASSIFIER_VERSION, CLASSIFIER_MODEL)
+        if hit:
+            return hit.result
+        category = self.classify_content(text)
+        cache.store("classify", text, CLASSIFIER_VERSION, CLASSIFIER_MODEL, category, source_url=source_url,
+                    buffered=True)
+        return category
+
     def process_text(self, text: str, source_url: str = ""):
         """
         Main entry point for processing mined text.
+        Returns False if a case was detected but could not be saved (callers retry later).
         """
-        category = self.classify_content(text)
+        category = self.classify_cached(text, source_url)
         print(f"🔍 Content classified as: {category}")
         
+        ok = True
         if category == "CASE" or category == "MIXED":
-            self._handle_case(text, source_url)
+            ok = self._handle_case(text, source_url)
         
         if category == "RULE" or category == "MIXED":
             self._handle_rule(text, source_url)
+        return ok
 
-    def _handle_case(self, text: str, source_url: str):
-        """Extract and save case data"""
+    def _handle_case(self, text: str, source_url: str) -> bool:
+        """Extract and save case data; True once the case is stored"""
         print("⚡ Extracting Case data...")
         
         # Check Configuration for extraction mode
@@ -93,13 +112,13 @@ class ContentProcessor:
              print("   ⏩ [Processor] Using Local Regex Mode (Configured)")
 
         # Step 1: Extraction
-        case_data = self.case_extractor.extract(text, model=extraction_model)
+        case_data = self.case_extractor.extract(text, model=extraction_model, source_url=source_url)
         
         if not case_data:
             # For demo, use mock data if LLM is not connected
             # In production, this should log an error/warning
             print("⚠️ Extraction failed (No LLM). Skipping save.")
-            return
+            return False
 
         # Step 2: Enrich metadata
         case_data['source_url'] = source_url
@@ -113,7 +132,7 @@ class ContentProcessor:
         case_data['id'] = case_id
         
         # Step 3: Persistence
-        self.case_db.insert_case(case_data)
+        return self.case_db.insert_case(case_data)
 
     def _handle_rule(self, text: str, source_url: str):
         """Extract and save rule data"""
@@ -7,10 +7,10 @@ Specialized strategies for high-quality Bazi data sources.
 Target 1: Astro-Databank (The Gold Standard)
 """
 
-import requests
 import re
 import urllib.parse
 from datetime import datetime
+from typing import List
 try:
     from bs4 import BeautifulSoup
 except ImportError:
@@ -18,10 +18,12 @@ except ImportError:
 
 from service.sanitizer import Sanitizer
 from service.processor import ContentProcessor
+from learning.fetcher import FetchResult, get_fetcher
 
 class WebHunter:
     def __init__(self):
         self.processor = ContentProcessor()
+        self.fetcher = get_fetcher()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
@@ -75,10 +77,13 @@ class WebHunter:
         if not BeautifulSoup:
             raise ImportError("BeautifulSoup is required for ADB parsing.")
 
-        resp = requests.get(url, headers=self.headers, timeout=10)
-        if resp.status_code == 404:
+        resp = self.fetcher.fetch(url, headers=self.headers)
+        if resp.status == 404:
             return False
         resp.raise_for_status()
+        if self.fetcher.store.is_processed(resp.content_hash):
+            print("   ⏭️ Page unchanged since last capture.")
+            return True
         
         soup = BeautifulSoup(resp.text, 'html.parser')
         
@@ -142,8 +147,10 @@ class WebHunter:
         
         print(f"   📦 Extracted {len(final_text)} chars of high-grade intel.")
         
-        # Send to Processor
-        self.processor.process_text(final_text, source_url=url)
+        # Send to Processor; only a stored result marks the page as done
+        if not self.processor.process_text(final_text, source_url=url):
+            return False
+        self.fetcher.store.mark_processed(url, resp.content_hash)
         return True
 
     def hunt_from_url(self, url: str) -> bool:
@@ -152,19 +159,35 @@ class WebHunter:
         Used for Method 1 (Search Results) & Method 3 (Discovery).
         """
         print(f"   🕸️ Generic Hunt: {url}")
-        if "youtube.com" in url or "youtu.be" in url:
+        if self._is_video_url(url):
             print("   ⚠️ Skipping YouTube URL (VideoMiner territory).")
             return False
-            
+        return self._capture(url, self.fetcher.fetch(url, headers=self.headers))
+
+    def hunt_many(self, urls: List[str]) -> int:
+        """
+        hunt_from_url for a batch: pages are prefetched in parallel (each host rate-limited
+        by the shared fetcher), then processed one by one. Returns the number captured.
+        """
+        urls = [u for u in urls if not self._is_video_url(u)]
+        captured = 0
+        for url, resp in zip(urls, self.fetcher.fetch_many(urls, headers=self.headers)):
+            print(f"   🕸️ Generic Hunt: {url}")
+            captured += self._capture(url, resp)
+        return captured
+
+    @staticmethod
+    def _is_video_url(url: str) -> bool:
+        return "youtube.com" in url or "youtu.be" in url
+
+    def _capture(self, url: str, resp: FetchResult) -> bool:
         try:
-            resp = requests.get(url, headers=self.headers, timeout=10)
-            if resp.status_code != 200:
-                print(f"   ❌ Access Failed: {resp.status_code}")
+            if not resp.ok:
+                print(f"   ❌ Access Failed: {resp.error or resp.status}")
+                return False
+            if self.fetcher.store.is_processed(resp.content_hash):
+                print("   ⏭️ Content unchanged since last capture, skipping.")
                 return False
-                
-            # Encoding fix
-            if 'charset' not in resp.headers.get('content-type', '').lower():
-                resp.encoding = resp.apparent_encoding
                 
             text = self._extract_visible_text(resp.text)
             
@@ -172,7 +195,10 @@ class WebHunter:
                 print("   ⚠️ Content too short, skipping.")
                 return False
                 
-            self.processor.process_text(text, source_url=url)
+            if not self.processor.process_text(text, source_url=url):
+                print("   ⚠️ Processing failed, will retry on next hunt.")
+                return False
+            self.fetcher.store.mark_processed(url, resp.content_hash)
             print("   ✅ Generic capture successful.")
             return True
         except Exception as e:
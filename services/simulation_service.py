@@ -23,6 +23,11 @@ from core.trinity.core.engines.pattern_lifecycle_manager import PatternLifecycle
 from core.trinity.core.engines.intervention_engine import InterventionEngine
 from core.profile_manager import ProfileManager
 from core.bazi_profile import BaziProfile
+from core.bazi_profile_factory import get_profile_factory
+from services.universe_audit import (
+    AuditCheckpoint, BatchSimulationAudit, GrandPhaseAudit, StreamingAudit,
+    DEFAULT_CHECKPOINT_EVERY, checkpoint_snapshot, get_live_board, run_streaming_audit
+)
 
 # Legacy/Unified Engine Imports
 from core.unified_engine import UnifiedEngine as QuantumEngine
@@ -162,44 +167,45 @@ class SimulationService:
 
     # --- Trinity Engine Logic (Ex-SimulationController) ---
 
-    def run_batch_simulation(self, sample_size: int, progress_callback=None):
+    def _audit_checkpoint(self, audit_name: str) -> AuditCheckpoint:
+        return AuditCheckpoint(os.path.join(self.model.reports_dir, f"{audit_name}_checkpoint.json"))
+
+    def _new_audit(self, audit_name: str, total: int) -> StreamingAudit:
+        if audit_name == GrandPhaseAudit.name:
+            return GrandPhaseAudit(self.framework, self.model.config.get("damping_factor", 1.0), total)
+        if audit_name == BatchSimulationAudit.name:
+            return BatchSimulationAudit(self.framework, ExpectedValueCollector(),
+                                        self.model.config["geo_variance"], total)
+        raise ValueError(f"Unknown audit: {audit_name}")
+
+    def run_batch_simulation(self, sample_size: int, progress_callback=None, resume: bool = True,
+                             seed: Optional[int] = None, checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY):
+        """
+        [V9.4] 流式批量仿真：部分聚合定期写入 reports/batch_simulation_checkpoint.json，
+        停止/崩溃后以相同 sample_size 重新调用即续跑
+
+        结束或停止时都保存基线；停止时的基线标记 partial=True（processed < sample_size），
+        续跑完成后再保存完整基线
+        """
         self.model.reset_progress(sample_size)
         self.model.is_running = True
-        self.collector = ExpectedValueCollector()
-        bazi_gen = self.engine.generate_all_bazi()
-        start_t = time.time()
-        
-        for i in range(sample_size):
-            if not self.model.is_running: break
-            try:
-                chart = next(bazi_gen)
-                luck = random.choice(self.engine.JIA_ZI)
-                annual = random.choice(self.engine.JIA_ZI)
-                geo_factor = random.uniform(1.0 - self.model.config["geo_variance"], 
-                                           1.0 + self.model.config["geo_variance"])
-                geo_element = random.choice(["Wood", "Fire", "Earth", "Metal", "Water", "Neutral"])
-                
-                ctx = {
-                    "luck_pillar": luck, "annual_pillar": annual,
-                    "geo_factor": geo_factor, "data": {"geo_factor": geo_factor, "geo_element": geo_element},
-                    "scenario": "ASE_SIMULATION"
-                }
-                report = self.framework.arbitrate_bazi(chart, current_context=ctx)
-                report["meta"]["chart"] = chart
-                self.collector.collect(report)
-                self.model.processed_count += 1
-                if progress_callback and i % 100 == 0:
-                    progress_callback(i, sample_size, self.collector.get_summary())
-            except StopIteration: break
-            except Exception as e:
-                logger.error(f"Error in batch at {i}: {e}")
-                
+        audit = self._new_audit(BatchSimulationAudit.name, sample_size)
+        self.collector = audit.collector
+        result = run_streaming_audit(
+            audit, self.engine.generate_all_bazi, self._audit_checkpoint(audit.name),
+            should_continue=lambda: self.model.is_running, progress_callback=progress_callback,
+            resume=resume, seed=seed, checkpoint_every=checkpoint_every
+        )
+        self.model.processed_count = audit.processed
         self.model.is_running = False
-        final_summary = self.collector.get_summary()
-        final_summary["duration"] = time.time() - start_t
+        final_summary = result["summary"]
+        final_summary["duration"] = result["elapsed"]
         self.model.summary_stats = final_summary
         self.model.singularities = self.collector.singularities
-        self.model.save_baseline({"summary": final_summary, "singularities": self.model.singularities[:200]})
+        self.model.save_baseline({"summary": final_summary, "singularities": self.model.singularities[:200],
+                                  "partial": not result["complete"], "processed": audit.processed,
+                                  "sample_size": sample_size})
+        return result
 
     def run_phase_2_audit(self, sample_size: int, progress_callback=None):
         self.model.reset_progress(sample_size)
@@ -335,7 +341,7 @@ class SimulationService:
         results = []
         try:
             bdt = datetime(profile_data['year'], profile_data['month'], profile_data['day'], profile_data['hour'], profile_data.get('minute', 0))
-            po = BaziProfile(bdt, 1 if profile_data['gender'] == '男' else 0)
+            po = get_profile_factory().get(bdt, 1 if profile_data['gender'] == '男' else 0)
             natal = po.pillars
             
             for y in range(start_year, end_year + 1):
@@ -411,13 +417,30 @@ class SimulationService:
              "no_match_count": no_match_count
         }
 
+    def _build_saved_profiles(self, profiles: List[Dict]) -> List[Optional[BaziProfile]]:
+        """[V9.4] 批量构建已保存档案的 BaziProfile（共享缓存，解析失败的档案返回 None）"""
+        entries, positions = [], []
+        for i, p in enumerate(profiles):
+            try:
+                bdt = datetime(p['year'], p['month'], p['day'], p['hour'], p.get('minute', 0))
+                entries.append((bdt, 1 if p['gender'] == '男' else 0))
+                positions.append(i)
+            except Exception as e:
+                logger.error(f"Invalid birth data for {p.get('name')}: {e}")
+        built = get_profile_factory().build_many(entries) if entries else []
+        result: List[Optional[BaziProfile]] = [None] * len(profiles)
+        for i, po in zip(positions, built):
+            result[i] = po
+        return result
+
     def run_real_world_audit(self, target_year: int = 2024, progress_callback=None):
         profiles = self.profile_manager.get_all()
+        profile_objs = self._build_saved_profiles(profiles)
         results = []
         for i, p in enumerate(profiles):
             try:
-                bdt = datetime(p['year'], p['month'], p['day'], p['hour'], p.get('minute', 0))
-                po = BaziProfile(bdt, 1 if p['gender'] == '男' else 0)
+                po = profile_objs[i]
+                if po is None: continue
                 chart = [po.pillars['year'], po.pillars['month'], po.pillars['day'], po.pillars['hour']]
                 luck = po.get_luck_pillar_at(target_year)
                 annual = po.get_year_pillar(target_year)
@@ -429,32 +452,44 @@ class SimulationService:
             except Exception as e: logger.error(f"Audit failed for {p.get('name')}: {e}")
         return results
 
-    def run_grand_universal_audit(self, total_samples: int = 518400, progress_callback=None):
+    def run_grand_universal_audit(self, total_samples: int = 518400, progress_callback=None, resume: bool = True,
+                                  seed: Optional[int] = None, checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY):
+        """
+        [V9.4] 流式全谱相图审计：部分聚合定期写入 reports/grand_universal_checkpoint.json，
+        停止/崩溃后以相同参数重新调用即续跑
+        """
         self.model.is_running = True
-        iteration = 0
-        points = []
-        bazi_gen = self.engine.generate_all_bazi()
-        start_time = time.time()
-        while iteration < total_samples and self.model.is_running:
-            try:
-                chart = next(bazi_gen)
-                ctx = {"luck_pillar": random.choice(self.engine.JIA_ZI), "annual_pillar": random.choice(self.engine.JIA_ZI), "geo_factor": 1.0, "scenario": "ASE_GRAND_AUDIT"}
-                report = self.framework.arbitrate_bazi(chart, current_context=ctx)
-                phy = report.get("physics", {})
-                re_val = phy.get("wealth", {}).get("Reynolds", 0)
-                sai_val = phy.get("stress", {}).get("SAI", 0)
-                density = re_val / (self.model.config.get("damping_factor", 1.0) + 0.1)
-                resistance = 1.0 / (sai_val + 0.2)
-                if len(points) < 20000: points.append({"x": density, "y": resistance, "sai": sai_val, "re": re_val})
-                iteration += 1
-                if progress_callback and iteration % 2000 == 0:
-                    elapsed = time.time() - start_time
-                    eta = (elapsed / iteration) * (total_samples - iteration)
-                    progress_callback(iteration, total_samples, {"phase": f"🌓 映射中... ETA: {int(eta)}s", "count": iteration})
-            except StopIteration: break
-            except: iteration += 1
+        audit = self._new_audit(GrandPhaseAudit.name, total_samples)
+        result = run_streaming_audit(
+            audit, self.engine.generate_all_bazi, self._audit_checkpoint(audit.name),
+            should_continue=lambda: self.model.is_running, progress_callback=progress_callback,
+            resume=resume, seed=seed, checkpoint_every=checkpoint_every
+        )
         self.model.is_running = False
-        return {"total_samples": iteration, "phase_points": points, "status": "UNIVERSAL_PHASE_MAPPED"}
+        return result
+
+    def start_background_audit(self, audit_name: str, total: int, **kwargs) -> bool:
+        """在后台线程运行审计（grand_universal / batch_simulation）；同名审计已在运行时返回 False"""
+        runners = {
+            GrandPhaseAudit.name: self.run_grand_universal_audit,
+            BatchSimulationAudit.name: self.run_batch_simulation,
+        }
+        runner = runners[audit_name]
+        return get_live_board().start(audit_name, lambda: runner(total, **kwargs))
+
+    def is_audit_running(self, audit_name: str) -> bool:
+        return get_live_board().is_running(audit_name)
+
+    def get_live_aggregates(self, audit_name: str) -> Optional[Dict[str, Any]]:
+        """
+        读取审计的实时聚合快照（不阻塞工作线程）：
+        优先取本进程看板上的最新发布，否则从检查点重建
+        """
+        snapshot = get_live_board().get(audit_name)
+        if snapshot is not None:
+            return snapshot
+        checkpoint = self._audit_checkpoint(audit_name)
+        return checkpoint_snapshot(self._new_audit(audit_name, 0), checkpoint)
 
     def run_v43_live_fire_audit(self, sample_size: int = 518400, progress_callback=None):
         self.model.is_running = True
@@ -472,11 +507,12 @@ class SimulationService:
 
     def run_v43_penetration_audit(self, progress_callback=None):
         profiles = self.profile_manager.get_all()
+        profile_objs = self._build_saved_profiles(profiles)
         report_data = []
         for i, p in enumerate(profiles):
             try:
-                dt = datetime(p['year'], p['month'], p['day'], p['hour'], p.get('minute', 0))
-                po = BaziProfile(dt, 1 if p['gender'] == '男' else 0)
+                po = profile_objs[i]
+                if po is None: continue
                 hits = self.run_deep_specialized_scan(po.pillars, po.get_luck_pillar_at(2024), po.get_year_pillar(2024))
                 report_data.append({"name": p['name'], "defense_type": "SSI", "v43_hits": hits, "max_sai": 1.0})
                 if progress_callback: progress_callback(i+1, len(profiles), {"name": p['name']})
@@ -0,0 +1,369 @@
+"""
+全谱流式审计 (Streaming Universe Audit)
+======================================
+[V9.4 Performance] 将 518,400 全谱审计改为可断点续跑的流式管线：
+
+    audit = GrandPhaseAudit(framework, damping_factor=1.0, total_samples=518400)
+    result = run_streaming_audit(audit, engine.generate_all_bazi, AuditCheckpoint(path),
+                                 should_continue=lambda: model.is_running)
+
+- 每处理 checkpoint_every 个样本，把部分聚合（审计器状态 + 当前游标 + RNG 状态 + 已耗时）原子写入 JSON 检查点
+- 停止（should_continue 返回 False）时立即写检查点；崩溃/Streamlit 重跑后，以相同参数重新启动即从检查点续跑
+- 每 publish_every 个样本向进程级 LiveAggregateBoard 发布快照；UI 读取快照只需一次加锁拷贝，不阻塞工作线程
+- 完成后检查点标记 complete=True（保留最终状态），下一次同参数启动从头开始
+- 其他进程可用 checkpoint_snapshot() 从检查点重建快照
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from core.online_stats import DensityGrid2D, ReservoirSampler
+from core.trinity.core.engines.synthetic_bazi_engine import JIA_ZI, sai_reynolds_grid
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_EVERY = 5000
+DEFAULT_PUBLISH_EVERY = 500
+MAX_PHASE_POINTS = 20000
+
+
+def _json_default(obj):
+    # numpy 标量等
+    if hasattr(obj, "item"):
+        return obj.item()
+    return str(obj)
+
+
+def rng_state_to_json(rng: random.Random) -> List:
+    version, internal, gauss_next = rng.getstate()
+    return [version, list(internal), gauss_next]
+
+
+def rng_from_json(state: List) -> random.Random:
+    rng = random.Random()
+    rng.setstate((state[0], tuple(state[1]), state[2]))
+    return rng
+
+
+class AuditCheckpoint:
+    """
+    审计检查点文件
+
+    内容: {audit, params, seed, index, state, rng, elapsed, complete, updated_at}
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Checkpoint unreadable, starting fresh: {self.path}: {e}")
+            return None
+
+    def save(self, payload: Dict[str, Any]):
+        """先写临时文件再 os.replace，读者不会看到写了一半的检查点"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, default=_json_default)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class LiveAggregateBoard:
+    """
+    进程级实时聚合看板：工作线程 publish，UI get（均为一次加锁的字典操作）
+
+    running: 正在后台运行的审计名
+    """
+
+    def __init__(self):
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        self._running: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, name: str, snapshot: Dict[str, Any]):
+        with self._lock:
+            self._snapshots[name] = snapshot
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._snapshots.get(name)
+
+    def is_running(self, name: str) -> bool:
+        with self._lock:
+            thread = self._running.get(name)
+            return thread is not None and thread.is_alive()
+
+    def start(self, name: str, target: Callable[[], Any]) -> bool:
+        """在守护线程中运行 target；同名审计已在运行时返回 False"""
+        with self._lock:
+            thread = self._running.get(name)
+            if thread is not None and thread.is_alive():
+                return False
+            thread = threading.Thread(target=target, name=f"audit-{name}", daemon=True)
+            self._running[name] = thread
+        thread.start()
+        return True
+
+
+_live_board: Optional[LiveAggregateBoard] = None
+_live_board_lock = threading.Lock()
+
+
+def get_live_board() -> LiveAggregateBoard:
+    """获取进程级实时聚合看板"""
+    global _live_board
+    if _live_board is None:
+        with _live_board_lock:
+            if _live_board is None:
+                _live_board = LiveAggregateBoard()
+    return _live_board
+
+
+class StreamingAudit(ABC):
+    """
+    流式审计器基类
+
+    子类必须实现 process / state_dict / load_state_dict / snapshot（缺一则实例化即报错），
+    可覆盖 progress_info / result；params 决定检查点能否续用（参数不同则从头开始）
+    """
+
+    name = "audit"
+    progress_every = 1000
+
+    def __init__(self, total_samples: int, params: Optional[Dict[str, Any]] = None):
+        self.total_samples = total_samples
+        self.params = {"total_samples": total_samples, **(params or {})}
+
+    @abstractmethod
+    def process(self, index: int, chart: List[str], rng: random.Random):
+        """处理第 index 个样本"""
+
+    @abstractmethod
+    def state_dict(self) -> Dict[str, Any]:
+        """可 JSON 序列化的部分聚合（写入检查点）"""
+
+    @abstractmethod
+    def load_state_dict(self, state: Dict[str, Any]):
+        """从检查点恢复 state_dict() 的内容"""
+
+    @abstractmethod
+    def snapshot(self, index: int) -> Dict[str, Any]:
+        """供 UI 展示的实时聚合（需可 JSON 序列化）"""
+
+    def progress_info(self, index: int, elapsed: float) -> Dict[str, Any]:
+        return {"count": index}
+
+    def result(self, index: int) -> Dict[str, Any]:
+        return self.snapshot(index)
+
+
+def run_streaming_audit(
+    audit: StreamingAudit,
+    source: Callable[[int], Iterator[List[str]]],
+    checkpoint: AuditCheckpoint,
+    should_continue: Callable[[], bool] = lambda: True,
+    progress_callback: Optional[Callable] = None,
+    resume: bool = True,
+    seed: Optional[int] = None,
+    checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    publish_every: int = DEFAULT_PUBLISH_EVERY,
+    board: Optional[LiveAggregateBoard] = None
+) -> Dict[str, Any]:
+    """
+    驱动审计器扫描 source(start) 产生的八字流
+
+    Returns:
+        audit.result(index)，附加 scanned / resumed_from / complete / elapsed / checkpoint
+    """
+    board = board or get_live_board()
+    payload = checkpoint.load() if resume else None
+    if (payload and not payload.get("complete") and payload.get("audit") == audit.name
+            and payload.get("params") == audit.params and seed in (None, payload.get("seed"))):
+        start = payload["index"]
+        audit.load_state_dict(payload["state"])
+        rng = rng_from_json(payload["rng"])
+        seed = payload.get("seed")
+        prior_elapsed = payload.get("elapsed", 0.0)
+        logger.info(f"Resuming {audit.name} from checkpoint at {start}/{audit.total_samples}")
+    else:
+        start = 0
+        seed = seed if seed is not None else random.randrange(2 ** 32)
+        rng = random.Random(seed)
+        prior_elapsed = 0.0
+
+    t0 = time.time()
+    index = start
+
+    def elapsed() -> float:
+        return prior_elapsed + (time.time() - t0)
+
+    def save(complete: bool):
+        checkpoint.save({
+            "audit": audit.name, "params": audit.params, "seed": seed, "index": index,
+            "state": audit.state_dict(), "rng": rng_state_to_json(rng), "elapsed": elapsed(),
+            "complete": complete, "updated_at": datetime.now().isoformat(),
+        })
+
+    board.publish(audit.name, {**audit.snapshot(index), "running": True, "complete": False, "resumed_from": start})
+    stopped = False
+    for chart in source(start):
+        if index >= audit.total_samples:
+            break
+        if not should_continue():
+            stopped = True
+            break
+        audit.process(index, chart, rng)
+        index += 1
+        if index % checkpoint_every == 0:
+            save(complete=False)
+        if index % publish_every == 0:
+            board.publish(audit.name, {**audit.snapshot(index), "running": True, "complete": False,
+                                       "resumed_from": start})
+        if progress_callback and index % audit.progress_every == 0:
+            progress_callback(index, audit.total_samples, audit.progress_info(index, elapsed()))
+
+    complete = not stopped
+    save(complete=complete)
+    board.publish(audit.name, {**audit.snapshot(index), "running": False, "complete": complete,
+                                "resumed_from": start})
+    return {**audit.result(index), "scanned": index, "resumed_from": start, "complete": complete,
+            "elapsed": elapsed(), "checkpoint": checkpoint.path}
+
+
+def checkpoint_snapshot(audit: StreamingAudit, checkpoint: AuditCheckpoint) -> Optional[Dict[str, Any]]:
+    """从检查点重建审计快照（供未运行该审计的进程/会话读取）"""
+    payload = checkpoint.load()
+    if not payload or payload.get("audit") != audit.name:
+        return None
+    audit.load_state_dict(payload["state"])
+    return {**audit.snapshot(payload["index"]), "running": False, "complete": payload.get("complete", False),
+            "updated_at": payload.get("updated_at")}
+
+
+class GrandPhaseAudit(StreamingAudit):
+    """
+    大一统相图审计：对每个八字随机注入大运/流年，记录 (density, resistance) 相点
+
+    相点为全程的蓄水池均匀样本（最多 MAX_PHASE_POINTS 个，不再偏向扫描顺序的前段）；
+    完整相图由 SAI×Reynolds 与 density×resistance 两张计数网格给出，内存固定
+    """
+
+    name = "grand_universal"
+    progress_every = 2000
+
+    def __init__(self, framework, damping_factor: float = 1.0, total_samples: int = 518400):
+        super().__init__(total_samples, {"damping_factor": damping_factor})
+        self.framework = framework
+        self.damping_factor = damping_factor
+        self.sampler = ReservoirSampler(MAX_PHASE_POINTS)
+        self.phase_grid = sai_reynolds_grid()
+        self.density_grid = DensityGrid2D((0.0, 5000.0 / (damping_factor + 0.1)), (0.0, 5.0), bins=(48, 48),
+                                          scale="log1p", x_label="density", y_label="resistance")
+
+    @property
+    def points(self) -> List[Dict[str, float]]:
+        return self.sampler.items
+
+    def process(self, index, chart, rng):
+        ctx = {"luck_pillar": rng.choice(JIA_ZI), "annual_pillar": rng.choice(JIA_ZI),
+               "geo_factor": 1.0, "scenario": "ASE_GRAND_AUDIT"}
+        try:
+            report = self.framework.arbitrate_bazi(chart, current_context=ctx)
+            phy = report.get("physics", {})
+            re_val = phy.get("wealth", {}).get("Reynolds", 0)
+            sai_val = phy.get("stress", {}).get("SAI", 0)
+            density = re_val / (self.damping_factor + 0.1)
+            resistance = 1.0 / (sai_val + 0.2)
+            self.sampler.add({"x": density, "y": resistance, "sai": sai_val, "re": re_val})
+            self.phase_grid.add(sai_val, re_val)
+            self.density_grid.add(density, resistance)
+        except Exception as e:
+            logger.debug(f"Grand audit sample {index} failed: {e}")
+
+    def state_dict(self):
+        return {"points": self.sampler.state_dict(), "phase_grid": self.phase_grid.state_dict(),
+                "density_grid": self.density_grid.state_dict()}
+
+    def load_state_dict(self, state):
+        self.sampler.load_state_dict(state.get("points", {}))
+        self.phase_grid.load_state_dict(state.get("phase_grid", {}))
+        self.density_grid.load_state_dict(state.get("density_grid", {}))
+
+    def snapshot(self, index):
+        return {"total_samples": index, "target": self.total_samples,
+                "phase_points": list(self.points), "sampled_from": self.sampler.seen,
+                "phase_grid": self.phase_grid.to_dict(), "density_grid": self.density_grid.to_dict(),
+                "status": "UNIVERSAL_PHASE_MAPPED"}
+
+    def progress_info(self, index, elapsed):
+        eta = (elapsed / index) * (self.total_samples - index) if index else 0
+        return {"phase": f"🌓 映射中... ETA: {int(eta)}s", "count": index}
+
+
+class BatchSimulationAudit(StreamingAudit):
+    """ASE 批量仿真：随机大运/流年/地理注入，汇总到 ExpectedValueCollector"""
+
+    name = "batch_simulation"
+    progress_every = 100
+
+    def __init__(self, framework, collector, geo_variance: float = 0.2, sample_size: int = 10000):
+        super().__init__(sample_size, {"geo_variance": geo_variance})
+        self.framework = framework
+        self.collector = collector
+        self.geo_variance = geo_variance
+        self.processed = 0
+
+    def process(self, index, chart, rng):
+        try:
+            luck = rng.choice(JIA_ZI)
+            annual = rng.choice(JIA_ZI)
+            geo_factor = rng.uniform(1.0 - self.geo_variance, 1.0 + self.geo_variance)
+            geo_element = rng.choice(["Wood", "Fire", "Earth", "Metal", "Water", "Neutral"])
+            ctx = {
+                "luck_pillar": luck, "annual_pillar": annual,
+                "geo_factor": geo_factor, "data": {"geo_factor": geo_factor, "geo_element": geo_element},
+                "scenario": "ASE_SIMULATION"
+            }
+            report = self.framework.arbitrate_bazi(chart, current_context=ctx)
+            report["meta"]["chart"] = chart
+            self.collector.collect(report)
+            self.processed += 1
+        except Exception as e:
+            logger.error(f"Error in batch at {index}: {e}")
+
+    def state_dict(self):
+        return {"collector": self.collector.state_dict(), "processed": self.processed}
+
+    def load_state_dict(self, state):
+        self.collector.load_state_dict(state.get("collector", {}))
+        self.processed = state.get("processed", 0)
+
+    def snapshot(self, index):
+        return {"total_samples": index, "target": self.total_samples, "processed": self.processed,
+                "summary": self.collector.get_summary()}
+
+    def progress_info(self, index, elapsed):
+        return self.collector.get_summary()
+
+    def result(self, index):
+        return {"processed": self.processed, "summary": self.collector.get_summary(),
+                "singularities": self.collector.singularities,
+                "top_singularities": {k: v.items() for k, v in self.collector.top_singularities.items()},
+                "phase_grid": self.collector.phase_grid.to_dict()}
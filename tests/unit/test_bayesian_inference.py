@@ -0,0 +1,64 @@
+import time
+import unittest
+
+import numpy as np
+
+from core.bayesian_inference import BayesianInference
+from core.bayesian_strength_calibration import BayesianStrengthCalibration
+
+RANGES = {'strength_probability': (0.2, 0.9), 'energy_sum': (1.0, 6.0)}
+
+
+class TestMonteCarlo(unittest.TestCase):
+
+    def test_parameter_matrix_shape_and_bounds(self):
+        for method in ("random", "sobol", "lhs"):
+            names, matrix = BayesianInference.sample_parameters(RANGES, 512, seed=3, method=method)
+            self.assertEqual(names, list(RANGES))
+            self.assertEqual(matrix.shape, (512, 2))
+            self.assertTrue(np.all(matrix[:, 0] >= 0.2) and np.all(matrix[:, 0] <= 0.9))
+            self.assertTrue(np.all(matrix[:, 1] >= 1.0) and np.all(matrix[:, 1] <= 6.0))
+        with self.assertRaises(ValueError):
+            BayesianInference.sample_parameters(RANGES, 10, method="halton")
+
+    def test_seeded_runs_are_reproducible(self):
+        a = BayesianInference.monte_carlo_simulation(0, RANGES, 2000, evaluate=BayesianStrengthCalibration.confidence_batch, seed=7)
+        b = BayesianInference.monte_carlo_simulation(0, RANGES, 2000, evaluate=BayesianStrengthCalibration.confidence_batch, seed=7)
+        np.testing.assert_array_equal(a['samples'], b['samples'])
+        self.assertEqual(a['percentiles'], b['percentiles'])
+
+    def test_evaluation_uses_sampled_parameters(self):
+        result = BayesianInference.monte_carlo_simulation(
+            0, {'x': (0.0, 1.0), 'y': (0.0, 2.0)}, 20000, evaluate=lambda p: p['x'] + p['y'], seed=1)
+        self.assertAlmostEqual(result['mean'], 1.5, delta=0.02)
+        self.assertAlmostEqual(result['percentiles']['p50'], 1.5, delta=0.03)
+        self.assertLess(result['lower_bound'], result['percentiles']['p5'])
+
+    def test_quasi_random_converges_faster(self):
+        def error(method):
+            errs = []
+            for seed in range(10):
+                r = BayesianInference.monte_carlo_simulation(
+                    0, {'x': (0.0, 1.0)}, 256, evaluate=lambda p: p['x'] ** 2, seed=seed, method=method)
+                errs.append(abs(r['mean'] - 1.0 / 3.0))
+            return np.mean(errs)
+        self.assertLess(error("sobol"), error("random") / 5)
+        self.assertLess(error("lhs"), error("random"))
+
+    def test_batch_confidence_matches_scalar(self):
+        params = {'strength_probability': np.array([0.1, 0.5, 0.93]), 'energy_sum': np.array([0.5, 3.0, 9.0])}
+        batch = BayesianStrengthCalibration.confidence_batch(params)
+        for i in range(3):
+            self.assertAlmostEqual(batch[i], BayesianStrengthCalibration.calculate_strength_confidence(
+                params['strength_probability'][i], params['energy_sum'][i]))
+
+    def test_hundred_thousand_samples_is_interactive(self):
+        start = time.perf_counter()
+        result = BayesianInference.monte_carlo_simulation(
+            0, RANGES, 100000, evaluate=BayesianStrengthCalibration.confidence_batch, seed=0, method="sobol")
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(result['samples'].shape, (100000,))
+
+
+if __name__ == '__main__':
+    unittest.main()
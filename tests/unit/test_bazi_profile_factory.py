@@ -0,0 +1,74 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+
+from lunar_python import Solar
+
+from core.bazi_profile import BaziProfile
+from core.bazi_profile_factory import BaziProfileFactory
+
+
+class TestBaziProfileFactory(unittest.TestCase):
+
+    def setUp(self):
+        self.factory = BaziProfileFactory(maxsize=8)
+
+    def _snapshot(self, profile, birth_year):
+        return (
+            profile.pillars,
+            profile.day_master,
+            profile.get_luck_cycles(),
+            {y: profile.get_luck_pillar_at(y) for y in range(birth_year - 1, birth_year + 100)},
+        )
+
+    def test_precomputed_profiles_match_lunar(self):
+        rng = random.Random(27)
+        births = []
+        for i in range(60):
+            moment = datetime(1901, 1, 1) + timedelta(seconds=rng.randrange(198 * 365 * 86400))
+            if i % 6 == 0:
+                moment = moment.replace(hour=23)  # 晚子时
+            births.append((moment, i % 2))
+
+        factory = BaziProfileFactory(maxsize=len(births))
+        for (moment, gender), fast in zip(births, factory.build_many(births)):
+            expected = self._snapshot(BaziProfile(moment, gender), moment.year)
+            self.assertEqual(self._snapshot(fast, moment.year), expected, (moment, gender))
+
+    def test_get_returns_shared_instance(self):
+        birth = datetime(1964, 9, 10, 12, 0)
+        first = self.factory.get(birth, 1)
+        second = self.factory.get(birth, 1)
+        self.assertIs(first, second)
+        self.assertIsNot(first, self.factory.get(birth, 0))
+        self.assertEqual(self.factory.get_cache_stats()['hits'], 1)
+
+    def test_shared_profile_is_read_only(self):
+        profile = self.factory.get(datetime(1964, 9, 10, 12, 0), 1)
+        with self.assertRaises(AttributeError):
+            profile.gender = 0
+        pillars = profile.pillars
+        pillars['year'] = '甲子'
+        self.assertNotEqual(profile.pillars['year'], '甲子')
+
+    def test_lru_eviction(self):
+        base = datetime(1990, 1, 1, 8, 0)
+        for d in range(10):
+            self.factory.get(base + timedelta(days=d), 1)
+        self.assertEqual(self.factory.get_cache_stats()['cache_size'], 8)
+
+    def test_longitude_uses_true_solar_time(self):
+        birth = datetime(1990, 5, 5, 12, 0)
+        profile = self.factory.get(birth, 1, longitude=87.6)
+        self.assertNotEqual(profile.birth_date, birth)
+        self.assertIsNot(profile, self.factory.get(birth, 1))
+
+    def test_year_pillar_matches_lunar(self):
+        profile = self.factory.get(datetime(1964, 9, 10, 12, 0), 1)
+        for year in (1900, 1984, 2024, 2100):
+            expected = Solar.fromYmd(year, 6, 15).getLunar().getYearInGanZhi()
+            self.assertEqual(profile.get_year_pillar(year), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from service.case_db import CaseDatabase
+
+
+def _case(i, valid=True, tier="A", events=2):
+    return {
+        "id": f"case-{i:04d}",
+        "profile": {"name": f"N{i}", "gender": "男", "birth_year": 1950 + i % 50,
+                    "birth_month": 1 + i % 12, "birth_day": 1 + i % 28, "birth_hour": i % 24},
+        "quality_tier": tier,
+        "valid_for_validation": valid,
+        "tags": ["测试"],
+        "life_events": [{"year": 1980 + k, "event_type": "career", "description": f"e{k}"}
+                        for k in range(events)]
+    }
+
+
+class TestCaseDatabase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "cases.db")
+        with redirect_stdout(StringIO()):
+            self.db = CaseDatabase(self.path)
+
+    def _quiet(self, fn, *args, **kwargs):
+        with redirect_stdout(StringIO()):
+            return fn(*args, **kwargs)
+
+    def test_bulk_insert_matches_single_inserts(self):
+        cases = [_case(i, valid=i % 3 != 0, tier="AB"[i % 2]) for i in range(40)]
+        other = self._quiet(CaseDatabase, os.path.join(self.tmp.name, "single.db"))
+        for case in cases:
+            self._quiet(other.insert_case, case)
+
+        self.assertEqual(self._quiet(self.db.insert_cases_many, cases), 40)
+        for case in cases:
+            bulk, single = self.db.get_case(case["id"]), other.get_case(case["id"])
+            for row in (bulk, single):
+                row.pop("created_at")
+                for ev in row["life_events"]:
+                    ev.pop("id")
+            self.assertEqual(bulk, single)
+        self.assertEqual(self.db.count_cases(), 40)
+        self.assertEqual(self.db.count_cases(valid_only=True), 26)
+
+    def test_bulk_update_replaces_events_and_skips_malformed(self):
+        self._quiet(self.db.insert_cases_many, [_case(1, events=3)])
+        updated = _case(1, events=1)
+        written = self._quiet(self.db.insert_cases_many, [_case(2), {"id": "broken"}, _case(1, events=5), updated])
+        self.assertEqual(written, 2)
+        self.assertEqual(len(self.db.get_case("case-0001")["life_events"]), 1)
+        self.assertIsNone(self.db.get_case("broken"))
+
+    def test_iter_validation_cases_pages(self):
+        cases = [_case(i, valid=i % 4 != 0, tier="ABC"[i % 3], events=i % 3) for i in range(103)]
+        self._quiet(self.db.insert_cases_many, cases)
+        expected = sorted(c["id"] for c in cases if c["valid_for_validation"])
+
+        streamed = list(self.db.iter_validation_cases(batch_size=10))
+        self.assertEqual([c["id"] for c in streamed], expected)
+        for case in streamed:
+            self.assertEqual(case, self.db.get_case(case["id"]))
+
+        tiers = [c["id"] for c in self.db.iter_validation_cases(batch_size=7, tiers=("A", "C"))]
+        self.assertEqual(tiers, [cid for cid in expected if int(cid[-4:]) % 3 != 1])
+        bare = next(self.db.iter_validation_cases(with_events=False))
+        self.assertEqual(bare["life_events"], [])
+
+    def test_indexes_used(self):
+        conn = sqlite3.connect(self.path)
+        self.addCleanup(conn.close)
+
+        def plan(sql, args=()):
+            return " ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, args))
+
+        self.assertIn("idx_life_events_case", plan("SELECT * FROM life_events WHERE case_id = ? ORDER BY year", ("x",)))
+        self.assertIn("idx_cases_validation",
+                      plan("SELECT * FROM cases WHERE valid_for_validation = 1 AND id > ? ORDER BY id LIMIT 5", ("",)))
+        self.assertIn("idx_cases_tier", plan("SELECT id FROM cases WHERE quality_tier = ?", ("A",)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import json
+import os
+import tempfile
+import unittest
+
+from unittest import mock
+
+from core.trinity.core.engines import celebrity_backtester
+from core.trinity.core.engines.celebrity_backtester import BacktestCellCache, CelebrityBacktester
+
+
+class _FakeFramework:
+    """Deterministic stand-in for arbitrate_bazi (module level so pool workers can build it)"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def arbitrate_bazi(self, chart, birth_info=None, current_context=None):
+        self.calls += 1
+        ctx = current_context
+        h = sum(ord(c) for c in "".join(chart) + ctx["annual_pillar"] + ctx["tier_override"])
+        h += int(ctx["damping_override"] * 100) + int(10 * ctx.get("geo_bias", {}).get("Fire", 0))
+        return {"physics": {"stress": {"SAI": (h % 50) / 10.0, "IC": h % 3},
+                            "wealth": {"Reynolds": float(h % 70)}}}
+
+
+CASES = [
+    {"case_id": "A", "name": "Alpha", "bazi": ["甲子", "丙寅", "戊辰", "庚午"], "birth_year": 1950, "tier": "Mars",
+     "life_events": [{"year": 1970, "type": "stress"}, {"year": 1985, "type": "wealth"}]},
+    {"case_id": "B", "name": "Beta", "bazi": ["乙丑", "丁卯", "己巳", "辛未"], "birth_year": 1962,
+     "geo_context": {"fire_bias": 1.3},
+     "life_events": [{"year": 1990, "type": "wealth"}, {"year": 2001, "type": "stress"}]},
+]
+
+
+class TestCelebrityBacktester(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cases_path = os.path.join(self.tmp.name, "cases.json")
+        self._write_cases(CASES)
+        self.cache_path = os.path.join(self.tmp.name, "backtest_cache.jsonl")
+
+    def _write_cases(self, cases):
+        with open(self.cases_path, "w", encoding="utf-8") as f:
+            json.dump(cases, f, ensure_ascii=False)
+
+    def _backtester(self, **kwargs):
+        return CelebrityBacktester(_FakeFramework(), cache=BacktestCellCache(self.cache_path), **kwargs)
+
+    @staticmethod
+    def _strip(results):
+        return [{k: v for k, v in r.items() if k != "timing"} for r in results]
+
+    def test_aggregate_matches_serial_backtests(self):
+        serial = CelebrityBacktester(_FakeFramework(), cache=BacktestCellCache(None))
+        expected = [serial.run_backtest(c, c["birth_year"], horizon=75, use_cache=False) for c in CASES]
+        report = self._backtester().aggregate_audit(self.cases_path)
+        self.assertEqual(self._strip(report["individual_results"]), self._strip(expected))
+        self.assertEqual(report["case_count"], 2)
+        self.assertEqual(len(report["individual_results"][0]["timeline"]), 75)
+        # 75 years cover 60 distinct annual pillars per case
+        self.assertEqual(report["timing"]["computed_cells"], 120)
+
+    def test_second_run_is_served_from_persisted_cache(self):
+        first = self._backtester().aggregate_audit(self.cases_path)
+        bt = self._backtester()
+        second = bt.aggregate_audit(self.cases_path)
+        self.assertEqual(bt.framework.calls, 0)
+        self.assertEqual(second["timing"]["cached_cells"], 120)
+        self.assertEqual(self._strip(second["individual_results"]), self._strip(first["individual_results"]))
+        self.assertEqual(second["individual_results"][1]["timing"]["cached_cells"], 60)
+
+    def test_only_affected_cells_recompute(self):
+        self._backtester().aggregate_audit(self.cases_path)
+        self._write_cases([dict(CASES[0], tier="Normal"), CASES[1]])
+        bt = self._backtester()
+        report = bt.aggregate_audit(self.cases_path)
+        self.assertEqual(bt.framework.calls, 60)
+        self.assertEqual(report["individual_results"][0]["timing"]["computed_cells"], 60)
+        self.assertEqual(report["individual_results"][1]["timing"]["computed_cells"], 0)
+
+        bt = self._backtester(context_overrides={"damping_override": 0.5})
+        bt.aggregate_audit(self.cases_path)
+        self.assertEqual(bt.framework.calls, 120)
+
+    def test_physics_changes_invalidate_cells(self):
+        self._backtester().aggregate_audit(self.cases_path)
+
+        framework = _FakeFramework()
+        framework.registry = mock.Mock(version="2.0.0")
+        bt = CelebrityBacktester(framework, cache=BacktestCellCache(self.cache_path))
+        bt.aggregate_audit(self.cases_path)
+        self.assertEqual(framework.calls, 120)
+
+        with mock.patch.object(celebrity_backtester, "physics_constants_digest", return_value="tuned"):
+            bt = self._backtester()
+            bt.aggregate_audit(self.cases_path)
+        self.assertEqual(bt.framework.calls, 120)
+
+    def test_shared_cells_are_timed_once(self):
+        twin = dict(CASES[0], case_id="A2", name="Alpha twin")
+        self._write_cases([CASES[0], twin, CASES[1]])
+        report = self._backtester().aggregate_audit(self.cases_path, use_cache=False)
+        per_case = [r["timing"] for r in report["individual_results"]]
+        self.assertEqual([t["computed_cells"] for t in per_case], [60, 0, 60])
+        self.assertEqual([t["cached_cells"] for t in per_case], [0, 60, 0])
+        self.assertEqual(sum(t["computed_cells"] for t in per_case), report["timing"]["computed_cells"])
+        self.assertEqual(per_case[1]["compute_s"], 0)
+
+    def test_process_pool_matches_serial(self):
+        serial = self._backtester().aggregate_audit(self.cases_path, use_cache=False)
+        with self.assertNoLogs("CelebrityBacktester", level="WARNING"):  # no serial fallback
+            pooled = self._backtester().aggregate_audit(self.cases_path, n_workers=2, use_cache=False)
+        self.assertEqual(self._strip(pooled["individual_results"]), self._strip(serial["individual_results"]))
+        self.assertFalse(os.path.exists(self.cache_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from learning.channel_scanner import ChannelScanner
+from learning.db import LearningDB
+
+CHANNEL = "https://www.youtube.com/@Test/videos"
+
+
+class _FakeChannel:
+    """Newest-first listing provider; records how far each scan paged"""
+
+    def __init__(self, n):
+        self.videos = []
+        self.pulled = []
+        self.uploaded = 0
+        self.upload(n)
+
+    def upload(self, n=1):
+        for i in range(self.uploaded, self.uploaded + n):
+            self.uploaded += 1
+            self.videos.append({"id": f"v{i:03d}", "title": f"Video {i}", "timestamp": 1000 + i})
+
+    def __call__(self, url):
+        self.pulled.append(0)
+        for entry in reversed(self.videos):
+            self.pulled[-1] += 1
+            yield dict(entry)
+
+
+class TestChannelScanner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db = LearningDB(os.path.join(self.tmp.name, "brain.db"))
+        self.db.add_channel("Test", CHANNEL)
+        self.channel = _FakeChannel(30)
+        self.scanner = ChannelScanner(db=self.db, list_videos=self.channel)
+
+    def _scan(self):
+        with redirect_stdout(StringIO()):
+            return self.scanner.scan_all()
+
+    def _queued_ids(self):
+        jobs = self.db.get_jobs_by_status(['pending'], limit=1000)
+        return sorted(json.loads(j['payload'])['url'].split('=')[-1] for j in jobs)
+
+    def test_rescans_only_fetch_new_uploads(self):
+        self.assertEqual(self._scan(), 30)
+        self.assertEqual(self.channel.pulled, [30])
+        self.assertEqual(self.db.get_channel_cursor(CHANNEL), ("v029", "1029"))
+
+        self.assertEqual(self._scan(), 0)
+        self.channel.upload(3)
+        self.assertEqual(self._scan(), 3)
+        # the second scan stopped at the cursor, the third one right after the 3 new uploads
+        self.assertEqual(self.channel.pulled, [30, 1, 4])
+        self.assertEqual(self._queued_ids(), [f"v{i:03d}" for i in range(33)])
+        self.assertIsNotNone(self.db.get_all_channels()[0]['last_scanned'])
+
+    def test_deleted_cursor_video_falls_back_to_timestamp(self):
+        self._scan()
+        self.channel.videos.pop()  # the cursor video disappears
+        self.channel.upload(2)
+        self.assertEqual(self._scan(), 2)
+        self.assertEqual(self.channel.pulled[-1], 3)
+
+    def test_known_videos_are_not_queued_twice(self):
+        self.db.mark_videos_processed(["v005", "v006"])
+        self.db.mark_videos_queued([("v007", "from a playlist")])
+        self.assertEqual(self._scan(), 27)
+        self.assertNotIn("v005", self._queued_ids())
+        self.assertTrue(self.db.is_video_processed("v005"))
+        self.assertFalse(self.db.is_video_processed("v010"))
+
+        # losing the cursor re-lists the channel but queues nothing new
+        self.db.update_channel_cursor(CHANNEL, None)
+        self.assertEqual(self._scan(), 0)
+        self.assertEqual(len(self._queued_ids()), 27)
+
+        self.db.mark_videos_processed(["v010"], channel_url=CHANNEL)
+        self.assertEqual(self.db.get_video_statuses(["v010", "v011", "nope"]),
+                         {"v010": "processed", "v011": "queued"})
+        self.assertEqual(self.db.get_processed_video_ids(), {"v005", "v006", "v010"})
+
+    def test_failed_jobs_are_requeued_after_threshold(self):
+        self._scan()
+        jobs = {json.loads(j['payload'])['url'].split('=')[-1]: j['id']
+                for j in self.db.get_jobs_by_status(['pending'], limit=1000)}
+        self.db.update_job_status(jobs["v003"], "failed")
+        self.db.update_job_status(jobs["v004"], "deleted")
+        self.db.update_job_status(jobs["v005"], "running")
+        self.db.update_job_status(jobs["v006"], "finished")
+        self.db.mark_videos_processed(["v006"])
+
+        self.assertEqual(self._scan(), 0)  # default threshold: too recent to re-offer
+
+        self.scanner.requeue_after = 0
+        self.assertEqual(self._scan(), 2)
+        self.assertEqual(self.channel.pulled[-1], 1)  # the cursor still bounds the listing
+        self.assertEqual(self._queued_ids().count("v003"), 1)
+        self.assertIn("v004", self._queued_ids())
+        self.assertEqual(self._scan(), 0)  # the new jobs are live again
+
+        # partially mined: processed, but offered again to retry the failed segments
+        self.db.mark_video_partial("v006", [3, 1])
+        self.assertEqual(self.db.get_video_statuses(["v006"]), {"v006": "processed"})
+        self.assertEqual(self.db.get_pending_segments("v006"), [1, 3])
+        self.assertEqual(self._scan(), 1)
+        self.db.mark_videos_processed(["v006"])
+        self.assertIsNone(self.db.get_pending_segments("v006"))
+
+    def test_listing_errors_keep_the_cursor(self):
+        def broken(url):
+            yield {"id": "x", "title": "", "timestamp": None}
+            raise RuntimeError("HTTP 429")
+
+        scanner = ChannelScanner(db=self.db, list_videos=broken)
+        with redirect_stdout(StringIO()):
+            self.assertEqual(scanner.scan_all(), 0)
+        self.assertEqual(self.db.get_channel_cursor(CHANNEL), (None, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
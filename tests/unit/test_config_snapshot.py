@@ -0,0 +1,108 @@
+import gc
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from core.config_snapshot import ConfigSnapshotService, thaw
+from core.unified_engine import UnifiedEngine
+
+
+class TestConfigSnapshotService(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.tuning = os.path.join(self.tmpdir, "tuning_params.json")
+        self.era = os.path.join(self.tmpdir, "era_constants.json")
+        self._write(self.tuning, {"ollama_host": "http://a", "physics": {"stem_score": 10}})
+        self.service = ConfigSnapshotService(
+            sources={"tuning": self.tuning, "era_constants": self.era},
+            check_interval=0.0,
+            defaults={"era_constants": {"physics_multipliers": {}}},
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, path, data):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    def test_snapshot_is_read_only(self):
+        snap = self.service.current()
+        self.assertEqual(snap.get("ollama_host"), "http://a")
+        with self.assertRaises(TypeError):
+            snap.get("physics")["stem_score"] = 1
+        with self.assertRaises(AttributeError):
+            snap.version = 99
+
+        copy = snap.to_dict()
+        copy["physics"]["stem_score"] = 1
+        self.assertEqual(self.service.current().get("physics")["stem_score"], 10)
+
+    def test_missing_source_uses_default(self):
+        snap = self.service.current()
+        self.assertEqual(thaw(snap.source("era_constants")), {"physics_multipliers": {}})
+
+    def test_file_change_publishes_new_version(self):
+        first = self.service.current()
+        self.assertIs(self.service.current(), first)
+
+        self._write(self.tuning, {"ollama_host": "http://b", "max_concurrent_jobs": 3})
+        second = self.service.current()
+        self.assertGreater(second.version, first.version)
+        self.assertEqual(second.get("max_concurrent_jobs"), 3)
+        # 旧快照保持不变
+        self.assertEqual(first.get("ollama_host"), "http://a")
+
+    def test_check_interval_limits_stat_calls(self):
+        service = ConfigSnapshotService(sources={"tuning": self.tuning}, check_interval=3600)
+        before = service.current()
+        self._write(self.tuning, {"ollama_host": "http://c"})
+        self.assertIs(service.current(), before)
+        service.invalidate()
+        self.assertEqual(service.current().get("ollama_host"), "http://c")
+
+    def test_subscribers_receive_new_snapshot(self):
+        received = []
+        unsubscribe = self.service.subscribe(received.append)
+        self._write(self.era, {"physics_multipliers": {"fire": 1.2}})
+        self.service.current()
+        self.assertEqual(len(received), 1)
+        self.assertEqual(received[0].source("era_constants")["physics_multipliers"]["fire"], 1.2)
+
+        unsubscribe()
+        self._write(self.era, {"physics_multipliers": {"fire": 1.3}})
+        self.service.current()
+        self.assertEqual(len(received), 1)
+
+    def test_unified_engine_caches_era_multipliers_until_new_snapshot(self):
+        self._write(self.era, {"physics_multipliers": {"fire": 1.2}})
+        with mock.patch("core.unified_engine.get_config_service", return_value=self.service):
+            engine = UnifiedEngine()
+            self.assertEqual(engine.era_multipliers(), {"fire": 1.2})
+            cached = engine._era_multipliers
+            engine.era_multipliers()["fire"] = 9.9  # callers get a copy
+            self.assertIs(engine._era_multipliers, cached)
+            self.assertEqual(engine.era_multipliers(), {"fire": 1.2})
+
+            self._write(self.era, {"physics_multipliers": {"fire": 1.5}})
+            self.service.current()  # publishes: the subscription drops the cache
+            self.assertIsNone(engine._era_multipliers)
+            self.assertEqual(engine.era_multipliers(), {"fire": 1.5})
+
+        self.assertEqual(len(self.service._subscribers), 1)
+        del engine
+        gc.collect()
+        self.assertEqual(len(self.service._subscribers), 0)
+
+    def test_invalid_json_keeps_previous_content(self):
+        with open(self.tuning, "w", encoding="utf-8") as f:
+            f.write("{broken")
+        self.assertEqual(self.service.current().get("ollama_host"), "http://a")
+
+
+if __name__ == '__main__':
+    unittest.main()
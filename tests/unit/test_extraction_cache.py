@@ -0,0 +1,163 @@
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from service import extractor as extractor_module
+from service.extraction_cache import ExtractionCache
+from service.extractor import EXTRACTOR_VERSION, CaseExtractor
+
+CHARS = "甲乙丙丁戊己庚辛壬癸子丑寅卯辰巳午未申酉戌亥男命女命出生年月日时大运流年伤官见官财印"
+
+
+def _article(seed, n=1200):
+    rng = random.Random(seed)
+    return "".join(rng.choice(CHARS) for _ in range(n))
+
+
+def _repost(text):
+    """Same article re-laid out with a couple of edited characters"""
+    text = text[:100] + "乙" + text[101:700] + "丙" + text[701:]
+    return "\n  ".join(text[i:i + 60] for i in range(0, len(text), 60))
+
+
+class _FakeOllama:
+    """Counts LLM calls; answers with a fixed case (or garbage)"""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.calls = 0
+        outer = self
+
+        class Client:
+            def __init__(self, host=None, timeout=None):
+                pass
+
+            def chat(self, model, messages):
+                outer.calls += 1
+                return {"message": {"content": outer.answer}}
+
+        self.Client = Client
+
+
+def _flush_lookups(path, seed):
+    """Miner process: 200 lookups, flushing after each (maximal merge contention)"""
+    cache = ExtractionCache(path)
+    for i in range(200):
+        cache.lookup("extract", f"{seed}-{i}", "v1", "m")
+        cache.flush()
+
+
+class TestExtractionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "extraction_cache.jsonl")
+        self.cache = ExtractionCache(self.path)
+
+    def test_exact_namespaced_and_persistent(self):
+        text = "男命，1985年10月5日早上6点生于上海。2012年结婚。"
+        self.assertIsNone(self.cache.lookup("extract", text, "v1", "qwen"))
+        self.cache.store("extract", text, "v1", "qwen", {"profile": {"birth_year": 1985}}, source_url="u1")
+
+        hit = ExtractionCache(self.path).lookup("extract", " " + text.replace("，", "， \n"), "v1", "qwen")
+        self.assertEqual((hit.kind, hit.result, hit.source_url), ("exact", {"profile": {"birth_year": 1985}}, "u1"))
+        self.assertIsNone(self.cache.lookup("extract", text, "v2", "qwen"))
+        self.assertIsNone(self.cache.lookup("extract", text, "v1", "llama"))
+        self.assertIsNone(self.cache.lookup("classify", text, "v1", "qwen"))
+
+    def test_negative_results_are_hits(self):
+        self.cache.store("classify", "广告广告", "h1", "heuristic", None)
+        hit = self.cache.lookup("classify", "广告广告", "h1", "heuristic")
+        self.assertIsNotNone(hit)
+        self.assertIsNone(hit.result)
+
+    def test_near_duplicates(self):
+        article = _article(1)
+        self.cache.store("classify", article, "v1", "qwen", "CASE")
+        hit = self.cache.lookup("classify", _repost(article), "v1", "qwen")
+        self.assertEqual((hit.kind, hit.result), ("near", "CASE"))
+        self.assertLessEqual(hit.distance, 3)
+        self.assertIsNone(self.cache.lookup("classify", _article(2), "v1", "qwen"))
+        # near matching is restricted to the same namespace and to long texts
+        self.assertIsNone(self.cache.lookup("classify", _repost(article), "v1", "llama"))
+        self.cache.store("classify", article[:50], "v1", "qwen", "RULE")
+        self.assertIsNone(self.cache.lookup("classify", article[:49] + "乙", "v1", "qwen"))
+
+    def test_extractions_are_not_shared_between_near_duplicates(self):
+        body = _article(5, n=380)
+        first = f"男命，1985年10月5日生，乙丑 丙戌 甲子 丁卯。{body}"
+        second = f"男命，1986年10月5日生，丙寅 戊戌 甲子 丁卯。{body}"
+        self.cache.store("extract", first, "v1", "qwen", {"profile": {"birth_year": 1985}})
+        self.assertIsNone(self.cache.lookup("extract", second, "v1", "qwen"))
+        # a near-duplicate of a text the LLM could not use is still skipped
+        self.cache.store("extract", _article(6), "v1", "qwen", None)
+        hit = self.cache.lookup("extract", _repost(_article(6)), "v1", "qwen")
+        self.assertEqual((hit.kind, hit.result), ("near", None))
+
+    def test_stats_are_aggregated_and_merged(self):
+        self.cache.store("extract", "a" * 10, "v1", "m", {})
+        self.cache.lookup("extract", "a" * 10, "v1", "m")
+        other = ExtractionCache(self.path)
+        other.lookup("extract", "b" * 10, "v1", "m")
+        # counters stay in memory until a flush
+        self.assertFalse(os.path.exists(self.cache.stats_path))
+        self.assertEqual(self.cache.stats()["extract"]["exact"], 1)
+        self.cache.flush()
+        other.flush()
+        stats = ExtractionCache(self.path).stats()
+        self.assertEqual(stats["extract"], {"exact": 1, "near": 0, "miss": 1, "hit_rate": 0.5})
+        self.assertEqual(self.cache.stats(persisted=False)["extract"]["miss"], 0)
+        with open(self.cache.stats_path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"extract": {"exact": 1, "near": 0, "miss": 1}})
+
+    def test_concurrent_processes_merge_without_losing_counts(self):
+        ctx = multiprocessing.get_context("fork")
+        workers = [ctx.Process(target=_flush_lookups, args=(self.path, n)) for n in range(4)]
+        for p in workers:
+            p.start()
+        for p in workers:
+            p.join()
+            self.assertEqual(p.exitcode, 0)
+        self.assertEqual(ExtractionCache(self.path).stats()["extract"]["miss"], 4 * 200)
+
+    def test_buffered_entries_are_batched(self):
+        for i in range(10):
+            self.cache.store("classify", f"text {i}", "h1", "heuristic", "NOISE", buffered=True)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(self.cache.lookup("classify", "text 3", "h1", "heuristic").result, "NOISE")
+        self.cache.flush()
+        self.assertEqual(len(ExtractionCache(self.path)), 10)
+
+    def test_extractor_skips_llm_for_reposts(self):
+        case = {"profile": {"name": "张三", "birth_year": 1985}, "life_events": []}
+        fake = _FakeOllama(json.dumps(case, ensure_ascii=False))
+        article = "男命 1985年生 " + _article(3)
+        with mock.patch.object(extractor_module, "ollama", fake), \
+                mock.patch.object(extractor_module, "get_extraction_cache", return_value=self.cache):
+            ext = CaseExtractor()
+            first = ext.extract(article, model="qwen", source_url="thread-1")
+            first["id"] = "mutated by caller"
+            self.assertEqual(ext.extract(article, model="qwen"), case)
+            self.assertEqual(fake.calls, 1)
+            # reposts are near-duplicates, but a positive extraction is only reused verbatim
+            ext.extract(_repost(article), model="qwen")
+            self.assertEqual(fake.calls, 2)
+            ext.extract(article, model="qwen", use_cache=False)
+            self.assertEqual(fake.calls, 3)
+
+            garbage = _FakeOllama("not json")
+            with mock.patch.object(extractor_module, "ollama", garbage):
+                other = _article(4)
+                ext.extract(other, model="qwen")
+                ext.extract(other, model="qwen")
+                self.assertEqual(garbage.calls, 1)
+        self.assertEqual(EXTRACTOR_VERSION[:5], "case-")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import random
+import sqlite3
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+import numpy as np
+
+from core.feature_store import FeatureStore
+from core.vectorizer import Vectorizer
+from learning.db import LearningDB
+
+STEMS = ["甲", "乙", "丙", "丁", "戊", "己", "庚", "辛", "壬", "癸"]
+BRANCHES = ["子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥"]
+
+
+def _chart(rng):
+    return {p: {"stem": rng.choice(STEMS), "branch": rng.choice(BRANCHES)}
+            for p in ("year", "month", "day", "hour")}
+
+
+class TestFeatureStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db = LearningDB(os.path.join(self.tmp.name, "brain.db"))
+        self.rng = random.Random(7)
+        with redirect_stdout(StringIO()):
+            for i in range(40):
+                truth = {"wealth": i % 100, "career": str(50 + i)}
+                if i % 5 == 0:
+                    truth["wealth"] = None
+                if i % 7 == 0:
+                    truth["career"] = "unknown"
+                self.db.add_case(f"case{i}", _chart(self.rng), truth)
+            self.db.add_case("no chart", {}, {"wealth": 10})
+            self.db.add_case("no truth", _chart(self.rng), {})
+
+    def _vectorizer(self):
+        return Vectorizer(use_db_weights=False, db=self.db)
+
+    def _assert_matches_full_path(self, vec, aspect):
+        X, y = vec.load_dataset(aspect)
+        X_ref, y_ref = vec.load_dataset(aspect, use_cache=False)
+        self.assertEqual(X.shape, X_ref.shape)
+        np.testing.assert_array_equal(X, X_ref)
+        np.testing.assert_array_equal(y, y_ref)
+
+    def test_matches_uncached_dataset(self):
+        vec = self._vectorizer()
+        for aspect in ("wealth", "career", "health"):
+            self._assert_matches_full_path(vec, aspect)
+        X, y = vec.load_dataset("wealth")
+        self.assertEqual(X.shape, (32, 93))
+
+    def test_only_new_or_changed_cases_are_vectorized(self):
+        vec = self._vectorizer()
+        self.assertEqual(vec.feature_store.sync(), 42)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, "brain_features.npz")))
+
+        # A fresh vectorizer (next training run) reuses the persisted rows
+        vec = self._vectorizer()
+        with mock.patch.object(vec, "vectorize_chart", wraps=vec.vectorize_chart) as spy:
+            with redirect_stdout(StringIO()):
+                self.db.add_case("new", _chart(self.rng), {"wealth": 99, "marriage": 3})
+            conn = sqlite3.connect(self.db.db_path)
+            conn.execute("UPDATE cases SET ground_truth = ? WHERE name = 'case3'", ('{"wealth": 1}',))
+            conn.execute("DELETE FROM cases WHERE name = 'case4'")
+            conn.commit()
+            conn.close()
+            self._assert_matches_full_path(vec, "wealth")
+            self.assertEqual(vec.feature_store.sync(), 0)
+            # store: the new and the edited case; reference path: every charted case
+            self.assertEqual(spy.call_count, 2 + 41)
+        self._assert_matches_full_path(vec, "marriage")
+
+    def test_dataset_can_reuse_the_last_sync(self):
+        vec = self._vectorizer()
+        store = vec.feature_store
+        with mock.patch.object(self.db, "get_case_rows", wraps=self.db.get_case_rows) as spy:
+            self.assertEqual(store.sync(), 42)
+            X, y = store.dataset("wealth", sync=False)
+            self.assertEqual(spy.call_count, 1)
+        X_ref, y_ref = vec.load_dataset("wealth", use_cache=False)
+        np.testing.assert_array_equal(X, X_ref)
+        np.testing.assert_array_equal(y, y_ref)
+
+    def test_weight_change_invalidates_rows(self):
+        vec = self._vectorizer()
+        vec.feature_store.sync()
+        vec.update_weights({"W_E": {"month_command": 6.0}})
+        self.assertEqual(vec.feature_store.sync(), 42)
+        self._assert_matches_full_path(vec, "wealth")
+
+        store = FeatureStore(self._vectorizer())
+        self.assertFalse(store.load())  # persisted rows were built with other weights
+
+    def test_one_hot_handles_unknown_values(self):
+        vec = self._vectorizer()
+        raw = vec._encode_raw_one_hot({"year": {"stem": "乙", "branch": "亥"}, "month": "bad",
+                                       "day": {"stem": ["x"], "branch": "?"}})
+        self.assertEqual(raw.shape, (88,))
+        self.assertEqual(np.flatnonzero(raw).tolist(), [1, 21])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,190 @@
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from learning.fetcher import Fetcher, FetchStore, TokenBucket
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the mined sites; per-server request log in server.hits"""
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits.append((self.path, time.monotonic(), dict(self.headers)))
+            count = sum(1 for p, _, _ in server.hits if p == self.path)
+        if self.path == "/etag":
+            if self.headers.get("If-None-Match") == '"v1"':
+                return self._send(304)
+            return self._send(200, "案例 v1".encode("gbk"), {"ETag": '"v1"', "Content-Type": "text/html; charset=gbk"})
+        if self.path == "/modified":
+            if self.headers.get("If-Modified-Since") == "Mon, 01 Jan 2024 00:00:00 GMT":
+                return self._send(304)
+            return self._send(200, b"dated page", {"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+        if self.path == "/flaky":
+            if count <= 2:
+                return self._send(503, headers={"Retry-After": "0"})
+            return self._send(200, b"recovered")
+        if self.path == "/down":
+            return self._send(503)
+        if self.path.startswith("/mirror"):
+            return self._send(200, b"same article body")
+        if self.path.startswith("/page"):
+            return self._send(200, f"page {self.path}".encode())
+        self._send(404)
+
+    do_POST = do_GET
+
+
+class _StubServer:
+    def __init__(self):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self.httpd.hits = []
+        self.httpd.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def base(self):
+        return f"http://127.0.0.1:{self.httpd.server_port}"
+
+    @property
+    def hits(self):
+        return self.httpd.hits
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_spacing_and_burst(self):
+        now = [0.0]
+        waits = []
+
+        def sleep(dt):
+            waits.append(dt)
+            now[0] += dt
+
+        bucket = TokenBucket(rate=2.0, burst=2, clock=lambda: now[0], sleep=sleep)
+        self.assertEqual([bucket.acquire() for _ in range(4)], [0.0, 0.0, 0.5, 0.5])
+        now[0] += 10
+        self.assertEqual(bucket.acquire(), 0.0)  # refilled, capped at burst
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(bucket.acquire(), 0.5)
+
+
+class TestFetcher(unittest.TestCase):
+
+    def setUp(self):
+        self.server = _StubServer()
+        self.addCleanup(self.server.close)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _fetcher(self, **kwargs):
+        kwargs.setdefault("rate_per_host", 1000.0)
+        kwargs.setdefault("backoff", 0.01)
+        return Fetcher(store=FetchStore(self.tmp.name), **kwargs)
+
+    def test_conditional_get_survives_restart(self):
+        first = self._fetcher().fetch(self.server.base + "/etag")
+        self.assertEqual(first.status, 200)
+        self.assertEqual(first.text, "案例 v1")
+
+        again = self._fetcher().fetch(self.server.base + "/etag")  # fresh store instance, same directory
+        self.assertTrue(again.not_modified)
+        self.assertTrue(again.ok)
+        self.assertEqual(again.text, "案例 v1")
+        self.assertEqual(self.server.hits[-1][2].get("If-None-Match"), '"v1"')
+
+        dated = self._fetcher()
+        dated.fetch(self.server.base + "/modified")
+        self.assertTrue(dated.fetch(self.server.base + "/modified").not_modified)
+        self.assertFalse(dated.fetch(self.server.base + "/modified", conditional=False).not_modified)
+
+    def test_retry_with_backoff(self):
+        fetcher = self._fetcher(retries=3)
+        result = fetcher.fetch(self.server.base + "/flaky")
+        self.assertEqual((result.status, result.attempts, result.text), (200, 3, "recovered"))
+
+        failed = fetcher.fetch(self.server.base + "/down")
+        self.assertEqual((failed.status, failed.attempts, failed.ok), (503, 4, False))
+        with self.assertRaises(Exception):
+            failed.raise_for_status()
+
+        posted = fetcher.fetch(self.server.base + "/down", method="POST", data={"q": "x"})
+        self.assertEqual((posted.status, posted.attempts), (503, 1))  # not idempotent: never resent
+
+        unreachable = fetcher.fetch("http://127.0.0.1:9/nothing")
+        self.assertEqual(unreachable.status, 0)
+        self.assertIsNotNone(unreachable.error)
+
+    def test_content_hash_dedup(self):
+        fetcher = self._fetcher()
+        a, b = fetcher.fetch_many([self.server.base + "/mirror/a", self.server.base + "/mirror/b"])
+        self.assertEqual(a.content_hash, b.content_hash)
+        self.assertEqual(sorted([a.duplicate, b.duplicate]), [False, True])
+        self.assertFalse(fetcher.fetch(self.server.base + "/page/1").duplicate)
+        self.assertEqual(len(fetcher.store), 3)
+
+    def test_search_pages_are_not_persisted(self):
+        fetcher = self._fetcher()
+        for _ in range(2):
+            result = fetcher.fetch(self.server.base + "/page/search", params={"q": "八字"}, persist=False)
+            self.assertEqual((result.status, result.not_modified, result.duplicate), (200, False, False))
+            self.assertIsNotNone(result.content_hash)
+        self.assertEqual(len(fetcher.store), 0)
+        self.assertEqual(len(self.server.hits), 2)  # no conditional GET either
+
+    def test_processed_marks_survive_restart(self):
+        fetcher = self._fetcher()
+        a, b = fetcher.fetch_many([self.server.base + "/mirror/a", self.server.base + "/mirror/b"])
+        # fetched (even twice) is not processed: a failed processing run leaves it pending
+        self.assertFalse(fetcher.store.is_processed(a.content_hash))
+        fetcher.store.mark_processed(a.url, a.content_hash)
+        self.assertTrue(fetcher.store.is_processed(b.content_hash))
+
+        restarted = self._fetcher()
+        self.assertTrue(restarted.store.is_processed(a.content_hash))
+        page = restarted.fetch(self.server.base + "/page/1")
+        self.assertFalse(restarted.store.is_processed(page.content_hash))
+        self.assertFalse(restarted.store.is_processed(None))
+
+    def test_per_host_rate_limit_scales_with_hosts(self):
+        other = _StubServer()
+        self.addCleanup(other.close)
+        fetcher = self._fetcher(rate_per_host=10.0, max_workers=8)
+        urls = [f"{server.base}/page/{i}" for i in range(4) for server in (self.server, other)]
+
+        start = time.monotonic()
+        results = fetcher.fetch_many(urls)
+        elapsed = time.monotonic() - start
+
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual([r.text for r in results], [f"page /page/{i}" for i in range(4) for _ in range(2)])
+        for server in (self.server, other):
+            times = sorted(t for _, t, _ in server.hits)
+            self.assertEqual(len(times), 4)
+            # 10 req/s per host, burst 1: consecutive requests to one host >= ~0.1 s apart
+            self.assertGreaterEqual(min(b - a for a, b in zip(times, times[1:])), 0.08)
+        # two hosts in parallel: ~0.3 s rather than the ~0.7 s a single host queue would take
+        self.assertLess(elapsed, 0.6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import math
+import random
+import unittest
+import warnings
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    from core.flux import FluxEngine
+
+from core.flux_array import FLAG, FluxArrayEngine, calculate_flux_many, status_names
+
+STEMS = "甲乙丙丁戊己庚辛壬癸"
+BRANCHES = "子丑寅卯辰巳午未申酉戌亥"
+PILLARS = ("year", "month", "day", "hour")
+
+
+def _corpus(n, seed):
+    """Fixed chart corpus: natal charts plus optional Da Yun / Liu Nian and damaged structures"""
+    rng = random.Random(seed)
+    charts, envs, maps = [], [], []
+    for _ in range(n):
+        charts.append({p: {"stem": rng.choice(STEMS), "branch": rng.choice(BRANCHES)} for p in PILLARS})
+        env = {}
+        if rng.random() < 0.6:
+            env.update(dy_stem=rng.choice(STEMS), dy_branch=rng.choice(BRANCHES))
+        if rng.random() < 0.6:
+            env.update(ln_stem=rng.choice(STEMS), ln_branch=rng.choice(BRANCHES))
+        envs.append(env or None)
+        maps.append({"month_branch": 60.0, "day_branch": 30.0} if rng.random() < 0.25 else None)
+    # Complete SanHe frames (with duplicates) and six clashes on every pillar
+    charts.append({p: {"stem": s, "branch": b} for p, s, b in zip(PILLARS, "甲壬庚丙", "申子辰子")})
+    envs.append({"dy_stem": "癸", "dy_branch": "午", "ln_stem": "丙", "ln_branch": "午"})
+    maps.append(None)
+    charts.append({p: {"stem": s, "branch": b} for p, s, b in zip(PILLARS, "甲乙丙丁", "子午卯酉")})
+    envs.append({"ln_stem": "庚", "ln_branch": "子"})
+    maps.append({"year_branch": 50.0})
+    return charts, envs, maps
+
+
+def _reference(chart, env, state_map=None, disabled_rules=None, params=None):
+    engine = FluxEngine(chart)
+    if params:
+        engine.set_hyperparameters(params)
+    return engine.calculate_flux(**(env or {}), state_map=state_map, disabled_rules=disabled_rules)
+
+
+class TestFluxArrayParity(unittest.TestCase):
+
+    def assertSameResult(self, got, expected):
+        self.assertEqual(set(got), set(expected))
+        self.assertEqual(got['log'], expected['log'])
+        self.assertEqual(set(got['detected_rules']), set(expected['detected_rules']))
+        self.assertEqual(got['final_state_map'], expected['final_state_map'])
+        for key in ('spectrum',):
+            for e, v in expected[key].items():
+                self.assertTrue(math.isclose(got[key][e], v, rel_tol=1e-12, abs_tol=1e-9), (key, e))
+        self.assertEqual(list(got['trace']), list(expected['trace']))
+        self.assertEqual(got['trace']['interactions'], expected['trace']['interactions'])
+        for e, v in expected['trace']['l1_spectrum'].items():
+            self.assertTrue(math.isclose(got['trace']['l1_spectrum'][e], v, rel_tol=1e-12, abs_tol=1e-9))
+        self.assertEqual(len(got['particle_states']), len(expected['particle_states']))
+        for p, q in zip(got['particle_states'], expected['particle_states']):
+            self.assertEqual((p['id'], p['char'], p['type'], p['health']), (q['id'], q['char'], q['type'], q['health']))
+            self.assertTrue(math.isclose(p['amp'], q['amp'], rel_tol=1e-12, abs_tol=1e-9), p['id'])
+            # status comes back from bitflags: canonical order, no duplicates
+            self.assertEqual(set(p['status']), set(q['status']))
+        for key, value in expected.items():
+            if isinstance(value, dict) and 'score' in value:
+                self.assertEqual(got[key]['score'], value['score'], key)
+
+    def setUp(self):
+        self.charts, self.envs, self.maps = _corpus(250, seed=32)
+
+    def test_batch_matches_object_engine(self):
+        results = calculate_flux_many(self.charts, self.envs, self.maps)
+        for chart, env, state_map, got in zip(self.charts, self.envs, self.maps, results):
+            self.assertSameResult(got, _reference(chart, env, state_map))
+
+    def test_disabled_rules_and_positional_weights(self):
+        rng = random.Random(7)
+        detected = sorted({r for res in calculate_flux_many(self.charts, self.envs) for r in res['detected_rules']})
+        disabled = set(rng.sample(detected, len(detected) // 2))
+        params = {'positional_weights': {"month_branch": 3.0, "hour_branch": 2.0, "day_branch": 1.0, "year_branch": 1.2,
+                                         "month_stem": 2.0, "hour_stem": 1.5, "day_stem": 1.0, "year_stem": 0.8}}
+        results = calculate_flux_many(self.charts, self.envs, self.maps, disabled_rules=disabled, params=params)
+        for chart, env, state_map, got in zip(self.charts, self.envs, self.maps, results):
+            self.assertSameResult(got, _reference(chart, env, state_map, disabled, params))
+
+    def test_single_chart_engine_interface(self):
+        chart, env = self.charts[-2], self.envs[-2]
+        engine = FluxArrayEngine(chart)
+        first = engine.calculate_flux(**env)
+        self.assertSameResult(first, _reference(chart, env))
+        self.assertEqual(engine.detected_rules, set(first['detected_rules']))
+        # log accumulates on the instance, like FluxEngine
+        n_first = len(first['log'])
+        second = engine.calculate_flux(**env)
+        self.assertEqual(len(second['log']), 2 * n_first)
+        self.assertIs(second['log'], engine.log)
+
+    def test_hyperparameters_keep_environment(self):
+        chart = self.charts[-2]
+        params = {'positional_weights': {"month_branch": 3.0, "hour_branch": 2.0, "day_branch": 1.0, "year_branch": 1.2}}
+        luck, annual = {'stem': '癸', 'branch': '午'}, {'stem': '丙', 'branch': '午'}
+
+        late = FluxEngine(chart)
+        late._build_particles({"month_branch": 60.0})
+        late.set_environment(luck, annual)
+        late.set_hyperparameters(params)
+        early = FluxEngine(chart)
+        early._build_particles({"month_branch": 60.0})
+        early.set_hyperparameters(params)
+        early.set_environment(luck, annual)
+
+        ids = [p.id for p in late.particles]
+        self.assertEqual(ids, [p.id for p in early.particles])
+        self.assertEqual(ids[-4:], ["dy_stem", "dy_branch", "ln_stem", "ln_branch"])
+        self.assertEqual({p.id: p.health for p in late.particles}["month_branch"], 60.0)
+        self.assertEqual({p.id: p.wave.amplitude for p in late.particles}["month_branch"], 30.0)
+        self.assertSameResult(late.compute_energy_state(), early.compute_energy_state())
+
+    def test_status_flags_round_trip(self):
+        flags = FLAG["Rooted"] | FLAG["LaserBeam"] | FLAG["PhaseLock_Water"]
+        self.assertEqual(status_names(flags), ["PhaseLock_Water", "Rooted", "LaserBeam"])
+        self.assertEqual(calculate_flux_many([]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
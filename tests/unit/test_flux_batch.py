@@ -0,0 +1,57 @@
+import random
+import unittest
+
+import numpy as np
+
+from learning.flux_batch import FluxBatchModel, vector_to_weights, weights_to_vector
+from learning.optimizer import WeightOptimizer
+
+STEMS = "甲乙丙丁戊己庚辛壬癸"
+BRANCHES = "子丑寅卯辰巳午未申酉戌亥"
+
+
+def _random_cases(n, seed):
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(n):
+        chart = {p: {"stem": rng.choice(STEMS), "branch": rng.choice(BRANCHES)}
+                 for p in ("year", "month", "day", "hour")}
+        cases.append({"chart": chart, "label": float(rng.random() < 0.5)})
+    return cases
+
+
+class TestFluxBatchModel(unittest.TestCase):
+
+    def setUp(self):
+        self.cases = _random_cases(120, seed=30)
+        self.charts = [c["chart"] for c in self.cases]
+        self.labels = np.array([c["label"] for c in self.cases])
+        self.model = FluxBatchModel(self.charts)
+        self.reference = WeightOptimizer(self.cases, backend="engine")
+
+    def test_strength_matches_flux_engine(self):
+        rng = np.random.default_rng(30)
+        W = np.vstack([weights_to_vector(self.reference.weights), rng.uniform(0.2, 6.0, size=(3, 8))])
+        batched = self.model.strength(W)
+        for k, w in enumerate(W):
+            expected = [self.reference._predict_strength(c, vector_to_weights(w)) for c in self.charts]
+            np.testing.assert_allclose(batched[k], expected, atol=1e-12)
+
+    def test_analytic_gradient_matches_central_differences(self):
+        w = weights_to_vector(self.reference.weights)
+        loss, grad = self.model.loss_and_grad(w, self.labels)
+        loss_c, grad_c = self.model.central_grad(w, self.labels, epsilon=1e-5)
+        self.assertAlmostEqual(loss, loss_c, places=12)
+        np.testing.assert_allclose(grad, grad_c, atol=1e-8)
+
+    def test_optimizer_reduces_loss_and_keeps_weights_positive(self):
+        optimizer = WeightOptimizer(self.cases)
+        optimizer.learning_rate = 50.0
+        weights = optimizer.optimize(epochs=20)
+        self.assertLess(optimizer.history[-1], optimizer.history[0])
+        self.assertTrue(all(v >= optimizer.min_weight for v in weights.values()))
+        self.assertEqual(set(weights), set(optimizer.weights))
+
+
+if __name__ == '__main__':
+    unittest.main()
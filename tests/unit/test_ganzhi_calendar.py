@@ -0,0 +1,110 @@
+import random
+import unittest
+from datetime import date, datetime, timedelta
+
+from lunar_python import Solar
+
+from core.bazi_reverse_calculator import BaziReverseCalculator
+from core.ganzhi_calendar import (
+    get_ganzhi_calendar, ganzhi_index, ganzhi_name, hour_for_pillar
+)
+
+
+class TestGanzhiCalendar(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.calendar = get_ganzhi_calendar()
+
+    def test_ganzhi_index_roundtrip(self):
+        for idx in range(60):
+            self.assertEqual(ganzhi_index(ganzhi_name(idx)), idx)
+        self.assertEqual(ganzhi_index("甲子"), 0)
+        self.assertIsNone(ganzhi_index("甲丑"))
+        self.assertIsNone(ganzhi_index(""))
+
+    def test_daily_pillars_match_lunar_exact(self):
+        rng = random.Random(26)
+        span = (self.calendar.last_day - self.calendar.first_day).days
+        for _ in range(300):
+            d = self.calendar.first_day + timedelta(days=rng.randrange(span))
+            lunar = Solar.fromYmd(d.year, d.month, d.day).getLunar()
+            expected = (
+                ganzhi_index(lunar.getYearInGanZhiExact()),
+                ganzhi_index(lunar.getMonthInGanZhiExact()),
+                ganzhi_index(lunar.getDayInGanZhiExact()),
+            )
+            self.assertEqual(self.calendar.pillars_on(d), expected, d)
+
+    def test_term_boundaries_match_lunar_exact(self):
+        # 每隔若干节抽查交接时刻及其前一秒
+        for i in range(12, len(self.calendar.term_ts) - 12, 97):
+            moment = datetime(1900, 1, 1) + timedelta(seconds=int(self.calendar.term_ts[i]))
+            for m in (moment, moment - timedelta(seconds=1)):
+                lunar = Solar.fromYmdHms(m.year, m.month, m.day, m.hour, m.minute, m.second).getLunar()
+                expected = (
+                    ganzhi_index(lunar.getYearInGanZhiExact()),
+                    ganzhi_index(lunar.getMonthInGanZhiExact()),
+                )
+                self.assertEqual(self.calendar.pillars_at(m), expected, m)
+
+    def test_hour_for_pillar(self):
+        for hour in range(0, 24, 2):
+            lunar = Solar.fromYmdHms(2024, 3, 15, hour, 0, 0).getLunar()
+            day_idx = ganzhi_index(lunar.getDayInGanZhiExact())
+            hour_idx = ganzhi_index(lunar.getTimeInGanZhi())
+            self.assertEqual(hour_for_pillar(day_idx, hour_idx), hour)
+
+
+class TestReverseCalculatorIndexed(unittest.TestCase):
+
+    def _pillars_of(self, dt):
+        lunar = Solar.fromYmdHms(dt.year, dt.month, dt.day, dt.hour, 0, 0).getLunar()
+        return {
+            'year': lunar.getYearInGanZhiExact(),
+            'month': lunar.getMonthInGanZhiExact(),
+            'day': lunar.getDayInGanZhiExact(),
+            'hour': lunar.getTimeInGanZhi(),
+        }
+
+    def test_full_range_lookup_finds_birth_date(self):
+        birth = datetime(1987, 8, 21, 14, 0, 0)
+        calc = BaziReverseCalculator()
+        result = calc.reverse_calculate(self._pillars_of(birth), precision='high')
+        self.assertIsNotNone(result)
+        self.assertIn(birth, result['matches'])
+
+    def test_matches_scan_mode(self):
+        cases = [
+            # 立春前的一月生日：逐日扫描的窗口会重叠，索引版给出去重后的同一组日期
+            (datetime(1990, 1, 20, 6, 0, 0), (1989, 1991)),
+            # 立春年 1989 不在范围内，扫描回退全范围窗口仍从 1990-01-01 起
+            (datetime(1990, 1, 20, 6, 0, 0), (1990, 1991)),
+            # 立春年 1996 不在范围内，末年窗口延伸到 1996-02-15
+            (datetime(1996, 2, 10, 6, 0, 0), (1990, 1995)),
+            # 范围内的普通日期
+            (datetime(1993, 7, 8, 12, 0, 0), (1990, 1995)),
+        ]
+        for birth, year_range in cases:
+            with self.subTest(birth=birth, year_range=year_range):
+                pillars = self._pillars_of(birth)
+                calc = BaziReverseCalculator(year_range=year_range)
+
+                indexed = calc._reverse_high_precision(
+                    pillars['year'], pillars['month'], pillars['day'], pillars['hour'], True)
+                scanned = calc._reverse_high_precision_scan(
+                    pillars['year'], pillars['month'], pillars['day'], pillars['hour'], True)
+
+                self.assertIsNotNone(indexed)
+                self.assertIn(birth, indexed['matches'])
+                self.assertEqual(indexed['matches'], sorted(set(scanned['matches'])))
+                self.assertEqual(indexed['birth_date'], scanned['birth_date'])
+
+    def test_invalid_pillars_return_none(self):
+        calc = BaziReverseCalculator()
+        pillars = {'year': '甲子', 'month': '丙寅', 'day': '甲丑', 'hour': '甲子'}
+        self.assertIsNone(calc.reverse_calculate(pillars, precision='high'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from core.lazy_loader import LazyEngine, LazyModuleRegistry, registry
+from utils.startup_profiler import StartupProfiler, profiling_requested
+
+
+class _Counter:
+    instances = 0
+
+    def __init__(self, scale=1):
+        _Counter.instances += 1
+        self.scale = scale
+
+
+class _Host:
+    counter = LazyEngine(_Counter, scale=3)
+    decoder = LazyEngine("json:JSONDecoder")
+
+
+class TestLazyLoader(unittest.TestCase):
+
+    def test_lazy_module_imports_on_first_attribute(self):
+        local = LazyModuleRegistry()
+        proxy = local.module("colorsys")
+        self.assertFalse(proxy.is_loaded)
+        self.assertEqual(local.pending(), ["colorsys"])
+
+        self.assertEqual(proxy.rgb_to_hsv(1.0, 0.0, 0.0)[0], 0.0)
+        self.assertTrue(proxy.is_loaded)
+        self.assertEqual(local.pending(), [])
+        self.assertEqual(local.materialized(), ["colorsys"])
+        self.assertIs(local.module("colorsys"), proxy)
+
+    def test_lazy_engine_constructs_once_per_instance(self):
+        _Counter.instances = 0
+        host = _Host()
+        self.assertEqual(_Counter.instances, 0)
+        self.assertIs(host.counter, host.counter)
+        self.assertEqual(host.counter.scale, 3)
+        self.assertEqual(_Counter.instances, 1)
+
+        _Host().counter
+        self.assertEqual(_Counter.instances, 2)
+        self.assertIn("_Host.counter", registry.materialized())
+
+    def test_lazy_engine_string_target_and_override(self):
+        host = _Host()
+        self.assertEqual(type(host.decoder).__name__, "JSONDecoder")
+        host.decoder = "stub"
+        self.assertEqual(host.decoder, "stub")
+        self.assertIsInstance(_Host.__dict__["decoder"], LazyEngine)
+
+    def test_trinity_submodule_import_skips_oracle(self):
+        code = (
+            "import sys\n"
+            "import core.trinity.core.nexus.definitions\n"
+            "assert 'core.trinity.core.oracle' not in sys.modules\n"
+            "from core.trinity import TrinityOracle\n"
+            "assert TrinityOracle.__module__ == 'core.trinity.core.oracle'\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        proc = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+
+
+class TestStartupProfiler(unittest.TestCase):
+
+    def test_flag_detection(self):
+        self.assertTrue(profiling_requested(["main.py", "--profile-startup"]))
+        self.assertFalse(profiling_requested(["main.py"]))
+
+    def test_nested_spans_and_lazy_events(self):
+        profiler = StartupProfiler(enabled=True)
+        with profiler.measure("page:outer"):
+            with profiler.measure("import:inner", kind="import"):
+                pass
+        _Host().counter
+
+        spans = {s['name']: s for s in profiler.report()['spans']}
+        self.assertEqual(spans["page:outer"]['depth'], 0)
+        self.assertEqual(spans["import:inner"]['depth'], 1)
+        self.assertEqual(spans["_Host.counter"]['kind'], "lazy_engine")
+
+    def test_disabled_profiler_records_nothing(self):
+        profiler = StartupProfiler(enabled=False)
+        with profiler.measure("page:any"):
+            pass
+        self.assertEqual(profiler.report()['spans'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from core.trinity.core.engines.mirror_engine import MirrorEngine
+from core.trinity.core.engines.mirror_index import CHARTS_PER_CHUNK, MirrorFeatureTable, partition_keys
+from core.trinity.core.engines.synthetic_bazi_engine import SyntheticBaziEngine
+from core.trinity.core.nexus.definitions import BaziParticleNexus
+
+
+class _Registry:
+    def __init__(self, version):
+        self.version = version
+
+
+class _FakeFramework:
+    """Cheap deterministic natal physics keyed on the chart"""
+
+    def __init__(self, version="1.0.0"):
+        self.registry = _Registry(version)
+        self.calls = 0
+
+    def arbitrate_bazi(self, chart, birth_info=None, current_context=None):
+        self.calls += 1
+        h = sum(ord(c) * (i + 1) for i, c in enumerate("".join(chart)))
+        return {"meta": {"chart": chart},
+                "physics": {"stress": {"SAI": (h % 97) / 20.0, "IC": (h % 7) / 10.0},
+                            "wealth": {"Reynolds": float(h % 300)}, "entropy": 0.5,
+                            "vibration": {"energy_state": {"Wood": 1.0, "Water": 2.0}}}}
+
+
+class TestMirrorFeatureTable(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.framework = _FakeFramework()
+        self.table = MirrorFeatureTable(self.tmp.name)
+        self.table.build(self.framework, chunks=[0, 1])
+
+    def test_partition_keys_match_chart_structure(self):
+        uids = np.arange(0, SyntheticBaziEngine.TOTAL_COMBINATIONS, 4099)
+        for uid, key in zip(uids, partition_keys(uids)):
+            chart = SyntheticBaziEngine.chart_at(int(uid))
+            month_elem = BaziParticleNexus.BRANCHES[chart[1][1]][0]
+            self.assertEqual(key, SyntheticBaziEngine.STEMS.index(chart[2][0]) * 5
+                             + ("Wood", "Fire", "Earth", "Metal", "Water").index(month_elem))
+
+    def test_index_matches_live_scan(self):
+        table = MirrorFeatureTable(self.tmp.name).load("1.0.0")
+        self.assertEqual(len(table.uid), 2 * CHARTS_PER_CHUNK)
+        engine = MirrorEngine(self.framework, feature_table=table)
+        target = self.framework.arbitrate_bazi(SyntheticBaziEngine.chart_at(12345))
+        engine.LIVE_SCAN_LIMIT = 2 * CHARTS_PER_CHUNK
+        live = engine.find_mirrors(target, use_index=False)
+        self.framework.calls = 0
+        combined = engine.find_mirrors(target)
+        # partial table: chunks 0-1 come from the table, chunks 2-3 are scanned live
+        self.assertLess(self.framework.calls, CHARTS_PER_CHUNK)
+        self.assertTrue(live)
+        self.assertEqual(combined[:len(live)], live)
+        self.assertTrue(any(SyntheticBaziEngine.uid_of(c) >= 2 * CHARTS_PER_CHUNK for c in combined))
+        self.assertEqual(engine.find_mirrors(target, limit=1), live[:1])
+
+        # a complete table answers from the index alone
+        self.framework.calls = 0
+        with mock.patch.object(MirrorFeatureTable, "is_complete", new_callable=mock.PropertyMock,
+                               return_value=True):
+            indexed = engine.find_mirrors(target)
+        self.assertEqual(self.framework.calls, 0)
+        self.assertEqual(indexed, [c for c in live if SyntheticBaziEngine.uid_of(c) < 2 * CHARTS_PER_CHUNK])
+
+    def test_query_is_fast(self):
+        table = MirrorFeatureTable(self.tmp.name).load("1.0.0")
+        start = time.perf_counter()
+        for sai in np.linspace(0, 4.8, 100):
+            table.query("甲", "Wood", float(sai), 0.3)
+        self.assertLess((time.perf_counter() - start) / 100, 0.005)
+
+    def test_registry_change_rebuilds_incrementally(self):
+        self.assertEqual(len(self.table.stale_chunks("1.0.0")), 58)
+        self.assertEqual(self.table.build(self.framework, chunks=[0, 1]), [])
+        bumped = _FakeFramework("1.1.0")
+        engine = MirrorEngine(bumped, feature_table=MirrorFeatureTable(self.tmp.name))
+        self.assertIsNone(engine.feature_table())
+        self.assertEqual(MirrorFeatureTable(self.tmp.name).build(bumped, chunks=[1]), [1])
+        self.assertEqual(len(engine.feature_table().uid), CHARTS_PER_CHUNK)
+
+
+class _AnnualFramework(_FakeFramework):
+    """SAI depends on the chart and the annual pillar, as in the real time-scan"""
+
+    def arbitrate_bazi(self, chart, birth_info=None, current_context=None):
+        h = sum(ord(c) for c in "".join(chart) + current_context["annual_pillar"])
+        return {"physics": {"stress": {"SAI": (h % 41) / 10.0}}}
+
+
+class TestMirrorTimeScan(unittest.TestCase):
+
+    def test_matches_per_year_loop(self):
+        framework = _AnnualFramework()
+        mirrors = [SyntheticBaziEngine.chart_at(u) for u in range(0, 50000, 997)]
+        result = MirrorEngine(framework).run_mirror_time_scan(mirrors, years=70, reality_target_year=11)
+
+        self.assertEqual(len(result["resonance_points"]), 70)
+        for point in result["resonance_points"]:
+            annual = SyntheticBaziEngine.JIA_ZI[point["year_offset"] % 60]
+            vals = [framework.arbitrate_bazi(m, current_context={"annual_pillar": annual})["physics"]["stress"]["SAI"]
+                    for m in mirrors]
+            self.assertEqual(point["avg_sai"], float(np.mean(vals)))
+            self.assertEqual(point["spike_ratio"], sum(1 for v in vals if v > 2.0) / len(mirrors))
+        target = result["resonance_points"][11]["avg_sai"]
+        self.assertEqual(result["reality_gap"], abs(target - 3.228) / 3.228)
+
+    def test_no_mirrors(self):
+        result = MirrorEngine(_AnnualFramework()).run_mirror_time_scan([])
+        self.assertEqual(result["resonance_points"], [])
+        self.assertEqual(result["reality_gap"], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import core.narrator as narrator
+from core.narrator import NarrationCache, iter_chunks, narration_key, stream_holographic_report
+
+TENSOR = {'projection': {'E': 0.81234, 'O': 0.72001, 'M': -0.1, 'S': 0.15, 'R': 0.33}, 'alpha': 0.9}
+
+
+class _FakeClient:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.calls = 0
+
+    def generate(self, **kwargs):
+        self.calls += 1
+        return iter({'response': t} for t in self.tokens)
+
+
+class _FakeSynthesizer:
+    use_llm = True
+    model_name = "fake-model"
+
+    def __init__(self, client):
+        self._llm_client = client
+
+
+class TestNarratorCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "narration_cache.jsonl")
+        self.cache = NarrationCache(path=self.path)
+        patcher = patch.object(narrator, "_narration_cache", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_chunks_reassemble_to_original_text(self):
+        text = narrator._generate_with_rules(TENSOR, "A-03", "STABLE")
+        for chunking in ("sentence", "token", "char", "none"):
+            chunks = list(iter_chunks(text, chunking))
+            self.assertEqual("".join(chunks), text)
+        self.assertLess(len(list(iter_chunks(text, "sentence"))), len(text) // 5)
+
+    def test_rules_stream_is_cached_and_unpaced(self):
+        start = time.perf_counter()
+        first = "".join(stream_holographic_report(TENSOR, "A-03", "STABLE", use_llm=False))
+        self.assertLess(time.perf_counter() - start, 0.5)
+        with patch.object(narrator, "_generate_with_rules", side_effect=AssertionError("recomputed")):
+            second = "".join(stream_holographic_report(TENSOR, "A-03", "STABLE", use_llm=False))
+        self.assertEqual(first, second)
+        self.assertEqual(self.cache.stats()['hits'], 1)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_key_rounds_tensor_and_separates_state(self):
+        nudged = {'projection': dict(TENSOR['projection'], E=0.812341), 'alpha': 0.9}
+        self.assertEqual(narration_key(TENSOR, "A-03", "STABLE"), narration_key(nudged, "A-03", "STABLE"))
+        self.assertNotEqual(narration_key(TENSOR, "A-03", "STABLE"), narration_key(TENSOR, "A-03", "COLLAPSED"))
+        self.assertNotEqual(narration_key(TENSOR, "A-03", "STABLE"),
+                            narration_key(TENSOR, "A-03", "STABLE", source="llm:fake-model"))
+
+    def test_llm_stream_is_persisted_and_replayed(self):
+        tokens = ["## 分析\n\n", "**秩序轴**高企，", "权力集中。", "财富有限，", "重名轻利。"] * 10
+        client = _FakeClient(tokens)
+        with patch.object(narrator, "_get_llm_synthesizer", return_value=_FakeSynthesizer(client)):
+            first = "".join(stream_holographic_report(TENSOR, "A-03", "STABLE"))
+            self.assertEqual(first, "".join(tokens))
+            # 新进程：从 JSONL 重新加载
+            with patch.object(narrator, "_narration_cache", NarrationCache(path=self.path)):
+                replay = "".join(stream_holographic_report(TENSOR, "A-03", "STABLE"))
+        self.assertEqual(client.calls, 1)
+        self.assertEqual(replay, first.strip())
+
+    def test_short_llm_response_is_not_dropped(self):
+        client = _FakeClient(["短评：", "权柄稳固。"])
+        with patch.object(narrator, "_get_llm_synthesizer", return_value=_FakeSynthesizer(client)):
+            text = "".join(stream_holographic_report(TENSOR, "A-03", "STABLE", use_cache=False))
+        self.assertEqual(text, "短评：权柄稳固。")
+
+
+if __name__ == '__main__':
+    unittest.main()
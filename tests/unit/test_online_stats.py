@@ -0,0 +1,237 @@
+import json
+import random
+import unittest
+
+import numpy as np
+from scipy import stats
+
+from core.online_stats import DensityGrid2D, ReservoirSampler, RunningMoments, StreamingSummary, TDigest, TopK
+from core.statistical_audit import StatisticalAuditor
+from core.trinity.core.engines.synthetic_bazi_engine import ExpectedValueCollector
+
+
+class TestReservoirSampler(unittest.TestCase):
+
+    def test_fills_then_stays_at_capacity(self):
+        sampler = ReservoirSampler(10, seed=1)
+        for i in range(5):
+            sampler.add(i)
+        self.assertEqual(sampler.items, [0, 1, 2, 3, 4])
+        for i in range(5, 1000):
+            sampler.add(i)
+        self.assertEqual(len(sampler), 10)
+        self.assertEqual(sampler.seen, 1000)
+
+    def test_sample_is_uniform_over_stream(self):
+        # 前半段与后半段被选中的次数应接近（旧实现只保留前段）
+        hits = [0] * 10
+        for trial in range(400):
+            sampler = ReservoirSampler(20, seed=trial)
+            for i in range(1000):
+                sampler.add(i)
+            for item in sampler.items:
+                hits[item // 100] += 1
+        expected = 400 * 20 / 10
+        for h in hits:
+            self.assertLess(abs(h - expected) / expected, 0.15)
+
+    def test_state_round_trip_continues_identically(self):
+        a = ReservoirSampler(8, seed=3)
+        for i in range(100):
+            a.add(i)
+        b = ReservoirSampler(8)
+        b.load_state_dict(json.loads(json.dumps(a.state_dict())))
+        for i in range(100, 300):
+            a.add(i)
+            b.add(i)
+        self.assertEqual(a.items, b.items)
+        self.assertEqual(a.seen, b.seen)
+
+    def test_merge_weights_by_seen(self):
+        from_a = 0
+        for trial in range(300):
+            a, b = ReservoirSampler(10, seed=trial), ReservoirSampler(10, seed=trial + 1000)
+            for i in range(300):
+                a.add(("a", i))
+            for i in range(100):
+                b.add(("b", i))
+            merged = a.merge(b)
+            self.assertEqual(merged.seen, 400)
+            self.assertEqual(len(merged), 10)
+            from_a += sum(1 for tag, _ in merged.items if tag == "a")
+        self.assertAlmostEqual(from_a / (300 * 10), 0.75, delta=0.04)
+
+    def test_merge_of_small_shards_keeps_everything(self):
+        a, b = ReservoirSampler(10), ReservoirSampler(10)
+        for i in range(3):
+            a.add(i)
+        for i in range(4):
+            b.add(10 + i)
+        self.assertEqual(sorted(a.merge(b).items), [0, 1, 2, 10, 11, 12, 13])
+
+
+class TestDensityGrid2D(unittest.TestCase):
+
+    def test_linear_binning_and_clipping(self):
+        grid = DensityGrid2D((0, 10), (0, 1), bins=(10, 2))
+        grid.add(0.5, 0.1)
+        grid.add(9.99, 0.9)
+        grid.add(25, -3)
+        grid.add(float("nan"), 0.5)
+        self.assertEqual(grid.total, 3)
+        self.assertEqual(grid.clipped, 1)
+        self.assertEqual(grid.counts[0][0], 1)
+        self.assertEqual(grid.counts[1][9], 1)
+        self.assertEqual(grid.counts[0][9], 1)
+        self.assertEqual(grid.marginal_x()[9], 2)
+        self.assertEqual(grid.marginal_y(), [2, 1])
+
+    def test_log1p_edges_span_range(self):
+        grid = DensityGrid2D((0, 100), (0, 5000), bins=(4, 4), scale="log1p")
+        xs, ys = grid.edges()
+        self.assertAlmostEqual(xs[0], 0.0)
+        self.assertAlmostEqual(xs[-1], 100.0)
+        self.assertAlmostEqual(ys[-1], 5000.0)
+        grid.add(0.0, 0.0)
+        grid.add(99.0, 4999.0)
+        self.assertEqual(grid.counts[0][0], 1)
+        self.assertEqual(grid.counts[3][3], 1)
+
+    def test_merge_and_state_round_trip(self):
+        a = DensityGrid2D((0, 1), (0, 1), bins=(4, 4))
+        b = DensityGrid2D((0, 1), (0, 1), bins=(4, 4))
+        a.add(0.1, 0.1)
+        b.add(0.1, 0.1)
+        b.add(0.9, 0.9)
+        merged = a.merge(b)
+        self.assertEqual(merged.counts[0][0], 2)
+        self.assertEqual(merged.total, 3)
+        restored = DensityGrid2D((0, 1), (0, 1), bins=(4, 4))
+        restored.load_state_dict(json.loads(json.dumps(merged.state_dict())))
+        self.assertEqual(restored.to_dict()["counts"], merged.to_dict()["counts"])
+        with self.assertRaises(ValueError):
+            a.merge(DensityGrid2D((0, 1), (0, 1), bins=(2, 2)))
+
+
+
+class TestRunningMoments(unittest.TestCase):
+
+    def setUp(self):
+        self.values = np.random.default_rng(4).lognormal(0.0, 0.8, 5000)
+
+    def test_matches_numpy_and_scipy(self):
+        m = RunningMoments()
+        for v in self.values:
+            m.add(float(v))
+        self.assertAlmostEqual(m.mean, float(np.mean(self.values)), places=9)
+        self.assertAlmostEqual(m.std, float(np.std(self.values)), places=9)
+        self.assertAlmostEqual(m.skewness, float(stats.skew(self.values)), places=9)
+        self.assertAlmostEqual(m.kurtosis, float(stats.kurtosis(self.values)), places=8)
+        self.assertEqual(m.max, float(np.max(self.values)))
+
+    def test_merge_equals_single_pass(self):
+        shards = [RunningMoments() for _ in range(3)]
+        for i, v in enumerate(self.values):
+            shards[i % 3 if i < 4000 else 2].add(float(v))
+        merged = shards[0].merge(shards[1]).merge(RunningMoments()).merge(shards[2])
+        self.assertEqual(merged.count, len(self.values))
+        self.assertAlmostEqual(merged.mean, float(np.mean(self.values)), places=9)
+        self.assertAlmostEqual(merged.variance, float(np.var(self.values)), places=9)
+        self.assertAlmostEqual(merged.skewness, float(stats.skew(self.values)), places=9)
+        self.assertAlmostEqual(merged.kurtosis, float(stats.kurtosis(self.values)), places=8)
+
+
+class TestTDigest(unittest.TestCase):
+
+    def test_quantiles_close_to_exact(self):
+        values = np.random.default_rng(9).normal(10.0, 2.0, 20000)
+        digest = TDigest()
+        for v in values:
+            digest.add(float(v))
+        self.assertLess(len(digest.centroids), 200)
+        for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+            self.assertAlmostEqual(digest.quantile(q), float(np.percentile(values, q * 100)), delta=0.05)
+        self.assertEqual(digest.quantile(0.0), float(values.min()))
+        self.assertEqual(digest.quantile(1.0), float(values.max()))
+
+    def test_merge_and_round_trip(self):
+        values = np.random.default_rng(2).exponential(1.0, 8000)
+        a, b = TDigest(), TDigest()
+        for v in values[:3000]:
+            a.add(float(v))
+        for v in values[3000:]:
+            b.add(float(v))
+        restored = TDigest()
+        restored.load_state_dict(json.loads(json.dumps(a.merge(b).state_dict())))
+        self.assertEqual(restored.count, 8000)
+        self.assertAlmostEqual(restored.quantile(0.5), float(np.median(values)), delta=0.03)
+
+    def test_query_does_not_change_state(self):
+        digest = TDigest(buffer_size=50)
+        for v in range(30):
+            digest.add(float(v))
+        before = digest.state_dict()
+        digest.quantile(0.5)
+        self.assertEqual(digest.state_dict(), before)
+
+
+class TestTopK(unittest.TestCase):
+
+    def test_keeps_largest_and_merges(self):
+        rng = random.Random(0)
+        scores = [rng.random() for _ in range(500)]
+        a, b = TopK(5), TopK(5)
+        for i, s in enumerate(scores):
+            (a if i % 2 else b).add(s, {"i": i})
+        expected = sorted(range(500), key=lambda i: -scores[i])[:5]
+        merged = a.merge(b)
+        self.assertEqual([item["i"] for item in merged.items()], expected)
+        merged.add(2.0, {"i": -1})
+        merged.add(2.0, {"i": -2})
+        self.assertEqual([item["i"] for item in merged.items()][:2], [-1, -2])
+        restored = TopK(5)
+        restored.load_state_dict(json.loads(json.dumps(merged.state_dict())))
+        self.assertEqual(restored.items(), merged.items())
+
+
+class TestStreamingOutlierBounds(unittest.TestCase):
+
+    def test_streaming_bounds_agree_with_detect_outliers(self):
+        values = list(np.random.default_rng(1).normal(0.8, 0.05, 4000)) + [0.1, 0.15, 1.6]
+        auditor = StatisticalAuditor()
+        exact = auditor.detect_outliers(values)
+        shards = [auditor.summarize_stream(iter(values[i::4])) for i in range(4)]
+        merged = shards[0].merge(shards[1]).merge(shards[2]).merge(shards[3])
+        bounds = auditor.outlier_bounds(merged)
+        for key in ("mean", "std", "skewness"):
+            self.assertAlmostEqual(bounds[key], exact["statistics"][key], places=9)
+        for key in ("q1", "q3", "lower_bound", "upper_bound"):
+            self.assertAlmostEqual(bounds[key], exact["statistics"][key], delta=0.005)
+        streamed = [i for i, v in enumerate(values) if auditor.is_outlier(v, bounds)]
+        self.assertTrue({4000, 4001, 4002} <= set(streamed))
+        self.assertLess(len(set(streamed) ^ set(exact["outlier_indices"])), 5)
+        self.assertEqual(len(exact["normal_indices"]) + len(exact["outlier_indices"]), len(values))
+
+
+class TestCollectorMerge(unittest.TestCase):
+
+    def _report(self, i):
+        return {"meta": {"chart": [str(i)]},
+                "physics": {"stress": {"SAI": (i % 41) / 10.0, "IC": i % 3},
+                            "wealth": {"Reynolds": float((i * 37) % 4500)}, "entropy": 0.5}}
+
+    def test_sharded_collectors_merge(self):
+        whole, a, b = ExpectedValueCollector(), ExpectedValueCollector(), ExpectedValueCollector()
+        for i in range(600):
+            whole.collect(self._report(i))
+            (a if i < 250 else b).collect(self._report(i))
+        merged = a.merge(b).get_summary()
+        single = whole.get_summary()
+        self.assertEqual(merged["singularity_count"], single["singularity_count"])
+        for key in ("mean", "stdev", "max", "min"):
+            self.assertAlmostEqual(merged["SAI"][key], single["SAI"][key], places=9)
+        self.assertEqual(a.merge(b).top_singularities["SAI"].items()[0]["SAI"], 4.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
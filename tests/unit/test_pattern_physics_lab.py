@@ -0,0 +1,79 @@
+import logging
+import unittest
+
+import numpy as np
+
+from core.trinity.core.engines.pattern_physics_lab import SWEEP_CONTEXT, PatternPhysicsLab
+from core.trinity.core.engines.synthetic_bazi_engine import SyntheticBaziEngine
+from core.trinity.core.nexus.definitions import BaziParticleNexus
+from core.trinity.core.nexus.pattern_registry import PatternRegistry
+from core.trinity.core.unified_arbitrator_master import QuantumUniversalFramework
+
+
+def _sgjg_charts(n):
+    """First n charts (uid stride 997) holding both 伤官 and 正官, plus every 5th other chart"""
+    charts = []
+    for uid in range(0, SyntheticBaziEngine.TOTAL_COMBINATIONS, 997):
+        chart = SyntheticBaziEngine.chart_at(uid)
+        gods = [BaziParticleNexus.get_shi_shen(p[0], chart[2][0]) for p in chart]
+        if ("伤官" in gods and "正官" in gods) or uid % 5 == 0:
+            charts.append(chart)
+        if len(charts) == n:
+            return charts
+
+
+class TestPatternPhysicsLab(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.INFO)
+        cls.framework = QuantumUniversalFramework()
+        cls.charts = _sgjg_charts(30)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def setUp(self):
+        self.modulus = PatternRegistry.SGJG_CONST["BREAKING_MODULUS"]
+        self.addCleanup(PatternRegistry.update_const, "SHANG_GUAN_JIAN_GUAN", "BREAKING_MODULUS", self.modulus)
+        self.lab = PatternPhysicsLab(self.framework)
+
+    def _reference(self, key, values):
+        """The per-value x per-chart arbitration loop the batched sweep replaces"""
+        rows = []
+        for val in values:
+            phys = [self.framework.arbitrate_bazi(c, current_context={**SWEEP_CONTEXT, key: val})["physics"]
+                    for c in self.charts]
+            rows.append(([p["stress"]["SAI"] for p in phys], [p["wealth"]["Reynolds"] for p in phys],
+                         [p["entropy"] for p in phys]))
+        return rows
+
+    def test_boost_replay_matches_full_arbitration(self):
+        for values in (list(np.arange(0.5, 3.0, 0.5)), [0.8, 1.3, 2.9]):
+            cells = self.lab.sweep_matrix(self.charts, SWEEP_CONTEXT, "pattern_boost_multiplier", values)
+            for i, (sai, re, ent) in enumerate(self._reference("pattern_boost_multiplier", values)):
+                self.assertEqual(cells["sai"][i].tolist(), sai)
+                self.assertEqual(cells["reynolds"][i].tolist(), re)
+                self.assertEqual(cells["entropy"][i].tolist(), ent)
+        # the sample must actually cross the breaking modulus for the check to mean anything
+        self.assertGreater(cells["sai"][-1].sum(), cells["sai"][0].sum())
+
+    def test_damping_sweep_matches_full_arbitration(self):
+        values = [0.0, 0.6]
+        result = self.lab.sensitivity_sweep(self.charts, "damping", values)
+        for summary, (sai, re, ent) in zip(result["sweep_data"], self._reference("damping_override", values)):
+            self.assertEqual(summary["avg_sai"], np.mean(sai))
+            self.assertEqual(summary["max_sai"], np.max(sai))
+            self.assertEqual(summary["avg_re"], np.mean(re))
+            self.assertEqual(summary["avg_entropy"], np.mean(ent))
+            self.assertEqual(summary["singularity_rate"], sum(1 for s in sai if s > 3.0) / len(self.charts))
+
+    def test_sample_cap(self):
+        result = self.lab.fine_tune_sgjg(self.charts, max_charts=10)
+        self.assertEqual(result["sample_size"], 10)
+        self.assertEqual(float(result["breaking_modulus"]), round(PatternRegistry.SGJG_CONST["BREAKING_MODULUS"], 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
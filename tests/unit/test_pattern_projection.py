@@ -0,0 +1,105 @@
+import unittest
+
+import numpy as np
+
+from controllers.holographic_pattern_controller import HolographicPatternController
+from core.engine_graph.constants import TWELVE_LIFE_STAGES
+from core.pattern_projection import AXES, SINGULARITY_LABELS, get_batch_projector
+from core.rule_index import decode_chart, encode_charts, encode_universe
+from core.trinity.core.nexus.definitions import BaziParticleNexus
+
+PATTERN = {
+    "name": "七杀格", "name_cn": "七杀格", "version": "1.0",
+    "tensor_operator": {"weights": {"E": 2.0, "O": 1.0, "M": 0.5, "S": 0.3, "R": 0.2}},
+    "audit_trail": {"data_selection_criteria": {"month_lock": "帝旺"}},
+}
+
+
+def _sample(chart):
+    """select_samples 逐例路径构造的样本字典"""
+    dm = chart[2][0]
+    return {
+        "chart": chart,
+        "qi_sha_stems": [chart[i][0] for i in (0, 1, 3) if BaziParticleNexus.get_shi_shen(chart[i][0], dm) == "七杀"],
+        "ten_gods": [BaziParticleNexus.get_shi_shen(p[0], dm) for p in chart],
+    }
+
+
+class TestBatchTensorProjector(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.projector = get_batch_projector()
+        cls.controller = HolographicPatternController()
+        cls.controller.registry = {"patterns": {"A-01": PATTERN}}
+        universe = encode_universe()
+        rng = np.random.default_rng(50)
+        # 随机样本 + 全部通过海选的命盘（覆盖七杀、强根、羊刃等稀有分支）
+        passed, _ = cls.projector.screen(universe)
+        rows = np.union1d(rng.choice(len(universe), 3000, replace=False), np.flatnonzero(passed))
+        cls.codes = universe[rows]
+        cls.charts = [decode_chart(code) for code in cls.codes]
+
+    def test_ten_gods_match_nexus(self):
+        gods = self.projector.ten_gods(self.codes[:500])
+        for chart, row in zip(self.charts, gods):
+            expected = [BaziParticleNexus.get_shi_shen(p[0], chart[2][0]) for p in chart]
+            self.assertEqual([BaziParticleNexus.STEM_SHI_SHEN[g] for g in row], expected)
+
+    def test_purity_and_singularity_match_per_sample_logic(self):
+        purity = self.projector.purity_scores(self.codes)
+        kinds = self.projector.singularity_types(self.codes)
+        for chart, score, kind in zip(self.charts, purity, kinds):
+            sample = _sample(chart)
+            self.assertEqual(score, self.controller._calculate_purity_score(sample, chart[2][0]))
+            flag, label = self.controller._detect_singularity(sample, chart[2][0])
+            self.assertEqual((bool(kind), SINGULARITY_LABELS[int(kind)]), (flag, label))
+
+    def test_screen_matches_selection_criteria(self):
+        passed, stats = self.projector.screen(self.codes)
+        for chart, ok in zip(self.charts, passed):
+            dm = chart[2][0]
+            sample = _sample(chart)
+            rooted = any(stem == qs and weight >= 5
+                         for qs in sample["qi_sha_stems"] for p in chart
+                         for stem, weight in BaziParticleNexus.get_branch_weights(p[1]))
+            gods = sample["ten_gods"]
+            expected = (TWELVE_LIFE_STAGES.get((dm, chart[1][1])) == "帝旺" and rooted
+                        and gods.count("食神") + gods.count("伤官") < 2
+                        and gods.count("正财") + gods.count("偏财") < 2)
+            self.assertEqual(bool(ok), expected, chart)
+        self.assertEqual(sum(stats.values()) + passed.sum(), len(self.codes))
+
+    def test_select_samples_tiers(self):
+        result = self.controller.select_samples("A-01", target_count=50)
+        self.assertEqual(result["total_scanned"], 518400)
+        stats = result["stats"]
+        self.assertEqual(sum(stats[k] for k in stats if k != "scanned"), 518400)
+        self.assertGreaterEqual(stats["matched"], result["tier_a"]["count"] + result["tier_x"]["count"])
+        scores = [s["purity_score"] for s in result["tier_a"]["samples"]]
+        self.assertEqual(len(scores), 50)
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        for sample in result["tier_a"]["samples"][:5] + result["tier_x"]["samples"][:5]:
+            self.assertEqual(sample["purity_score"],
+                             self.controller._calculate_purity_score(sample, sample["day_master"]))
+        for sample in result["tier_x"]["samples"]:
+            self.assertTrue(self.controller._detect_singularity(sample, sample["day_master"])[0])
+
+    def test_batch_projection_matches_single_chart(self):
+        charts = self.charts[:3]
+        batch = self.controller.calculate_tensor_projection_batch("A-01", charts)
+        self.assertEqual(batch["projection"].shape, (3, 5))
+        for n, chart in enumerate(charts):
+            single = self.controller.calculate_tensor_projection("A-01", chart, chart[2][0])
+            self.assertEqual(batch["sai"][n], single["sai"])
+            np.testing.assert_allclose(batch["projection"][n], [single["projection"][a] for a in AXES])
+
+        sai = np.linspace(0.0, 2.0, len(self.codes))
+        projected = self.controller.calculate_tensor_projection_batch("A-01", self.codes, sai=sai)
+        weights = self.controller.normalize_weights(PATTERN["tensor_operator"]["weights"])
+        np.testing.assert_allclose(projected["projection"], sai[:, None] * [weights[a] for a in AXES])
+        np.testing.assert_array_equal(projected["purity"], self.projector.purity_scores(encode_charts(self.charts)))
+
+
+if __name__ == '__main__':
+    unittest.main()
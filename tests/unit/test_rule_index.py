@@ -0,0 +1,71 @@
+import random
+import unittest
+
+from core.rule_index import decode_chart, encode_universe, get_rule_index
+from core.rule_matcher import RuleMatcher
+from core.trinity.core.engines.synthetic_bazi_engine import SyntheticBaziEngine
+
+STEMS = "甲乙丙丁戊己庚辛壬癸"
+BRANCHES = "子丑寅卯辰巳午未申酉戌亥"
+
+
+class TestRuleIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.index = get_rule_index()
+        cls.matcher = RuleMatcher()
+        cls.codes = encode_universe()
+        cls.bits = cls.index.match_bits(cls.codes)
+
+    def _expected(self, bazi, day_master):
+        return {r.rule_id for r in self.matcher.match(bazi, day_master)}
+
+    def test_universe_order_matches_generator(self):
+        self.assertEqual(self.codes.shape, (518400, 8))
+        for i, bazi in enumerate(SyntheticBaziEngine().generate_all_bazi()):
+            if i % 4099 == 0:
+                self.assertEqual(decode_chart(self.codes[i]), bazi)
+
+    def test_bits_match_rule_matcher_on_universe_sample(self):
+        rng = random.Random(31)
+        for row in rng.sample(range(len(self.codes)), 3000):
+            bazi = decode_chart(self.codes[row])
+            self.assertEqual(set(self.index.rule_ids_of(self.bits[row])), self._expected(bazi, bazi[2][0]), bazi)
+
+    def test_explicit_day_master_and_missing_pillars(self):
+        rng = random.Random(32)
+        charts, masters = [], []
+        for _ in range(1000):
+            charts.append([rng.choice(STEMS) + rng.choice(BRANCHES) if rng.random() > 0.15 else ""
+                           for _ in range(4)])
+            masters.append(rng.choice(STEMS))
+        bits = self.matcher.match_bits(charts, masters)
+        for bazi, dm, row in zip(charts, masters, bits):
+            self.assertEqual(set(self.index.rule_ids_of(row)), self._expected(bazi, dm), (bazi, dm))
+
+    def test_frequency_cooccurrence_and_query(self):
+        freq = self.index.frequencies(self.bits)
+        self.assertEqual(freq["A1"], 518400)
+        self.assertEqual(freq["E3"], 0)
+
+        co = self.index.cooccurrence(self.bits)
+        col = self.index.column
+        rows = self.index.query(self.bits, all_of=["B1", "C3"])
+        self.assertEqual(len(rows), co[col["B1"], col["C3"]])
+        self.assertTrue(self.bits[rows, col["B1"]].all())
+
+        opened_not_sealed = self.index.query(self.bits, all_of=["D2"], none_of=["D3"])
+        self.assertFalse(self.bits[opened_not_sealed, col["D3"]].any())
+
+    def test_lazy_match_builds_rules_on_demand(self):
+        bazi, dm = ["甲子", "己丑", "丙午", "辛卯"], "丙"
+        result = self.matcher.match_lazy(bazi, dm)
+        self.assertTrue(result.has("B1"))
+        self.assertFalse(result.is_materialized)
+        self.assertEqual(set(result.rule_ids), {r.rule_id for r in result})
+        self.assertTrue(result.is_materialized)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -63,5 +63,64 @@ class TestSchedulerLogic(unittest.TestCase):
         self.db.update_job_progress.assert_called_with('job_123', 3, 3)
         self.db.update_job_status.assert_called_with('job_123', 'finished')
 
+    def _audio_job(self):
+        job = {'id': 'job_7', 'status': 'running', 'target_file': 'Video abc', 'current_progress': 0,
+               'total_work': 3, 'payload': json.dumps({'type': 'video', 'url': 'https://www.youtube.com/watch?v=abc'})}
+        self.db.get_job.return_value = job
+        return job
+
+    def _run_audio_job(self, result, pending=None):
+        from learning.video_pipeline import VideoResult
+        job = self._audio_job()
+        self.db.get_pending_segments.return_value = pending
+        with patch('learning.video_downloader.VideoDownloader') as MockVD, \
+                patch.object(self.worker, '_stream_transcribe_and_mine',
+                             return_value=VideoResult(url='u', **result)) as stream, \
+                patch('os.makedirs'), patch('builtins.open', mock_open()) as opened:
+            MockVD.return_value.download_audio.return_value = ("a.mp3", "Test", 100, False)
+            self.worker._process_video_job(job, json.loads(job['payload']))
+        return stream, opened
+
+    def test_partially_mined_video_keeps_failed_segments(self):
+        stream, _ = self._run_audio_job(dict(transcript="text", chunks=3, extracted=[1, 1],
+                                             failed_segments=[1]))
+        self.assertIsNone(stream.call_args[0][4])
+        self.db.mark_video_partial.assert_called_once_with('abc', [1])
+        self.db.mark_videos_processed.assert_not_called()
+        self.db.update_job_status.assert_called_with('job_7', 'finished')
+
+    def test_retry_mines_pending_segments_and_completes(self):
+        stream, opened = self._run_audio_job(dict(transcript="text", chunks=1, extracted=[1]), pending=[1])
+        self.assertEqual(stream.call_args[0][4], [1])
+        self.assertEqual(opened.call_args[0][1], "a")  # appended to the first run's transcript
+        self.db.mark_videos_processed.assert_called_once_with(['abc'])
+        self.db.mark_video_partial.assert_not_called()
+
+    def test_nothing_mined_fails_the_job(self):
+        self._run_audio_job(dict(transcript="text", chunks=2, failed_segments=[0, 1]))
+        self.db.update_job_status.assert_called_with('job_7', 'failed')
+        self.db.mark_videos_processed.assert_not_called()
+        self.db.mark_video_partial.assert_not_called()
+
+    def test_stream_reports_failed_segments_and_chunks(self):
+        kp = MagicMock()
+        kp.process_content_chunk.side_effect = [RuntimeError("LLM down"), {'type': 'RULE', 'extracted': []}]
+
+        def transcribe(path):
+            if path.endswith("1"):
+                raise RuntimeError("decoder error")
+            return path[-1] * 3000
+
+        with patch.object(self.worker, '_knowledge_processor', return_value=kp), \
+                patch('learning.video_pipeline.split_audio', lambda path, out, sec: [f"{path}.{i}" for i in range(3)]), \
+                patch('learning.video_pipeline.VideoPipeline._default_transcribe', lambda self, path: transcribe(path)), \
+                patch('builtins.print'):
+            result = self.worker._stream_transcribe_and_mine('job_7', 'u', 'a.mp3', {})
+        # chunk 0 (segment 0) failed to mine, segment 1 failed to transcribe, segment 2 was mined
+        self.assertEqual(result.failed_segments, [0, 1])
+        self.assertTrue(result.partial)
+        self.assertFalse(result.ok)
+
+
 if __name__ == '__main__':
     unittest.main()
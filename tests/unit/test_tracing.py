@@ -0,0 +1,80 @@
+import unittest
+
+from core import tracing
+from core.tracing import StageHistogram, Tracer, get_tracer, traced
+
+
+class TestTracing(unittest.TestCase):
+
+    def test_disabled_tracer_records_nothing(self):
+        tracer = Tracer()
+        span = tracer.span("stage")
+        self.assertIs(span, tracer.span("other"))
+        with span:
+            pass
+        self.assertEqual(tracer.summary()['stages'], {})
+        self.assertEqual(tracer.chrome_trace()['traceEvents'], [])
+
+    def test_histogram_percentiles(self):
+        hist = StageHistogram()
+        for ms in [1.0] * 90 + [50.0] * 10:
+            hist.add(ms / 1000.0)
+        stats = hist.to_dict()
+        self.assertEqual(stats['count'], 100)
+        self.assertAlmostEqual(stats['total_ms'], 590.0)
+        self.assertAlmostEqual(stats['min_ms'], 1.0)
+        self.assertAlmostEqual(stats['max_ms'], 50.0)
+        # bucket upper bounds: 1ms -> 1.024ms, 50ms -> 50ms (capped at max)
+        self.assertLessEqual(stats['p50_ms'], 2 * 1.0)
+        self.assertGreaterEqual(stats['p50_ms'], 1.0)
+        self.assertAlmostEqual(stats['p99_ms'], 50.0)
+        self.assertEqual(sum(stats['buckets'].values()), 100)
+
+    def test_enabled_spans_export_summary_and_chrome_trace(self):
+        tracer = Tracer(enabled=True)
+        with tracer.span("outer", chart="甲子"):
+            with tracer.span("outer.inner"):
+                pass
+        with self.assertRaises(ValueError):
+            with tracer.span("outer.inner"):
+                raise ValueError("boom")
+
+        stages = tracer.summary()['stages']
+        self.assertEqual(stages['outer.inner']['count'], 2)
+        self.assertEqual(stages['outer']['count'], 1)
+
+        events = tracer.chrome_trace()['traceEvents']
+        self.assertEqual([e['name'] for e in events], ["outer.inner", "outer", "outer.inner"])
+        outer, inner = events[1], events[0]
+        self.assertEqual(outer['ph'], 'X')
+        self.assertEqual(outer['args'], {'chart': "甲子"})
+        self.assertLessEqual(outer['ts'], inner['ts'])
+        self.assertGreaterEqual(outer['ts'] + outer['dur'], inner['ts'] + inner['dur'])
+        self.assertEqual(events[2]['args'], {'error': 'ValueError'})
+
+        tracer.reset()
+        self.assertEqual(tracer.summary()['n_events'], 0)
+
+    def test_traced_decorator_uses_process_tracer(self):
+        tracer = get_tracer()
+        was_enabled = tracer.enabled
+
+        @traced("test.decorated")
+        def work(x):
+            return x * 2
+
+        try:
+            tracer.disable()
+            self.assertEqual(work(2), 4)
+            self.assertNotIn("test.decorated", tracer.summary()['stages'])
+            tracer.enable()
+            self.assertEqual(work(3), 6)
+            self.assertEqual(tracer.summary()['stages']["test.decorated"]['count'], 1)
+        finally:
+            tracer.enabled = was_enabled
+            tracer.stages.pop("test.decorated", None)
+        self.assertIs(tracing.get_tracer(), tracer)
+
+
+if __name__ == '__main__':
+    unittest.main()
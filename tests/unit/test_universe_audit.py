@@ -0,0 +1,132 @@
+import os
+import tempfile
+import unittest
+
+from core.trinity.core.engines.synthetic_bazi_engine import ExpectedValueCollector, SyntheticBaziEngine
+from services.universe_audit import (
+    AuditCheckpoint, BatchSimulationAudit, GrandPhaseAudit, LiveAggregateBoard, StreamingAudit,
+    checkpoint_snapshot, run_streaming_audit
+)
+
+
+class _FakeFramework:
+    """Deterministic stand-in for arbitrate_bazi: physics derived from the chart and context"""
+
+    def arbitrate_bazi(self, chart, birth_info=None, current_context=None):
+        h = sum(ord(c) for c in "".join(chart) + current_context["luck_pillar"] + current_context["annual_pillar"])
+        sai = (h % 37) / 10.0
+        return {"meta": {}, "physics": {"stress": {"SAI": sai, "IC": h % 5},
+                                        "wealth": {"Reynolds": float(h % 4500)},
+                                        "entropy": (h % 11) / 11.0}}
+
+
+class _StopAfter:
+    def __init__(self, n):
+        self.n = n
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.calls <= self.n
+
+
+class TestUniverseAudit(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.engine = SyntheticBaziEngine()
+        self.framework = _FakeFramework()
+
+    def _checkpoint(self, name):
+        return AuditCheckpoint(os.path.join(self.tmp.name, f"{name}.json"))
+
+    def test_generate_all_bazi_start_offset(self):
+        head = [c for _, c in zip(range(2000), self.engine.generate_all_bazi())]
+        self.assertEqual(next(self.engine.generate_all_bazi(1234)), head[1234])
+        self.assertEqual(list(self.engine.generate_all_bazi(518400)), [])
+
+    def test_grand_audit_resume_matches_uninterrupted_run(self):
+        full = run_streaming_audit(GrandPhaseAudit(self.framework, 1.0, 300), self.engine.generate_all_bazi,
+                                   self._checkpoint("full"), seed=7, board=LiveAggregateBoard())
+
+        checkpoint = self._checkpoint("resumed")
+        board = LiveAggregateBoard()
+        first = run_streaming_audit(GrandPhaseAudit(self.framework, 1.0, 300), self.engine.generate_all_bazi,
+                                    checkpoint, should_continue=_StopAfter(120), seed=7,
+                                    checkpoint_every=50, publish_every=25, board=board)
+        self.assertFalse(first["complete"])
+        self.assertEqual(first["scanned"], 120)
+        self.assertEqual(board.get("grand_universal")["total_samples"], 120)
+
+        second = run_streaming_audit(GrandPhaseAudit(self.framework, 1.0, 300), self.engine.generate_all_bazi,
+                                     checkpoint, board=board)
+        self.assertTrue(second["complete"])
+        self.assertEqual(second["resumed_from"], 120)
+        self.assertEqual(second["phase_points"], full["phase_points"])
+        self.assertTrue(checkpoint_snapshot(GrandPhaseAudit(None, 1.0, 0), checkpoint)["complete"])
+
+    def test_changed_params_start_fresh(self):
+        checkpoint = self._checkpoint("grand")
+        run_streaming_audit(GrandPhaseAudit(self.framework, 1.0, 100), self.engine.generate_all_bazi,
+                            checkpoint, should_continue=_StopAfter(40), board=LiveAggregateBoard())
+        result = run_streaming_audit(GrandPhaseAudit(self.framework, 0.5, 100), self.engine.generate_all_bazi,
+                                     checkpoint, board=LiveAggregateBoard())
+        self.assertEqual(result["resumed_from"], 0)
+        self.assertEqual(result["scanned"], 100)
+
+    def test_batch_collector_state_survives_resume(self):
+        def audit():
+            return BatchSimulationAudit(self.framework, ExpectedValueCollector(singularity_capacity=20, seed=11), 0.2, 200)
+
+        full = run_streaming_audit(audit(), self.engine.generate_all_bazi, self._checkpoint("b_full"),
+                                   seed=3, board=LiveAggregateBoard())
+        checkpoint = self._checkpoint("b_resumed")
+        run_streaming_audit(audit(), self.engine.generate_all_bazi, checkpoint,
+                            should_continue=_StopAfter(77), seed=3, board=LiveAggregateBoard())
+        resumed = run_streaming_audit(audit(), self.engine.generate_all_bazi, checkpoint, board=LiveAggregateBoard())
+        self.assertEqual(resumed["processed"], 200)
+        self.assertEqual(resumed["summary"], full["summary"])
+        self.assertEqual(resumed["singularities"], full["singularities"])
+        self.assertEqual(len(full["singularities"]), 20)
+        self.assertGreater(full["summary"]["singularity_count"], 20)
+        self.assertEqual(resumed["phase_grid"]["counts"], full["phase_grid"]["counts"])
+        self.assertEqual(full["phase_grid"]["total"], 200)
+
+    def test_grand_audit_samples_whole_pass(self):
+        audit = GrandPhaseAudit(self.framework, 1.0, 600)
+        audit.sampler.capacity = 50
+        result = run_streaming_audit(audit, self.engine.generate_all_bazi, self._checkpoint("sampled"),
+                                     seed=5, board=LiveAggregateBoard())
+        self.assertEqual(len(result["phase_points"]), 50)
+        self.assertEqual(result["sampled_from"], 600)
+        self.assertEqual(result["phase_grid"]["total"], 600)
+        self.assertEqual(sum(map(sum, result["density_grid"]["counts"])), 600)
+
+    def test_stopped_batch_run_saves_partial_baseline(self):
+        from core.trinity.core.engines.simulation_model import SimulationModel
+        from services.simulation_service import SimulationService
+
+        service = SimulationService.__new__(SimulationService)
+        service.model, service.engine, service.framework = SimulationModel(self.tmp.name), self.engine, self.framework
+
+        def stop(index, total, info):
+            service.model.is_running = False
+
+        result = service.run_batch_simulation(300, progress_callback=stop, seed=3)
+        self.assertFalse(result["complete"])
+        baseline = service.model.load_latest_baseline()
+        self.assertEqual((baseline["partial"], baseline["processed"], baseline["sample_size"]), (True, 100, 300))
+
+    def test_incomplete_audit_fails_at_construction(self):
+        class NoSnapshot(StreamingAudit):
+            def process(self, index, chart, rng): pass
+            def state_dict(self): return {}
+            def load_state_dict(self, state): pass
+
+        with self.assertRaises(TypeError):
+            NoSnapshot(10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from learning.video_pipeline import Stage, StagedPipeline, VideoPipeline, VideoTask
+
+
+class TestStagedPipeline(unittest.TestCase):
+
+    def test_fan_out_errors_and_backpressure(self):
+        in_flight = [0, 0]  # current, peak items between stage 1 and stage 2
+        lock = threading.Lock()
+
+        def split(n):
+            if n == 3:
+                raise ValueError("bad item")
+            for k in range(2):
+                with lock:
+                    in_flight[0] += 1
+                    in_flight[1] = max(in_flight[1], in_flight[0])
+                yield n * 10 + k
+
+        def slow_square(x):
+            time.sleep(0.002)
+            with lock:
+                in_flight[0] -= 1
+            yield x * x
+
+        errors = []
+        pipeline = StagedPipeline([Stage("split", split, 2), Stage("square", slow_square, 1)],
+                                  queue_size=2, on_error=lambda stage, item, e: errors.append((stage, item)))
+        out = pipeline.run(range(8))
+        self.assertEqual(sorted(out), sorted((n * 10 + k) ** 2 for n in range(8) if n != 3 for k in range(2)))
+        self.assertEqual(errors, [("split", 3)])
+        # queue (2) + one item held by the consumer + one blocked put per producer (2)
+        self.assertLessEqual(in_flight[1], 5)
+
+
+class TestVideoPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.events = []
+        self.lock = threading.Lock()
+        self.workdirs = set()
+
+    def log(self, *event):
+        with self.lock:
+            self.events.append(event)
+
+    def download(self, task, out_dir):
+        self.workdirs.add(out_dir)
+        if task.video_id == "broken":
+            raise RuntimeError("HTTP 403")
+        self.log("download", task.video_id)
+        path = os.path.join(out_dir, f"{task.video_id}.mp3")
+        with open(path, "w") as f:
+            f.write(task.video_id)
+        return path
+
+    def split(self, path, out_dir, seconds):
+        vid = open(path).read()
+        paths = []
+        for i in range(4):
+            seg = os.path.join(out_dir, f"{vid}_seg{i}.mp3")
+            with open(seg, "w") as f:
+                f.write(f"{vid}:{i}")
+            paths.append(seg)
+        return paths
+
+    def transcribe(self, path):
+        vid, i = open(path).read().split(":")
+        time.sleep(0.01)
+        self.log("transcribed", vid, int(i))
+        if vid == "glitch" and i == "1":
+            raise RuntimeError("decoder error")
+        return f"<{vid}{i}>" + "x" * 30
+
+    def extract(self, text, result):
+        self.log("extract", result.video_id, text)
+        return len(text)
+
+    def _pipeline(self, **kwargs):
+        kwargs.setdefault("extract", self.extract)
+        kwargs.setdefault("fetch_transcript", lambda task: ("字幕" * 40) if task.video_id.startswith("sub") else None)
+        return VideoPipeline(download_audio=self.download, split=self.split,
+                             transcribe=self.transcribe, clean_text=False, chunk_chars=50,
+                             temp_root=self.tmp.name, **kwargs)
+
+    def test_audio_segments_stream_into_extraction(self):
+        done = []
+        results = self._pipeline(on_video_done=done.append).run([VideoTask("u1", video_id="v1")])
+        r = results[0]
+        self.assertTrue(r.ok)
+        self.assertEqual((r.source, r.segments), ("audio", 4))
+        expected = "".join(f"<v1{i}>" + "x" * 30 for i in range(4))
+        self.assertEqual(r.transcript, expected)
+        self.assertEqual(r.chunks, 3)
+        extracted = [e[2] for e in self.events if e[0] == "extract"]
+        self.assertEqual("".join(extracted), expected)
+        self.assertEqual(r.extracted, [50, 50, len(expected) - 100])
+        self.assertEqual(done, [r])
+        # the first chunk is extracted before the last segment is transcribed
+        first_extract = next(i for i, e in enumerate(self.events) if e[0] == "extract")
+        last_segment = self.events.index(("transcribed", "v1", 3))
+        self.assertLess(first_extract, last_segment)
+        # temp files (audio, segments, run dir) are gone
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_channel_overlaps_downloads_with_transcription(self):
+        tasks = [VideoTask(f"u{i}", video_id=f"v{i}") for i in range(3)] + [VideoTask("s", video_id="sub1")]
+        results = self._pipeline(transcribe_workers=1).run(tasks)
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual([r.source for r in results], ["audio"] * 3 + ["subtitle"])
+        # v1 is downloaded while v0 is still transcribing
+        self.assertLess(self.events.index(("download", "v1")), self.events.index(("transcribed", "v0", 3)))
+
+    def test_failures_are_reported_per_video(self):
+        tasks = [VideoTask("a", video_id="broken"), VideoTask("b", video_id="glitch"), VideoTask("c", video_id="v2")]
+        broken, glitch, fine = self._pipeline().run(tasks)
+        self.assertEqual(broken.errors, ["fetch: HTTP 403"])
+        self.assertEqual(broken.chunks, 0)
+        # a failed segment is reported, the rest of the video is still transcribed and mined
+        self.assertEqual(glitch.errors, ["transcribe segment 1: decoder error"])
+        self.assertEqual(glitch.transcript, "".join(f"<glitch{i}>" + "x" * 30 for i in (0, 2, 3)))
+        self.assertGreater(glitch.chunks, 0)
+        self.assertEqual(glitch.failed_segments, [1])
+        self.assertTrue(glitch.partial)
+        self.assertFalse(glitch.ok)
+        self.assertTrue(fine.ok)
+        self.assertFalse(fine.partial)
+
+    def test_retry_mines_only_failed_segments(self):
+        def extract(text, result):
+            if "<v12>" in text:
+                raise RuntimeError("LLM timeout")
+            return self.extract(text, result)
+
+        first = self._pipeline(extract=extract).run([VideoTask("u", video_id="v1")])[0]
+        # chunks: [seg0 + seg1 head] [seg1 tail + seg2 head] [seg2 tail + seg3]
+        self.assertEqual(first.failed_segments, [1, 2])
+        self.assertTrue(first.partial)
+        self.assertEqual(len(first.extracted), 2)
+
+        self.events.clear()
+        retry = self._pipeline().run([VideoTask("u", video_id="v1", segments=first.failed_segments)])[0]
+        self.assertTrue(retry.ok)
+        self.assertEqual(sorted(e[2] for e in self.events if e[0] == "transcribed"), [1, 2])
+        self.assertEqual(retry.transcript, "".join(f"<v1{i}>" + "x" * 30 for i in (1, 2)))
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_short_transcripts_are_skipped(self):
+        result = self._pipeline().run([VideoTask("t", video_id="t", text="太短")])[0]
+        self.assertEqual((result.chunks, result.errors, result.ok), (0, [], False))
+        self.assertFalse(any(e[0] == "extract" for e in self.events))
+
+
+if __name__ == '__main__':
+    unittest.main()
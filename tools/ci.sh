@@ -19,4 +19,12 @@ echo "🧪 Running Pytest..."
 export PYTHONPATH=.
 pytest tests/ -v
 
+# 2. Startup import-time regression gate
+echo "⏱️ Checking startup import times..."
+python scripts/profile_startup.py --check config/startup_import_baseline.json
+
+# 3. Engine benchmark regression gate
+echo "📈 Checking engine benchmarks..."
+python scripts/benchmark_engines.py --check config/engine_benchmark_baseline.json
+
 echo "✅ All Tests Passed!"
@@ -1,5 +1,8 @@
 import streamlit as st
-import ollama
+from core.lazy_loader import lazy_import
+
+# [V9.4 Performance] ollama 客户端约 0.3s 导入开销，首次调用时才加载
+ollama = lazy_import("ollama")
 
 @st.cache_data(show_spinner=False)
 def get_ai_advice(profile_id, chart_str, strength_str, reactions_str, host, model_name):
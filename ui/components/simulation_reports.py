@@ -2,6 +2,7 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 from datetime import datetime
 from core.data.geo_cities import GEO_CITY_MAP
 from core.translation_util import T
@@ -32,18 +33,56 @@ def render_phase_radar(latest):
         fig.update_layout(paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', font_color="#888")
         st.plotly_chart(fig, use_container_width=True)
 
-def render_grand_audit():
+def render_phase_grid(grid, title):
+    """[V9.4] 计数网格热图（log1p 分桶，对数坐标轴），全量相图无需保留全部散点"""
+    if not grid or not grid.get("total"):
+        return
+    fig = go.Figure(go.Heatmap(z=grid["counts"], x=grid["x_centers"], y=grid["y_centers"],
+                               colorscale="Viridis", colorbar=dict(title="样本数")))
+    axis_type = "log" if grid.get("scale") == "log1p" else "linear"
+    fig.update_layout(title=f"{title} (N={grid['total']:,})", template="plotly_dark",
+                      xaxis=dict(title=grid.get("x_label"), type=axis_type),
+                      yaxis=dict(title=grid.get("y_label"), type=axis_type))
+    st.plotly_chart(fig, use_container_width=True)
+
+def render_grand_audit(controller=None):
     st.markdown("### 🏛️ 大一统因果审计")
+    # [V9.4] 后台流式审计：读取实时聚合快照（看板或检查点），不阻塞工作线程
+    live = controller.get_live_aggregates("grand_universal") if controller is not None else None
+    running = controller is not None and controller.is_audit_running("grand_universal")
+    if running or (live and not live.get("complete")):
+        live = live or {}
+        done, target = live.get("total_samples", 0), live.get("target") or 518400
+        st.progress(min(done / target, 1.0), text=f"{'🛰️ 后台审计中' if running else '⏸️ 检查点'}: {done:,} / {target:,}")
+        render_phase_grid(live.get("phase_grid"), "实时 SAI × Reynolds 相图 (部分聚合)")
+        if live.get("phase_points"):
+            df_live = pd.DataFrame(live["phase_points"])
+            st.plotly_chart(px.scatter(df_live, x="x", y="y", color="sai", title="实时相图 (部分聚合)", template="plotly_dark"),
+                            use_container_width=True)
+        if running:
+            if st.button("🔄 刷新实时聚合"):
+                st.rerun()
+        elif st.button("▶️ 从检查点后台续跑", type="primary"):
+            controller.start_background_audit("grand_universal", target)
+            st.rerun()
     if st.session_state.get("grand_res"):
         gres = st.session_state.grand_res
+        render_phase_grid(gres.get("phase_grid"), "SAI × Reynolds 全量相图")
+        render_phase_grid(gres.get("density_grid"), "Density × Resistance 全量相图")
         df_phase = pd.DataFrame(gres["phase_points"])
-        fig = px.scatter(df_phase, x="x", y="y", color="sai", size="re", title="52万全量样本物理相图", template="plotly_dark")
+        fig = px.scatter(df_phase, x="x", y="y", color="sai", size="re",
+                         title=f"物理相图（{len(df_phase):,} 点均匀抽样自 {gres.get('sampled_from', len(df_phase)):,} 样本）",
+                         template="plotly_dark")
         st.plotly_chart(fig, use_container_width=True)
-    else:
-        if st.button("🚀 立即启动全量对撞 (518,400 Samples)", type="primary"):
+    elif not running:
+        c1, c2 = st.columns(2)
+        if c1.button("🚀 立即启动全量对撞 (518,400 Samples)", type="primary"):
             st.session_state.sim_active = True
             st.session_state.sim_op_type = "phase_8_grand"
             st.rerun()
+        if controller is not None and c2.button("🛰️ 后台运行（可断点续跑）"):
+            controller.start_background_audit("grand_universal", 518400)
+            st.rerun()
 
 def render_live_fire_whitepaper():
     st.markdown("### 🏛️ QGA V4.3 实弹扫频与自爆风险白皮书")
@@ -1,7 +1,8 @@
 
 import streamlit as st
 import numpy as np
-import pandas as pd
+from core.lazy_loader import lazy_import
+pd = lazy_import("pandas")
 import plotly.graph_objects as go
 from core.flux import FluxEngine
 
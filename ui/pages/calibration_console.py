@@ -1,6 +1,7 @@
 import streamlit as st
 import json
-import pandas as pd
+from core.lazy_loader import lazy_import
+pd = lazy_import("pandas")
 import plotly.graph_objects as go
 import plotly.express as px
 import sys
@@ -169,61 +170,65 @@ global_rmse = np.sqrt(total_sq_err / count) if count > 0 else 0
 # 3. DASHBOARD METRICS
 col1, col2, col3, col4 = st.columns(4)
 col1.metric("Global RMSE", f"{global_rmse:.4f}", delta_color="inverse")
-col2.metric("Worst Case", f"{df.iloc[df['RMSE'].argmax()]['Case']}", f"RMSE: {df['RMSE'].max():.2f}")
+if results:
+    col2.metric("Worst Case", f"{df.iloc[df['RMSE'].argmax()]['Case']}", f"RMSE: {df['RMSE'].max():.2f}")
 col3.metric("Cases Loaded", len(cases))
 col4.metric("Engine Version", "V2.6.1")
 
-# 4. HEATMAP (The Grid)
-st.subheader("🌡️ Global Error Heatmap")
-
-# Transform for Heatmap
-heat_data = []
-for r in results:
-    heat_data.append({"Case": r["Case"], "Aspect": "Career", "Delta": r["Career_Delta"], "AbsDelta": abs(r["Career_Delta"])})
-    heat_data.append({"Case": r["Case"], "Aspect": "Wealth", "Delta": r["Wealth_Delta"], "AbsDelta": abs(r["Wealth_Delta"])})
-    heat_data.append({"Case": r["Case"], "Aspect": "Rel", "Delta": r["Rel_Delta"], "AbsDelta": abs(r["Rel_Delta"])})
-
-df_heat = pd.DataFrame(heat_data)
-
-# Visual with Plotly
-fig_heat = px.density_heatmap(
-    df_heat, 
-    x="Aspect", 
-    y="Case", 
-    z="AbsDelta", 
-    color_continuous_scale=["#00CC96", "#FECB52", "#EF553B"], # Green, Yellow, Red
-    range_color=[0, 8],
-    title="Absolute Error Magnitude (Green < 2, Red > 5)"
-)
-fig_heat.update_layout(height=600)
-st.plotly_chart(fig_heat, width='stretch')
-
-# 5. SCATTER PLOT (Correlation)
-st.subheader("📈 Prediction vs Reality Correlation")
-
-scatter_data = []
-for r in results:
-    scatter_data.append({"Val": r["Career_Real"], "Pred": r["Career_Pred"], "Type": "Career", "Case": r["Case"]})
-    scatter_data.append({"Val": r["Wealth_Real"], "Pred": r["Wealth_Pred"], "Type": "Wealth", "Case": r["Case"]})
-    scatter_data.append({"Val": r["Rel_Real"], "Pred": r["Rel_Pred"], "Type": "Rel", "Case": r["Case"]})
-
-df_scatter = pd.DataFrame(scatter_data)
-
-fig_scatter = px.scatter(
-    df_scatter, 
-    x="Val", 
-    y="Pred", 
-    color="Type", 
-    hover_data=["Case"],
-    title="V_real (X) vs E_pred (Y)",
-    range_x=[-11, 11],
-    range_y=[-11, 11]
-)
-# Add y=x line
-fig_scatter.add_shape(type="line", x0=-10, y0=-10, x1=10, y1=10, line=dict(color="Gray", dash="dash"))
-
-st.plotly_chart(fig_scatter, width='stretch')
-
-# 6. DETAILED DATA
-with st.expander("查看详细数据表 (Detailed Data)"):
-    st.dataframe(df.style.background_gradient(subset=['RMSE'], cmap="RdYlGn_r"))
+if not results:
+    st.info(f"No calibration cases found ({os.path.normpath(CASES_PATH)}).")
+else:
+    # 4. HEATMAP (The Grid)
+    st.subheader("🌡️ Global Error Heatmap")
+
+    # Transform for Heatmap
+    heat_data = []
+    for r in results:
+        heat_data.append({"Case": r["Case"], "Aspect": "Career", "Delta": r["Career_Delta"], "AbsDelta": abs(r["Career_Delta"])})
+        heat_data.append({"Case": r["Case"], "Aspect": "Wealth", "Delta": r["Wealth_Delta"], "AbsDelta": abs(r["Wealth_Delta"])})
+        heat_data.append({"Case": r["Case"], "Aspect": "Rel", "Delta": r["Rel_Delta"], "AbsDelta": abs(r["Rel_Delta"])})
+
+    df_heat = pd.DataFrame(heat_data)
+
+    # Visual with Plotly
+    fig_heat = px.density_heatmap(
+        df_heat, 
+        x="Aspect", 
+        y="Case", 
+        z="AbsDelta", 
+        color_continuous_scale=["#00CC96", "#FECB52", "#EF553B"], # Green, Yellow, Red
+        range_color=[0, 8],
+        title="Absolute Error Magnitude (Green < 2, Red > 5)"
+    )
+    fig_heat.update_layout(height=600)
+    st.plotly_chart(fig_heat, width='stretch')
+
+    # 5. SCATTER PLOT (Correlation)
+    st.subheader("📈 Prediction vs Reality Correlation")
+
+    scatter_data = []
+    for r in results:
+        scatter_data.append({"Val": r["Career_Real"], "Pred": r["Career_Pred"], "Type": "Career", "Case": r["Case"]})
+        scatter_data.append({"Val": r["Wealth_Real"], "Pred": r["Wealth_Pred"], "Type": "Wealth", "Case": r["Case"]})
+        scatter_data.append({"Val": r["Rel_Real"], "Pred": r["Rel_Pred"], "Type": "Rel", "Case": r["Case"]})
+
+    df_scatter = pd.DataFrame(scatter_data)
+
+    fig_scatter = px.scatter(
+        df_scatter, 
+        x="Val", 
+        y="Pred", 
+        color="Type", 
+        hover_data=["Case"],
+        title="V_real (X) vs E_pred (Y)",
+        range_x=[-11, 11],
+        range_y=[-11, 11]
+    )
+    # Add y=x line
+    fig_scatter.add_shape(type="line", x0=-10, y0=-10, x1=10, y1=10, line=dict(color="Gray", dash="dash"))
+
+    st.plotly_chart(fig_scatter, width='stretch')
+
+    # 6. DETAILED DATA
+    with st.expander("查看详细数据表 (Detailed Data)"):
+        st.dataframe(df.style.background_gradient(subset=['RMSE'], cmap="RdYlGn_r"))
@@ -1,5 +1,6 @@
 import streamlit as st
-import pandas as pd
+from core.lazy_loader import lazy_import
+pd = lazy_import("pandas")
 import numpy as np
 import plotly.graph_objects as go
 from datetime import datetime
@@ -555,7 +556,7 @@ def render():
         current_data = next((d for d in timeline_data if d['year'] == selected_year), timeline_data[0])
         
         # [QGA V2.5.6] Dynamic Streaming LLM Report
-        # Removed full-report cache to enable token-by-token streaming
+        # Reports are cached inside core.narrator (LLM output persisted); streaming stays token/sentence based
         with st.status("🔮 正在实时解析全息轨迹...", expanded=True) as status:
             st.write("🌌 正在提取 5D 张量特征...")
             report_data = {
@@ -573,17 +574,16 @@ def render():
             
             st.write(f"🧠 正在联通星际语义引擎 ({current_model_name})...")
             
-            # 使用自定义流式显示实现逐字逐句打字机效果
+            # 使用自定义流式显示（LLM 按 token，缓存命中/规则生成按句子分块）
             report_container = st.empty()
             accumulated_text = ""
             
-            # 使用生成器逐字符获取内容
-            for char in stream_holographic_report(
+            for chunk in stream_holographic_report(
                 report_data,
                 result.get('pattern_name'), 
                 current_data['pattern_state'].get('state', 'STABLE')
             ):
-                accumulated_text += char
+                accumulated_text += chunk
                 # 实时更新显示内容（支持Markdown格式）
                 report_container.markdown(accumulated_text)
             
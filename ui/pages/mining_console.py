@@ -1,5 +1,6 @@
 import streamlit as st
-import pandas as pd
+from core.lazy_loader import lazy_import
+pd = lazy_import("pandas")
 import json
 import time
 import os
@@ -13,6 +14,7 @@ from service.rule_db import RuleDatabase
 from service.processor import ContentProcessor
 from service.sanitizer import Sanitizer
 from service.web_hunter import WebHunter
+from service.extraction_cache import get_extraction_cache
 from core.config_manager import ConfigManager
 
 def render():
@@ -248,8 +250,14 @@ def render():
         with col_op_r:
             st.subheader("2. 实时监控 (Monitor)")
             with st.container(border=True):
-                st.metric("今日已挖掘案例", len(case_db.get_all_cases_meta()), delta="+2")
+                st.metric("今日已挖掘案例", case_db.count_cases(), delta="+2")
                 st.metric("待审核规则", 0) # TODO: Connect to RuleDB count
+                # Extraction cache (lookups of every miner process, incl. background jobs)
+                cache_stats = get_extraction_cache().stats()
+                extract_stats = cache_stats.get("extract", {})
+                st.metric("提取缓存命中率 (LLM 跳过)", f"{extract_stats.get('hit_rate', 0.0):.0%}")
+                for stage, row in cache_stats.items():
+                    st.caption(f"{stage}: 精确 {row['exact']} | 近似重复 {row['near']} | 未命中 {row['miss']}")
                 st.markdown("---")
                 st.caption("系统日志")
                 st.code("System Ready...\nMiner Alpha loaded.\nCaseDB connected.", language="bash")
@@ -4,7 +4,8 @@ import os
 from datetime import datetime, timedelta
 import plotly.graph_objects as go
 import numpy as np
-import pandas as pd
+from core.lazy_loader import lazy_import
+pd = lazy_import("pandas")
 import re
 import sys
 
@@ -134,9 +134,14 @@ def render():
             # --- 任务分发 ---
             if op_type == "phase_8_grand":
                 st.write("🌌 加载 518,400 样本全息矩阵...")
-                res = controller.run_grand_unified_audit()
+                grand_bar = st.progress(0.0)
+                res = controller.run_grand_universal_audit(
+                    progress_callback=lambda i, n, info: grand_bar.progress(min(i / n, 1.0), text=info.get("phase", ""))
+                )
                 st.session_state.grand_res = res
-                st.write("✅ 审计完成，相图生成中...")
+                if res.get("resumed_from"):
+                    st.write(f"♻️ 已从检查点续跑（起点 {res['resumed_from']:,}）")
+                st.write("✅ 审计完成，相图生成中..." if res.get("complete") else "⏸️ 审计已暂停，进度已写入检查点")
                 
             elif op_type in ["v43_live_fire_audit", "v43_penetration_audit", "v435_yangren_audit", 
                              "v435_thermo_audit", "v435_inertia_audit", "v435_tunnel_audit",
@@ -224,7 +229,7 @@ def render():
             st.code("System Ready.\nEngine V15.6.0 Loaded.\nMatrix: 518,400 x 64", language="bash")
 
     elif view == "grand_audit":
-        reports.render_grand_audit()
+        reports.render_grand_audit(controller)
         st.divider()
         reports.render_live_fire_whitepaper()
         st.divider()
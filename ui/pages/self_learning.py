@@ -348,11 +348,13 @@ def _render_multimedia_learning(): # Renamed function
                         
                          if vids:
                             from learning.video_miner import VideoMiner
-                            vm = VideoMiner()
-                            history = vm.get_history()
+                            vm = VideoMiner(db=db)
                             for v in vids:
-                                v_id = vm.get_video_id(v['url'])
-                                is_done = v_id in history
+                                v['Video_ID'] = vm.get_video_id(v['url'])
+                            statuses = vm.db.get_video_statuses(v['Video_ID'] for v in vids if v['Video_ID'])
+                            for v in vids:
+                                v_id = v['Video_ID']
+                                is_done = statuses.get(v_id) == 'processed'
                                 v['Status'] = "✅ 已学" if is_done else "🆕 新课"
                                 v['Select'] = not is_done
                                 v['Video_ID'] = v_id
@@ -390,12 +392,14 @@ def _render_multimedia_learning(): # Renamed function
                             if not vids: vids = []
                             
                             from learning.video_miner import VideoMiner
-                            vm = VideoMiner()
-                            history = vm.get_history()
+                            vm = VideoMiner(db=db)
+                            for v in vids:
+                                v['Video_ID'] = vm.get_video_id(v['url'])
+                            statuses = vm.db.get_video_statuses(v['Video_ID'] for v in vids if v['Video_ID'])
                             
                             for v in vids:
-                                v_id = vm.get_video_id(v['url'])
-                                is_done = v_id in history
+                                v_id = v['Video_ID']
+                                is_done = statuses.get(v_id) == 'processed'
                                 v['Status'] = "✅ 已学" if is_done else "🆕 新课"
                                 v['Select'] = not is_done 
                                 v['Video_ID'] = v_id 
@@ -1,5 +1,11 @@
 import streamlit as st
-import ollama
+from core.lazy_loader import lazy_import
+
+# [V9.4 Performance] ollama 客户端约 0.3s 导入开销，首次调用时才加载
+ollama = lazy_import("ollama")
+
+PROFILE_VIEW = "profile"
+
 
 def render_system_config(config_manager):
     """
@@ -15,6 +21,11 @@ def render_system_config(config_manager):
             <p style="color: {COLORS['moon_silver']}; font-style: italic;">调节命运算法的底层参数与链接</p>
         </div>
     """, unsafe_allow_html=True)
+
+    # /profile 视图：?view=profile 时只渲染阶段耗时剖析
+    if st.query_params.get("view") == PROFILE_VIEW:
+        render_profile_view()
+        return
     
     # ==================== 学习任务配置 ====================
     st.markdown(f"""
@@ -147,3 +158,63 @@ def render_system_config(config_manager):
             else:
                  st.info("请先测试连接以加载模型列表")
 
+    st.divider()
+
+    # ==================== 性能剖析 ====================
+    with st.expander("⏱️ 阶段耗时剖析 (Profile)", expanded=False):
+        st.caption(f"独立视图：在地址后追加 ?view={PROFILE_VIEW}")
+        render_profile_view()
+
+
+def render_profile_view():
+    """
+    /profile 视图：arbitrate_bazi 与 UnifiedEngine.analyze 的分阶段耗时 (core/tracing.py)
+    """
+    import json
+    from core.tracing import get_tracer
+
+    tracer = get_tracer()
+    st.markdown("#### ⏱️ 阶段耗时剖析 (Stage Profile)")
+
+    col_toggle, col_reset = st.columns([1, 1])
+    with col_toggle:
+        enabled = st.checkbox("启用阶段追踪", value=tracer.enabled, key="trace_enabled",
+                              help="启用后每次排盘/仲裁按阶段计时；关闭时 span 为空操作")
+        if enabled != tracer.enabled:
+            tracer.enable() if enabled else tracer.disable()
+    with col_reset:
+        if st.button("🧹 清空统计", key="trace_reset"):
+            tracer.reset()
+
+    summary = tracer.summary()
+    stages = summary['stages']
+    if not stages:
+        st.info("暂无数据：启用追踪后运行一次排盘或仲裁 (也可用环境变量 BAZI_TRACE=1 启动)")
+        return
+
+    st.dataframe([
+        {
+            "阶段": name,
+            "次数": s['count'],
+            "总计 (ms)": round(s['total_ms'], 2),
+            "平均 (ms)": round(s['mean_ms'], 3),
+            "p50 (ms)": round(s['p50_ms'], 3),
+            "p90 (ms)": round(s['p90_ms'], 3),
+            "p99 (ms)": round(s['p99_ms'], 3),
+            "最大 (ms)": round(s['max_ms'], 3),
+        }
+        for name, s in stages.items()
+    ], use_container_width=True, hide_index=True)
+
+    selected = st.selectbox("耗时分布", list(stages), key="trace_stage")
+    buckets = stages[selected]['buckets']
+    st.bar_chart({"≤ ms": list(buckets), "次数": list(buckets.values())}, x="≤ ms", y="次数")
+
+    col_json, col_chrome = st.columns([1, 1])
+    with col_json:
+        st.download_button("📥 JSON 汇总", json.dumps(summary, ensure_ascii=False, indent=2),
+                           file_name="trace_summary.json", mime="application/json")
+    with col_chrome:
+        st.download_button("📥 Chrome Trace", json.dumps(tracer.chrome_trace()),
+                           file_name="trace_chrome.json", mime="application/json",
+                           help="在 chrome://tracing 或 ui.perfetto.dev 中打开")
@@ -1,5 +1,6 @@
 import streamlit as st
-import pandas as pd
+from core.lazy_loader import lazy_import
+pd = lazy_import("pandas")
 import json
 import numpy as np
 import time
@@ -6,7 +6,8 @@ MVC View - 只负责UI展示，所有业务逻辑通过Controller处理
 
 import streamlit as st
 import json
-import pandas as pd
+from core.lazy_loader import lazy_import
+pd = lazy_import("pandas")
 import plotly.graph_objects as go
 from pathlib import Path
 import sys
@@ -0,0 +1,117 @@
+"""
+utils/startup_profiler.py
+-------------------------
+启动分析器：记录 Streamlit 入口各阶段的导入与初始化耗时。
+
+[V9.4 Performance] 通过 `--profile-startup` 启用：
+
+    streamlit run main.py -- --profile-startup
+    # 或
+    BAZI_PROFILE_STARTUP=1 streamlit run main.py
+
+启用后 main.py 的侧边栏、页面导入与渲染分段计时，惰性模块/引擎的物化
+（core.lazy_loader.registry）也一并记录，报告写入 results/startup_profile.json。
+未启用时 measure() 为空操作，不引入额外开销。
+
+分析器是进程级单例，会跨 Streamlit 重跑存活：main.py 顶部调用 begin_run()，
+每次重跑的报告只包含本次运行的分段。
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+PROFILE_FLAG = "--profile-startup"
+PROFILE_ENV = "BAZI_PROFILE_STARTUP"
+PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__))
+DEFAULT_REPORT_PATH = os.path.join(PROJECT_ROOT, "results", "startup_profile.json")
+
+
+def profiling_requested(argv: Optional[List[str]] = None) -> bool:
+    """命令行带 --profile-startup 或设置了 BAZI_PROFILE_STARTUP=1"""
+    argv = sys.argv if argv is None else argv
+    return PROFILE_FLAG in argv or os.environ.get(PROFILE_ENV, "") in ("1", "true")
+
+
+class StartupProfiler:
+    """
+    分段计时器
+
+    spans: [{'name', 'kind', 'seconds', 'depth'}, ...]（按结束顺序）
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.started_at = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._depth = threading.local()
+        if enabled:
+            from core.lazy_loader import registry
+            registry.add_listener(self._on_lazy_event)
+
+    def begin_run(self):
+        """开始新一次运行（Streamlit 重跑）：清空分段并重置起点"""
+        with self._lock:
+            self.spans = []
+            self.started_at = time.perf_counter()
+
+    def _on_lazy_event(self, event: Dict[str, Any]):
+        self.record(event['name'], event['seconds'], kind=f"lazy_{event['kind']}")
+
+    def record(self, name: str, seconds: float, kind: str = "span", depth: Optional[int] = None):
+        if not self.enabled:
+            return
+        if depth is None:
+            depth = getattr(self._depth, "value", 0)
+        with self._lock:
+            self.spans.append({'name': name, 'kind': kind, 'seconds': seconds, 'depth': depth})
+
+    @contextmanager
+    def measure(self, name: str, kind: str = "span"):
+        """计时一个阶段（可嵌套）"""
+        if not self.enabled:
+            yield
+            return
+        depth = getattr(self._depth, "value", 0)
+        self._depth.value = depth + 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth.value = depth
+            self.record(name, time.perf_counter() - start, kind=kind, depth=depth)
+
+    def report(self) -> Dict[str, Any]:
+        """汇总报告：总耗时、各阶段耗时（降序）与惰性物化记录"""
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            'total_seconds': time.perf_counter() - self.started_at,
+            'spans': sorted(spans, key=lambda s: s['seconds'], reverse=True),
+        }
+
+    def write_report(self, path: str = DEFAULT_REPORT_PATH) -> str:
+        """写出 JSON 报告并返回路径"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        return path
+
+
+_profiler: Optional[StartupProfiler] = None
+_profiler_lock = threading.Lock()
+
+
+def get_startup_profiler() -> StartupProfiler:
+    """获取进程级启动分析器（未请求分析时返回禁用实例）"""
+    global _profiler
+    if _profiler is None:
+        with _profiler_lock:
+            if _profiler is None:
+                _profiler = StartupProfiler(enabled=profiling_requested())
+    return _profiler